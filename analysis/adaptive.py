@@ -0,0 +1,272 @@
+import argparse
+import math
+import os
+import random
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import numpy as np
+
+import aggregates
+import config
+import data_loader
+import machine
+import orchestrator
+import record_stream
+
+# --- 설정 ---
+# 고정된 SEEDS(5개) 대신, (시나리오, 전략) 칸마다 평균 totalTime 의 신뢰구간이 충분히 좁아질 때까지만 실행합니다.
+# 모든 칸을 min_runs 번 실행한 뒤, 라운드마다 t 신뢰구간 반폭(평균 대비 %)이 target_ci_pct 보다 넓은 칸에만
+# batch 개의 시드를 더 실행하고, 목표에 도달했거나 max_runs 에 닿은 칸은 멈춥니다.
+# 몇 번 안 되는 실행으로 멈출지 정하므로 부트스트랩(n=3 에서 95% 구간의 실제 포함률 약 76%) 대신 t 분포를 씁니다.
+# 모든 칸은 같은 시드 순서(SEEDS, 그 뒤로는 고정 난수 시드)를 쓰므로 칸끼리 같은 그래프로 비교됩니다.
+# 결과는 data_loader 가 그대로 읽는 raw_results.json 하나로 모입니다 (라운드마다 원자적 교체).
+ADAPTIVE_DIR_NAME = 'adaptive'
+MAX_SEED = 2 ** 31 - 1
+
+
+def _settings() -> dict:
+    cfg = config.load_config()
+    adaptive, robust = cfg.get('adaptive', {}), cfg.get('robust', {})
+    return {
+        'target_ci_pct': adaptive.get('target_ci_pct', 5.0),
+        'min_runs': adaptive.get('min_runs', 3),
+        'batch': adaptive.get('batch', 3),
+        'max_runs': adaptive.get('max_runs', 30),
+        'repeat': adaptive.get('repeat', False),
+        'warmup': adaptive.get('warmup', True),
+        'seed': adaptive.get('seed', 0),
+        'confidence': robust.get('confidence', 0.95),
+    }
+
+
+def seed_sequence(base_seeds: list, count: int, repeat: bool = False, rng_seed: int = 0) -> list:
+    """
+    칸마다 k 번째 실행에 쓸 시드 목록의 앞 count 개를 만듭니다.
+    기본 시드(SEEDS)를 먼저 쓰고, 그 뒤로는 repeat 이면 기본 시드를 다시 반복(같은 그래프, 측정 잡음만),
+    아니면 rng_seed 로 만든 새 시드(새 그래프)를 씁니다. 같은 인자면 항상 같은 목록입니다.
+    """
+    seeds = list(base_seeds[:count])
+    if repeat:
+        while len(seeds) < count:
+            seeds.extend(base_seeds[:count - len(seeds)])
+        return seeds
+    rng, used = random.Random(rng_seed), set(base_seeds)
+    while len(seeds) < count:
+        seed = rng.randint(1, MAX_SEED)
+        if seed not in used:
+            used.add(seed)
+            seeds.append(seed)
+    return seeds
+
+
+def _t_cdf_abs(t: float, df: int) -> float:
+    """자유도 df(정수) 인 t 분포에서 P(|T| < t). 정수 자유도의 유한 급수 (Abramowitz & Stegun 26.7.3, 26.7.4)."""
+    theta = math.atan(t / math.sqrt(df))
+    sin, cos2 = math.sin(theta), math.cos(theta) ** 2
+    if df % 2 == 0:
+        term = total = 1.0
+        for k in range(1, df // 2):
+            term *= cos2 * (2 * k - 1) / (2 * k)
+            total += term
+        return sin * total
+    total = theta
+    if df > 1:
+        term = series = 1.0
+        for k in range(1, (df - 1) // 2):
+            term *= cos2 * (2 * k) / (2 * k + 1)
+            series += term
+        total += sin * math.cos(theta) * series
+    return 2 / math.pi * total
+
+
+def t_critical(confidence: float, df: int) -> float:
+    """양측 신뢰 수준 confidence 의 t 임계값 (scipy 없이 _t_cdf_abs 를 이분 탐색)."""
+    low, high = 0.0, 1.0
+    while _t_cdf_abs(high, df) < confidence:
+        low, high = high, high * 2
+    for _ in range(100):
+        mid = (low + high) / 2
+        low, high = (mid, high) if _t_cdf_abs(mid, df) < confidence else (low, mid)
+    return (low + high) / 2
+
+
+def cell_precision(records: list, confidence: float) -> dict:
+    """
+    (시나리오, 전략) 칸별 평균 totalTime 과 t 신뢰구간 (평균 ± t·s/√n), 반폭(평균 대비 %)을 계산합니다.
+
+    Returns:
+        dict: (scenario, strategy) → {'n', 'mean', 'ci_low', 'ci_high', 'ci_halfwidth_pct'}.
+              표본이 2개 미만이면 신뢰구간 값은 NaN 입니다.
+    """
+    times = {}
+    for record in records:
+        times.setdefault((record['scenario'], record['strategy']), []).append(record['totalTime'])
+    out = {}
+    for cell, values in times.items():
+        values = np.asarray(values, dtype=float)
+        row = {'n': len(values), 'mean': float(values.mean()), 'ci_low': np.nan, 'ci_high': np.nan,
+               'ci_halfwidth_pct': np.nan}
+        if len(values) >= 2:
+            halfwidth = t_critical(confidence, len(values) - 1) * values.std(ddof=1) / math.sqrt(len(values))
+            row['ci_low'], row['ci_high'] = row['mean'] - halfwidth, row['mean'] + halfwidth
+            row['ci_halfwidth_pct'] = halfwidth / row['mean'] * 100 if row['mean'] else 0.0
+        out[cell] = row
+    return out
+
+
+def run_batch(
+    command: list,
+    case: dict,
+    seeds: list,
+    step_dir: str,
+    extra_args: list = (),
+    warmup: bool = True,
+) -> tuple:
+    """
+    한 칸의 시드 묶음을 run-benchmark.ts 한 번으로 실행합니다.
+
+    Returns:
+        tuple: (레코드 목록, 성공 여부).
+    """
+    os.makedirs(step_dir, exist_ok=True)
+    stream_path = os.path.join(step_dir, 'raw_results.ndjson')
+    scenario = f"{case['scenario']}:{case['nodes']}:{case['edges']}:{case['groups']}"
+    args = command + [
+        f'--scenario={scenario}', f"--strategy={case['strategy']}", f"--seeds={','.join(map(str, seeds))}",
+        f'--out={step_dir}',
+    ] + ([] if warmup else ['--no-warmup']) + list(extra_args)
+    with open(os.path.join(step_dir, orchestrator.LOG_FILE_NAME), 'w') as log:
+        code = subprocess.call(args, cwd=orchestrator.REPO_ROOT, stdout=log, stderr=subprocess.STDOUT)
+    records = list(record_stream.iter_records(stream_path)) if os.path.exists(stream_path) else []
+    return records, code == 0 and len(records) == len(seeds)
+
+
+def run_adaptive(
+    target_ci_pct: Optional[float] = None,
+    max_runs: Optional[int] = None,
+    batch: Optional[int] = None,
+    repeat: Optional[bool] = None,
+    extra_args: list = (),
+) -> Optional[str]:
+    """
+    칸마다 신뢰구간이 목표 폭에 도달할 때까지 시드를 늘려 가며 실행합니다.
+
+    Args:
+        target_ci_pct (Optional[float]): 멈출 신뢰구간 반폭 (평균 대비 %). 기본값은 config.yaml 의 adaptive.target_ci_pct.
+        max_runs (Optional[int]): 칸마다 최대 실행 수. 기본값은 adaptive.max_runs.
+        batch (Optional[int]): 라운드마다 목표에 못 미친 칸에 더할 실행 수. 기본값은 adaptive.batch.
+        repeat (Optional[bool]): True 이면 새 시드 대신 기본 시드를 반복합니다. 기본값은 adaptive.repeat.
+        extra_args (list): run-benchmark.ts 에 그대로 넘길 인자 (예: ['--no-layout']).
+
+    Returns:
+        Optional[str]: raw_results.json 경로. 벤치마크 행렬을 가져오지 못하면 None.
+    """
+    settings = _settings()
+    command = list(config.load_config().get('orchestrator', {}).get('command', ['npx', 'tsx', 'scripts/run-benchmark.ts']))
+    target_ci_pct = target_ci_pct or settings['target_ci_pct']
+    max_runs = max_runs or settings['max_runs']
+    batch = batch or settings['batch']
+    repeat = settings['repeat'] if repeat is None else repeat
+
+    try:
+        matrix = orchestrator.list_cases(command)
+    except (OSError, subprocess.CalledProcessError, ValueError, IndexError) as e:
+        print(f"❌ Error: Could not list benchmark cases with '{' '.join(command)} --list': {e}")
+        return None
+    cells = {(case['scenario'], case['strategy']): case for case in matrix}
+    base_seeds = list(dict.fromkeys(case['seed'] for case in matrix))
+    seeds = seed_sequence(base_seeds, max_runs, repeat, settings['seed'])
+
+    run_dir = os.path.join(data_loader.RESULTS_DIR, time.strftime(orchestrator.RUN_TIME_FORMAT))
+    output_path = os.path.join(run_dir, orchestrator.RAW_FILE_NAME)
+    os.makedirs(run_dir, exist_ok=True)
+    print(f"🚀 Adaptive run over {len(cells)} cells: stop at ±{target_ci_pct:.1f}% CI "
+          f"({settings['confidence']:.0%}), {settings['min_runs']} to {max_runs} runs per cell, +{batch} per round")
+
+    records, step_dirs, offsets, counts = [], [], [], {cell: 0 for cell in cells}
+    active, precision, failed = list(cells), {}, []
+    round_no = 0
+    while active:
+        round_no += 1
+        started = time.monotonic()
+        for cell in active:
+            n = counts[cell]
+            want = min(settings['min_runs'] if n == 0 else batch, max_runs - n)
+            step_dir = os.path.join(run_dir, ADAPTIVE_DIR_NAME,
+                                    f"{aggregates.safe_name(cell[0])}_{aggregates.safe_name(cell[1])}-r{round_no}")
+            step_records, ok = run_batch(command, cells[cell], seeds[n:n + want], step_dir, extra_args,
+                                         warmup=settings['warmup'])
+            offsets.append(len(records))
+            records.extend(step_records)
+            step_dirs.append(step_dir)
+            counts[cell] += len(step_records)
+            if not ok:
+                failed.append(cell)
+                print(f"❌ Error: {cell[0]} / {cell[1]} failed "
+                      f"(see {os.path.join(step_dir, orchestrator.LOG_FILE_NAME)}). Stopping this cell.")
+        orchestrator.write_records(records, output_path)
+        orchestrator.merge_layouts(step_dirs, offsets, os.path.join(run_dir, orchestrator.LAYOUT_FILE_NAME))
+        machine.merge_machines(step_dirs, os.path.join(run_dir, machine.MACHINE_FILE_NAME))
+
+        precision = cell_precision(records, settings['confidence'])
+        converged = [cell for cell in active if precision.get(cell, {}).get('ci_halfwidth_pct', np.nan) <= target_ci_pct]
+        active = [cell for cell in active if cell not in converged and cell not in failed and counts[cell] < max_runs]
+        print(f"🔁 Round {round_no}: {len(cells) - len(active)}/{len(cells)} cells done, "
+              f"{sum(counts.values())} runs so far ({time.monotonic() - started:.1f}s)")
+
+    print(format_precision(precision, counts, target_ci_pct, max_runs))
+    fixed = len(base_seeds) * len(cells)
+    print(f"📝 Saved {len(records)} records ({fixed} with the fixed seed list) into: {output_path}")
+    return output_path
+
+
+def format_precision(precision: dict, counts: dict, target_ci_pct: float, max_runs: int) -> str:
+    """칸별 실행 수, 평균, 신뢰구간 반폭과 멈춘 이유를 고정폭 표로 만듭니다."""
+    header = ['Scenario', 'Strategy', 'Runs', 'Mean (ms)', 'CI ±%', 'Status']
+    rows = []
+    for cell, n in counts.items():
+        stats = precision.get(cell, {})
+        halfwidth = stats.get('ci_halfwidth_pct', np.nan)
+        status = 'converged' if halfwidth <= target_ci_pct else ('max runs' if n >= max_runs else 'failed')
+        rows.append([cell[0], cell[1], str(n), f"{stats.get('mean', np.nan):.2f}", f"{halfwidth:.1f}", status])
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = ['  '.join(cell.ljust(w) if i in (0, 1, 5) else cell.rjust(w) for i, (cell, w) in enumerate(zip(row, widths)))
+             for row in [header] + rows]
+    lines.insert(1, '  '.join('-' * w for w in widths))
+    return '\n'.join(lines)
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Run seeds per (scenario, strategy) until the mean totalTime CI is narrow enough.',
+        epilog='Arguments after "--" are passed to run-benchmark.ts (e.g. -- --no-layout).',
+    )
+    parser.add_argument('--target-ci', type=float, default=None,
+                        help='Stop a cell once the CI half-width is at most this %% of the mean (default: adaptive.target_ci_pct).')
+    parser.add_argument('--max-runs', type=int, default=None, help='Most runs per cell (default: adaptive.max_runs).')
+    parser.add_argument('--batch', type=int, default=None, help='Runs added per round to unconverged cells (default: adaptive.batch).')
+    parser.add_argument('--repeat', action='store_true', default=None,
+                        help='Repeat the base seeds instead of drawing new ones (timing noise only, same graphs).')
+    parser.add_argument('--analyze', action='store_true', help='Run the analysis pipeline on the results.')
+    argv = sys.argv[1:]
+    extra = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    output_path = run_adaptive(args.target_ci, args.max_runs, args.batch, args.repeat, extra)
+    if output_path is None:
+        return 1
+    if args.analyze:
+        import main as analysis_main
+
+        return analysis_main.run_pipeline(output_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
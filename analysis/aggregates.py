@@ -0,0 +1,109 @@
+import re
+
+import numpy as np
+import pandas as pd
+
+import timer_tree
+from profiler import profiler
+
+# --- 설정 ---
+# (시나리오, 전략, 측정 경로) 단위의 집계 큐브입니다.
+# 벤치마크 데이터프레임을 한 번만 long 형태로 바꾸고 한 번의 groupby 로 모든 통계를 계산하여,
+# analyzer / visualizer / report_generator 가 같은 큐브를 인덱스 조회로 나눠 씁니다.
+index_columns = ['scenario', 'strategy', 'path']
+# 시나리오별 차트/요약 이전에는 이 시나리오만 분석했습니다 (summary.json 의 large_scenario_breakdown,
+# 'three_step_breakdown_pie_<전략>.png'). 기존 소비자와 리포트 링크가 깨지지 않도록 이 시나리오는 예전 이름을 유지합니다.
+LEGACY_SCENARIO = 'Large (Standard)'
+QUANTILES = {'median': 0.5, 'p90': 0.9}
+
+
+def build_cube(df: pd.DataFrame, levels_cfg: dict = None) -> pd.DataFrame:
+    """
+    모든 (시나리오, 전략, 측정 경로) 셀의 통계를 한 번에 계산합니다.
+    경로는 timer_tree 의 호출 트리 경로이므로 레거시 키('Placement')와 L1 키('L1-Placement')가 같은 행으로 모입니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임 (한 실행).
+        levels_cfg (dict): config.yaml 의 'levels' 섹션.
+
+    Returns:
+        pd.DataFrame: (scenario, strategy, path) 인덱스와 key, level, parent,
+                      count, mean, std, min, median, p90, max (측정된 레코드 기준),
+                      inclusive, exclusive, uninstrumented, share (timer_tree.build_tree 와 동일) 컬럼.
+                      시나리오/전략은 데이터에 처음 등장한 순서, 셀 안에서는 (level, 키 순서)로 정렬됩니다.
+    """
+    with profiler.section('L2-Cube:Long'):
+        long = timer_tree.compute_self_time(timer_tree.to_long(df, levels_cfg))
+    with profiler.section('L2-Cube:Stats'):
+        grouped = long.groupby(index_columns, sort=False)['time']
+
+        stats = grouped.agg(['count', 'mean', 'std', 'min', 'max'])
+        quantiles = grouped.quantile(list(QUANTILES.values())).unstack()
+        quantiles.columns = list(QUANTILES)
+        keys = long.groupby(index_columns, sort=False)['key'].first()
+
+    with profiler.section('L2-Cube:Tree'):
+        tree = timer_tree.tree_from_long(long).set_index(index_columns)
+    cube = tree.join(keys).join(stats).join(quantiles)
+
+    # 출력 순서: 시나리오/전략은 등장 순서, 측정 키는 원본 컬럼 순서
+    key_rank = {key: i for i, key in enumerate(['totalTime'] + timer_tree.timer_columns(df))}
+    order = pd.DataFrame({
+        'scenario': cube.index.get_level_values('scenario').map(_rank(df['scenario'])),
+        'strategy': cube.index.get_level_values('strategy').map(_rank(df['strategy'])),
+        'level': cube['level'].to_numpy(),
+        'key': cube['key'].map(key_rank).to_numpy(),
+    })
+    cube = cube.iloc[np.lexsort([order[c].to_numpy() for c in reversed(order.columns)])]
+
+    columns = ['key', 'level', 'parent', 'count', 'mean', 'std', 'min', *QUANTILES, 'max',
+               'inclusive', 'exclusive', 'uninstrumented', 'share']
+    return cube[columns]
+
+
+def _rank(values: pd.Series) -> dict:
+    return {value: i for i, value in enumerate(pd.unique(values))}
+
+
+def scenarios(cube: pd.DataFrame) -> list:
+    """큐브에 있는 시나리오 이름 (등장 순서)."""
+    return list(cube.index.get_level_values('scenario').unique())
+
+
+def cells(cube: pd.DataFrame, scenario: str = None):
+    """
+    (scenario, strategy, 셀 DataFrame) 을 순서대로 돌려줍니다.
+    셀 DataFrame 은 path 를 인덱스로 하는 큐브의 한 조각입니다.
+    """
+    selected = cube if scenario is None else cube.loc[[scenario]]
+    for (cell_scenario, strategy), frame in selected.groupby(level=['scenario', 'strategy'], sort=False):
+        yield cell_scenario, strategy, frame.droplevel(['scenario', 'strategy'])
+
+
+def level_table(cube: pd.DataFrame, level: int = 1, stat: str = 'mean') -> pd.DataFrame:
+    """
+    특정 level 의 측정 경로를 컬럼으로 펼친 표를 반환합니다 (예: L1 = 3단계).
+
+    Returns:
+        pd.DataFrame: (scenario, strategy) 인덱스, 경로 이름 컬럼 (큐브 순서 유지).
+    """
+    rows = cube[cube['level'] == level]
+    paths = list(dict.fromkeys(rows.index.get_level_values('path')))
+    return rows[stat].unstack('path', sort=False).reindex(columns=paths)
+
+
+def children(cell: pd.DataFrame, path: str, include_self: bool = True) -> pd.DataFrame:
+    """셀의 특정 노드의 직계 자식들 (timer_tree.children_of 참조)."""
+    return timer_tree.children_of(cell.reset_index(), path, include_self=include_self)
+
+
+def chart_suffix(scenario: str, strategy: str) -> str:
+    """시나리오/전략별 차트 파일 이름의 접미사. LEGACY_SCENARIO 는 예전처럼 전략 이름만 씁니다."""
+    if scenario == LEGACY_SCENARIO:
+        return safe_name(strategy)
+    return f'{safe_name(scenario)}_{safe_name(strategy)}'
+
+
+def safe_name(name: str) -> str:
+    """시나리오/전략 이름을 파일 이름에 쓸 수 있는 형태로 바꿉니다 (예: 'A*' → 'A-Star')."""
+    return re.sub(r'[^0-9A-Za-z]+', '-', name.replace('*', '-Star')).strip('-')
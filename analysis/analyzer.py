@@ -1,37 +1,218 @@
+import numpy as np
 import pandas as pd
 
+import aggregates
+import censoring
+import layout_quality
+import memory
+import robust_stats
+import timer_tree
+from config import load_config
+from profiler import profiler
+
 
 basic_columns = ['scenario', 'seed', 'strategy', 'totalTime']
-three_step_column_names = ['Placement', 'Routing', 'Post-Process']
 
-def analyze_data(df: pd.DataFrame) -> dict:
+def analyze_data(df: pd.DataFrame, cube: pd.DataFrame = None, quality: pd.DataFrame = None) -> dict:
     """
     데이터프레임을 받아 전체 요약 통계와 모듈별 성능을 분석하고,
     결과를 딕셔너리 형태로 반환합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+        cube (pd.DataFrame): aggregates.build_cube 결과. 없으면 여기서 계산합니다.
+        quality (pd.DataFrame): layout_quality.load_quality 결과. 없으면 품질 요약을 생략합니다.
     """
+    if cube is None:
+        cube = aggregates.build_cube(df)
     summary_dict = {}
 
-    # 1. 전체 성능 요약
-    summary = df.groupby(['scenario', 'strategy'])['totalTime'].agg(['mean', 'std', 'min', 'max']).round(2)
-    summary_dict['overall_summary'] = summary.to_dict('index')
+    # 1. 견고한 통계: JIT warm-up 판정, 부트스트랩 신뢰구간, p90/p99, MAD 이상치
+    with profiler.section('L2-Analyze:Robust'):
+        warmup = robust_stats.detect_warmup(df)
+        summary_dict['warmup'] = [
+            {**row, 'record': int(row['record']), 'seed': int(row['seed'])}
+            for row in warmup.round(4).to_dict('records')
+        ]
+        robust = robust_stats.robust_summary(df, warmup=warmup)
+        numeric = robust.drop(columns='outlier_seeds').round(2)
+        numeric = numeric.astype(object).where(numeric.notna(), None)
+        robust_summary = {}
+        for (scenario, strategy, path), stats, seeds in zip(robust.index, numeric.to_dict('records'), robust['outlier_seeds']):
+            robust_summary.setdefault(scenario, {}).setdefault(strategy, {})[path] = {**stats, 'outlier_seeds': seeds}
+        summary_dict['robust_summary'] = robust_summary
+
+    # 1-1. 전체 성능 요약 (호출 트리의 루트 = totalTime)
+    # robust_summary 와 같은 표본(warm-up 제외)을 써서, CLI 표/보고서/서버가 같은 평균을 보여주게 합니다.
+    # 견고한 통계가 없는 셀(레코드가 모두 warm-up 또는 예산 초과)만 전체 레코드 통계로 채웁니다.
+    with profiler.section('L2-Analyze:Overall'):
+        columns = ['mean', 'std', 'min', 'max']
+        totals = cube.xs(timer_tree.ROOT_PATH, level='path')[columns]
+        steady = robust.xs(timer_tree.ROOT_PATH, level='path')[columns]
+        overall = pd.concat([steady, totals[~totals.index.isin(steady.index)]]).reindex(totals.index)
+        summary_dict['overall_summary'] = overall.round(2).to_dict('index')
+
+    # 2. 시나리오별 모듈 성능 분석
+    # L{level}-{path} 키를 호출 트리로 해석한 노드별 inclusive/exclusive 시간 (모든 시나리오)
+    with profiler.section('L2-Analyze:Breakdown'):
+        nodes = cube[['level', 'parent', 'inclusive', 'exclusive', 'uninstrumented']].round(2)
+        nodes = nodes.astype(object).where(nodes.notna(), None)
+        module_performance = {}
+        for (scenario, strategy, path), node in zip(nodes.index, nodes.to_dict('records')):
+            module_performance.setdefault(scenario, {}).setdefault(strategy, {})[path] = node
+
+        summary_dict['scenario_breakdown'] = module_performance
+        # 이전 스키마 호환: 'Large (Standard)' 시나리오만 담던 키 (전략 → 경로 → 노드)
+        summary_dict['large_scenario_breakdown'] = module_performance.get(aggregates.LEGACY_SCENARIO, {})
+
+    # 3. 확장성(scaling) 분석: 전략/측정 키별 log-log 성장 지수
+    with profiler.section('L2-Analyze:Scaling'):
+        scaling = fit_scaling(df)
+        summary_dict['scaling'] = {
+            strategy: group.drop(columns='strategy').set_index('key').round(4).to_dict('index')
+            for strategy, group in scaling.groupby('strategy')
+        } if not scaling.empty else {}
+
+    # 3-1. 크기 스윕의 전략별 실용 한계 (예산이 기록된 실행만)
+    with profiler.section('L2-Analyze:Ceilings'):
+        ceilings = censoring.practical_ceilings(attach_scenario_sizes(df), scaling, timer_tree.ROOT_PATH)
+        if not ceilings.empty:
+            ceilings = ceilings.round(2)
+            summary_dict['ceilings'] = ceilings.astype(object).where(ceilings.notna(), None).to_dict('records')
+
+    # 4. 힙 사용량: 측정 경로별 heapDelta/peakHeap (MB) 과 노드/엣지당 bytes 적합 (기록된 실행만)
+    with profiler.section('L2-Analyze:Memory'):
+        mem = memory.memory_cube(df)
+        if not mem.empty:
+            mem = mem.round(3)
+            mem = mem.astype(object).where(mem.notna(), None)
+            memory_summary = {}
+            for (scenario, strategy, path), node in zip(mem.index, mem.to_dict('records')):
+                memory_summary.setdefault(scenario, {}).setdefault(strategy, {})[path] = node
+            summary_dict['memory'] = memory_summary
+            mem_scaling = memory.fit_memory_scaling(attach_scenario_sizes(df))
+            summary_dict['memory_scaling'] = {
+                strategy: group.drop(columns='strategy').set_index('key').round(4)
+                               .astype(object).where(lambda frame: frame.notna(), None).to_dict('index')
+                for strategy, group in mem_scaling.groupby('strategy')
+            } if not mem_scaling.empty else {}
+
+    # 5. 레이아웃 품질: (시나리오, 전략)별 평균 지표와, 시나리오 안에서 (시간, 지표) 파레토 최적인 지표 목록
+    with profiler.section('L2-Analyze:Quality'):
+        quality_summary = layout_quality.quality_summary(quality, df) if quality is not None and not quality.empty else None
+        if quality_summary is not None and not quality_summary.empty:
+            pareto_cols = [c for c in quality_summary.columns if c.startswith('pareto_')]
+            values = quality_summary.drop(columns=pareto_cols).round(2)
+            values = values.astype(object).where(values.notna(), None)
+            summary_dict['quality'] = {}
+            for (scenario, strategy), row, flags in zip(values.index, values.to_dict('records'),
+                                                        quality_summary[pareto_cols].to_numpy()):
+                pareto = [col[len('pareto_'):] for col, flag in zip(pareto_cols, flags) if flag]
+                summary_dict['quality'].setdefault(scenario, {})[strategy] = {**row, 'n': int(row['n']), 'pareto': pareto}
 
-    # 2. 'Large (Standard)' 시나리오 모듈별 성능 분석
-    target_scenario = 'Large (Standard)'
-    scenario_df = df[df['scenario'] == target_scenario]
-    
-    module_performance = {}
-    if not scenario_df.empty:
-        strategies = sorted(scenario_df['strategy'].unique())
-        for strategy in strategies:
-            # ... (기존 print_module_performance 함수의 로직을 사용하여 데이터를 계산)
-            # 예시: module_avg = strategy_df[measured_modules].mean().round(2)
-            # module_performance[strategy] = module_avg.to_dict()
-            pass # 여기에 실제 계산 로직을 구현합니다.
-            
-    summary_dict['large_scenario_breakdown'] = module_performance
-    
     return summary_dict
 
+def attach_scenario_sizes(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    각 레코드에 시나리오 크기(nodes, edges, groups)를 붙입니다.
+    크기가 기록되지 않은 과거 실행은 config.yaml 의 'scenarios' 표에서 채웁니다.
+    """
+    sizes = pd.DataFrame.from_dict(load_config().get('scenarios', {}), orient='index')
+    out = df.copy()
+    for col in ['nodes', 'edges', 'groups']:
+        fallback = out['scenario'].map(sizes[col]) if col in sizes.columns else np.nan
+        out[col] = out[col].fillna(fallback) if col in out.columns else fallback
+    return out
+
+
+def _bootstrap_slopes(x: np.ndarray, y: np.ndarray, n_samples: int, rng: np.random.Generator) -> np.ndarray:
+    """레코드를 복원 추출하여 최소제곱 기울기를 한꺼번에 계산합니다."""
+    idx = rng.integers(0, len(x), size=(n_samples, len(x)))
+    xs, ys = x[idx], y[idx]
+    xc = xs - xs.mean(axis=1, keepdims=True)
+    yc = ys - ys.mean(axis=1, keepdims=True)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return (xc * yc).sum(axis=1) / (xc ** 2).sum(axis=1)
+
+
+def fit_scaling(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    전략별로 totalTime 과 모든 측정 키에 대해 log(time) = a + b·log(nodes) 를 적합하여
+    경험적 성장 지수 b 와 부트스트랩 신뢰구간, 그리고 큰 그래프에서의 예상 실행 시간을 계산합니다.
+    크기 스윕에서 예산을 넘겨 중단된(censored) 레코드는 전체 시간(Total)에만 "예산보다 오래 걸림" 으로 들어가며,
+    그런 점이 있는 셀은 최소제곱 대신 Tobit 으로 적합합니다 (method 컬럼).
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+
+    Returns:
+        pd.DataFrame: strategy, key, exponent, ci_low, ci_high, r2, n, n_censored, method, predicted_ms@{N} 컬럼.
+                      크기가 2종류 미만인 셀은 제외됩니다. r2 는 관측된 점만으로 계산합니다.
+    """
+    cfg = load_config().get('scaling', {})
+    x_col = cfg.get('x', 'nodes')
+    targets = cfg.get('extrapolate_nodes', [1000, 5000])
+    rng = np.random.default_rng(cfg.get('seed', 0))
+    tail = (1 - cfg.get('confidence', 0.95)) / 2 * 100
+
+    sized = attach_scenario_sizes(df).reset_index(drop=True)
+    long = timer_tree.to_long(sized)
+    long['size'] = sized[x_col].to_numpy()[long['record'].to_numpy()]
+    long['censored'] = False
+    if censoring.has_censored(sized):
+        # to_long 에서 빠진 중단 레코드를 전체 시간 경로에만 하한(= 예산)으로 다시 붙입니다.
+        cut = sized[censoring.is_censored(sized)]
+        long = pd.concat([long, pd.DataFrame({
+            'strategy': cut['strategy'], 'path': timer_tree.ROOT_PATH, 'time': cut['totalTime'],
+            'size': cut[x_col], 'censored': True,
+        })], ignore_index=True)
+    long = long[(long['time'] > 0) & long['size'].notna()]
+
+    rows = []
+    for (strategy, path), group in long.groupby(['strategy', 'path'], sort=True):
+        x, y = np.log(group['size'].to_numpy(float)), np.log(group['time'].to_numpy(float))
+        censored = group['censored'].to_numpy(bool)
+        if np.unique(x).size < 2 or censored.all():
+            continue
+        if censored.any():
+            slope, intercept, _ = censoring.tobit_fit(x, y, censored)
+            slopes = censoring.bootstrap_tobit_slopes(x, y, censored, cfg.get('censored_bootstrap_samples', 200), rng)
+        else:
+            slope, intercept = np.polyfit(x, y, 1)
+            slopes = _bootstrap_slopes(x, y, cfg.get('bootstrap_samples', 2000), rng)
+        observed_x, observed_y = x[~censored], y[~censored]
+        residual = observed_y - (intercept + slope * observed_x)
+        total = ((observed_y - observed_y.mean()) ** 2).sum()
+        r2 = 1 - (residual ** 2).sum() / total if total > 0 else np.nan
+        ci_low, ci_high = np.nanpercentile(slopes, [tail, 100 - tail])
+        row = {
+            'strategy': strategy,
+            'key': path,
+            'exponent': slope,
+            'ci_low': ci_low,
+            'ci_high': ci_high,
+            'r2': r2,
+            'n': len(x),
+            'n_censored': int(censored.sum()),
+            'method': 'tobit' if censored.any() else 'ols',
+        }
+        for n_nodes in targets:
+            row[f'predicted_ms@{n_nodes}'] = float(np.exp(intercept + slope * np.log(n_nodes)))
+        rows.append(row)
+
+    return pd.DataFrame(rows)
+
+
+def scaling_frame(summary_data: dict) -> pd.DataFrame:
+    """summary.json 의 'scaling' 섹션을 fit_scaling 과 같은 형태의 DataFrame 으로 되돌립니다."""
+    rows = [
+        {'strategy': strategy, 'key': key, **fit}
+        for strategy, fits in summary_data.get('scaling', {}).items()
+        for key, fit in fits.items()
+    ]
+    return pd.DataFrame(rows)
+
+
 # def print_summary_statistics(df: pd.DataFrame):
 #     """
 #     시나리오별/전략별 전체 실행 시간(totalTime)에 대한 요약 통계를 출력합니다.
@@ -0,0 +1,118 @@
+import json
+import os
+from typing import Iterator, Optional
+
+import numpy as np
+import pandas as pd
+
+from config import load_config
+
+# --- 설정 ---
+# `npm run benchmark -- --trace[=chrome]` 이 남기는 호출 단위 trace 를 읽어,
+# 측정 키별 호출 횟수, 호출당 지연 시간 분위수, 가장 느린 개별 호출(엣지)을 계산합니다.
+# - trace.ndjson : 한 줄에 하나의 trace 이벤트
+# - trace.json   : Chrome trace-event 형식 ({"traceEvents": [...]} 또는 이벤트 배열)
+TRACE_FILE_NAMES = ['trace.ndjson', 'trace.json']
+record_columns = ['scenario', 'seed', 'strategy']
+
+
+def find_trace_file(run_dir: str) -> Optional[str]:
+    """실행 디렉터리 안의 trace 파일 경로를 반환합니다. 없으면 None."""
+    for name in TRACE_FILE_NAMES:
+        path = os.path.join(run_dir, name)
+        if os.path.exists(path):
+            return path
+    return None
+
+
+def iter_events(file_path: str) -> Iterator[dict]:
+    """trace 파일에서 이벤트를 하나씩 읽습니다 (확장자로 형식을 판단)."""
+    with open(file_path, 'r', encoding='utf-8') as f:
+        if file_path.endswith('.ndjson'):
+            for line in f:
+                line = line.strip()
+                if line:
+                    yield json.loads(line)
+            return
+        data = json.load(f)
+    yield from data['traceEvents'] if isinstance(data, dict) else data
+
+
+def load_calls(file_path: str) -> pd.DataFrame:
+    """
+    trace 이벤트를 호출 단위 테이블로 변환합니다.
+    complete('X') 이벤트와 begin/end('B'/'E') 쌍을 모두 지원하며,
+    레코드(시나리오/시드/전략)는 pid 별 'process_name' 메타데이터 이벤트로 식별합니다.
+
+    Args:
+        file_path (str): trace.ndjson 또는 trace.json 경로.
+
+    Returns:
+        pd.DataFrame: scenario, seed, strategy, record, key, edge, start_ms, duration_ms 컬럼.
+                      record 는 trace 의 pid (레코드 번호) 로, 같은 (시나리오, 시드, 전략) 을 반복한 레코드를 구분합니다.
+    """
+    records, calls, open_spans = {}, [], {}
+    for event in iter_events(file_path):
+        phase, pid = event.get('ph'), event.get('pid', 0)
+        args = event.get('args') or {}
+        if phase == 'M':
+            if event.get('name') == 'process_name':
+                records[pid] = {col: args.get(col) for col in record_columns}
+        elif phase == 'X':
+            calls.append((pid, event['name'], args.get('edge'), event['ts'], event.get('dur', 0.0)))
+        elif phase == 'B':
+            open_spans.setdefault((pid, event.get('tid', 0), event['name']), []).append((event['ts'], args))
+        elif phase == 'E':
+            stack = open_spans.get((pid, event.get('tid', 0), event['name']))
+            if stack:
+                ts, begin_args = stack.pop()
+                calls.append((pid, event['name'], begin_args.get('edge'), ts, event['ts'] - ts))
+
+    frame = pd.DataFrame(calls, columns=['pid', 'key', 'edge', 'ts', 'dur'])
+    meta = pd.DataFrame.from_dict(records, orient='index', columns=record_columns)
+    frame = frame.join(meta, on='pid').rename(columns={'pid': 'record'})
+    # trace-event 의 시간 단위는 마이크로초입니다.
+    frame['start_ms'] = frame.pop('ts') / 1000.0
+    frame['duration_ms'] = frame.pop('dur') / 1000.0
+    return frame[record_columns + ['record', 'key', 'edge', 'start_ms', 'duration_ms']]
+
+
+def call_stats(calls: pd.DataFrame, percentiles: list = None) -> pd.DataFrame:
+    """
+    (시나리오, 전략, 측정 키)별 호출 통계를 계산합니다.
+
+    Args:
+        calls (pd.DataFrame): load_calls 결과.
+        percentiles (list): 계산할 백분위 (예: [50, 95, 99]). 기본값은 config.yaml 의 trace.percentiles.
+
+    Returns:
+        pd.DataFrame: calls(전체 호출 수), calls_per_run(레코드당 평균 호출 수), total_ms(레코드당 평균 합),
+                      p{n}_ms, max_ms 컬럼. 호출당 p99 가 큰 순으로 정렬됩니다.
+    """
+    if percentiles is None:
+        percentiles = load_config().get('trace', {}).get('percentiles', [50, 95, 99])
+    cell = ['scenario', 'strategy', 'key']
+    grouped = calls.groupby(cell, sort=False)['duration_ms']
+
+    stats = grouped.agg(calls='count', total_ms='sum', max_ms='max')
+    n_records = calls.groupby(cell, sort=False)['record'].nunique()
+    stats['calls_per_run'] = stats['calls'] / n_records
+    stats['total_ms'] = stats['total_ms'] / n_records
+    quantiles = grouped.quantile(np.array(percentiles) / 100).unstack()
+    quantiles.columns = [f'p{p:g}_ms' for p in percentiles]
+
+    stats = stats.join(quantiles)[['calls', 'calls_per_run', 'total_ms', *quantiles.columns, 'max_ms']]
+    return stats.sort_values(quantiles.columns[-1], ascending=False).reset_index()
+
+
+def slowest_calls(calls: pd.DataFrame, top_n: int = None) -> pd.DataFrame:
+    """
+    (시나리오, 전략, 측정 키)별로 가장 느린 개별 호출 top-N 을 반환합니다.
+    호출에 엣지 정보가 있으면 어느 엣지가 꼬리 지연(tail latency)을 만드는지 알 수 있습니다.
+    """
+    if top_n is None:
+        top_n = load_config().get('trace', {}).get('top_n', 10)
+    ranked = calls.sort_values('duration_ms', ascending=False)
+    top = ranked.groupby(['scenario', 'strategy', 'key'], sort=False).head(top_n)
+    top = top.assign(rank=top.groupby(['scenario', 'strategy', 'key'], sort=False).cumcount() + 1)
+    return top.sort_values(['scenario', 'strategy', 'key', 'rank']).reset_index(drop=True)
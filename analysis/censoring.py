@@ -0,0 +1,146 @@
+import math
+
+import numpy as np
+import pandas as pd
+
+from record_stream import BUDGET_COLUMN, CENSORED_COLUMN
+
+# --- 설정 ---
+# 크기 스윕(sweep.py)에서 시간 예산을 넘겨 중단된 실행은 "실제 시간 > 예산" 이라는 것만 알려주는
+# 우측 중도절단(right-censored) 측정값입니다. 예산 값을 그대로 평균에 넣거나 버리면 느린 전략의 성장 지수를
+# 과소평가하므로, 성장 지수는 Tobit(중도절단 정규 회귀)으로 적합하고 전략별 실용 한계를 따로 정리합니다.
+EM_MAX_ITER = 200
+EM_TOL = 1e-8
+MIN_SIGMA = 1e-6
+_erfc = np.vectorize(math.erfc, otypes=[float])
+
+
+def is_censored(df: pd.DataFrame) -> np.ndarray:
+    """레코드별 중도절단 여부 (timedOut 컬럼이 없는 일반 실행이면 모두 False)."""
+    if CENSORED_COLUMN not in df.columns:
+        return np.zeros(len(df), dtype=bool)
+    return df[CENSORED_COLUMN].to_numpy(bool)
+
+
+def has_censored(df: pd.DataFrame) -> bool:
+    return bool(is_censored(df).any())
+
+
+def _normal_pdf(z: np.ndarray) -> np.ndarray:
+    return np.exp(-0.5 * z ** 2) / math.sqrt(2 * math.pi)
+
+
+def _normal_sf(z: np.ndarray) -> np.ndarray:
+    """표준정규분포의 생존 함수 1 - Φ(z) (scipy 없이 math.erfc 로 계산)."""
+    return 0.5 * _erfc(np.asarray(z, dtype=float) / math.sqrt(2))
+
+
+def tobit_fit(x: np.ndarray, y: np.ndarray, censored: np.ndarray) -> tuple:
+    """
+    y = a + b·x + ε, ε ~ N(0, σ²) 에서 censored 인 점은 "y 가 이 값보다 크다" 는 것만 알 때의 최대우도 적합 (EM).
+    - E-step : 중도절단된 점의 y 를 조건부 기대값 E[y | y > c] = μ + σ·λ(α) 로 채우고 (λ: inverse Mills ratio),
+               조건부 분산 σ²·(1 + α·λ - λ²) 를 σ² 갱신에 더합니다.
+    - M-step : 채운 값으로 최소제곱 직선과 σ 를 다시 구합니다.
+
+    Args:
+        x (np.ndarray): 독립 변수 (log nodes).
+        y (np.ndarray): 종속 변수 (log time). 중도절단된 점은 하한 (log budget).
+        censored (np.ndarray): 점별 중도절단 여부.
+
+    Returns:
+        tuple: (slope, intercept, sigma).
+    """
+    design = np.column_stack([np.ones_like(x), x])
+    observed = ~censored
+    # 관측된 크기가 2종류 이상이면 그 점들로, 아니면 하한을 관측값처럼 보고 시작합니다.
+    start = observed if np.unique(x[observed]).size >= 2 else np.ones_like(observed)
+    beta = np.linalg.lstsq(design[start], y[start], rcond=None)[0]
+    sigma = max(float(np.std(y[start] - design[start] @ beta)), MIN_SIGMA)
+
+    for _ in range(EM_MAX_ITER):
+        mu = design @ beta
+        alpha = (y[censored] - mu[censored]) / sigma
+        mills = _normal_pdf(alpha) / np.maximum(_normal_sf(alpha), 1e-300)
+        filled = y.copy()
+        filled[censored] = mu[censored] + sigma * mills
+        extra = np.zeros_like(y)
+        extra[censored] = sigma ** 2 * np.maximum(1 + alpha * mills - mills ** 2, 0)
+
+        new_beta = np.linalg.lstsq(design, filled, rcond=None)[0]
+        new_sigma = max(math.sqrt(float(np.mean((filled - design @ new_beta) ** 2 + extra))), MIN_SIGMA)
+        converged = np.abs(new_beta - beta).max() < EM_TOL and abs(new_sigma - sigma) < EM_TOL
+        beta, sigma = new_beta, new_sigma
+        if converged:
+            break
+    return float(beta[1]), float(beta[0]), float(sigma)
+
+
+def bootstrap_tobit_slopes(
+    x: np.ndarray,
+    y: np.ndarray,
+    censored: np.ndarray,
+    n_samples: int,
+    rng: np.random.Generator,
+) -> np.ndarray:
+    """레코드를 복원 추출하여 Tobit 기울기를 다시 적합합니다 (EM 이 반복마다 필요해서 OLS 보다 표본 수를 줄여 씁니다)."""
+    slopes = np.full(n_samples, np.nan)
+    for i in range(n_samples):
+        idx = rng.integers(0, len(x), size=len(x))
+        if np.unique(x[idx]).size < 2 or censored[idx].all():
+            continue
+        slopes[i] = tobit_fit(x[idx], y[idx], censored[idx])[0]
+    return slopes
+
+
+def practical_ceilings(df: pd.DataFrame, scaling: pd.DataFrame = None, root_key: str = 'Total') -> pd.DataFrame:
+    """
+    크기 스윕 결과에서 전략별 실용 한계(practical ceiling)를 정리합니다.
+    - max_ok_nodes     : 모든 시드가 예산 안에 끝난 가장 큰 그래프의 노드 수
+    - first_over_nodes : 처음으로 예산을 넘긴 (중단되었거나 예산보다 오래 걸린) 노드 수. 없으면 NaN
+    - predicted_nodes  : 전체 시간 적합선이 예산과 만나는 노드 수 (scaling 이 주어졌을 때)
+
+    Args:
+        df (pd.DataFrame): 시나리오 크기가 붙은 벤치마크 데이터프레임 (analyzer.attach_scenario_sizes).
+        scaling (pd.DataFrame): analyzer.fit_scaling 결과 (선택).
+        root_key (str): scaling 에서 전체 시간을 나타내는 키.
+
+    Returns:
+        pd.DataFrame: strategy, budget_ms, max_ok_nodes, max_ok_mean_ms, first_over_nodes, n_censored,
+                      predicted_nodes 컬럼 (전략은 데이터에 처음 등장한 순서). 예산이 기록되지 않은 실행이면 빈 DataFrame.
+    """
+    if BUDGET_COLUMN not in df.columns or 'nodes' not in df.columns:
+        return pd.DataFrame()
+    frame = df[['strategy', 'nodes', 'totalTime', BUDGET_COLUMN]].assign(censored=is_censored(df))
+    frame = frame[frame['nodes'].notna() & frame[BUDGET_COLUMN].notna()]
+    frame['over'] = frame['censored'] | (frame['totalTime'] > frame[BUDGET_COLUMN])
+
+    totals = {}
+    if scaling is not None and not scaling.empty:
+        totals = scaling[scaling['key'] == root_key].set_index('strategy').to_dict('index')
+
+    rows = []
+    for strategy, group in frame.groupby('strategy', sort=False):
+        budget = float(group[BUDGET_COLUMN].max())
+        by_size = group.groupby('nodes').agg(over=('over', 'any'), mean=('totalTime', 'mean'))
+        ok = by_size[~by_size['over']]
+        over = by_size[by_size['over']]
+        row = {
+            'strategy': strategy,
+            'budget_ms': budget,
+            'max_ok_nodes': float(ok.index.max()) if not ok.empty else np.nan,
+            'max_ok_mean_ms': float(ok['mean'].iloc[-1]) if not ok.empty else np.nan,
+            'first_over_nodes': float(over.index.min()) if not over.empty else np.nan,
+            'n_censored': int(group['censored'].sum()),
+            'predicted_nodes': np.nan,
+        }
+        fit = totals.get(strategy)
+        if fit is not None and fit.get('exponent', 0) > 0:
+            # 적합선 time(N) = pred · (N / target)^b 가 예산과 만나는 N
+            target_col = next((c for c in fit if c.startswith('predicted_ms@')), None)
+            if target_col is not None and fit[target_col] > 0:
+                target = float(target_col.split('@')[1])
+                row['predicted_nodes'] = target * (budget / fit[target_col]) ** (1 / fit['exponent'])
+        rows.append(row)
+    return pd.DataFrame(rows, columns=[
+        'strategy', 'budget_ms', 'max_ok_nodes', 'max_ok_mean_ms', 'first_over_nodes', 'n_censored', 'predicted_nodes',
+    ])
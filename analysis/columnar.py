@@ -0,0 +1,239 @@
+from __future__ import annotations
+
+import argparse
+import json
+import math
+import os
+import struct
+import sys
+import time
+from typing import TYPE_CHECKING, Iterator, Optional
+
+import record_stream
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- 설정 ---
+# raw_results.json(들여쓰기된 JSON 텍스트) 대신 쓰는 컬럼 단위 바이너리 포맷입니다.
+# 여러 실행을 다룰 때 JSON 을 다시 파싱하는 비용을 없애기 위해, 컬럼 버퍼를 그대로 memory-map 해서 읽습니다
+# (필요한 컬럼의 페이지만 디스크에서 읽히고, 숫자 컬럼은 복사 없이 DataFrame 이 됩니다).
+# pyarrow 같은 추가 의존성 없이 numpy 만으로 읽고, run-benchmark.ts (--format=columnar) 도 같은 포맷을 씁니다.
+#
+# 파일 구조 (little-endian):
+#   MAGIC (8 bytes) | 헤더 길이 (uint64) | 헤더 JSON (UTF-8) | 0 패딩 | 컬럼 버퍼들 (각각 ALIGNMENT 배수 오프셋)
+#   헤더: {"version": 1, "rows": N, "columns": [{"name", "dtype", "offset", "categories"?}, ...]}
+#   - dtype 은 numpy 형식 문자열 ('<f8', '<i8', '|b1'). 문자열 컬럼은 '<i4' 코드 + categories 목록 (-1 = 없음).
+#   - 컬럼은 record_stream.build_frame 의 wide 테이블과 같습니다 (flatten_record 의 키, 처음 등장한 순서).
+COLUMNAR_FILE_NAME = 'raw_results.col'
+MAGIC = b'OLCOL\x00\x01\n'
+FORMAT_VERSION = 1
+ALIGNMENT = 64
+HEADER_LENGTH = struct.Struct('<Q')
+
+
+def is_columnar(path: str) -> bool:
+    """파일이 이 포맷인지 (첫 8 bytes 가 MAGIC 인지) 확인합니다."""
+    with open(path, 'rb') as f:
+        return f.read(len(MAGIC)) == MAGIC
+
+
+def read_header(path: str) -> dict:
+    """헤더를 읽습니다. 헤더의 offset 은 파일 처음부터의 byte 위치입니다."""
+    with open(path, 'rb') as f:
+        if f.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"'{path}' is not a columnar results file")
+        (length,) = HEADER_LENGTH.unpack(f.read(HEADER_LENGTH.size))
+        header = json.loads(f.read(length).decode('utf-8'))
+    if header.get('version') != FORMAT_VERSION:
+        raise ValueError(f"Unsupported columnar format version {header.get('version')} in '{path}'")
+    return header
+
+
+def _align(position: int) -> int:
+    return -(-position // ALIGNMENT) * ALIGNMENT
+
+
+def write_frame(df: pd.DataFrame, path: str):
+    """
+    wide 데이터프레임(record_stream.build_frame)을 컬럼 포맷으로 씁니다 (임시 파일 + rename).
+    문자열 컬럼은 사전(dictionary) 인코딩하고, 숫자/불리언 컬럼은 numpy 버퍼를 그대로 씁니다.
+    """
+    import numpy as np
+    import pandas as pd
+
+    buffers, columns = [], []
+    for name in df.columns:
+        values = df[name]
+        column = {'name': str(name)}
+        if pd.api.types.is_bool_dtype(values) or pd.api.types.is_numeric_dtype(values):
+            data = np.ascontiguousarray(values.to_numpy())
+            data = data.astype(data.dtype.newbyteorder('<'), copy=False)
+        else:
+            codes, categories = pd.factorize(values, use_na_sentinel=True)
+            data = codes.astype('<i4')
+            column['categories'] = [str(category) for category in categories]
+        column['dtype'] = data.dtype.str
+        columns.append(column)
+        buffers.append(data)
+
+    # 헤더 길이가 오프셋 자릿수에 따라 바뀌므로, 오프셋이 더 바뀌지 않을 때까지 다시 계산합니다.
+    header = {'version': FORMAT_VERSION, 'rows': len(df), 'columns': columns}
+    offsets = [0] * len(columns)
+    while True:
+        for column, offset in zip(columns, offsets):
+            column['offset'] = offset
+        position = _align(len(MAGIC) + HEADER_LENGTH.size + len(json.dumps(header).encode('utf-8')))
+        layout = []
+        for data in buffers:
+            layout.append(position)
+            position = _align(position + data.nbytes)
+        if layout == offsets:
+            break
+        offsets = layout
+    encoded = json.dumps(header).encode('utf-8')
+
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'wb') as f:
+        f.write(MAGIC + HEADER_LENGTH.pack(len(encoded)) + encoded)
+        for column, data in zip(columns, buffers):
+            f.write(b'\0' * (column['offset'] - f.tell()))
+            f.write(data.tobytes())
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def load_frame(path: str, columns: Optional[list] = None) -> Optional[pd.DataFrame]:
+    """
+    컬럼 파일을 memory-map 해서 wide 데이터프레임으로 읽습니다. 숫자 컬럼은 파일 페이지를 그대로 가리키는
+    읽기 전용 배열이며(복사 없음), 실제로 접근한 컬럼의 페이지만 디스크에서 읽힙니다.
+
+    Args:
+        path (str): raw_results.col 경로.
+        columns (Optional[list]): 읽을 컬럼 이름. 없으면 전부 (헤더 순서).
+
+    Returns:
+        Optional[pd.DataFrame]: record_stream.build_frame 과 같은 형태. 레코드가 없으면 None.
+    """
+    import numpy as np
+    import pandas as pd
+
+    header = read_header(path)
+    if header['rows'] == 0:
+        return None
+    wanted = None if columns is None else set(columns)
+    data = {}
+    for column in header['columns']:
+        if wanted is not None and column['name'] not in wanted:
+            continue
+        # 파일을 가리키는 읽기 전용 배열 (memmap 하위 클래스가 연산 결과로 번지지 않도록 ndarray 뷰로 씁니다)
+        values = np.memmap(path, dtype=np.dtype(column['dtype']), mode='r', offset=column['offset'],
+                           shape=(header['rows'],)).view(np.ndarray)
+        if 'categories' in column:
+            # 문자열 컬럼은 build_frame 과 같이 object 로 풉니다 (레코드 수만큼의 작은 컬럼).
+            categories = np.asarray(column['categories'] + [None], dtype=object)
+            values = categories[values]
+        data[column['name']] = values
+    return pd.DataFrame(data, copy=False)
+
+
+def iter_records(path: str) -> Iterator[dict]:
+    """
+    컬럼 파일에서 원본 형태의 레코드를 하나씩 다시 만듭니다 (히스토리 적재, 샤드 병합 등 레코드 단위 경로용).
+    flatten_record 에 들어가지 않는 필드(host, shard 등)는 남지 않습니다.
+    """
+    header = read_header(path)
+    df = load_frame(path)
+    if df is None:
+        return
+    nested = {metric: f'{metric}{record_stream.MEMORY_SEPARATOR}' for metric in record_stream.memory_metrics}
+    top_level = set(record_stream.string_columns + record_stream.size_columns + record_stream.sweep_columns
+                    + record_stream.machine_columns + ['seed', 'totalTime'])
+    names = [column['name'] for column in header['columns']]
+    for row in zip(*(df[name].tolist() for name in names)):
+        record, details = {}, {}
+        memory = {metric: {} for metric in nested}
+        for name, value in zip(names, row):
+            if value is None or (isinstance(value, float) and math.isnan(value)):
+                continue
+            metric = next((m for m, prefix in nested.items() if name.startswith(prefix)), None)
+            if metric is not None:
+                memory[metric][name[len(nested[metric]):]] = value
+            elif name in top_level:
+                record[name] = int(value) if name in ('seed', *record_stream.size_columns) else value
+            else:
+                details[name] = value
+        record['details'] = details
+        record.update({metric: values for metric, values in memory.items() if values})
+        yield record
+
+
+def convert_run(run_dir: str, force: bool = False) -> Optional[tuple]:
+    """
+    실행 디렉터리의 JSON 결과를 raw_results.col 로 변환합니다. 이미 최신이면 (force 가 아니면) 건너뜁니다.
+
+    Returns:
+        Optional[tuple]: (원본 경로, 원본 크기, 컬럼 파일 크기). 변환할 JSON 이 없거나 최신이면 None.
+    """
+    import history_store
+
+    source = next((os.path.join(run_dir, name) for name in history_store.RAW_FILE_NAMES
+                   if name != COLUMNAR_FILE_NAME and os.path.exists(os.path.join(run_dir, name))), None)
+    if source is None:
+        return None
+    target = os.path.join(run_dir, COLUMNAR_FILE_NAME)
+    if not force and os.path.exists(target) and os.path.getmtime(target) >= os.path.getmtime(source):
+        return None
+    df = record_stream.build_frame(record_stream.iter_records(source))
+    write_frame(df, target)
+    return source, os.path.getsize(source), os.path.getsize(target)
+
+
+def main() -> int:
+    import data_loader
+
+    parser = argparse.ArgumentParser(description='Convert raw JSON results under results/ to the memory-mapped columnar format.')
+    parser.add_argument('--target', type=str, default=None,
+                        help="Runs to convert: prefix, range 'A..B' or glob (default: all).")
+    parser.add_argument('--force', action='store_true', help='Rewrite columnar files that are already up to date.')
+    parser.add_argument('--delete-json', action='store_true',
+                        help='Delete the JSON file after a successful conversion (the columnar file becomes the only copy).')
+    args = parser.parse_args()
+
+    if not os.path.isdir(data_loader.RESULTS_DIR):
+        print(f"❌ Error: Results directory not found at '{data_loader.RESULTS_DIR}'")
+        return 1
+    converted, before, after = 0, 0, 0
+    for run in data_loader.match_run_names(args.target, os.listdir(data_loader.RESULTS_DIR)):
+        run_dir = os.path.join(data_loader.RESULTS_DIR, run)
+        if not os.path.isdir(run_dir):
+            continue
+        try:
+            result = convert_run(run_dir, force=args.force)
+        except (json.JSONDecodeError, ValueError) as e:
+            print(f"Warning: Skipping '{run}' ({e})")
+            continue
+        if result is None:
+            continue
+        source, source_size, target_size = result
+        converted, before, after = converted + 1, before + source_size, after + target_size
+        started = time.perf_counter()
+        record_stream.build_frame(record_stream.iter_records(source))
+        json_ms = (time.perf_counter() - started) * 1000
+        started = time.perf_counter()
+        load_frame(os.path.join(run_dir, COLUMNAR_FILE_NAME))
+        col_ms = (time.perf_counter() - started) * 1000
+        print(f"🗜️ {run}: {os.path.basename(source)} {source_size / 1024:.0f} KiB → {COLUMNAR_FILE_NAME} "
+              f"{target_size / 1024:.0f} KiB (load {json_ms:.1f} ms → {col_ms:.1f} ms)")
+        if args.delete_json and not source.endswith('.ndjson'):
+            os.remove(source)
+    if converted:
+        print(f"✅ Converted {converted} runs ({before / 2 ** 20:.1f} MiB → {after / 2 ** 20:.1f} MiB).")
+    else:
+        print("✅ All runs are already converted.")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
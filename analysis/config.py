@@ -0,0 +1,23 @@
+import os
+from functools import lru_cache
+
+import yaml
+
+# --- 설정 ---
+# analysis/config.yaml 을 읽어 각 모듈에서 공유하는 설정 값을 제공합니다.
+CONFIG_PATH = os.path.join(os.path.dirname(__file__), 'config.yaml')
+
+
+@lru_cache(maxsize=None)
+def load_config(path: str = CONFIG_PATH) -> dict:
+    """
+    YAML 설정 파일을 로드합니다. 같은 경로는 한 번만 읽습니다.
+
+    Args:
+        path (str): 설정 파일 경로.
+
+    Returns:
+        dict: 파싱된 설정 딕셔너리.
+    """
+    with open(path, 'r', encoding='utf-8') as f:
+        return yaml.safe_load(f) or {}
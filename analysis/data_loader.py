@@ -1,7 +1,17 @@
-import pandas as pd
+from __future__ import annotations
+
+import fnmatch
 import json
 import os
-from typing import Optional
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import history_store
+import machine
+import record_stream
+
+if TYPE_CHECKING:
+    # pandas 는 record_stream.build_frame 안에서 처음 임포트됩니다 (summary 등 빠른 CLI 경로용).
+    import pandas as pd
 
 # --- 설정 ---
 # 이 파일의 위치를 기준으로 data 디렉터리의 절대 경로를 설정합니다.
@@ -48,20 +58,83 @@ def find_benchmark_file(target_prefix: Optional[str] = None) -> Optional[str]:
         target_dir = subdirectories[0]
 
     json_file_path = os.path.join(RESULTS_DIR, target_dir, 'raw_results.json')
+    ndjson_file_path = os.path.join(RESULTS_DIR, target_dir, 'raw_results.ndjson')
+    columnar_file_path = os.path.join(RESULTS_DIR, target_dir, history_store.COLUMNAR_FILE_NAME)
 
-    if os.path.exists(json_file_path):
+    if history_store.find_raw_file(os.path.join(RESULTS_DIR, target_dir)) == columnar_file_path:
+        # 변환(columnar.py)되었거나 --format=columnar 로 저장된 실행: JSON 대신 memory-map 으로 읽습니다.
+        return columnar_file_path
+    elif os.path.exists(json_file_path):
         return json_file_path
+    elif os.path.exists(ndjson_file_path):
+        # 벤치마크가 아직 실행 중이면 NDJSON 스트림만 존재합니다.
+        print(f"ℹ️ Using in-progress stream 'raw_results.ndjson' in '{target_dir}'")
+        return ndjson_file_path
     else:
         print(f"Error: 'raw_results.json' not found in the directory '{target_dir}'")
         return None
 
 
-def load_and_preprocess_data(file_path: str) -> Optional[pd.DataFrame]:
+def is_run_pattern(target: Optional[str]) -> bool:
+    """target 이 여러 실행을 가리키는 범위('A..B') 또는 glob('2025-10-1*') 인지 확인합니다."""
+    return bool(target) and ('..' in target or any(ch in target for ch in '*?['))
+
+
+def match_run_names(target: Optional[str], run_names: Iterable[str]) -> list:
+    """
+    실행 디렉터리 이름들 중 target 에 맞는 것을 (오래된 순으로) 고릅니다.
+
+    Args:
+        target (Optional[str]): 다음 중 하나. 없으면 전체.
+            - 범위 'A..B': A 이상이고 B 이하(또는 B 로 시작)인 실행. 한쪽은 비워도 됩니다 (예: '2025-10-10..').
+            - glob: '2025-10-1*', '2025-10-0?_*' 등.
+            - 접두사: 'YYYY-MM-DD' 또는 'YYYY-MM-DD_HH-MM-SS'.
+        run_names (Iterable[str]): 실행 디렉터리 이름들.
+
+    Returns:
+        list: 조건에 맞는 실행 이름 목록.
+    """
+    run_names = sorted(run_names)
+    if not target:
+        return run_names
+    if '..' in target:
+        start, end = target.split('..', 1)
+        return [
+            name for name in run_names
+            if (not start or name >= start) and (not end or name <= end or name.startswith(end))
+        ]
+    if is_run_pattern(target):
+        return [name for name in run_names if fnmatch.fnmatch(name, target)]
+    return [name for name in run_names if name.startswith(target)]
+
+
+def list_benchmark_files(target: Optional[str] = None) -> list:
+    """
+    results 디렉터리에서 target(범위/glob/접두사, 없으면 전체)에 맞는 실행들의
+    원시 결과 파일 경로를 (오래된 순으로) 반환합니다.
+    """
+    if not os.path.exists(RESULTS_DIR):
+        print(f"❌ Error: Results directory not found at '{RESULTS_DIR}'")
+        return []
+    paths = []
+    for subdir in match_run_names(target, os.listdir(RESULTS_DIR)):
+        run_dir = os.path.join(RESULTS_DIR, subdir)
+        if os.path.isdir(run_dir):
+            raw_path = history_store.find_raw_file(run_dir)
+            if raw_path:
+                paths.append(raw_path)
+    return paths
+
+
+def load_and_preprocess_data(file_path: str, follow: bool = False, normalize: bool = True) -> Optional[pd.DataFrame]:
     """
-    주어진 경로의 JSON 파일을 로드하고, 분석하기 좋은 DataFrame 형태로 전처리합니다.
+    주어진 경로의 JSON/NDJSON 파일을 로드하고, 분석하기 좋은 DataFrame 형태로 전처리합니다.
+    실행 디렉터리에 machine.json 이 있으면 호스트 지문을 보여주고, 시간 컬럼을 보정 점수로 정규화합니다.
 
     Args:
-        file_path (str): 로드할 JSON 파일의 경로.
+        file_path (str): 로드할 JSON(배열) 또는 NDJSON 파일의 경로.
+        follow (bool): True이면 아직 기록 중인 파일을 끝까지(새 레코드가 멈출 때까지) 따라가며 읽습니다.
+        normalize (bool): False 이면 정규화하지 않습니다 (여러 실행을 같은 기준 점수로 정규화할 때).
 
     Returns:
         Optional[pd.DataFrame]: 전처리된 데이터프레임. 파일이 없거나 비어있으면 None을 반환합니다.
@@ -69,29 +142,61 @@ def load_and_preprocess_data(file_path: str) -> Optional[pd.DataFrame]:
     print(f"📄 Loading data from: {os.path.basename(file_path)}")
     
     try:
-        with open(file_path, 'r') as f:
-            raw_data = json.load(f)
-        
-        if not raw_data:
+        # 레코드를 하나씩 읽어 컬럼 단위로 DataFrame을 구성합니다 (전체 JSON을 한 번에 올리지 않음).
+        df = record_stream.load_frame(file_path, follow=follow)
+
+        if df is None:
             print("Warning: Benchmark file is empty.")
             return None
 
-        # 중첩된 'details' 데이터를 상위 레벨로 올겨서 평탄화(flatten)합니다.
-        normalized_data = []
-        for record in raw_data:
-            flat_record = {
-                'scenario': record.get('scenario'),
-                'seed': record.get('seed'),
-                'strategy': record.get('strategy'),
-                'totalTime': record.get('totalTime'),
-                **record.get('details', {}) # 'details' 객체의 모든 키-값을 풀어헤쳐 추가
-            }
-            normalized_data.append(flat_record)
-
-        df = pd.DataFrame(normalized_data)
+        machines = machine.load_machines(os.path.dirname(file_path))
+        for host, info in machines.items():
+            print(f"🖥️ Host {host}: {machine.describe(info)}, calibration {info.get('calibrationMs', float('nan')):.2f} ms")
+        # 샤드를 여러 호스트에서 돌려 합친 실행이면 호스트끼리도 비교 가능한지 확인합니다.
+        if not machine.check_compatible({host: {host: info} for host, info in machines.items()}):
+            return None
+        machine.warn_busy(df, machines)
+        if normalize:
+            df = machine.normalize_frame(df)
+
         print("✅ Data loaded and preprocessed successfully.")
         return df
 
     except (FileNotFoundError, json.JSONDecodeError) as e:
         print(f"Error loading or parsing file: {e}")
-        return None
\ No newline at end of file
+        return None
+
+
+def load_history_data(
+    run_prefix: Optional[str] = None,
+    scenarios: Optional[Iterable[str]] = None,
+    strategies: Optional[Iterable[str]] = None,
+    runs: Optional[Iterable[str]] = None,
+) -> Optional[pd.DataFrame]:
+    """
+    히스토리 저장소를 최신 상태로 동기화한 뒤, 여러 실행에 걸친 레코드를 조회합니다.
+    새로 생겼거나 바뀐 실행 디렉터리만 적재되므로, 반복 호출 시 JSON을 다시 파싱하지 않습니다.
+    실행들의 호스트 지문이 호환되는지 확인하고, 시간 값을 하나의 기준 점수로 정규화합니다.
+
+    Args:
+        run_prefix (Optional[str]): 'YYYY-MM-DD' 등 실행 디렉터리 이름의 접두사.
+        scenarios (Optional[Iterable[str]]): 포함할 시나리오 이름 목록.
+        strategies (Optional[Iterable[str]]): 포함할 전략 이름 목록.
+        runs (Optional[Iterable[str]]): 포함할 실행 디렉터리 이름 목록 (match_run_names 결과 등).
+
+    Returns:
+        Optional[pd.DataFrame]: record_stream 의 compact long 형식 데이터프레임 (run, record, scenario, seed, strategy,
+                                key, value). wide 테이블이 필요하면 record_stream.pivot_wide 로 펼칩니다.
+                                결과가 없거나, 호환되지 않는 호스트의 실행이 섞여 있고 machine.on_mismatch 가 'error' 이면 None.
+    """
+    history_store.sync_history(RESULTS_DIR)
+    df = history_store.query_history_long(run_prefix, scenarios, strategies, runs=runs)
+    if df.empty:
+        print("Warning: No matching runs in history.")
+        return None
+    if not machine.check_compatible(history_store.query_machines(df['run'].cat.categories)):
+        return None
+    df = machine.normalize_long(df)
+    print(f"✅ Loaded {df['record'].nunique()} records from {df['run'].nunique()} runs "
+          f"({df.memory_usage(deep=True).sum() / 2 ** 20:.1f} MiB).")
+    return df
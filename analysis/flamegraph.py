@@ -0,0 +1,103 @@
+import os
+
+import pandas as pd
+
+import aggregates
+import timer_tree
+from config import load_config
+
+# --- 설정 ---
+# L{n}-A:B:C 측정 키의 호출 트리를 flame graph 형태로 내보냅니다.
+# - folded stack : 'Total;Routing;aStar_Loop 1234' (값 = exclusive 시간, µs 정수)
+#                  flamegraph.pl, inferno, speedscope 등 표준 도구에서 그대로 열 수 있습니다.
+# - icicle 레이아웃 : 노드별 (depth, x0, width) — visualizer 가 SVG 로 그립니다.
+FOLDED_UNIT = 1000  # ms → µs (folded 값은 정수 샘플 수로 취급되므로 해상도를 높임)
+
+
+def _frames(path: str, delimiter: str) -> list:
+    if path == timer_tree.ROOT_PATH:
+        return [timer_tree.ROOT_PATH]
+    return [timer_tree.ROOT_PATH] + path.split(delimiter)
+
+
+def folded_stacks(cell: pd.DataFrame) -> list:
+    """
+    한 (시나리오, 전략) 셀의 호출 트리를 folded stack 줄 목록으로 변환합니다.
+    각 노드의 값은 exclusive(self) 시간이므로, 도구가 조상 방향으로 합산하면 inclusive 시간이 됩니다.
+
+    Args:
+        cell (pd.DataFrame): aggregates.cells 가 돌려주는 셀 (path 인덱스, exclusive 컬럼).
+
+    Returns:
+        list: 'frame;frame;... value' 형식의 문자열 목록 (값이 0 인 노드는 제외).
+    """
+    delimiter = load_config()['levels']['delimiter']
+    values = (cell['exclusive'].clip(lower=0) * FOLDED_UNIT).round().astype(int)
+    return [
+        f"{';'.join(_frames(path, delimiter))} {value}"
+        for path, value in values.items()
+        if value > 0
+    ]
+
+
+def write_folded(cube: pd.DataFrame, output_dir: str) -> list:
+    """
+    셀마다 '<scenario>_<strategy>.folded' 파일을 저장합니다.
+
+    Returns:
+        list: 저장한 파일 경로 목록.
+    """
+    os.makedirs(output_dir, exist_ok=True)
+    paths = []
+    for scenario, strategy, cell in aggregates.cells(cube):
+        path = os.path.join(output_dir, f'{aggregates.safe_name(scenario)}_{aggregates.safe_name(strategy)}.folded')
+        with open(path, 'w', encoding='utf-8') as f:
+            f.write('\n'.join(folded_stacks(cell)) + '\n')
+        paths.append(path)
+    print(f"🔥 Folded stacks saved to: {output_dir} ({len(paths)} files)")
+    return paths
+
+
+def icicle_layout(cell: pd.DataFrame) -> pd.DataFrame:
+    """
+    icicle(위에서 아래로 자라는 flame graph) 레이아웃을 계산합니다.
+    노드 폭은 inclusive 시간이고, 자식들은 부모 구간의 왼쪽부터 큐브 순서대로 놓입니다.
+    측정 오차로 자식 합이 부모보다 크면 자식들을 부모 폭에 맞게 줄입니다.
+
+    Args:
+        cell (pd.DataFrame): aggregates.cells 가 돌려주는 셀 (path 인덱스, parent/inclusive/exclusive 컬럼).
+
+    Returns:
+        pd.DataFrame: path, name, depth, x0, width, inclusive, exclusive 컬럼 (DFS 순서).
+    """
+    delimiter = load_config()['levels']['delimiter']
+    widths = cell['inclusive'].clip(lower=0)
+    children = {}
+    for path, parent in cell['parent'].items():
+        if pd.notna(parent):
+            children.setdefault(parent, []).append(path)
+
+    rows = []
+    stack = [(timer_tree.ROOT_PATH, 0.0, float(widths.get(timer_tree.ROOT_PATH, 0.0)), 0)]
+    while stack:
+        path, x0, width, depth = stack.pop()
+        rows.append({
+            'path': path,
+            'name': path.rpartition(delimiter)[2],
+            'depth': depth,
+            'x0': x0,
+            'width': width,
+            'inclusive': cell.at[path, 'inclusive'],
+            'exclusive': cell.at[path, 'exclusive'],
+        })
+        kids = children.get(path, [])
+        total = float(widths[kids].sum()) if kids else 0.0
+        scale = min(1.0, width / total) if total > 0 else 0.0
+        x = x0
+        placed = []
+        for kid in kids:
+            kid_width = float(widths[kid]) * scale
+            placed.append((kid, x, kid_width, depth + 1))
+            x += kid_width
+        stack.extend(reversed(placed))
+    return pd.DataFrame(rows)
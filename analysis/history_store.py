@@ -0,0 +1,320 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import sqlite3
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import machine
+import record_stream
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- 설정 ---
+# results/<timestamp>/ 디렉터리들을 한 번씩만 적재하는 로컬 SQLite 히스토리 저장소입니다.
+RESULTS_DIR = os.path.join(os.path.dirname(__file__), 'results')
+HISTORY_DB_PATH = os.path.join(RESULTS_DIR, 'history.sqlite')
+
+# 최신 벤치마크는 raw_results.json, 초기(2025-10-09) 실행은 benchmark-results.json 으로 저장되어 있습니다.
+# raw_results.ndjson 은 아직 실행 중인 벤치마크의 스트림입니다.
+# raw_results.col 은 같은 레코드의 컬럼 바이너리 포맷 (columnar.py) 으로, JSON 파싱 없이 memory-map 으로 읽습니다.
+COLUMNAR_FILE_NAME = 'raw_results.col'  # columnar.COLUMNAR_FILE_NAME
+RAW_FILE_NAMES = [COLUMNAR_FILE_NAME, 'raw_results.json', 'benchmark-results.json', 'raw_results.ndjson']
+
+# 스키마가 바뀌면 값을 올립니다. 버전이 다른 DB는 캐시이므로 비우고 다시 적재합니다.
+SCHEMA_VERSION = 4
+HISTORY_CHUNK_ROWS = 200_000  # timings 를 한 번에 읽어 들일 최대 행 수
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS runs (
+    run_id      TEXT PRIMARY KEY,
+    file_name   TEXT NOT NULL,
+    mtime       REAL NOT NULL,
+    size        INTEGER NOT NULL,
+    sha256      TEXT NOT NULL,
+    machine     TEXT              -- machine.json (호스트 지문) 내용. 기록되지 않은 실행은 NULL
+);
+CREATE TABLE IF NOT EXISTS records (
+    record_id   INTEGER PRIMARY KEY,
+    run_id      TEXT NOT NULL REFERENCES runs(run_id) ON DELETE CASCADE,
+    scenario    TEXT,
+    nodes       INTEGER,
+    edges       INTEGER,
+    groups      INTEGER,
+    ports       INTEGER,
+    seed        INTEGER,
+    strategy    TEXT,
+    totalTime   REAL,
+    calibrationMs REAL,
+    loadAvg     REAL
+);
+CREATE TABLE IF NOT EXISTS timings (
+    record_id   INTEGER NOT NULL REFERENCES records(record_id) ON DELETE CASCADE,
+    key         TEXT NOT NULL,
+    value       REAL
+);
+CREATE INDEX IF NOT EXISTS idx_records_run ON records(run_id);
+CREATE INDEX IF NOT EXISTS idx_records_cell ON records(scenario, strategy);
+CREATE INDEX IF NOT EXISTS idx_timings_record ON timings(record_id);
+"""
+
+
+def connect(db_path: str = HISTORY_DB_PATH) -> sqlite3.Connection:
+    """
+    히스토리 DB에 연결하고, 테이블이 없으면 생성합니다.
+
+    Args:
+        db_path (str): SQLite 파일 경로.
+
+    Returns:
+        sqlite3.Connection: 스키마가 준비된 연결 객체.
+    """
+    conn = sqlite3.connect(db_path)
+    conn.execute("PRAGMA foreign_keys = ON")
+    if conn.execute("PRAGMA user_version").fetchone()[0] != SCHEMA_VERSION:
+        conn.executescript("DROP TABLE IF EXISTS timings; DROP TABLE IF EXISTS records; DROP TABLE IF EXISTS runs;")
+        conn.execute(f"PRAGMA user_version = {SCHEMA_VERSION}")
+    conn.executescript(SCHEMA)
+    return conn
+
+
+def find_raw_file(run_dir: str) -> Optional[str]:
+    """
+    실행 디렉터리 안의 원시 결과 파일 경로를 반환합니다. 없으면 None.
+    컬럼 파일은 변환 뒤에 JSON 이 다시 쓰이지 않았을 때(JSON 보다 새것일 때)만 씁니다.
+    """
+    paths = [os.path.join(run_dir, name) for name in RAW_FILE_NAMES if os.path.exists(os.path.join(run_dir, name))]
+    if len(paths) > 1 and os.path.basename(paths[0]) == COLUMNAR_FILE_NAME \
+            and os.path.getmtime(paths[0]) < os.path.getmtime(paths[1]):
+        return paths[1]
+    return paths[0] if paths else None
+
+
+def _file_sha256(path: str) -> str:
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+def _ingest_run(conn: sqlite3.Connection, run_id: str, raw_path: str, stat: os.stat_result, sha256: str):
+    """한 실행의 레코드를 (기존 행을 지운 뒤) 다시 적재합니다."""
+    conn.execute("DELETE FROM runs WHERE run_id = ?", (run_id,))
+    machine_path = os.path.join(os.path.dirname(raw_path), machine.MACHINE_FILE_NAME)
+    machine_json = None
+    if os.path.exists(machine_path):
+        with open(machine_path, 'r') as f:
+            machine_json = f.read()
+    conn.execute(
+        "INSERT INTO runs (run_id, file_name, mtime, size, sha256, machine) VALUES (?, ?, ?, ?, ?, ?)",
+        (run_id, os.path.basename(raw_path), stat.st_mtime, stat.st_size, sha256, machine_json)
+    )
+    for record in record_stream.iter_records(raw_path):
+        if record.get(record_stream.CENSORED_COLUMN):
+            continue  # 크기 스윕에서 예산을 넘겨 중단된 실행: totalTime 은 실제 시간이 아니라 예산입니다.
+        cursor = conn.execute(
+            "INSERT INTO records (run_id, scenario, nodes, edges, groups, ports, seed, strategy, totalTime, calibrationMs, loadAvg) "
+            "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+            (run_id, record.get('scenario'), record.get('nodes'), record.get('edges'), record.get('groups'),
+             record.get('ports'), record.get('seed'), record.get('strategy'), record.get('totalTime'),
+             record.get(record_stream.CALIBRATION_COLUMN), record.get(record_stream.LOAD_COLUMN))
+        )
+        record_id = cursor.lastrowid
+        conn.executemany(
+            "INSERT INTO timings (record_id, key, value) VALUES (?, ?, ?)",
+            [(record_id, key, value) for key, value in record.get('details', {}).items()]
+        )
+
+
+def sync_history(results_dir: str = RESULTS_DIR, db_path: str = HISTORY_DB_PATH) -> dict:
+    """
+    results 디렉터리를 훑어 새로 생겼거나 바뀐 실행만 히스토리 DB에 적재합니다.
+    mtime/크기가 같으면 파일을 읽지 않고, 달라졌을 때만 해시를 계산해 내용 변경 여부를 판단합니다.
+
+    Args:
+        results_dir (str): 실행 디렉터리들이 모여 있는 경로.
+        db_path (str): SQLite 파일 경로.
+
+    Returns:
+        dict: {'added': [...], 'updated': [...], 'unchanged': int} 형태의 적재 결과.
+    """
+    report = {'added': [], 'updated': [], 'unchanged': 0}
+    if not os.path.exists(results_dir):
+        print(f"❌ Error: Results directory not found at '{results_dir}'")
+        return report
+
+    conn = connect(db_path)
+    try:
+        known = {
+            row[0]: row[1:]
+            for row in conn.execute("SELECT run_id, mtime, size, sha256 FROM runs")
+        }
+        for run_id in sorted(os.listdir(results_dir)):
+            run_dir = os.path.join(results_dir, run_id)
+            if not os.path.isdir(run_dir):
+                continue
+            raw_path = find_raw_file(run_dir)
+            if raw_path is None:
+                continue
+
+            stat = os.stat(raw_path)
+            previous = known.get(run_id)
+            if previous is not None and previous[0] == stat.st_mtime and previous[1] == stat.st_size:
+                report['unchanged'] += 1
+                continue
+
+            sha256 = _file_sha256(raw_path)
+            if previous is not None and previous[2] == sha256:
+                # 내용은 그대로이고 mtime만 바뀐 경우 (예: 복사/체크아웃)
+                conn.execute("UPDATE runs SET mtime = ?, size = ? WHERE run_id = ?", (stat.st_mtime, stat.st_size, run_id))
+                report['unchanged'] += 1
+                continue
+
+            try:
+                with conn:
+                    _ingest_run(conn, run_id, raw_path, stat, sha256)
+            except json.JSONDecodeError as e:
+                print(f"Warning: Skipping '{run_id}' (invalid JSON: {e})")
+                continue
+            report['updated' if previous is not None else 'added'].append(run_id)
+        conn.commit()
+    finally:
+        conn.close()
+
+    print(f"🗄️ History synced: {len(report['added'])} added, {len(report['updated'])} updated, {report['unchanged']} unchanged")
+    return report
+
+
+def _in_clause(column: str, values: Iterable[str]):
+    values = list(values)
+    return f"{column} IN ({', '.join('?' * len(values))})", values
+
+
+def _where(run_prefix, scenarios, strategies, runs) -> tuple:
+    conditions, params = [], []
+    if run_prefix:
+        conditions.append("r.run_id LIKE ?")
+        params.append(f"{run_prefix}%")
+    if scenarios:
+        clause, values = _in_clause("r.scenario", scenarios)
+        conditions.append(clause)
+        params.extend(values)
+    if strategies:
+        clause, values = _in_clause("r.strategy", strategies)
+        conditions.append(clause)
+        params.extend(values)
+    if runs is not None:
+        clause, values = _in_clause("r.run_id", runs)
+        conditions.append(clause)
+        params.extend(values)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+
+def query_history_long(
+    run_prefix: Optional[str] = None,
+    scenarios: Optional[Iterable[str]] = None,
+    strategies: Optional[Iterable[str]] = None,
+    db_path: str = HISTORY_DB_PATH,
+    runs: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    히스토리 DB에서 조건에 맞는 레코드를 record_stream 의 compact long 형식으로 조회합니다.
+    전략마다 측정 키가 달라 wide 테이블은 대부분이 NaN 이므로, 여러 달의 히스토리는 이 형식으로 다룹니다.
+    레코드 필드(nodes, edges, groups, ports, totalTime, calibrationMs, loadAvg)도 key 행으로 들어갑니다.
+
+    Args:
+        run_prefix (Optional[str]): 'YYYY-MM' / 'YYYY-MM-DD' 등 실행 디렉터리 이름의 접두사.
+        scenarios (Optional[Iterable[str]]): 포함할 시나리오 이름 목록.
+        strategies (Optional[Iterable[str]]): 포함할 전략 이름 목록.
+        db_path (str): SQLite 파일 경로.
+        runs (Optional[Iterable[str]]): 포함할 실행 디렉터리 이름 목록.
+
+    Returns:
+        pd.DataFrame: run, record, scenario, seed, strategy, key, value 컬럼 (record 는 0부터의 레코드 번호).
+    """
+    where, params = _where(run_prefix, scenarios, strategies, runs)
+
+    import numpy as np  # 조회 결과를 만들 때만 필요합니다 (CLI 시작 시간 단축).
+    import pandas as pd
+    from pandas.api.types import union_categoricals
+
+    conn = connect(db_path)
+    try:
+        records = pd.read_sql_query(
+            f"SELECT r.record_id, r.run_id AS run, r.scenario, r.nodes, r.edges, r.groups, r.ports, "
+            f"r.seed, r.strategy, r.totalTime, r.calibrationMs, r.loadAvg "
+            f"FROM records r {where} ORDER BY r.record_id",
+            conn, params=params
+        )
+        # timings 는 히스토리에서 가장 큰 테이블이라, 청크마다 compact 형식으로 줄여 가며 읽습니다.
+        chunks = [
+            record_stream.compact_long(chunk.rename(columns={'record_id': 'record'}))
+            for chunk in pd.read_sql_query(
+                f"SELECT t.record_id, t.key, t.value FROM timings t "
+                f"JOIN records r ON r.record_id = t.record_id {where} ORDER BY t.rowid",
+                conn, params=params, chunksize=HISTORY_CHUNK_ROWS
+            )
+        ]
+    finally:
+        conn.close()
+
+    fields = record_stream.compact_long(records.melt(
+        id_vars=['record_id'], value_vars=record_stream.size_columns + ['totalTime'] + record_stream.machine_columns,
+        var_name='key'
+    ).dropna(subset=['value']).rename(columns={'record_id': 'record'}))
+    parts = [fields] + chunks
+    # 청크마다 category 가 다르므로 합칠 때 키의 처음 등장 순서를 유지하며 합집합을 만듭니다.
+    keys = union_categoricals([part['key'].array for part in parts])
+    long = pd.DataFrame({
+        'record': np.concatenate([part['record'].to_numpy() for part in parts]),
+        'key': keys,
+        'value': np.concatenate([part['value'].to_numpy() for part in parts]),
+    }).sort_values('record', kind='stable')
+
+    ids = records.set_index('record_id')[['run', 'scenario', 'seed', 'strategy']].astype(
+        {'run': 'category', 'scenario': 'category', 'strategy': 'category'}
+    )
+    long = long.join(ids, on='record')
+    long['record'] = ids.index.get_indexer(long['record'])
+    return record_stream.compact_long(long[record_stream.long_columns]).reset_index(drop=True)
+
+
+def query_history(
+    run_prefix: Optional[str] = None,
+    scenarios: Optional[Iterable[str]] = None,
+    strategies: Optional[Iterable[str]] = None,
+    db_path: str = HISTORY_DB_PATH,
+    runs: Optional[Iterable[str]] = None,
+) -> pd.DataFrame:
+    """
+    히스토리 DB에서 조건에 맞는 레코드를 조회해 `load_and_preprocess_data`와 같은
+    wide 형태의 DataFrame(+ 'run' 컬럼)으로 반환합니다 (query_history_long 결과를 펼친 것).
+
+    Returns:
+        pd.DataFrame: run, scenario, seed, strategy, nodes, edges, groups, ports, totalTime 및 세부 측정 컬럼.
+    """
+    long = query_history_long(run_prefix, scenarios, strategies, db_path, runs)
+    if long.empty:
+        import pandas as pd
+
+        return pd.DataFrame(columns=['run', 'scenario', 'seed', 'strategy', 'totalTime'])
+    return record_stream.pivot_wide(long)
+
+
+def query_machines(runs: Iterable[str], db_path: str = HISTORY_DB_PATH) -> dict:
+    """
+    실행별 호스트 지문을 조회합니다 (machine.check_compatible 의 입력).
+
+    Returns:
+        dict: 실행 이름 → {host id: 지문}. 지문이 기록되지 않은 실행은 빈 dict.
+    """
+    clause, values = _in_clause("run_id", runs)
+    conn = connect(db_path)
+    try:
+        rows = conn.execute(f"SELECT run_id, machine FROM runs WHERE {clause} ORDER BY run_id", values).fetchall()
+    finally:
+        conn.close()
+    return {run_id: json.loads(machine_json) if machine_json else {} for run_id, machine_json in rows}
@@ -0,0 +1,244 @@
+import os
+from typing import Optional
+
+import numpy as np
+import pandas as pd
+
+import censoring
+import record_stream
+from config import load_config
+
+# --- 설정 ---
+# run-benchmark.ts 가 레코드마다 남기는 최종 레이아웃(layouts.ndjson: 노드 사각형, 엣지 꺾은선)으로
+# 레이아웃 품질을 계산합니다. 빠른 전략이 더 나쁜 레이아웃을 만드는지 함께 보기 위한 지표입니다 (모두 작을수록 좋음).
+# - crossings     : 서로 다른 수평/수직 선분이 내부에서 교차하는 횟수 (스윕 라인)
+# - bends         : 엣지 꺾은선의 꺾임 수
+# - wire_length   : 엣지 길이의 합
+# - node_overlaps : 엣지가 자신의 양 끝이 아닌 노드의 내부를 지나는 (엣지, 노드) 쌍의 수
+# - area          : 노드와 엣지를 모두 포함하는 경계 상자의 넓이
+LAYOUT_FILE_NAME = 'layouts.ndjson'
+record_columns = ['scenario', 'seed', 'strategy']
+metric_columns = ['crossings', 'bends', 'wire_length', 'node_overlaps', 'area']
+EPS = 1e-9                # 수평/수직 판정과 길이 0 선분 판정의 허용 오차
+SWEEP_BLOCK = 512         # 스윕 라인에서 지나온 선분들을 y 로 정렬해 두는 블록 크기
+OVERLAP_CHUNK = 1 << 22   # 노드-엣지 겹침 검사에서 한 번에 비교하는 (선분 × 노드) 쌍의 수
+
+
+def find_layout_file(run_dir: str) -> Optional[str]:
+    """실행 디렉터리 안의 layouts.ndjson 경로를 반환합니다. 없으면 None (2025-10 이전 실행 또는 --no-layout)."""
+    path = os.path.join(run_dir, LAYOUT_FILE_NAME)
+    return path if os.path.exists(path) else None
+
+
+def edge_segments(layout: dict) -> dict:
+    """
+    엣지 꺾은선을 선분 배열로 펼칩니다 (길이 0 인 선분은 제외).
+
+    Returns:
+        dict: x0, y0, x1, y1 (선분 양 끝), edge (엣지 인덱스), source, target (양 끝 노드 인덱스) 배열.
+    """
+    edges = layout.get('edges', [])
+    paths = [np.asarray(edge['path'], dtype=float).reshape(-1, 2) for edge in edges]
+    counts = np.array([len(path) for path in paths], dtype=int)
+    if counts.sum() < 2:
+        empty = np.empty(0)
+        return {'x0': empty, 'y0': empty, 'x1': empty, 'y1': empty,
+                'edge': empty.astype(int), 'source': empty.astype(int), 'target': empty.astype(int)}
+
+    points = np.concatenate(paths)
+    owner = np.repeat(np.arange(len(edges)), counts)
+    same_edge = owner[:-1] == owner[1:]
+    start, end = points[:-1][same_edge], points[1:][same_edge]
+    edge = owner[:-1][same_edge]
+    keep = np.abs(end - start).max(axis=1) > EPS
+    ends = np.array([[e['source'], e['target']] for e in edges], dtype=int)
+    return {
+        'x0': start[keep, 0], 'y0': start[keep, 1], 'x1': end[keep, 0], 'y1': end[keep, 1],
+        'edge': edge[keep], 'source': ends[edge[keep], 0], 'target': ends[edge[keep], 1],
+    }
+
+
+def count_bends(seg: dict) -> int:
+    """같은 엣지의 연속된 두 선분의 방향이 바뀌는 지점 수 (되돌아가는 경우 포함)."""
+    dx, dy = seg['x1'] - seg['x0'], seg['y1'] - seg['y0']
+    same_edge = seg['edge'][:-1] == seg['edge'][1:]
+    cross = dx[:-1] * dy[1:] - dy[:-1] * dx[1:]
+    dot = dx[:-1] * dx[1:] + dy[:-1] * dy[1:]
+    scale = np.hypot(dx[:-1], dy[:-1]) * np.hypot(dx[1:], dy[1:])
+    return int((same_edge & ((np.abs(cross) > EPS * scale) | (dot < 0))).sum())
+
+
+def _dominance_counts(
+    p: np.ndarray,
+    q: np.ndarray,
+    x: np.ndarray,
+    y: np.ndarray,
+    x_inclusive: bool,
+    y_inclusive: bool,
+) -> np.ndarray:
+    """
+    질의 (x, y) 마다 p < x 이고 q < y 인 점 (p, q) 의 수를 셉니다 (inclusive 면 ≤).
+    점을 p 순서로 훑는 스윕 라인에서 "지금까지 지나온 점" 을 SWEEP_BLOCK 크기 블록으로 나눠 q 로 정렬해 두고,
+    질의마다 꽉 찬 블록은 이진 탐색, 마지막 블록 하나만 직접 비교합니다. 모든 질의를 블록 단위로 한꺼번에 처리합니다.
+    """
+    counts = np.zeros(len(x), dtype=np.int64)
+    if len(p) == 0 or len(x) == 0:
+        return counts
+    order = np.argsort(p, kind='stable')
+    p_sorted, q_sorted = p[order], q[order]
+    passed = np.searchsorted(p_sorted, x, side='right' if x_inclusive else 'left')
+    side = 'right' if y_inclusive else 'left'
+    for start in range(0, len(p_sorted), SWEEP_BLOCK):
+        block = q_sorted[start:start + SWEEP_BLOCK]
+        full = passed >= start + len(block)
+        counts[full] += np.searchsorted(np.sort(block), y[full], side=side)
+        partial = np.nonzero((passed > start) & ~full)[0]
+        if partial.size:
+            within = np.arange(len(block)) < (passed[partial] - start)[:, None]
+            below = block <= y[partial, None] if y_inclusive else block < y[partial, None]
+            counts[partial] += (within & below).sum(axis=1)
+    return counts
+
+
+def count_crossings(seg: dict) -> int:
+    """
+    수평 선분과 수직 선분이 양쪽 모두의 내부에서 만나는 횟수 (끝점이 닿는 T 자 접촉, 평행 겹침은 제외).
+    여러 엣지가 같은 선분을 공유하면(버스 간선 등) 한 번만 그려지므로 중복 선분은 하나로 셉니다.
+
+    수직 선분 (x, y_lo..y_hi) 과 교차하는 수평 선분 (x_lo..x_hi, y) 의 수는
+    #{x_lo < x, y_lo < y < y_hi} - #{x_hi ≤ x, y_lo < y < y_hi} 이고, 각 항을 _dominance_counts 로 계산합니다.
+    """
+    lines = np.column_stack([
+        np.minimum(seg['x0'], seg['x1']), np.minimum(seg['y0'], seg['y1']),
+        np.maximum(seg['x0'], seg['x1']), np.maximum(seg['y0'], seg['y1']),
+    ])
+    if len(lines) == 0:
+        return 0
+    lines = np.unique(lines, axis=0)
+    horizontal = lines[np.abs(lines[:, 3] - lines[:, 1]) <= EPS]
+    vertical = lines[np.abs(lines[:, 2] - lines[:, 0]) <= EPS]
+    hx_lo, hx_hi, hy = horizontal[:, 0], horizontal[:, 2], horizontal[:, 1]
+    vx, vy_lo, vy_hi = vertical[:, 0], vertical[:, 1], vertical[:, 3]
+
+    total = (
+        _dominance_counts(hx_lo, hy, vx, vy_hi, x_inclusive=False, y_inclusive=False)
+        - _dominance_counts(hx_lo, hy, vx, vy_lo, x_inclusive=False, y_inclusive=True)
+        - _dominance_counts(hx_hi, hy, vx, vy_hi, x_inclusive=True, y_inclusive=False)
+        + _dominance_counts(hx_hi, hy, vx, vy_lo, x_inclusive=True, y_inclusive=True)
+    )
+    return int(total.sum())
+
+
+def count_node_overlaps(seg: dict, rects: np.ndarray) -> int:
+    """
+    엣지가 자신의 양 끝이 아닌 노드의 내부를 지나는 (엣지, 노드) 쌍의 수.
+    선분의 경계 상자가 노드 내부와 겹치는지로 판정하므로 (직교 선분이면 정확), 테두리를 따라가는 선분은 겹침이 아닙니다.
+    (선분 × 노드) 비교는 OVERLAP_CHUNK 크기로 나눠 메모리 사용량을 제한합니다.
+    """
+    if len(seg['x0']) == 0 or len(rects) == 0:
+        return 0
+    sx_lo, sx_hi = np.minimum(seg['x0'], seg['x1']), np.maximum(seg['x0'], seg['x1'])
+    sy_lo, sy_hi = np.minimum(seg['y0'], seg['y1']), np.maximum(seg['y0'], seg['y1'])
+    nx_lo, ny_lo = rects[:, 0], rects[:, 1]
+    nx_hi, ny_hi = nx_lo + rects[:, 2], ny_lo + rects[:, 3]
+    node_ids = np.arange(len(rects))
+
+    pairs = []
+    step = max(1, OVERLAP_CHUNK // len(rects))
+    for start in range(0, len(sx_lo), step):
+        s = slice(start, start + step)
+        hit = (
+            (sx_hi[s, None] > nx_lo + EPS) & (sx_lo[s, None] < nx_hi - EPS)
+            & (sy_hi[s, None] > ny_lo + EPS) & (sy_lo[s, None] < ny_hi - EPS)
+            & (node_ids != seg['source'][s, None]) & (node_ids != seg['target'][s, None])
+        )
+        seg_idx, node_idx = np.nonzero(hit)
+        pairs.append(seg['edge'][s][seg_idx].astype(np.int64) * len(rects) + node_idx)
+    return int(np.unique(np.concatenate(pairs)).size)
+
+
+def layout_metrics(layout: dict) -> dict:
+    """레이아웃 하나의 품질 지표 (metric_columns) 와 선분 수."""
+    rects = np.asarray(layout.get('nodes', []), dtype=float).reshape(-1, 4)
+    seg = edge_segments(layout)
+
+    xs = np.concatenate([rects[:, 0], rects[:, 0] + rects[:, 2], seg['x0'], seg['x1']])
+    ys = np.concatenate([rects[:, 1], rects[:, 1] + rects[:, 3], seg['y0'], seg['y1']])
+    area = float((xs.max() - xs.min()) * (ys.max() - ys.min())) if xs.size else 0.0
+    return {
+        'crossings': count_crossings(seg),
+        'bends': count_bends(seg),
+        'wire_length': float(np.hypot(seg['x1'] - seg['x0'], seg['y1'] - seg['y0']).sum()),
+        'node_overlaps': count_node_overlaps(seg, rects),
+        'area': area,
+        'segments': len(seg['x0']),
+    }
+
+
+def load_quality(file_path: str) -> pd.DataFrame:
+    """
+    layouts.ndjson 의 레이아웃마다 품질 지표를 계산합니다.
+
+    Returns:
+        pd.DataFrame: record, scenario, seed, strategy, crossings, bends, wire_length, node_overlaps, area, segments 컬럼
+                      (파일 순서). record 는 레이아웃을 만든 레코드의 번호로, 기록되지 않은 (이전) 파일이면 NaN 입니다.
+                      레이아웃이 없으면 빈 DataFrame.
+    """
+    rows = [
+        {'record': layout.get('record'), **{col: layout.get(col) for col in record_columns}, **layout_metrics(layout)}
+        for layout in record_stream.iter_records(file_path)
+    ]
+    return pd.DataFrame(rows, columns=['record'] + record_columns + metric_columns + ['segments'])
+
+
+def join_records(quality: pd.DataFrame, df: pd.DataFrame, columns: list) -> pd.DataFrame:
+    """
+    레이아웃 품질 행에 같은 레코드의 columns 값을 붙입니다 (레이아웃과 레코드는 1:1).
+    같은 (시나리오, 시드, 전략) 이 여러 번 나와도 (adaptive --repeat) 곱으로 불어나지 않도록, 레이아웃의 record 번호
+    (df 의 행 순서) 로 맞춥니다. 번호가 없는 (이전) 파일이면 같은 키 안에서 몇 번째로 나왔는지로 맞춥니다.
+    """
+    records = df[record_columns + columns].reset_index(drop=True)
+    if 'record' in quality.columns and quality['record'].notna().all():
+        records['record'] = np.arange(len(records))
+        return quality.merge(records, on=['record'] + record_columns, how='inner')
+    occurrence = '_occurrence'
+    quality = quality.assign(**{occurrence: quality.groupby(record_columns, sort=False).cumcount()})
+    records[occurrence] = records.groupby(record_columns, sort=False).cumcount()
+    return quality.merge(records, on=record_columns + [occurrence], how='inner').drop(columns=occurrence)
+
+
+def pareto_front(time: np.ndarray, value: np.ndarray) -> np.ndarray:
+    """시간과 지표 모두 다른 어떤 점보다 나쁘지 않은 (지배되지 않는) 점이면 True."""
+    no_worse = (time[None, :] <= time[:, None]) & (value[None, :] <= value[:, None])
+    better = (time[None, :] < time[:, None]) | (value[None, :] < value[:, None])
+    return ~(no_worse & better).any(axis=1)
+
+
+def quality_summary(quality: pd.DataFrame, df: pd.DataFrame) -> pd.DataFrame:
+    """
+    (시나리오, 전략)별 평균 품질 지표와 평균 totalTime, 그리고 시나리오 안에서 (시간, 지표) 파레토 최적 여부.
+
+    Args:
+        quality (pd.DataFrame): load_quality 결과.
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임 (같은 실행).
+
+    Returns:
+        pd.DataFrame: (scenario, strategy) 인덱스와 time_ms, n, 각 지표의 평균, pareto_{지표} 컬럼
+                      (시나리오/전략은 데이터에 처음 등장한 순서). 시간이 없는 레이아웃은 제외됩니다.
+    """
+    metrics = load_config().get('quality', {}).get('metrics', metric_columns)
+    joined = join_records(quality, df.assign(_censored=censoring.is_censored(df)), ['totalTime', '_censored'])
+    joined = joined[~joined.pop('_censored')]
+    if joined.empty:
+        return pd.DataFrame()
+
+    grouped = joined.groupby(['scenario', 'strategy'], sort=False)
+    summary = grouped[metrics].mean()
+    summary.insert(0, 'n', grouped.size())
+    summary.insert(0, 'time_ms', grouped['totalTime'].mean())
+    for metric in metrics:
+        summary[f'pareto_{metric}'] = False
+        for scenario, cell in summary.groupby(level='scenario', sort=False):
+            front = pareto_front(cell['time_ms'].to_numpy(float), cell[metric].to_numpy(float))
+            summary.loc[cell.index, f'pareto_{metric}'] = front
+    return summary
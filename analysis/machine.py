@@ -0,0 +1,233 @@
+from __future__ import annotations
+
+import json
+import os
+from typing import TYPE_CHECKING, Iterable, Optional
+
+import config
+from record_stream import BUDGET_COLUMN, CALIBRATION_COLUMN, LOAD_COLUMN, MEMORY_SEPARATOR
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- 설정 ---
+# 여러 호스트(노트북, 빌드 서버)에서 측정한 실행을 비교할 수 있게 합니다.
+# - run-benchmark.ts 는 실행 디렉터리에 machine.json ({host id: 지문}) 을 남기고,
+#   레코드마다 그 프로세스의 보정 점수(calibrationMs: 고정된 마이크로벤치마크의 중앙값, 작을수록 빠름)와
+#   측정 시작 시점의 1분 load average(loadAvg)를 기록합니다.
+# - 정규화된 시간 = 측정 시간 × 기준 점수 / calibrationMs ("기준 호스트였다면 걸렸을 시간").
+# - 지문의 match 필드가 다른 실행끼리 비교하면 경고하거나 (on_mismatch: error 이면) 거부합니다.
+MACHINE_FILE_NAME = 'machine.json'  # results/<run>/machine.json
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('machine', {})
+    return {
+        'normalize': cfg.get('normalize', True),
+        'reference_calibration_ms': cfg.get('reference_calibration_ms'),
+        'match': cfg.get('match', ['cpuModel', 'cores', 'arch', 'node']),
+        'on_mismatch': cfg.get('on_mismatch', 'warn'),
+        'max_load_per_core': cfg.get('max_load_per_core', 0.5),
+    }
+
+
+def load_machines(run_dir: str) -> dict:
+    """실행 디렉터리의 machine.json ({host id: 지문}). 기록되지 않은 (이전) 실행이면 빈 dict."""
+    path = os.path.join(run_dir, MACHINE_FILE_NAME)
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return json.load(f)
+
+
+def merge_machines(dirs: Iterable[str], output_path: str) -> dict:
+    """
+    하위 프로세스 디렉터리(샤드, 스윕 단계 등)의 machine.json 을 하나로 합쳐 씁니다 (임시 파일 + rename).
+    같은 host id 는 한 번만 남습니다. 합칠 파일이 없으면 출력 파일을 만들지 않습니다.
+    """
+    machines = {}
+    for path in dirs:
+        machines.update(load_machines(path))
+    if machines:
+        tmp_path = output_path + '.tmp'
+        with open(tmp_path, 'w') as f:
+            json.dump(machines, f, indent=2)
+        os.replace(tmp_path, output_path)
+    return machines
+
+
+def describe(info: dict) -> str:
+    """지문 한 줄 요약 (예: 'AMD EPYC 7B13 ×8, linux/x64, Node 20.11.1'). warm-up 없이 잰 실행은 표시합니다."""
+    return (f"{info.get('cpuModel', '?')} ×{info.get('cores', '?')}, {info.get('platform', '?')}/{info.get('arch', '?')}, "
+            f"Node {info.get('node', '?')}" + (', no warm-up' if info.get('warmup') is False else ''))
+
+
+def run_warmup(machines: dict) -> Optional[bool]:
+    """
+    실행이 측정 전에 JIT warm-up 을 했는지 (machine.json 의 warmup).
+    기록되지 않은 (이전) 실행이면 None 입니다: 직접 실행은 warm-up 없이, 샤드 실행은 warm-up 을 하고 쟀습니다.
+    """
+    values = {info['warmup'] for info in machines.values() if 'warmup' in info}
+    return values.pop() if len(values) == 1 else None
+
+
+def check_warmup(machines_by_run: dict):
+    """warm-up 여부가 기록된 실행들 중 서로 다른 것이 있으면 경고합니다 (차가운 JIT 는 첫 레코드들을 느리게 만듭니다)."""
+    warmups = {run: run_warmup(machines) for run, machines in machines_by_run.items()}
+    known = {run: warmup for run, warmup in warmups.items() if warmup is not None}
+    if len(set(known.values())) > 1:
+        cold = ', '.join(run for run, warmup in known.items() if not warmup)
+        print(f"Warning: Some runs were measured without JIT warm-up ({cold}); their first records may be slower.")
+
+
+def check_compatible(machines_by_run: dict, match: Optional[list] = None, on_mismatch: Optional[str] = None) -> bool:
+    """
+    실행들의 지문이 match 필드에서 모두 같은지 확인합니다. 지문이 없는 (이전) 실행은 건너뜁니다.
+    다르면 어떤 실행이 어떤 호스트인지 출력하고, on_mismatch 가 'error' 이면 False 를 반환합니다.
+
+    Args:
+        machines_by_run (dict): 실행 이름 → load_machines 결과.
+        match (Optional[list]): 같아야 하는 지문 필드. 기본값은 config.yaml 의 machine.match.
+        on_mismatch (Optional[str]): 'warn' 또는 'error'. 기본값은 machine.on_mismatch.
+
+    Returns:
+        bool: 비교를 계속해도 되면 True.
+    """
+    settings = _settings()
+    match = match or settings['match']
+    on_mismatch = on_mismatch or settings['on_mismatch']
+    groups = {}
+    for run, machines in machines_by_run.items():
+        for info in machines.values():
+            groups.setdefault(tuple(info.get(field) for field in match), (info, []))[1].append(run)
+    if len(groups) <= 1:
+        return True
+
+    lines = [f"  - {describe(info)}: {', '.join(dict.fromkeys(runs))}" for info, runs in groups.values()]
+    details = '\n'.join(lines)
+    if on_mismatch == 'error':
+        print(f"❌ Error: Runs come from incompatible machines ({', '.join(match)} differ):\n{details}")
+        return False
+    print(f"Warning: Runs come from different machines ({', '.join(match)} differ); "
+          f"timings are compared after calibration normalization:\n{details}")
+    return True
+
+
+def warn_busy(df: pd.DataFrame, machines: dict, max_load_per_core: Optional[float] = None):
+    """측정 중 load average / 코어 수가 max_load_per_core 를 넘은 레코드가 있으면 경고합니다."""
+    max_load_per_core = max_load_per_core or _settings()['max_load_per_core']
+    cores = max((info.get('cores') or 0 for info in machines.values()), default=0)
+    if LOAD_COLUMN not in df.columns or not cores:
+        return
+    busy = df[LOAD_COLUMN] > max_load_per_core * cores
+    if busy.any():
+        print(f"Warning: {int(busy.sum())}/{len(df)} records were measured with load average above "
+              f"{max_load_per_core:.2f} per core (max {df[LOAD_COLUMN].max():.2f} on {cores} cores); timings may be noisy.")
+
+
+def timing_keys(keys: Iterable[str]) -> list:
+    """정규화할 시간 키: totalTime, 세부 측정 키, 스윕 예산 (크기, 힙, 보정 점수 등은 제외)."""
+    import timer_tree
+
+    skip = set(timer_tree.non_timer_columns) - {'totalTime', BUDGET_COLUMN}
+    return [key for key in keys if key not in skip and MEMORY_SEPARATOR not in key]
+
+
+def reference_calibration(calibration: pd.Series) -> Optional[float]:
+    """
+    정규화의 기준 점수: machine.reference_calibration_ms, 없으면 보정 점수의 중앙값.
+    정규화가 꺼져 있거나 점수가 하나도 없으면 None (시간은 측정값 그대로).
+    """
+    settings = _settings()
+    if not settings['normalize'] or calibration.notna().sum() == 0:
+        return None
+    return settings['reference_calibration_ms'] or float(calibration.median())
+
+
+def calibration_factors(calibration: pd.Series, groups: Optional[pd.Series] = None, reference: Optional[float] = None):
+    """
+    레코드별 정규화 계수 (기준 점수 / calibrationMs) 와 기준 점수를 계산합니다.
+    보정 점수가 없는 레코드(스윕에서 중단된 실행 등)는 같은 그룹(실행)의 중앙값을 쓰고,
+    그룹 전체에 점수가 없으면 계수 1 (정규화하지 않음) 입니다.
+
+    Returns:
+        tuple: (계수 Series, 기준 점수). 점수가 하나도 없으면 (None, None).
+    """
+    if calibration.notna().sum() == 0:
+        return None, None
+    reference = reference or _settings()['reference_calibration_ms'] or float(calibration.median())
+    if groups is not None:
+        calibration = calibration.fillna(calibration.groupby(groups, observed=True).transform('median'))
+    else:
+        calibration = calibration.fillna(calibration.median())
+    return (reference / calibration).fillna(1.0), reference
+
+
+def normalize_frame(df: pd.DataFrame, reference: Optional[float] = None) -> pd.DataFrame:
+    """
+    wide 데이터프레임(record_stream.build_frame)의 시간 컬럼을 보정 점수로 정규화한 사본을 반환합니다.
+    보정 점수가 없는 (이전) 실행이거나 machine.normalize 가 꺼져 있으면 그대로 반환합니다.
+    """
+    if not _settings()['normalize'] or CALIBRATION_COLUMN not in df.columns:
+        return df
+    factors, reference = calibration_factors(df[CALIBRATION_COLUMN], reference=reference)
+    if factors is None:
+        return df
+    df = df.copy()
+    columns = timing_keys(df.columns)
+    df[columns] = df[columns].mul(factors, axis=0)
+    print(f"⚖️ Timings normalized to calibration {reference:.2f} ms "
+          f"(factor {factors.min():.3f}..{factors.max():.3f}).")
+    return df
+
+
+def normalize_together(frames: list, run_dirs: list) -> Optional[list]:
+    """
+    여러 실행(normalize=False 로 불러온 wide 데이터프레임)을 비교하기 전에, 호스트 지문이 호환되는지 확인하고
+    모두 같은 기준 점수로 정규화합니다 (main.py compare, server.py /diff).
+
+    Returns:
+        Optional[list]: 정규화된 데이터프레임 목록. 호환되지 않고 machine.on_mismatch 가 'error' 이면 None.
+    """
+    import pandas as pd
+
+    machines_by_run = {os.path.basename(run_dir): load_machines(run_dir) for run_dir in run_dirs}
+    if not check_compatible(machines_by_run):
+        return None
+    check_warmup(machines_by_run)
+    if not all(CALIBRATION_COLUMN in df.columns for df in frames):
+        return frames
+    _, reference = calibration_factors(pd.concat([df[CALIBRATION_COLUMN] for df in frames]))
+    return [normalize_frame(df, reference) for df in frames]
+
+
+def normalize_long(long: pd.DataFrame, reference: Optional[float] = None) -> pd.DataFrame:
+    """
+    compact long 형식(record_stream.long_columns)의 시간 키 값을 레코드별 보정 점수로 정규화합니다.
+    보정 점수가 없는 실행의 레코드는 그대로 두고, 그런 실행이 있으면 알려줍니다.
+    """
+    import numpy as np
+
+    if not _settings()['normalize']:
+        return long
+    is_calibration = (long['key'] == CALIBRATION_COLUMN).to_numpy()
+    if not is_calibration.any():
+        return long
+    n_records = int(long['record'].max()) + 1
+    calibration = np.full(n_records, np.nan)
+    calibration[long['record'].to_numpy()[is_calibration]] = long['value'].to_numpy()[is_calibration]
+    runs = long.drop_duplicates('record').set_index('record')['run'].reindex(range(n_records))
+
+    import pandas as pd
+
+    factors, reference = calibration_factors(pd.Series(calibration), groups=runs.reset_index(drop=True), reference=reference)
+    is_timing = long['key'].isin(timing_keys(long['key'].cat.categories)).to_numpy()
+    values = long['value'].to_numpy().copy()
+    values[is_timing] *= factors.to_numpy(dtype='float32')[long['record'].to_numpy()[is_timing]]
+    long = long.assign(value=values)
+
+    scored = pd.Series(calibration).notna().groupby(runs.to_numpy()).any()
+    missing = scored.index[~scored.to_numpy()]
+    note = f"; {len(missing)} runs without a calibration score are left as measured" if len(missing) else ''
+    print(f"⚖️ Timings normalized to calibration {reference:.2f} ms{note}.")
+    return long
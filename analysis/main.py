@@ -1,77 +1,634 @@
-# 각 모듈에서 필요한 함수들을 import 합니다.
-import data_loader
-import analyzer
-import visualizer
-import os
-import report_generator
-import json
+import time
+
+_STARTED_AT = time.perf_counter()  # 시작 시간 예산(summary_budget_ms) 측정 기준
+
+# 이 모듈은 가벼운 모듈만 import 합니다.
+# pandas / matplotlib / seaborn / jinja2 는 서브커맨드가 실제로 필요로 할 때 함수 안에서 import 하여,
+# pre-push 훅에서 자주 쓰는 'summary' / 'compare' 의 시작 시간을 짧게 유지합니다.
 import argparse
+import ast
+import contextlib
+import json
+import os
+import sys
 
-def main():
+import config
+import data_loader
+import profiler
+from pipeline import Pipeline, Stage
+
+# --- 설정 ---
+SUMMARY_FILE_NAME = 'summary.json'
+CHARTS_DIR_NAME = 'charts'
+FLAME_DIR_NAME = 'flame'
+CHART_CACHE_MANIFEST = '.chart_cache.json'  # visualizer.CACHE_MANIFEST
+REPORT_FILE_NAME = 'report_frame.md'        # report_generator.REPORT_FILE_NAME
+LAYOUT_FILE_NAME = 'layouts.ndjson'         # layout_quality.LAYOUT_FILE_NAME
+MACHINE_FILE_NAME = 'machine.json'          # machine.MACHINE_FILE_NAME
+REPORT_TEMPLATE_PATH = os.path.join(os.path.dirname(__file__), 'templates', 'report_frame.md.j2')
+TRENDS_DIR = os.path.join(os.path.dirname(__file__), 'trends')
+
+# 서브커맨드 → 확인할 파이프라인 단계
+COMMAND_STAGES = {
+    None: ['analyze', 'visualize', 'report'],
+    'summary': ['analyze'],
+    'charts': ['visualize'],
+    'report': ['report'],
+}
+
+
+class PipelineError(Exception):
+    """파이프라인 단계가 더 진행할 수 없을 때 발생합니다."""
+
+
+def run_compare(args) -> int:
     """
-    성능 분석 및 시각화 파이프라인 전체를 실행하는 메인 함수입니다.
+    두 벤치마크 실행을 비교하여 회귀 순위표를 출력합니다.
+    회귀로 판정된 셀이 하나라도 있으면 1을 반환합니다 (pre-push 훅/CI 에서 실패로 처리).
     """
-    parser = argparse.ArgumentParser(description='Run the analysis and visualization pipeline.')
-    parser.add_argument(
-        '--target',
-        type=str,
-        help='Target directory prefix (e.g., \'YYYY-MM-DD\' or \'YYYY-MM-DD_HH-MM-SS\') to analyze specific results.'
-    )
-    args = parser.parse_args()
+    import machine
+    import regression
 
-    print("🚀 Starting Analysis and Visualization Pipeline...")
+    frames, run_dirs = [], []
+    for prefix in (args.baseline, args.candidate):
+        file_path = data_loader.find_benchmark_file(prefix)
+        if not file_path:
+            return 2
+        df = data_loader.load_and_preprocess_data(file_path, normalize=False)
+        if df is None:
+            return 2
+        frames.append(df)
+        run_dirs.append(os.path.dirname(file_path))
 
-    # 1. 데이터 로딩
-    # 'target' 인자를 사용하여 특정 날짜 또는 최신 벤치마크 파일을 찾습니다.
-    benchmark_file_path = data_loader.find_benchmark_file(args.target)
+    # 다른 호스트에서 측정한 실행이면 경고(또는 거부)하고, 두 실행을 같은 기준 점수로 정규화합니다.
+    frames = machine.normalize_together(frames, run_dirs)
+    if frames is None:
+        return 2
+
+    print(f"🔍 Comparing '{args.baseline}' (baseline) → '{args.candidate}' (candidate)...")
+    result = regression.compare_runs(*frames, threshold_pct=args.threshold, alpha=args.alpha)
+    if result.empty:
+        print("Warning: No common (scenario, strategy, key) cells to compare.")
+        return 0
+
+    rounded = result.round({'baseline_mean': 2, 'candidate_mean': 2, 'change_pct': 1,
+                                     'ci_low_pct': 1, 'ci_high_pct': 1, 'p_value': 4})
+    print(rounded.to_string(index=False))
+
+    if args.output:
+        import report_generator
+
+        table = rounded.set_index(['scenario', 'strategy', 'key'])
+        table.index = [' / '.join(ix) for ix in table.index]
+        with open(args.output, 'w', encoding='utf-8') as f:
+            f.write(report_generator.md_table(table) + "\n")
+        print(f"📜 Comparison table saved to: {args.output}")
+
+    if args.flame:
+        import aggregates
+        import visualizer
+
+        # 차분 flame graph: 비교 실행의 호출 트리에 회귀/개선 판정을 색으로 표시
+        baseline_name = os.path.basename(run_dirs[0])
+        flame_dir = os.path.join(run_dirs[1], CHARTS_DIR_NAME, f'flame_diff_{baseline_name}')
+        os.makedirs(flame_dir, exist_ok=True)
+        jobs = visualizer.diff_flame_jobs(aggregates.build_cube(frames[1]), result, baseline_name)
+        visualizer.render_jobs(jobs, flame_dir)
+
+    regressions = result[result['verdict'] == 'regression']
+    if not regressions.empty:
+        print(f"\n❌ {len(regressions)} regression(s) detected.")
+        return 1
+    print("\n✅ No regressions detected.")
+    return 0
+
+
+def run_trend(args) -> int:
+    """
+    --target 에 맞는 여러 실행에 걸쳐 (시나리오, 전략, L1/L2 키)별 시계열을 만들고,
+    trend.csv, 변화점 표(change_points.md), 시계열 차트를 trends/<첫 실행>..<마지막 실행>/ 에 저장합니다.
+    """
+    import trend
+    import visualizer
+    import report_generator
 
+    runs = data_loader.match_run_names(args.target, os.listdir(data_loader.RESULTS_DIR))
+    if len(runs) < 2:
+        print(f"❌ Error: Trend analysis needs at least two runs (matched {len(runs)}).")
+        return 2
+    df = data_loader.load_history_data(runs=runs)
+    if df is None:
+        return 2
+
+    print(f"📈 Building trends across {df['run'].nunique()} runs ({runs[0]} → {runs[-1]})...")
+    result = trend.build_trend(df)
+    output_dir = args.output or os.path.join(TRENDS_DIR, f"{runs[0]}..{runs[-1]}")
+    os.makedirs(os.path.join(output_dir, CHARTS_DIR_NAME), exist_ok=True)
+
+    csv_path = os.path.join(output_dir, 'trend.csv')
+    result.to_csv(csv_path, index=False)
+    print(f"📈 Trend table saved to: {csv_path}")
+
+    points = trend.change_points(result)
+    if points.empty:
+        print("✅ No change points detected.")
+    else:
+        table = points.drop(columns=['timestamp', 'change_point']).set_index('run')
+        print(table.round({'mean': 2, 'median': 2, 'rolling_median': 2, 'change_pct': 1, 'p_value': 4}).to_string())
+        points_path = os.path.join(output_dir, 'change_points.md')
+        with open(points_path, 'w', encoding='utf-8') as f:
+            f.write(report_generator.md_table(table) + "\n")
+        print(f"📜 {len(points)} change point(s) saved to: {points_path}")
+
+    visualizer.render_jobs(visualizer.trend_jobs(result), os.path.join(output_dir, CHARTS_DIR_NAME), force=args.force)
+    return 0
+
+
+def run_trace(args) -> int:
+    """
+    `npm run benchmark -- --trace` 로 기록한 호출 단위 trace 를 분석합니다.
+    측정 키별 호출 횟수와 호출당 p50/p95/p99/max, 가장 느린 개별 호출(엣지)을
+    call_stats.csv / slowest_calls.csv 로 실행 디렉터리에 저장합니다.
+    """
+    import call_trace
+
+    benchmark_file_path = data_loader.find_benchmark_file(args.target)
     if not benchmark_file_path:
-        print("❌ Error: No benchmark result file found.")
-        if not args.target:
-            print("Please run 'npm run benchmark' first to generate data.")
-        return # 데이터 파일이 없으면 실행을 중단합니다.
+        return 2
+    run_dir = os.path.dirname(benchmark_file_path)
+    trace_path = call_trace.find_trace_file(run_dir)
+    if not trace_path:
+        print(f"❌ Error: No trace file in '{os.path.basename(run_dir)}'. Run 'npm run benchmark -- --trace' first.")
+        return 2
+
+    print(f"🔎 Loading trace from: {os.path.basename(trace_path)}")
+    calls = call_trace.load_calls(trace_path)
+    if calls.empty:
+        print("Warning: Trace file has no call events.")
+        return 0
+
+    stats = call_trace.call_stats(calls)
+    print(stats.round(3).to_string(index=False))
+    slowest = call_trace.slowest_calls(calls, args.top)
 
-    # 찾은 파일을 로드하고 데이터프레임으로 전처리합니다.
-    df = data_loader.load_and_preprocess_data(benchmark_file_path)
+    stats_path = os.path.join(run_dir, 'call_stats.csv')
+    slowest_path = os.path.join(run_dir, 'slowest_calls.csv')
+    stats.to_csv(stats_path, index=False)
+    slowest.to_csv(slowest_path, index=False)
+    print(f"🔎 Call statistics saved to: {stats_path}")
+    print(f"🔎 Slowest calls saved to: {slowest_path}")
+    return 0
 
+
+def _print_recommendation(result: dict):
+    """runtime_model.recommend 결과를 전략별 표와 추천 한 줄로 출력합니다."""
+    for c in result['candidates']:
+        steps = ', '.join(f"{step} {ms:.1f}" for step, ms in c['steps'].items())
+        mark = '✅' if c['within_budget'] else '  '
+        quality = f", quality {c['quality']:.2f}" if c['quality'] is not None else ''
+        extrapolated = f" (outside fitted range: {', '.join(c['out_of_range'])})" if c['extrapolated'] else ''
+        print(f"  {mark} {c['strategy']:<18} {c['predicted_ms']:>9.1f} ms (upper {c['upper_ms']:.1f}{quality}) [{steps}]{extrapolated}")
+    if result['time_scale'] != 1.0:
+        print(f"⚖️ Times scaled ×{result['time_scale']:.3f} from the model's reference host to this calibration score.")
+    if result['within_budget']:
+        print(f"🧭 Recommended: {result['strategy']} (within {result['budget_ms']:g} ms)")
+    elif result['strategy'] is None:
+        outside = ', '.join(dict.fromkeys(name for c in result['candidates'] for name in c['out_of_range']))
+        print(f"Warning: The graph is outside the fitted range of every strategy ({outside}); no strategy is recommended. "
+              f"Fit the model on runs whose {outside} covers this graph (e.g. a size sweep) first.")
+    else:
+        print(f"Warning: No strategy is predicted to finish within {result['budget_ms']:g} ms; "
+              f"fastest is {result['strategy']}.")
+
+
+def run_model(args) -> int:
+    """
+    히스토리에서 전략별 런타임 예측 모델 (Total, L1 단계) 을 적합하고, 교차 검증 오차를 출력한 뒤
+    모델 파일을 저장합니다. 히스토리에서 가장 큰 그래프에 대해 예산(model.budget_ms) 안에 드는 전략도 보여줍니다.
+    """
+    import record_stream
+    import runtime_model
+
+    runs = [run for run in data_loader.match_run_names(args.target, os.listdir(data_loader.RESULTS_DIR))
+            if os.path.isdir(os.path.join(data_loader.RESULTS_DIR, run))]
+    if not args.target:
+        # 전략 코드가 바뀌면 이전 실행의 시간은 더 이상 맞지 않으므로, 기본값은 최근 실행만 씁니다.
+        runs = runs[-runtime_model._settings()['recent_runs']:]
+    df = data_loader.load_history_data(runs=runs)
     if df is None:
-        print("❌ Error: Failed to load or process data. Aborting.")
-        return # 데이터 로딩에 실패하면 실행을 중단합니다.
-    
+        return 2
+    wide = record_stream.pivot_wide(df)
+    print(f"🧮 Fitting runtime models on {len(wide)} records from {df['run'].nunique()} runs...")
+    model = runtime_model.fit_model(wide, list(df['run'].cat.categories))
+    if not model['strategies']:
+        print("❌ Error: Need records of at least two graph sizes per strategy to fit a runtime model.")
+        return 2
+
+    table = runtime_model.cv_table(model)
+    print(table.round({'r2': 3, 'cv_mape': 1, 'cv_p90_ape': 1}).to_string(index=False))
+    output = args.output or runtime_model.MODEL_PATH
+    runtime_model.save_model(model, output)
+    print(f"🧮 Runtime model saved to: {output} ({os.path.getsize(output) / 1024:.1f} KiB)")
+
+    sized = runtime_model.feature_frame(wide)
+    largest = sized.loc[sized['nodes'].idxmax()]
+    stats = {name: largest[name] for name in ('nodes', 'edges', 'ports')}
+    print(f"\n🧭 Largest graph in history ({largest['scenario']}: {int(stats['nodes'])} nodes, {int(stats['edges'])} edges):")
+    _print_recommendation(runtime_model.recommend(stats, args.budget, model))
+    return 0
+
+
+def run_recommend(args) -> int:
+    """저장된 런타임 모델로 주어진 그래프 크기와 예산에 맞는 전략을 추천합니다."""
+    import runtime_model
+
+    path = args.model or runtime_model.MODEL_PATH
+    if not os.path.exists(path):
+        print(f"❌ Error: No runtime model at '{path}'. Run 'python main.py model' first.")
+        return 2
+    try:
+        model = runtime_model.load_model(path)
+    except ValueError as e:
+        print(f"❌ Error: {e}. Run 'python main.py model' again.")
+        return 2
+    if args.calibration and not model.get('reference_calibration_ms'):
+        print("Warning: The model was fitted on timings without calibration scores; --calibration is ignored.")
+    stats = {'nodes': args.nodes, 'edges': args.edges, 'ports': args.ports}
+    _print_recommendation(runtime_model.recommend(stats, args.budget, model, args.calibration))
+    return 0
+
+
+def build_pipeline(
+    benchmark_file_path: str,
+    force: bool = False,
+    follow: bool = False,
+    chart_workers: int = None,
+) -> Pipeline:
+    """
+    한 실행 디렉터리에 대한 load → analyze → visualize → report 단계 그래프를 구성합니다.
+    각 단계는 입력 파일, config.yaml, 템플릿, 관련 모듈 소스가 바뀌었을 때만 다시 실행되며,
+    단계에 필요한 모듈은 단계가 실제로 실행될 때 import 됩니다.
+    chart_workers 는 차트 렌더링 프로세스 수입니다 (없으면 config.yaml 의 charts.workers).
+    """
     # 결과물을 저장할 현재 실행의 고유 디렉터리 경로를 가져옴
     output_dir = os.path.dirname(benchmark_file_path)
-    print("\n" + "="*50 + "\n")
+    summary_path = os.path.join(output_dir, SUMMARY_FILE_NAME)
+    charts_dir = os.path.join(output_dir, CHARTS_DIR_NAME)
+    layout_path = os.path.join(output_dir, LAYOUT_FILE_NAME)
+    machine_path = os.path.join(output_dir, MACHINE_FILE_NAME)
+
+    # 1. 데이터 로딩 (메모리 전용: 하위 단계가 다시 실행될 때만 로드합니다)
+    def load(p: Pipeline):
+        df = data_loader.load_and_preprocess_data(benchmark_file_path, follow=follow)
+        if df is None:
+            raise PipelineError("Failed to load or process data.")
+        return df
+
+    # (시나리오, 전략, 측정 경로) 집계 큐브 (메모리 전용: analyze/visualize/report 가 한 번 계산된 값을 공유)
+    def cube(p: Pipeline):
+        with profiler.profiler.section('L2-Cube:Import'):
+            import aggregates
 
-    # 2. 통계 분석 
-    print("📊 Analyzing data...")
-    summary_data = analyzer.analyze_data(df)
-    
-    # 튜플 키를 문자열로 변환
-    if 'overall_summary' in summary_data:
-        summary_data['overall_summary'] = {str(key): value for key, value in summary_data['overall_summary'].items()}
+        return aggregates.build_cube(p.value('load'))
 
-    summary_path = os.path.join(output_dir, 'summary.json')
-    with open(summary_path, 'w') as f:
-        json.dump(summary_data, f, indent=2)
-    print(f"📊 Analysis summary saved to: {summary_path}")
+    # 레코드별 레이아웃 품질 지표 (메모리 전용: layouts.ndjson 이 없는 실행이면 None)
+    def quality(p: Pipeline):
+        if not os.path.exists(layout_path):
+            return None
+        import layout_quality
+
+        print("📐 Computing layout quality metrics...")
+        return layout_quality.load_quality(layout_path)
+
+    # 2. 통계 분석
+    def analyze(p: Pipeline):
+        with profiler.profiler.section('L2-Analyze:Import'):
+            import analyzer
+
+        print("📊 Analyzing data...")
+        summary_data = analyzer.analyze_data(p.value('load'), cube=p.value('cube'), quality=p.value('quality'))
+
+        # 튜플 키를 문자열로 변환
+        if 'overall_summary' in summary_data:
+            summary_data['overall_summary'] = {str(key): value for key, value in summary_data['overall_summary'].items()}
+
+        with profiler.profiler.section('L2-Analyze:Write'), open(summary_path, 'w') as f:
+            json.dump(summary_data, f, indent=2)
+        print(f"📊 Analysis summary saved to: {summary_path}")
+        return summary_data
+
+    def load_summary():
+        with open(summary_path, 'r') as f:
+            return json.load(f)
 
     # 3. 데이터 시각화
-    # visualizer 모듈을 사용해 분석 결과를 차트로 생성하고 파일로 저장합니다.
-    print("🎨 Generating charts...")
-    charts_dir = os.path.join(output_dir, 'charts')
-    os.makedirs(charts_dir, exist_ok=True)
+    def visualize(p: Pipeline):
+        with profiler.profiler.section('L2-Visualize:Import'):
+            import analyzer
+            import flamegraph
+            import visualizer
 
-    visualizer.plot_total_time_comparison(df, charts_dir)
-    visualizer.plot_three_step_breakdown(df, charts_dir)
-    visualizer.plot_routing_breakdown_pie(df, charts_dir)
-    visualizer.plot_three_step_breakdown_pie(df, charts_dir)
-    print("\n" + "="*50 + "\n")
+        print("🎨 Generating charts...")
+        os.makedirs(charts_dir, exist_ok=True)
+        with profiler.profiler.section('L2-Visualize:Sizes'):
+            df = analyzer.attach_scenario_sizes(p.value('load'))
+        # 입력이 바뀌지 않은 차트는 건너뛰고, 나머지는 프로세스 풀에서 병렬로 렌더링합니다.
+        visualizer.render_all_charts(
+            df,
+            charts_dir,
+            scaling=analyzer.scaling_frame(p.value('analyze')),
+            cube=p.value('cube'),
+            workers=chart_workers,
+            force=force,
+            quality=p.value('quality'),
+        )
+        # flamegraph.pl / inferno / speedscope 용 folded stack
+        with profiler.profiler.section('L2-Visualize:Flame'):
+            flamegraph.write_folded(p.value('cube'), os.path.join(output_dir, FLAME_DIR_NAME))
 
     # 4. Markdown 리포트 생성 (리포트 파일 저장)
-    report_generator.save_report_to_markdown(df, summary_data, output_dir)
+    def report(p: Pipeline):
+        with profiler.profiler.section('L2-Report:Import'):
+            import report_generator
+
+        report_generator.save_report_to_markdown(p.value('load'), p.value('analyze'), output_dir, cube=p.value('cube'))
+
+    return Pipeline(output_dir, [
+        Stage('load', load, inputs=[benchmark_file_path, machine_path, config.CONFIG_PATH],
+              modules=['data_loader', 'record_stream', 'columnar', 'history_store', 'machine']),
+        Stage('cube', cube, deps=['load'], inputs=[config.CONFIG_PATH], modules=['aggregates', 'timer_tree']),
+        Stage('quality', quality, inputs=[layout_path], modules=['layout_quality']),
+        Stage('analyze', analyze, deps=['load', 'cube', 'quality'], inputs=[config.CONFIG_PATH],
+              modules=['analyzer', 'robust_stats', 'memory', 'censoring'], outputs=[summary_path], load=load_summary),
+        Stage('visualize', visualize, deps=['load', 'analyze', 'cube', 'quality'], inputs=[config.CONFIG_PATH],
+              modules=['visualizer', 'flamegraph', 'memory', 'censoring'], outputs=[os.path.join(charts_dir, CHART_CACHE_MANIFEST)]),
+        Stage('report', report, deps=['load', 'analyze', 'cube'], inputs=[config.CONFIG_PATH, REPORT_TEMPLATE_PATH],
+              modules=['report_generator'], outputs=[os.path.join(output_dir, REPORT_FILE_NAME)]),
+    ], force=force)
+
+
+def format_summary_table(summary_data: dict) -> str:
+    """
+    summary.json 의 totalTime 요약을 (pandas 없이) 고정폭 텍스트 표로 만듭니다.
+    모든 열은 같은 표본, 즉 warm-up 레코드를 뺀 정상 상태(robust_summary 의 Total)에서 계산한 값입니다.
+    robust_summary 가 없는 (이전) summary.json 이면 overall_summary (전체 레코드) 를 쓰고 CI/p90 은 비워 둡니다.
+    """
+    header = ['Scenario', 'Strategy', 'N', 'Mean (ms)', 'Std (ms)', 'Min (ms)', 'Max (ms)', '95% CI (ms)', 'p90 (ms)',
+              'Warm-up excluded']
+    robust = summary_data.get('robust_summary', {})
+    rows = []
+    for key, overall in summary_data.get('overall_summary', {}).items():
+        scenario, strategy = ast.literal_eval(key)
+        total = robust.get(scenario, {}).get(strategy, {}).get('Total')
+        stats = total if total and 'std' in total else {**overall, 'n': None, 'n_excluded': None}
+        ci = (
+            f"{stats['mean_ci_low']:.2f}..{stats['mean_ci_high']:.2f}"
+            if stats.get('mean_ci_low') is not None else '-'
+        )
+        rows.append([scenario, strategy, '-' if stats.get('n') is None else str(stats['n'])] + [
+            '-' if stats.get(stat) is None else f"{stats[stat]:.2f}"
+            for stat in ('mean', 'std', 'min', 'max')
+        ] + [
+            ci,
+            '-' if stats.get('p90') is None else f"{stats['p90']:.2f}",
+            '-' if stats.get('n_excluded') is None else str(stats['n_excluded']),
+        ])
+
+    widths = [max(len(row[i]) for row in [header] + rows) for i in range(len(header))]
+    lines = []
+    for row in [header] + rows:
+        cells = [cell.ljust(width) if i < 2 else cell.rjust(width) for i, (cell, width) in enumerate(zip(row, widths))]
+        lines.append('  '.join(cells))
+    lines.insert(1, '  '.join('-' * width for width in widths))
+    return '\n'.join(lines)
+
+
+def run_pipeline(
+    benchmark_file_path: str,
+    command: str = None,
+    force: bool = False,
+    follow: bool = False,
+    profile: dict = None,
+    chart_workers: int = None,
+) -> int:
+    """
+    한 실행 디렉터리에 대해 서브커맨드에 필요한 단계 중 오래된(stale) 단계만 다시 실행합니다.
+    'summary' 는 summary.json 이 최신이면 pandas 를 import 하지 않고 바로 표를 출력합니다.
+    profile 이 주어지면 (profiler.session 의 cprofile/memory 옵션) 단계별 시간을 <run>/profile/ 에 기록합니다.
+    """
+    output_dir = os.path.dirname(benchmark_file_path)
+    run_name = os.path.basename(output_dir)
+    print(f"🚀 Starting Analysis and Visualization Pipeline for '{run_name}'...")
+    pipeline = build_pipeline(benchmark_file_path, force=force, follow=follow, chart_workers=chart_workers)
+    session = (
+        profiler.session(os.path.join(output_dir, profiler.PROFILE_DIR_NAME), command or 'all', **profile)
+        if profile is not None else contextlib.nullcontext({})
+    )
+    try:
+        with session as record:
+            executed = pipeline.run(COMMAND_STAGES[command])
+            if command == 'summary':
+                print(format_summary_table(pipeline.value('analyze')))
+            df = pipeline.cached('load')
+            if df is not None:
+                # 분석기의 입력 크기: 벤치마크 레코드 수(nodes)와 컬럼 수(edges). 여러 실행의 프로파일로 scaling 을 봅니다.
+                record.update(nodes=len(df), edges=len(df.columns))
+    except PipelineError as e:
+        print(f"❌ Error: {e} Aborting.")
+        return 1
+
+    if executed:
+        print(f"\n✅ Pipeline finished successfully! (rebuilt: {', '.join(executed)})")
+    else:
+        print("\n✅ Everything is up to date.")
+    return 0
+
+
+def run_profile(args) -> int:
+    """
+    --profile 로 쌓인 results/<run>/profile/pipeline_profile.json 을 벤치마크 결과처럼 분석합니다.
+    요약/차트/리포트는 같은 profile 디렉터리에 생성됩니다.
+    """
+    benchmark_file_path = data_loader.find_benchmark_file(args.target)
+    if benchmark_file_path is None:
+        return 1
+    profile_dir = os.path.join(os.path.dirname(benchmark_file_path), profiler.PROFILE_DIR_NAME)
+    profile_path = os.path.join(profile_dir, profiler.PROFILE_FILE_NAME)
+    if not os.path.exists(profile_path):
+        print(f"❌ Error: No pipeline profile at '{profile_path}'. Run 'python main.py --profile' first.")
+        return 1
+    return run_pipeline(profile_path, force=args.force)
+
+
+def _profile_settings(args) -> dict:
+    """--profile / --cprofile / --tracemalloc 인자를 profiler.session 옵션으로 바꿉니다. 프로파일링하지 않으면 None."""
+    cprofile, memory = getattr(args, 'cprofile', False), getattr(args, 'tracemalloc', False)
+    if not (getattr(args, 'profile', False) or cprofile or memory):
+        return None
+    cfg = config.load_config().get('profile', {})
+    return {'cprofile': cprofile or cfg.get('cprofile', False), 'memory': memory or cfg.get('tracemalloc', False)}
+
+
+def _add_run_arguments(parser: argparse.ArgumentParser, defaults: bool = True):
+    """
+    파이프라인 옵션을 추가합니다. 서브커맨드 파서에서는 기본값을 넣지 않아(SUPPRESS),
+    `main.py --target X summary` 처럼 서브커맨드 앞에 준 값을 덮어쓰지 않게 합니다.
+    """
+    default = {} if defaults else {'default': argparse.SUPPRESS}
+    parser.add_argument(
+        '--target',
+        type=str,
+        help='Target directory prefix (e.g., \'YYYY-MM-DD\' or \'YYYY-MM-DD_HH-MM-SS\'), range (\'A..B\') or glob (\'2025-10-1*\') to analyze specific results.',
+        **default
+    )
+    parser.add_argument(
+        '--follow',
+        action='store_true',
+        help='Keep reading a benchmark file that is still being written until no new records arrive.',
+        **default
+    )
+    parser.add_argument(
+        '--force',
+        action='store_true',
+        help='Re-run the selected pipeline stages (and re-render every chart) even if their inputs are unchanged.',
+        **default
+    )
+    parser.add_argument(
+        '--all',
+        action='store_true',
+        help='Run the pipeline for every run directory under results/ (only stale stages are rebuilt).',
+        **default
+    )
+    parser.add_argument(
+        '--chart-workers',
+        type=int,
+        help='Number of chart rendering processes (default: charts.workers in config.yaml, or the CPU count).',
+        **default
+    )
+    parser.add_argument(
+        '--profile',
+        action='store_true',
+        help='Time every pipeline stage and sub-step (L{level}-{path} keys) into results/<run>/profile/pipeline_profile.json.',
+        **default
+    )
+    parser.add_argument(
+        '--cprofile',
+        action='store_true',
+        help='With --profile: also save cProfile stats and the top functions by cumulative time.',
+        **default
+    )
+    parser.add_argument(
+        '--tracemalloc',
+        action='store_true',
+        help='With --profile: also record per-key heapDelta/peakHeap with tracemalloc and the top allocation sites.',
+        **default
+    )
+
+
+def main():
+    """
+    성능 분석 및 시각화 파이프라인 전체를 실행하는 메인 함수입니다.
+    """
+    parser = argparse.ArgumentParser(description='Run the analysis and visualization pipeline.')
+    _add_run_arguments(parser)
+    subparsers = parser.add_subparsers(dest='command')
+    for name, help_text in [
+        ('summary', 'Print the overall summary table (fast path: no plotting/templating imports).'),
+        ('charts', 'Render charts only.'),
+        ('report', 'Generate the markdown report only.'),
+    ]:
+        _add_run_arguments(subparsers.add_parser(name, help=help_text), defaults=False)
+    compare_parser = subparsers.add_parser('compare', help='Flag performance regressions between two runs.')
+    compare_parser.add_argument('baseline', help='Run directory prefix of the baseline run.')
+    compare_parser.add_argument('candidate', help='Run directory prefix of the candidate run.')
+    compare_parser.add_argument('--threshold', type=float, help='Minimum mean increase (%%) to count as a regression.')
+    compare_parser.add_argument('--alpha', type=float, help='Significance level of the Mann-Whitney U test.')
+    compare_parser.add_argument('--output', type=str, help='Write the ranked diff table as markdown to this path.')
+    compare_parser.add_argument('--flame', action='store_true', help='Render differential flame graphs (regressions in red) into the candidate run.')
+    trend_parser = subparsers.add_parser('trend', help='Time series with rolling median and change points across runs.')
+    trend_parser.add_argument('--target', type=str, help='Runs to include: range (\'2025-10-09..2025-10-14\'), glob (\'2025-10-1*\') or prefix. Default: all runs.')
+    trend_parser.add_argument('--output', type=str, help='Output directory (default: trends/<first>..<last>).')
+    trend_parser.add_argument('--force', action='store_true', help='Re-render every trend chart.')
+    trace_parser = subparsers.add_parser('trace', help='Call counts, per-call latency percentiles and slowest edges from a --trace run.')
+    trace_parser.add_argument('--target', type=str, help='Target directory prefix (default: latest run).')
+    trace_parser.add_argument('--top', type=int, help='Number of slowest calls to keep per key.')
+    profile_parser = subparsers.add_parser('profile', help='Analyze the pipeline_profile.json recorded with --profile like a benchmark run.')
+    profile_parser.add_argument('--target', type=str, help='Target directory prefix (default: latest run).')
+    profile_parser.add_argument('--force', action='store_true', help='Re-run every stage of the profile analysis.')
+    watch_parser = subparsers.add_parser('watch', help='Watch results/ and analyze new or changed runs once their files are complete.')
+    watch_parser.add_argument('--workers', type=int, help='Runs analyzed at the same time (default: watch.workers).')
+    watch_parser.add_argument('--debounce', type=float, help='Seconds a result file must stay unchanged before analysis (default: watch.debounce_s).')
+    watch_parser.add_argument('--polling', action='store_true', help='Poll the directory instead of using inotify.')
+    watch_parser.add_argument('--once', action='store_true', help='Analyze the runs that are stale now, then exit.')
+    model_parser = subparsers.add_parser('model', help='Fit per-strategy runtime models (Total and L1 steps) from history and report cross-validated error.')
+    model_parser.add_argument('--target', type=str, help='Runs to fit on: range, glob or prefix (default: the latest model.recent_runs runs).')
+    model_parser.add_argument('--output', type=str, help='Model file path (default: models/runtime_model.json).')
+    model_parser.add_argument('--budget', type=float, help='Time budget in ms for the largest-graph check (default: model.budget_ms).')
+    recommend_parser = subparsers.add_parser('recommend', help='Predict runtimes and recommend a strategy for a graph size and time budget.')
+    recommend_parser.add_argument('--nodes', type=int, required=True, help='Number of nodes.')
+    recommend_parser.add_argument('--edges', type=int, required=True, help='Number of edges.')
+    recommend_parser.add_argument('--ports', type=int, help='Port candidates (default: nodes x 4 x model.ports_per_side).')
+    recommend_parser.add_argument('--budget', type=float, help='Time budget in ms (default: model.budget_ms).')
+    recommend_parser.add_argument('--calibration', type=float,
+                                  help="Calibration score (calibrationMs in a run's machine.json) of the host the layout runs on. "
+                                       "Default: times of the model's reference host.")
+    recommend_parser.add_argument('--model', type=str, help='Model file path (default: models/runtime_model.json).')
+    serve_parser = subparsers.add_parser('serve', help='Serve cached summary / breakdown / diff queries over local HTTP (JSON).')
+    serve_parser.add_argument('--host', type=str, help='Address to bind (default: serve.host).')
+    serve_parser.add_argument('--port', type=int, help='Port to listen on (default: serve.port).')
+    args = parser.parse_args()
+
+    if args.command == 'compare':
+        return run_compare(args)
+    if args.command == 'trend':
+        return run_trend(args)
+    if args.command == 'trace':
+        return run_trace(args)
+    if args.command == 'profile':
+        return run_profile(args)
+    if args.command == 'watch':
+        import watcher
+
+        return watcher.watch(workers=args.workers, debounce_s=args.debounce, polling=args.polling, once=args.once)
+    if args.command == 'model':
+        return run_model(args)
+    if args.command == 'recommend':
+        return run_recommend(args)
+    if args.command == 'serve':
+        import server
+
+        return server.serve(host=args.host, port=args.port)
+
+    if args.all:
+        benchmark_files = data_loader.list_benchmark_files()
+    elif data_loader.is_run_pattern(args.target):
+        # 범위('A..B') 또는 glob 이면 맞는 모든 실행을 처리합니다.
+        benchmark_files = data_loader.list_benchmark_files(args.target)
+    else:
+        # 'target' 인자를 사용하여 특정 날짜 또는 최신 벤치마크 파일을 찾습니다.
+        benchmark_file_path = data_loader.find_benchmark_file(args.target)
+        benchmark_files = [benchmark_file_path] if benchmark_file_path else []
+
+    if not benchmark_files:
+        print("❌ Error: No benchmark result file found.")
+        if not args.target:
+            print("Please run 'npm run benchmark' first to generate data.")
+        return # 데이터 파일이 없으면 실행을 중단합니다.
+
+    for benchmark_file_path in benchmark_files:
+        status = run_pipeline(benchmark_file_path, args.command, force=args.force, follow=args.follow,
+                              profile=_profile_settings(args), chart_workers=args.chart_workers)
+        if status:
+            return status
+
+    if args.command == 'summary':
+        elapsed_ms = (time.perf_counter() - _STARTED_AT) * 1000
+        budget_ms = config.load_config().get('cli', {}).get('summary_budget_ms')
+        print(f"⏱️ summary finished in {elapsed_ms:.0f} ms" + (f" (budget {budget_ms} ms)" if budget_ms else ""))
+        if budget_ms and elapsed_ms > budget_ms:
+            print("Warning: startup budget exceeded.")
 
-    print("\n✅ Pipeline finished successfully!")
 
 if __name__ == '__main__':
     # 이 스크립트가 직접 실행될 때 main() 함수를 호출합니다.
-    main()
\ No newline at end of file
+    sys.exit(main())
\ No newline at end of file
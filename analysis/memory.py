@@ -0,0 +1,139 @@
+import numpy as np
+import pandas as pd
+
+import timer_tree
+from config import load_config
+from record_stream import MEMORY_SEPARATOR, memory_metrics
+
+# --- 설정 ---
+# run-benchmark.ts 가 레코드마다 남기는 측정 항목별 힙 사용량(heapDelta, peakHeap)을 분석합니다.
+# 키는 시간 측정과 같은 L{level}-{path} 규칙을 따르므로 같은 호출 트리 경로로 모입니다.
+# 'totalTime' 키는 레코드 전체(트리의 루트)입니다.
+BYTES_PER_MB = 1024 * 1024
+index_columns = ['scenario', 'strategy', 'path']
+
+
+def memory_columns(df: pd.DataFrame) -> list:
+    """DataFrame 에서 '<metric>@<key>' 형태의 힙 사용량 컬럼만 골라냅니다."""
+    return [col for col in df.columns if MEMORY_SEPARATOR in col]
+
+
+def has_memory(df: pd.DataFrame) -> bool:
+    """힙 사용량이 기록된 실행인지 확인합니다 (2025-10 이전 실행에는 없음)."""
+    return bool(memory_columns(df)) and df[memory_columns(df)].notna().any().any()
+
+
+def to_long(df: pd.DataFrame, levels_cfg: dict = None) -> pd.DataFrame:
+    """
+    힙 사용량 컬럼을 (record, metric, key, level, path, parent, bytes) long 테이블로 변환합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+        levels_cfg (dict): config.yaml 의 'levels' 섹션.
+
+    Returns:
+        pd.DataFrame: 기록되지 않은(NaN) 값이 제거된 long 형태의 데이터프레임.
+    """
+    ids = [c for c in ['scenario', 'seed', 'strategy', 'nodes', 'edges'] if c in df.columns]
+    columns = memory_columns(df)
+    frame = df[ids + columns].reset_index(drop=True)
+    frame['record'] = np.arange(len(frame))
+    long = frame.melt(id_vars=ids + ['record'], value_vars=columns, var_name='column', value_name='bytes')
+    long = long.dropna(subset=['bytes'])
+    long[['metric', 'key']] = long.pop('column').str.split(MEMORY_SEPARATOR, n=1, expand=True)
+
+    keys = [key for key in long['key'].unique() if key != 'totalTime']
+    meta = timer_tree.parse_timer_keys(keys, levels_cfg)
+    meta.loc['totalTime'] = {'level': 0, 'path': timer_tree.ROOT_PATH, 'parent': None}
+    return long.join(meta, on='key')
+
+
+def memory_cube(df: pd.DataFrame) -> pd.DataFrame:
+    """
+    (시나리오, 전략, 측정 경로)별 힙 사용량 통계 (MB).
+
+    Returns:
+        pd.DataFrame: (scenario, strategy, path) 인덱스와 level, heap_delta_mb(평균), peak_heap_mb(평균),
+                      peak_heap_max_mb(최대) 컬럼. 힙 사용량이 없는 실행이면 빈 DataFrame.
+                      시나리오/전략은 데이터에 처음 등장한 순서, 셀 안에서는 level 순서입니다.
+    """
+    if not has_memory(df):
+        return pd.DataFrame()
+    long = to_long(df)
+    long['mb'] = long['bytes'] / BYTES_PER_MB
+    grouped = long.groupby(index_columns + ['metric'], sort=False)['mb']
+    stats = grouped.agg(['mean', 'max']).unstack('metric')
+
+    cube = pd.DataFrame(index=stats.index)
+    cube['level'] = long.groupby(index_columns, sort=False)['level'].first()
+    if ('mean', 'heapDelta') in stats.columns:
+        cube['heap_delta_mb'] = stats[('mean', 'heapDelta')]
+    if ('mean', 'peakHeap') in stats.columns:
+        cube['peak_heap_mb'] = stats[('mean', 'peakHeap')]
+        cube['peak_heap_max_mb'] = stats[('max', 'peakHeap')]
+
+    order = np.lexsort([
+        cube['level'].to_numpy(),
+        cube.index.get_level_values('strategy').map(_rank(df['strategy'])).to_numpy(),
+        cube.index.get_level_values('scenario').map(_rank(df['scenario'])).to_numpy(),
+    ])
+    return cube.iloc[order]
+
+
+def fit_memory_scaling(df: pd.DataFrame, metric: str = 'peakHeap') -> pd.DataFrame:
+    """
+    전략/측정 경로별로 힙 사용량이 그래프 크기에 따라 어떻게 늘어나는지 적합합니다.
+    - bytes_per_node / bytes_per_edge : bytes = a + b·size 의 기울기 (노드/엣지 하나가 늘 때 추가되는 힙)
+    - exponent : log(bytes) = a + b·log(nodes) 의 기울기 (선형보다 빨리 늘어나는 모듈 찾기)
+    - predicted_mb@{N} : 거듭제곱 적합으로 외삽한 N 노드에서의 예상 힙 (워커 메모리 크기 산정용)
+
+    Args:
+        df (pd.DataFrame): 시나리오 크기가 붙은 벤치마크 데이터프레임 (analyzer.attach_scenario_sizes).
+        metric (str): 적합할 지표 (memory_metrics 중 하나, 기본값은 peakHeap).
+
+    Returns:
+        pd.DataFrame: strategy, key, bytes_per_node, bytes_per_edge, exponent, r2, n, predicted_mb@{N} 컬럼.
+                      크기가 2종류 미만인 셀은 제외됩니다.
+    """
+    if metric not in memory_metrics:
+        raise ValueError(f"Unknown memory metric '{metric}' (expected one of {memory_metrics})")
+    if not has_memory(df) or 'nodes' not in df.columns:
+        return pd.DataFrame()
+    targets = load_config().get('memory', {}).get(
+        'extrapolate_nodes', load_config().get('scaling', {}).get('extrapolate_nodes', [1000, 5000])
+    )
+
+    long = to_long(df)
+    long = long[(long['metric'] == metric) & long['nodes'].notna()]
+    rows = []
+    for (strategy, path), group in long.groupby(['strategy', 'path'], sort=True):
+        nodes = group['nodes'].to_numpy(float)
+        if np.unique(nodes).size < 2:
+            continue
+        bytes_ = group['bytes'].to_numpy(float)
+        row = {
+            'strategy': strategy,
+            'key': path,
+            'bytes_per_node': float(np.polyfit(nodes, bytes_, 1)[0]),
+            'bytes_per_edge': float(np.polyfit(group['edges'].to_numpy(float), bytes_, 1)[0])
+                              if 'edges' in group and group['edges'].notna().all() else np.nan,
+            'exponent': np.nan,
+            'r2': np.nan,
+            'n': len(group),
+        }
+        positive = bytes_ > 0
+        if np.unique(nodes[positive]).size >= 2:
+            x, y = np.log(nodes[positive]), np.log(bytes_[positive])
+            slope, intercept = np.polyfit(x, y, 1)
+            residual = y - (intercept + slope * x)
+            total = ((y - y.mean()) ** 2).sum()
+            row['exponent'] = float(slope)
+            row['r2'] = float(1 - (residual ** 2).sum() / total) if total > 0 else np.nan
+            for n_nodes in targets:
+                row[f'predicted_mb@{n_nodes}'] = float(np.exp(intercept + slope * np.log(n_nodes))) / BYTES_PER_MB
+        rows.append(row)
+    return pd.DataFrame(rows)
+
+
+def _rank(values: pd.Series) -> dict:
+    return {value: i for i, value in enumerate(pd.unique(values))}
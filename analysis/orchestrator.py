@@ -0,0 +1,354 @@
+import argparse
+import heapq
+import json
+import os
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import config
+import data_loader
+import history_store
+import machine
+import record_stream
+
+# --- 설정 ---
+# run-benchmark.ts 의 (시나리오 × 시드 × 전략) 행렬을 N 개의 Node 프로세스로 나눠 병렬 실행하고,
+# 샤드 결과를 하나의 raw_results.json 으로 합칩니다 (data_loader 가 그대로 읽는 형식).
+# - 분할 : 이전 실행의 평균 totalTime 을 비용으로 보고, 큰 칸부터 가장 한가한 샤드에 배정 (LPT)
+# - 고정 : 샤드마다 서로 겹치지 않는 CPU 코어 집합에 고정 (Linux, sched_setaffinity)
+# - 병합 : 모든 샤드가 성공했을 때만, 행렬 순서로 정렬해 임시 파일에 쓰고 os.replace 로 교체
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+RUN_TIME_FORMAT = '%Y-%m-%d_%H-%M-%S'  # run-benchmark.ts 의 결과 디렉터리 이름 형식
+SHARDS_DIR_NAME = 'shards'
+RAW_FILE_NAME = 'raw_results.json'
+CASES_FILE_NAME = 'cases.json'
+LOG_FILE_NAME = 'benchmark.log'
+LAYOUT_FILE_NAME = 'layouts.ndjson'  # layout_quality.LAYOUT_FILE_NAME (레코드별 최종 레이아웃)
+PROGRESS_INTERVAL = 5.0  # 진행 상황을 출력하는 간격 (초)
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('orchestrator', {})
+    return {
+        'command': cfg.get('command', ['npx', 'tsx', 'scripts/run-benchmark.ts']),
+        'shards': cfg.get('shards'),
+        'warmup': cfg.get('warmup', True),
+        'pin_cores': cfg.get('pin_cores', True),
+    }
+
+
+def list_cases(command: list) -> list:
+    """
+    run-benchmark.ts --list 로 전체 벤치마크 행렬을 가져옵니다 (SCENARIOS/SEEDS/STRATEGIES 의 단일 출처).
+
+    Returns:
+        list: index, scenario, nodes, edges, groups, seed, strategy 키를 가진 dict 목록 (행렬 순서).
+    """
+    completed = subprocess.run(command + ['--list'], cwd=REPO_ROOT, capture_output=True, text=True, check=True)
+    # tsx 가 경고를 먼저 출력할 수 있으므로 마지막 JSON 줄만 읽습니다.
+    lines = [line for line in completed.stdout.splitlines() if line.startswith('[')]
+    return json.loads(lines[-1])
+
+
+def estimate_costs(cases: list, reference_path: Optional[str] = None) -> list:
+    """
+    칸마다 예상 실행 시간(ms)을 추정합니다.
+    이전 실행(reference_path)에 같은 (시나리오, 전략)이 있으면 그 평균 totalTime 을 쓰고,
+    없으면 같은 전략의 다른 시나리오 평균을 노드 수의 제곱으로 환산합니다. 그것도 없으면 nodes².
+
+    Args:
+        cases (list): list_cases 결과.
+        reference_path (Optional[str]): 비용 추정에 쓸 이전 실행의 결과 파일. 없으면 균등하게 nodes².
+
+    Returns:
+        list: cases 와 같은 순서의 예상 비용 목록.
+    """
+    means, sizes = {}, {}
+    if reference_path:
+        sums = {}
+        for record in record_stream.iter_records(reference_path):
+            key = (record.get('scenario'), record.get('strategy'))
+            total, count = sums.get(key, (0.0, 0))
+            sums[key] = (total + (record.get('totalTime') or 0.0), count + 1)
+        means = {key: total / count for key, (total, count) in sums.items() if count}
+    for case in cases:
+        sizes[case['scenario']] = case['nodes']
+
+    costs = []
+    for case in cases:
+        known = means.get((case['scenario'], case['strategy']))
+        if known is None:
+            scaled = [
+                mean * (case['nodes'] / sizes[scenario]) ** 2
+                for (scenario, strategy), mean in means.items()
+                if strategy == case['strategy'] and scenario in sizes
+            ]
+            known = sum(scaled) / len(scaled) if scaled else float(case['nodes'] ** 2)
+        costs.append(known)
+    return costs
+
+
+def plan_shards(cases: list, costs: list, n_shards: int) -> list:
+    """
+    LPT(longest processing time first) 로 칸들을 샤드에 배정합니다.
+    가장 비싼 칸부터, 지금까지 예상 부하가 가장 작은 샤드에 넣습니다 (최적의 4/3 배 이내).
+
+    Returns:
+        list: 샤드별 {'cases': [case index...] (행렬 순서), 'cost': 예상 비용} 목록.
+    """
+    n_shards = max(1, min(n_shards, len(cases)))
+    shards = [{'cases': [], 'cost': 0.0} for _ in range(n_shards)]
+    loads = [(0.0, i) for i in range(n_shards)]
+    for case, cost in sorted(zip(cases, costs), key=lambda item: -item[1]):
+        load, i = heapq.heappop(loads)
+        shards[i]['cases'].append(case['index'])
+        shards[i]['cost'] += cost
+        heapq.heappush(loads, (load + cost, i))
+    for shard in shards:
+        shard['cases'].sort()  # 같은 (시나리오, 시드) 칸이 이어지도록 (기준 그래프 재사용)
+    return shards
+
+
+def core_sets(n_shards: int) -> list:
+    """사용 가능한 CPU 코어를 샤드 수만큼 겹치지 않는 연속 집합으로 나눕니다."""
+    if hasattr(os, 'sched_getaffinity'):
+        cores = sorted(os.sched_getaffinity(0))
+    else:
+        cores = list(range(os.cpu_count() or 1))
+    if n_shards >= len(cores):
+        return [{cores[i % len(cores)]} for i in range(n_shards)]
+    size, extra = divmod(len(cores), n_shards)
+    sets, start = [], 0
+    for i in range(n_shards):
+        end = start + size + (1 if i < extra else 0)
+        sets.append(set(cores[start:end]))
+        start = end
+    return sets
+
+
+def count_lines(path: str) -> int:
+    if not os.path.exists(path):
+        return 0
+    with open(path, 'rb') as f:
+        return sum(1 for _ in f)
+
+
+def run_shards(
+    shards: list,
+    run_dir: str,
+    command: list,
+    extra_args: list = (),
+    warmup: bool = True,
+    pin_cores: bool = True,
+) -> list:
+    """
+    샤드마다 Node 프로세스 하나를 띄우고 모두 끝날 때까지 기다립니다.
+    각 샤드는 <run_dir>/shards/shard-<i>/ 에 cases.json, benchmark.log, raw_results.json 을 남깁니다.
+
+    Returns:
+        list: 샤드별 (디렉터리, 종료 코드) 목록.
+    """
+    can_pin = pin_cores and hasattr(os, 'sched_setaffinity')
+    cores = core_sets(len(shards))
+    procs = []
+    for i, shard in enumerate(shards):
+        shard_dir = os.path.join(run_dir, SHARDS_DIR_NAME, f'shard-{i}')
+        os.makedirs(shard_dir, exist_ok=True)
+        cases_path = os.path.join(shard_dir, CASES_FILE_NAME)
+        with open(cases_path, 'w') as f:
+            json.dump(shard['cases'], f)
+
+        args = command + [f'--cases={cases_path}', f'--out={shard_dir}'] + ([] if warmup else ['--no-warmup']) + list(extra_args)
+        log = open(os.path.join(shard_dir, LOG_FILE_NAME), 'w')
+        preexec = (lambda cpus=cores[i]: os.sched_setaffinity(0, cpus)) if can_pin else None
+        proc = subprocess.Popen(args, cwd=REPO_ROOT, stdout=log, stderr=subprocess.STDOUT, preexec_fn=preexec)
+        pinned = f" on cores {sorted(cores[i])}" if can_pin else ""
+        print(f"🧩 Shard {i}: {len(shard['cases'])} cases, est. {shard['cost'] / 1000:.1f}s{pinned} (pid {proc.pid})")
+        procs.append((shard_dir, proc, log))
+
+    total = sum(len(shard['cases']) for shard in shards)
+    last_report = time.monotonic()
+    while any(proc.poll() is None for _, proc, _ in procs):
+        time.sleep(0.2)
+        if time.monotonic() - last_report >= PROGRESS_INTERVAL:
+            done = sum(count_lines(os.path.join(d, 'raw_results.ndjson')) for d, _, _ in procs)
+            print(f"⏳ {done}/{total} cases finished")
+            last_report = time.monotonic()
+
+    results = []
+    for shard_dir, proc, log in procs:
+        log.close()
+        results.append((shard_dir, proc.returncode))
+    return results
+
+
+def merge_shards(cases: list, shard_dirs: list, output_path: str) -> int:
+    """
+    샤드 결과를 행렬 순서로 정렬해 하나의 JSON 배열로 씁니다.
+    임시 파일에 다 쓴 뒤 os.replace 로 바꾸므로, 읽는 쪽은 이전 파일 또는 완성된 파일만 보게 됩니다.
+    각 레코드에는 어느 샤드(프로세스)에서 측정했는지 'shard' 필드가 붙습니다.
+    샤드의 layouts.ndjson 도 합치며, 레이아웃의 레코드 번호를 합친 파일의 번호로 바꿉니다.
+
+    Returns:
+        int: 합친 레코드 수.
+    """
+    order = {(case['scenario'], case['seed'], case['strategy']): case['index'] for case in cases}
+    records, origins = [], []
+    for i, shard_dir in enumerate(shard_dirs):
+        path = history_store.find_raw_file(shard_dir)
+        if path is None:
+            raise FileNotFoundError(f"No benchmark results in '{shard_dir}'")
+        for j, record in enumerate(record_stream.iter_records(path)):
+            records.append({**record, 'shard': i})
+            origins.append((i, j))
+    ranks = sorted(range(len(records)), key=lambda k: order.get(
+        (records[k]['scenario'], records[k]['seed'], records[k]['strategy']), len(order)))
+    write_records([records[k] for k in ranks], output_path)
+    renumber = [{} for _ in shard_dirs]
+    for merged, k in enumerate(ranks):
+        shard, local = origins[k]
+        renumber[shard][local] = merged
+    merge_layouts(shard_dirs, renumber, os.path.join(os.path.dirname(output_path), LAYOUT_FILE_NAME))
+    return len(records)
+
+
+def merge_layouts(dirs: list, renumber: list, output_path: str) -> int:
+    """
+    하위 프로세스 디렉터리들의 layouts.ndjson 을 순서대로 이어 붙이면서 (없는 파일은 건너뜀, 임시 파일에 쓴 뒤 교체), 레이아웃마다 붙은 레코드 번호
+    (그 프로세스의 raw_results 에서의 순서) 를 합친 raw_results 에서의 순서로 바꿉니다.
+    번호가 없는 (이전) 레이아웃은 그대로 씁니다.
+
+    Args:
+        dirs (list): 하위 프로세스 디렉터리.
+        renumber (list): 디렉터리마다 프로세스 안의 번호 → 합친 번호. int 이면 더할 값 (이어 붙인 레코드의 시작 번호).
+        output_path (str): 합친 layouts.ndjson 경로.
+
+    Returns:
+        int: 합친 레이아웃 수. 이어 붙일 파일이 하나도 없으면 0 이고 출력 파일을 만들지 않습니다.
+    """
+    parts = [(os.path.join(d, LAYOUT_FILE_NAME), mapping) for d, mapping in zip(dirs, renumber)]
+    parts = [(path, mapping) for path, mapping in parts if os.path.exists(path)]
+    if not parts:
+        return 0
+    n_lines = 0
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w') as out:
+        for path, mapping in parts:
+            for layout in record_stream.iter_records(path):
+                if 'record' in layout:
+                    local = layout['record']
+                    layout['record'] = local + mapping if isinstance(mapping, int) else mapping.get(local, local)
+                out.write(json.dumps(layout, separators=(',', ':')) + '\n')
+                n_lines += 1
+        out.flush()
+        os.fsync(out.fileno())
+    os.replace(tmp_path, output_path)
+    return n_lines
+
+
+def write_records(records: list, output_path: str):
+    """레코드 목록을 JSON 배열로 임시 파일에 다 쓴 뒤 os.replace 로 교체합니다 (읽는 쪽은 완성된 파일만 봄)."""
+    tmp_path = output_path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(records, f, indent=2)
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, output_path)
+
+
+def run_sharded(
+    n_shards: Optional[int] = None,
+    reference: Optional[str] = None,
+    extra_args: list = (),
+    warmup: Optional[bool] = None,
+    pin_cores: Optional[bool] = None,
+) -> Optional[str]:
+    """
+    행렬 조회 → 비용 추정 → 샤드 배정 → 병렬 실행 → 병합을 수행합니다.
+
+    Args:
+        n_shards (Optional[int]): 샤드(프로세스) 수. 기본값은 config.yaml 의 orchestrator.shards, 없으면 CPU 수.
+        reference (Optional[str]): 비용 추정에 쓸 이전 실행의 접두사. 없으면 가장 최근 실행.
+        extra_args (list): run-benchmark.ts 에 그대로 넘길 인자 (예: ['--no-layout']).
+        warmup (Optional[bool]): 샤드마다 측정 전에 JIT warm-up 을 할지 여부.
+        pin_cores (Optional[bool]): 샤드를 CPU 코어에 고정할지 여부.
+
+    Returns:
+        Optional[str]: 합쳐진 raw_results.json 경로. 샤드가 하나라도 실패하면 None.
+    """
+    settings = _settings()
+    command = list(settings['command'])
+    n_shards = n_shards or settings['shards'] or os.cpu_count() or 1
+    warmup = settings['warmup'] if warmup is None else warmup
+    pin_cores = settings['pin_cores'] if pin_cores is None else pin_cores
+
+    try:
+        cases = list_cases(command)
+    except (OSError, subprocess.CalledProcessError, ValueError, IndexError) as e:
+        print(f"❌ Error: Could not list benchmark cases with '{' '.join(command)} --list': {e}")
+        return None
+    reference_path = data_loader.find_benchmark_file(reference)
+    costs = estimate_costs(cases, reference_path)
+    shards = plan_shards(cases, costs, n_shards)
+    estimate = max(shard['cost'] for shard in shards)
+    print(f"🚀 Running {len(cases)} cases in {len(shards)} shards "
+          f"(est. {estimate / 1000:.1f}s vs {sum(costs) / 1000:.1f}s serial)")
+
+    run_dir = os.path.join(data_loader.RESULTS_DIR, time.strftime(RUN_TIME_FORMAT))
+    os.makedirs(run_dir, exist_ok=True)
+    started = time.monotonic()
+    results = run_shards(shards, run_dir, command, extra_args, warmup=warmup, pin_cores=pin_cores)
+
+    failed = [(shard_dir, code) for shard_dir, code in results if code != 0]
+    if failed:
+        for shard_dir, code in failed:
+            print(f"❌ Error: Shard '{os.path.basename(shard_dir)}' exited with code {code} "
+                  f"(see {os.path.join(shard_dir, LOG_FILE_NAME)})")
+        print("❌ Results were not merged.")
+        return None
+
+    output_path = os.path.join(run_dir, RAW_FILE_NAME)
+    shard_dirs = [shard_dir for shard_dir, _ in results]
+    n_records = merge_shards(cases, shard_dirs, output_path)
+    machine.merge_machines(shard_dirs, os.path.join(run_dir, machine.MACHINE_FILE_NAME))
+    if n_records != len(cases):
+        print(f"Warning: Expected {len(cases)} records but merged {n_records}.")
+    print(f"📝 Merged {n_records} records into: {output_path} ({time.monotonic() - started:.1f}s)")
+    return output_path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Run the benchmark matrix in parallel shards and merge the results.',
+        epilog='Arguments after "--" are passed to run-benchmark.ts (e.g. -- --no-layout).',
+    )
+    parser.add_argument('-j', '--shards', type=int, default=None,
+                        help='Number of shard processes (default: orchestrator.shards or CPU count).')
+    parser.add_argument('--reference', default=None,
+                        help='Previous run prefix used to estimate case costs (default: latest run).')
+    parser.add_argument('--no-warmup', dest='warmup', action='store_false', default=None,
+                        help='Do not warm up the JIT in each shard before measuring.')
+    parser.add_argument('--no-pin', dest='pin_cores', action='store_false', default=None,
+                        help='Do not pin shards to CPU cores.')
+    parser.add_argument('--analyze', action='store_true', help='Run the analysis pipeline on the merged results.')
+    argv = sys.argv[1:]
+    extra = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    output_path = run_sharded(args.shards, args.reference, extra, warmup=args.warmup, pin_cores=args.pin_cores)
+    if output_path is None:
+        return 1
+    if args.analyze:
+        import main as analysis_main
+
+        return analysis_main.run_pipeline(output_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
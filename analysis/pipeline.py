@@ -0,0 +1,158 @@
+import hashlib
+import importlib.util
+import json
+import os
+from typing import Callable, Iterable, Optional
+
+from profiler import profiler
+
+# --- 설정 ---
+# load → analyze → visualize → report 단계를 작은 의존성 그래프로 실행합니다.
+# 각 단계의 fingerprint 는 (입력 파일 내용, 코드 모듈 소스, 상위 단계 fingerprint) 의 해시이며,
+# 실행 디렉터리의 상태 파일에 기록된 값과 같고 산출물이 남아 있으면 그 단계를 건너뜁니다.
+STATE_FILE = '.pipeline_state.json'
+
+
+class Stage:
+    """
+    파이프라인의 한 단계.
+
+    Args:
+        name (str): 단계 이름.
+        run (Callable): Pipeline 을 받아 단계를 실행하고 (하위 단계에 넘길) 값을 반환하는 함수.
+        deps (Iterable[str]): 상위 단계 이름들.
+        inputs (Iterable[str]): 내용이 fingerprint 에 포함되는 파일 경로들 (예: raw_results.json, config.yaml).
+        modules (Iterable[str]): 소스 코드가 fingerprint 에 포함되는 파이썬 모듈 이름들.
+                                 모듈을 임포트하지 않고 소스 파일만 해시하므로, 최신 단계를 확인하는 데
+                                 pandas/matplotlib 같은 무거운 패키지를 불러오지 않습니다.
+        outputs (Iterable[str]): 단계가 만드는 파일 경로들. 비어 있으면 메모리 전용 단계로 보고,
+                                 하위 단계가 값을 요청할 때만 실행합니다.
+        load (Optional[Callable]): 단계가 최신일 때, 다시 실행하지 않고 산출물에서 값을 읽어오는 함수.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        run: Callable,
+        deps: Iterable[str] = (),
+        inputs: Iterable[str] = (),
+        modules: Iterable[str] = (),
+        outputs: Iterable[str] = (),
+        load: Optional[Callable] = None,
+    ):
+        self.name = name
+        self.run = run
+        self.deps = list(deps)
+        self.inputs = list(inputs)
+        self.modules = list(modules)
+        self.outputs = list(outputs)
+        self.load = load
+
+
+def _file_digest(path: str) -> str:
+    if not os.path.exists(path):
+        return 'missing'
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class Pipeline:
+    """
+    단계들을 의존성 순서대로 실행하면서, 입력이 바뀌지 않은 단계는 건너뜁니다.
+
+    Args:
+        state_dir (str): 상태 파일(.pipeline_state.json)을 저장할 디렉터리 (보통 실행 결과 디렉터리).
+        stages (Iterable[Stage]): 의존성 순서(상위 → 하위)로 나열된 단계들.
+        force (bool): True 이면 모든 단계를 다시 실행합니다.
+    """
+
+    def __init__(self, state_dir: str, stages: Iterable[Stage], force: bool = False):
+        self.state_path = os.path.join(state_dir, STATE_FILE)
+        self.stages = {stage.name: stage for stage in stages}
+        self.force = force
+        self._fingerprints = {}
+        self._values = {}
+        self.state = {}
+        if os.path.exists(self.state_path):
+            with open(self.state_path, 'r') as f:
+                self.state = json.load(f)
+
+    def fingerprint(self, name: str) -> str:
+        if name not in self._fingerprints:
+            stage = self.stages[name]
+            digest = hashlib.sha256(name.encode())
+            for path in stage.inputs:
+                digest.update(_file_digest(path).encode())
+            for module in stage.modules:
+                digest.update(_file_digest(importlib.util.find_spec(module).origin).encode())
+            for dep in stage.deps:
+                digest.update(self.fingerprint(dep).encode())
+            self._fingerprints[name] = digest.hexdigest()
+        return self._fingerprints[name]
+
+    def is_fresh(self, name: str) -> bool:
+        stage = self.stages[name]
+        return (
+            not self.force
+            and bool(stage.outputs)
+            and self.state.get(name) == self.fingerprint(name)
+            and all(os.path.exists(path) for path in stage.outputs)
+        )
+
+    def value(self, name: str):
+        """
+        단계의 값을 반환합니다. 최신 단계는 산출물에서 읽고(load), 아니면 실행합니다.
+        같은 프로세스 안에서는 한 번만 계산합니다.
+        """
+        if name not in self._values:
+            stage = self.stages[name]
+            key = f'L1-{name.capitalize()}'  # --profile 측정 키 (docs/measurement_levels.md)
+            if self.is_fresh(name) and stage.load is not None:
+                with profiler.section(key):
+                    self._values[name] = stage.load()
+            else:
+                # 상위 단계를 먼저 계산해 두어, 단계별 측정 시간에 상위 단계 시간이 섞이지 않게 합니다.
+                for dep in stage.deps:
+                    self.value(dep)
+                with profiler.section(key):
+                    self._values[name] = stage.run(self)
+                if stage.outputs:
+                    self.state[name] = self.fingerprint(name)
+        return self._values[name]
+
+    def cached(self, name: str):
+        """이미 계산(또는 로드)된 단계 값을 반환합니다. 아직 없으면 실행하지 않고 None."""
+        return self._values.get(name)
+
+    def run(self, targets: Optional[Iterable[str]] = None) -> list:
+        """
+        산출물이 있는 단계를 순서대로 확인하고, 오래된(stale) 단계만 실행합니다.
+
+        Args:
+            targets (Optional[Iterable[str]]): 확인할 단계 이름들. 없으면 모든 단계.
+                                               상위 단계는 값이 필요할 때 value() 를 통해 실행/로드됩니다.
+
+        Returns:
+            list: 실제로 실행된 단계 이름 목록.
+        """
+        executed = []
+        targets = set(self.stages) if targets is None else set(targets)
+        for name, stage in self.stages.items():
+            if name not in targets or not stage.outputs:
+                continue  # 메모리 전용 단계는 하위 단계가 요청할 때만 실행됩니다.
+            if self.is_fresh(name):
+                print(f"⏭️  Stage '{name}' is up to date.")
+                continue
+            print(f"▶️  Running stage '{name}'...")
+            self._values.pop(name, None)
+            self.value(name)
+            executed.append(name)
+            self._save_state()
+        return executed
+
+    def _save_state(self):
+        with open(self.state_path, 'w') as f:
+            json.dump(self.state, f, indent=2, sort_keys=True)
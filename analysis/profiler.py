@@ -0,0 +1,221 @@
+import contextlib
+import json
+import os
+import time
+from typing import Optional
+
+# --- 설정 ---
+# scripts/profiler.ts 의 Python 판입니다. 분석 파이프라인(main.py --profile)의 단계와 하위 단계를
+# docs/measurement_levels.md 와 같은 L{level}-{path} 키로 측정하고, 벤치마크 레코드와 같은 형식의
+# pipeline_profile.json 에 쌓아 이 분석기로 다시 분석할 수 있게 합니다 (python main.py profile).
+PROFILE_DIR_NAME = 'profile'                 # results/<run>/profile/
+PROFILE_FILE_NAME = 'pipeline_profile.json'
+CPROFILE_FILE_NAME = 'pipeline_profile.prof'  # python -m pstats / snakeviz 로 열 수 있는 cProfile 통계
+TOP_FILE_NAME = 'pipeline_profile_top.txt'    # 누적 시간 상위 함수와 할당량 상위 코드 위치
+PROFILE_STRATEGY = 'pipeline'
+TOTAL_KEY = 'totalTime'
+
+
+class Profiler:
+    """
+    scripts/profiler.ts 의 Profiler 와 같은 start/stop API 입니다. 같은 키를 여러 번 측정하면 시간이 누적됩니다.
+    비활성 상태(기본값)에서는 start/stop 이 아무것도 하지 않으므로 측정 코드를 파이프라인에 그대로 둡니다.
+    memory 모드에서는 tracemalloc 으로 키별 heapDelta(종료 - 시작 할당량의 누적합)와
+    peakHeap(한 번의 호출 동안 시작 대비 최대 증가량)를 bytes 로 기록합니다.
+    """
+
+    def __init__(self):
+        self.enabled = False
+        self.memory = False
+        self.clear()
+
+    def clear(self):
+        self._starts = {}
+        self._heap_starts = {}
+        self._heap_highs = {}
+        self.durations = {}
+        self.heap_deltas = {}
+        self.heap_peaks = {}
+
+    def enable(self, memory: bool = False):
+        import tracemalloc
+
+        self.clear()
+        self.enabled = True
+        self.memory = memory
+        if memory:
+            if not tracemalloc.is_tracing():
+                tracemalloc.start()
+            tracemalloc.reset_peak()
+
+    def disable(self):
+        import tracemalloc
+
+        if self.memory and tracemalloc.is_tracing():
+            tracemalloc.stop()
+        self.enabled = False
+        self.memory = False
+
+    def _sample_heap(self) -> int:
+        """
+        현재 할당량을 읽고, 직전 샘플 이후의 최대 할당량으로 측정 중인 모든 키의 최대값을 갱신합니다.
+        샘플마다 tracemalloc 의 peak 를 초기화하므로 (start/stop 시점만 보는 TS 판과 달리) 호출 중의 최대값이 정확합니다.
+        """
+        import tracemalloc
+
+        current, peak = tracemalloc.get_traced_memory()
+        tracemalloc.reset_peak()
+        for name, high in self._heap_highs.items():
+            if peak > high:
+                self._heap_highs[name] = peak
+        return current
+
+    def start(self, name: str):
+        """지정된 이름으로 시간 측정을 시작합니다 (예: 'L2-Report:Render')."""
+        if not self.enabled:
+            return
+        if self.memory:
+            used = self._sample_heap()
+            self._heap_starts[name] = used
+            self._heap_highs[name] = used
+        self.durations.setdefault(name, 0.0)  # 결과는 처음 시작한 순서 (부모 → 자식)
+        self._starts[name] = time.perf_counter()
+
+    def stop(self, name: str):
+        """지정된 이름의 시간 측정을 중지하고, 실행 시간(ms)을 누적합니다. start() 가 먼저 호출되어야 합니다."""
+        if not self.enabled:
+            return
+        started = self._starts.pop(name, None)
+        if started is None:
+            print(f"Warning: Profiler.stop('{name}') called without start.")
+            return
+        self.durations[name] = self.durations.get(name, 0.0) + (time.perf_counter() - started) * 1000
+
+        if self.memory:
+            used = self._sample_heap()
+            heap_start = self._heap_starts.pop(name, used)
+            growth = self._heap_highs.pop(name, used) - heap_start
+            self.heap_deltas[name] = self.heap_deltas.get(name, 0) + used - heap_start
+            self.heap_peaks[name] = max(self.heap_peaks.get(name, 0), growth)
+
+    @contextlib.contextmanager
+    def section(self, name: str):
+        """with 블록 하나를 start/stop 으로 감쌉니다."""
+        self.start(name)
+        try:
+            yield
+        finally:
+            self.stop(name)
+
+
+# 싱글턴 인스턴스: 파이프라인 모듈들이 `from profiler import profiler` 로 함께 씁니다.
+profiler = Profiler()
+
+
+def _append_record(path: str, record: dict) -> int:
+    """pipeline_profile.json(JSON 배열)에 레코드를 추가합니다 (임시 파일 + rename). 반환값은 전체 레코드 수."""
+    records = []
+    if os.path.exists(path):
+        with open(path, 'r') as f:
+            records = json.load(f)
+    record['seed'] = len(records)  # 반복 번호: 같은 실행을 여러 번 측정하면 시드처럼 표본이 됩니다.
+    records.append(record)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(records, f, indent=2)
+    os.replace(tmp_path, path)
+    return len(records)
+
+
+def _write_top(path: str, cpu, snapshot, top: int):
+    import io
+    import pstats
+
+    with open(path, 'w') as f:
+        if cpu is not None:
+            stream = io.StringIO()
+            pstats.Stats(cpu, stream=stream).sort_stats('cumulative').print_stats(top)
+            f.write(f"# cProfile: top {top} functions by cumulative time\n{stream.getvalue()}\n")
+        if snapshot is not None:
+            f.write(f"# tracemalloc: top {top} allocation sites still alive at the end of the run\n")
+            for stat in snapshot.statistics('lineno')[:top]:
+                f.write(f"{stat}\n")
+
+
+def format_profile(details: dict, total_ms: float) -> str:
+    """측정 키를 처음 시작한 순서대로, 레벨만큼 들여써서 (시간, 전체 대비 %) 로 보여줍니다."""
+    width = max([len(key) for key in details] + [len(TOTAL_KEY)])
+    lines = [f"{TOTAL_KEY.ljust(width)}  {total_ms:10.1f} ms"]
+    for key, ms in details.items():
+        level = key[1:key.index('-')] if key.startswith('L') and '-' in key else '1'
+        indent = '  ' * (int(level) if level.isdigit() else 1)
+        lines.append(f"{indent}{key.ljust(width)}  {ms:10.1f} ms  {ms / total_ms * 100 if total_ms else 0:5.1f}%")
+    return '\n'.join(lines)
+
+
+@contextlib.contextmanager
+def session(output_dir: str, scenario: str, cprofile: bool = False, memory: bool = False, top: Optional[int] = None):
+    """
+    with 블록 전체를 totalTime 으로, 블록 안의 start/stop 을 세부 키로 측정해
+    output_dir/pipeline_profile.json 에 벤치마크 레코드 하나로 추가합니다. 블록이 예외로 끝나면 저장하지 않습니다.
+
+    Args:
+        output_dir (str): 프로파일 파일을 저장할 디렉터리 (보통 results/<run>/profile).
+        scenario (str): 레코드의 scenario (예: 서브커맨드 이름). 같은 scenario 의 레코드끼리 비교됩니다.
+        cprofile (bool): True 이면 cProfile 통계(pipeline_profile.prof)와 상위 함수 목록을 남깁니다.
+        memory (bool): True 이면 tracemalloc 으로 키별 heapDelta/peakHeap 과 상위 할당 위치를 남깁니다.
+        top (Optional[int]): 상위 목록의 길이. 기본값은 config.yaml 의 profile.top.
+
+    Yields:
+        dict: 저장될 레코드. 호출한 쪽에서 nodes/edges 등을 채울 수 있습니다.
+    """
+    import config
+
+    top = top or config.load_config().get('profile', {}).get('top', 30)
+    # cProfile/tracemalloc 은 측정 시간 자체를 늘리므로 다른 전략처럼 따로 집계되게 합니다.
+    strategy = '+'.join([PROFILE_STRATEGY] + (['cprofile'] if cprofile else []) + (['tracemalloc'] if memory else []))
+    record = {'scenario': scenario, 'strategy': strategy}
+
+    cpu = None
+    if cprofile:
+        import cProfile
+
+        cpu = cProfile.Profile()
+    profiler.enable(memory=memory)
+    profiler.start(TOTAL_KEY)
+    if cpu is not None:
+        cpu.enable()
+    try:
+        yield record
+
+        if cpu is not None:
+            cpu.disable()
+        profiler.stop(TOTAL_KEY)
+        snapshot = None
+        if memory:
+            import tracemalloc
+
+            snapshot = tracemalloc.take_snapshot()
+        durations = dict(profiler.durations)
+        total_ms = durations.pop(TOTAL_KEY)
+        record['totalTime'] = round(total_ms, 4)
+        record['details'] = {key: round(ms, 4) for key, ms in durations.items()}
+        if memory:
+            record['heapDelta'] = dict(profiler.heap_deltas)
+            record['peakHeap'] = dict(profiler.heap_peaks)
+
+        os.makedirs(output_dir, exist_ok=True)
+        profile_path = os.path.join(output_dir, PROFILE_FILE_NAME)
+        count = _append_record(profile_path, record)
+        print(f"\n⏱️ Pipeline profile ({scenario}, {strategy}):\n{format_profile(record['details'], total_ms)}")
+        print(f"⏱️ Profile saved to: {profile_path} ({count} records)")
+        if cpu is not None:
+            cpu.dump_stats(os.path.join(output_dir, CPROFILE_FILE_NAME))
+        if cpu is not None or snapshot is not None:
+            top_path = os.path.join(output_dir, TOP_FILE_NAME)
+            _write_top(top_path, cpu, snapshot, top)
+            print(f"⏱️ Top functions / allocation sites saved to: {top_path}")
+    finally:
+        if cpu is not None:
+            cpu.disable()
+        profiler.disable()
@@ -0,0 +1,290 @@
+from __future__ import annotations
+
+import json
+import math
+import os
+import re
+import time
+from array import array
+from typing import IO, TYPE_CHECKING, Iterable, Iterator, Optional
+
+if TYPE_CHECKING:
+    import pandas as pd
+
+# --- 설정 ---
+# 벤치마크 결과 파일을 레코드 단위로 읽어들이는 스트리밍 로더입니다.
+# - raw_results.json   : 기존 JSON 배열 포맷 (점진적으로 파싱)
+# - raw_results.ndjson : run-benchmark.ts 가 실행 중에 한 줄씩 추가하는 NDJSON 포맷
+# - raw_results.col    : memory-map 으로 읽는 컬럼 바이너리 포맷 (columnar.py, 파일 앞의 MAGIC 으로 판별)
+CHUNK_SIZE = 1 << 16
+POLL_INTERVAL = 0.5  # follow 모드에서 새 데이터를 기다리는 간격 (초)
+IDLE_TIMEOUT = 30.0  # follow 모드에서 이 시간 동안 새 데이터가 없으면 종료 (초)
+
+string_columns = ['scenario', 'strategy']
+# 시나리오 크기. run-benchmark.ts 가 확장성 분석(analyzer.fit_scaling) 도입과 함께 기록하기 시작했으며,
+# 저장소에 있는 실행(2025-10-09 ~ 2025-10-14)에는 없으므로 analyzer.attach_scenario_sizes 가 config.yaml 의 scenarios 표로 채웁니다.
+# ports 는 라우터의 포트 후보 수로, 런타임 예측 모델(runtime_model.py) 도입 이후 실행부터 기록됩니다.
+size_columns = ['nodes', 'edges', 'groups', 'ports']
+# 측정 항목별 힙 사용량 (bytes). '<metric>@<key>' 컬럼으로 펼쳐지며, 시간 측정 키와 구분됩니다.
+memory_metrics = ['heapDelta', 'peakHeap']
+MEMORY_SEPARATOR = '@'
+# 크기 스윕(sweep.py) 실행에만 기록되는 필드: 시간 예산(ms)과, 예산을 넘겨 중단되었는지 여부.
+# 중단된(censored) 레코드의 totalTime 은 예산, 즉 실제 시간의 하한입니다.
+CENSORED_COLUMN = 'timedOut'
+BUDGET_COLUMN = 'budgetMs'
+sweep_columns = [CENSORED_COLUMN, BUDGET_COLUMN]
+# 호스트 간 비교용 (machine.py): 프로세스의 보정 마이크로벤치마크 점수(ms)와 측정 시작 시점의 1분 load average.
+# 호스트 지문 자체는 레코드가 아니라 실행 디렉터리의 machine.json 에 있습니다.
+CALIBRATION_COLUMN = 'calibrationMs'
+LOAD_COLUMN = 'loadAvg'
+machine_columns = [CALIBRATION_COLUMN, LOAD_COLUMN]
+# compact long 형식: (레코드, 측정 키)마다 한 행. 전략마다 다른 측정 키가 다른 전략의 NaN 컬럼으로 늘어나지 않고,
+# 문자열은 category 코드, 값은 float32, 레코드/시드 번호는 int32 로 저장합니다 (여러 달의 히스토리를 메모리에 둘 때).
+# 레코드 단위 숫자(nodes, totalTime, timedOut 등)도 같은 (key, value) 행입니다.
+long_columns = ['run', 'record', 'scenario', 'seed', 'strategy', 'key', 'value']
+category_columns = ['run', 'scenario', 'strategy', 'key']
+
+
+def flatten_record(record: dict) -> dict:
+    """중첩된 'details' 데이터를 상위 레벨로 올려서 평탄화(flatten)합니다. 힙 사용량은 '<metric>@<key>' 컬럼이 됩니다."""
+    return {
+        'scenario': record.get('scenario'),
+        **{key: record[key] for key in size_columns if key in record},
+        'seed': record.get('seed'),
+        'strategy': record.get('strategy'),
+        'totalTime': record.get('totalTime'),
+        **{key: record[key] for key in sweep_columns if key in record},
+        **{key: record[key] for key in machine_columns if key in record},
+        **record.get('details', {}),
+        **{
+            f'{metric}{MEMORY_SEPARATOR}{key}': value
+            for metric in memory_metrics
+            for key, value in record.get(metric, {}).items()
+        },
+    }
+
+
+class _Tail:
+    """파일 끝에 도달했을 때 follow 여부에 따라 대기하거나 종료를 알려주는 헬퍼."""
+
+    def __init__(self, follow: bool, idle_timeout: float):
+        self.follow = follow
+        self.idle_timeout = idle_timeout
+        self.last_data = time.monotonic()
+
+    def got_data(self):
+        self.last_data = time.monotonic()
+
+    def should_wait(self) -> bool:
+        if not self.follow or time.monotonic() - self.last_data > self.idle_timeout:
+            return False
+        time.sleep(POLL_INTERVAL)
+        return True
+
+
+_JSON_LITERALS = ('true', 'false', 'null', 'NaN', 'Infinity', '-Infinity')
+
+
+def _is_truncated(err: json.JSONDecodeError, buf: str) -> bool:
+    """디코딩 오류가 '레코드가 아직 다 쓰이지 않음'(버퍼 끝에서 끊김) 때문인지 판별합니다. 아니면 깨진 레코드입니다."""
+    rest = buf[err.pos:].rstrip()
+    if not rest or err.msg.startswith('Unterminated string'):
+        return True
+    if re.fullmatch(r'\.|[eE][-+]?', rest):  # 숫자가 소수점/지수 부분에서 끊긴 경우 (1. / 1e-)
+        return True
+    return any(lit.startswith(rest) for lit in _JSON_LITERALS)  # true/false/null 이 쓰이다 만 경우
+
+
+def _iter_json_array(f: IO[str], tail: _Tail, head: str = '') -> Iterator[dict]:
+    """JSON 배열을 전부 메모리에 올리지 않고 원소 단위로 디코딩합니다."""
+    decoder = json.JSONDecoder()
+    buf, pos = head, 0
+    started = False
+    while True:
+        chunk = f.read(CHUNK_SIZE)
+        if chunk:
+            tail.got_data()
+            buf, pos = buf[pos:] + chunk, 0
+        elif not tail.should_wait():
+            if buf[pos:].strip():
+                if not tail.follow:
+                    # 다 쓰인 파일로 읽는 중이므로, 끝이 잘린 레코드는 기다릴 대상이 아니라 손상입니다.
+                    raise json.JSONDecodeError("Benchmark file ends with an incomplete record", buf, pos)
+                print("Warning: Benchmark file ends with an incomplete record (run still in progress?).")
+            return
+
+        while True:
+            # 공백과 원소 구분자(,)를 건너뜁니다.
+            while pos < len(buf) and (buf[pos].isspace() or (started and buf[pos] == ',')):
+                pos += 1
+            if pos >= len(buf):
+                break
+            if not started:
+                if buf[pos] != '[':
+                    raise json.JSONDecodeError("Expected '[' at start of benchmark file", buf, pos)
+                started = True
+                pos += 1
+                continue
+            if buf[pos] == ']':
+                return
+            try:
+                obj, pos = decoder.raw_decode(buf, pos)
+            except json.JSONDecodeError as err:
+                if not _is_truncated(err, buf):
+                    raise  # 뒤에 데이터가 더 있는데 디코딩이 실패했다면 중간 레코드가 깨진 것입니다.
+                break  # 레코드가 아직 다 쓰이지 않았으므로 다음 청크를 기다립니다.
+            yield obj
+
+
+def _iter_ndjson(f: IO[str], tail: _Tail, head: str = '') -> Iterator[dict]:
+    """NDJSON을 한 줄씩 디코딩합니다. 개행으로 끝나지 않은 마지막 줄은 완성될 때까지 보류합니다."""
+    pending = head
+    while True:
+        line = f.readline()
+        if line:
+            tail.got_data()
+            pending += line
+            if not pending.endswith('\n'):
+                continue
+            text, pending = pending.strip(), ''
+            if text:
+                yield json.loads(text)
+        elif not tail.should_wait():
+            if pending.strip():
+                try:
+                    yield json.loads(pending)
+                except json.JSONDecodeError:
+                    print("Warning: Benchmark file ends with an incomplete record (run still in progress?).")
+            return
+
+
+def iter_records(file_path: str, follow: bool = False, idle_timeout: float = IDLE_TIMEOUT) -> Iterator[dict]:
+    """
+    벤치마크 결과 파일에서 레코드를 하나씩 꺼냅니다. 포맷(JSON 배열/NDJSON)은 첫 글자로 판별합니다.
+
+    Args:
+        file_path (str): raw_results.json 또는 raw_results.ndjson 경로.
+        follow (bool): True이면 파일 끝에서 종료하지 않고, 새로 추가되는 레코드를 계속 읽습니다 (tail -f).
+        idle_timeout (float): follow 모드에서 새 데이터 없이 기다릴 최대 시간(초).
+
+    Yields:
+        dict: 원본 형태의 벤치마크 레코드.
+    """
+    import columnar
+
+    if columnar.is_columnar(file_path):
+        yield from columnar.iter_records(file_path)  # 한 번에 다 쓰인 파일이므로 follow 할 것이 없습니다.
+        return
+    tail = _Tail(follow, idle_timeout)
+    with open(file_path, 'r') as f:
+        # 아직 아무것도 쓰이지 않은 파일이라면 첫 글자가 나올 때까지 기다립니다.
+        while True:
+            head = f.read(1)
+            if head and not head.isspace():
+                break
+            if not head and not tail.should_wait():
+                return
+        if head == '[':
+            yield from _iter_json_array(f, tail, head)
+        else:
+            yield from _iter_ndjson(f, tail, head)
+
+
+def build_frame(records: Iterable[dict]) -> pd.DataFrame:
+    """
+    레코드 스트림으로부터 DataFrame을 컬럼 단위로 구성합니다.
+    중간에 dict 리스트를 만들지 않고, 숫자 컬럼은 array('d')에 바로 누적합니다.
+    특정 전략에만 있는 측정 키는 처음 등장했을 때 이전 행들을 NaN으로 채웁니다.
+
+    Args:
+        records (Iterable[dict]): 원본 형태의 벤치마크 레코드.
+
+    Returns:
+        pd.DataFrame: load_and_preprocess_data 와 동일한 wide 형태의 데이터프레임.
+    """
+    # numpy/pandas 는 여기서만 필요하므로, 레코드만 훑는 CLI 경로의 시작 시간을 늘리지 않도록 지연 임포트합니다.
+    import numpy as np
+    import pandas as pd
+
+    columns = {}
+    n_rows = 0
+    for record in records:
+        for key, value in flatten_record(record).items():
+            column = columns.get(key)
+            if column is None:
+                column = columns[key] = [] if key in string_columns else array('d')
+            missing = n_rows - len(column)
+            if missing:
+                column.extend([None] * missing if isinstance(column, list) else array('d', [math.nan]) * missing)
+            column.append(value if isinstance(column, list) else (math.nan if value is None else float(value)))
+        n_rows += 1
+
+    data = {}
+    for key, column in columns.items():
+        missing = n_rows - len(column)
+        if missing:
+            column.extend([None] * missing if isinstance(column, list) else array('d', [math.nan]) * missing)
+        data[key] = column if isinstance(column, list) else np.frombuffer(column, dtype=np.float64)
+    df = pd.DataFrame(data)
+    if 'seed' in df.columns and df['seed'].notna().all():
+        df['seed'] = df['seed'].astype('int64')
+    if CENSORED_COLUMN in df.columns:
+        df[CENSORED_COLUMN] = df[CENSORED_COLUMN].fillna(0.0).astype(bool)
+    return df
+
+
+def load_frame(file_path: str, follow: bool = False, idle_timeout: float = IDLE_TIMEOUT) -> Optional[pd.DataFrame]:
+    """iter_records 와 build_frame 을 묶은 편의 함수입니다. 컬럼 파일은 memory-map 으로 바로 읽습니다. 레코드가 없으면 None."""
+    import columnar
+
+    if not os.path.exists(file_path):
+        raise FileNotFoundError(file_path)
+    if columnar.is_columnar(file_path):
+        return columnar.load_frame(file_path)
+    df = build_frame(iter_records(file_path, follow=follow, idle_timeout=idle_timeout))
+    return None if df.empty else df
+
+
+def compact_long(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    (run, record, scenario, seed, strategy, key, value) 테이블의 dtype 을 compact 형식으로 바꿉니다.
+    category 는 처음 등장한 순서를 유지하므로 pivot_wide 의 컬럼 순서가 원래 측정 키 순서와 같습니다.
+    """
+    import pandas as pd
+
+    out = {}
+    for col in long_columns:
+        if col not in long.columns:
+            continue
+        values = long[col]
+        if col in category_columns:
+            out[col] = values if isinstance(values.dtype, pd.CategoricalDtype) else pd.Categorical(
+                values, categories=pd.unique(values.dropna())
+            )
+        elif col == 'value':
+            out[col] = values.to_numpy(dtype='float32')
+        else:
+            out[col] = values.fillna(-1).to_numpy(dtype='int32')
+    return pd.DataFrame(out)
+
+
+def pivot_wide(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    compact long 테이블을 build_frame 과 같은 wide 테이블(레코드당 한 행, 측정 키당 한 컬럼)로 펼칩니다.
+    차트처럼 wide 형태가 꼭 필요한 곳에서만 호출합니다 (전략별 전용 키가 다른 전략 행에서 NaN 으로 채워짐).
+    """
+    ids = [col for col in long_columns if col in long.columns and col not in ('record', 'key', 'value')]
+    keys = long['key'].cat.remove_unused_categories()
+    records = long[['record'] + ids].drop_duplicates('record').set_index('record')
+    values = long.assign(key=keys).pivot(index='record', columns='key', values='value')
+    values.columns = [str(key) for key in values.columns]
+    df = records.join(values.astype('float64')).reset_index(drop=True)
+    for col in ids:
+        if col in category_columns:
+            df[col] = df[col].astype(str)
+    if 'seed' in df.columns:
+        df['seed'] = df['seed'].astype('int64')
+    if CENSORED_COLUMN in df.columns:
+        df[CENSORED_COLUMN] = df[CENSORED_COLUMN].fillna(0.0).astype(bool)
+    return df
+
@@ -0,0 +1,159 @@
+import math
+from itertools import combinations
+
+import numpy as np
+import pandas as pd
+
+import timer_tree
+from config import load_config
+
+# --- 설정 ---
+# 두 벤치마크 실행을 (시나리오, 전략, 측정 키) 단위로 비교하여 성능 회귀를 판정합니다.
+# 시드별 측정값을 표본으로 보고, Mann-Whitney U 검정과 부트스트랩 신뢰구간을 함께 사용합니다.
+EXACT_MAX_COMBINATIONS = 50_000  # 이보다 조합 수가 많으면 정규 근사를 사용합니다.
+cell_columns = ['scenario', 'strategy', 'path']
+
+
+def _midranks(values: np.ndarray) -> np.ndarray:
+    """동점에는 평균 순위를 부여한 1-based 순위를 반환합니다."""
+    return pd.Series(values).rank(method='average').to_numpy()
+
+
+def mann_whitney_u(baseline: np.ndarray, candidate: np.ndarray) -> tuple:
+    """
+    양측 Mann-Whitney U 검정을 수행합니다.
+    표본이 작으면 순위 배치를 전부 나열하는 정확 검정, 크면 동점 보정 정규 근사를 사용합니다.
+
+    Args:
+        baseline (np.ndarray): 기준 실행의 측정값.
+        candidate (np.ndarray): 비교 실행의 측정값.
+
+    Returns:
+        tuple: (candidate 의 U 통계량, 양측 p-value)
+    """
+    n1, n2 = len(candidate), len(baseline)
+    if n1 == 0 or n2 == 0:
+        return math.nan, math.nan
+
+    ranks = _midranks(np.concatenate([candidate, baseline]))
+    u = ranks[:n1].sum() - n1 * (n1 + 1) / 2
+    mean_u = n1 * n2 / 2
+
+    if math.comb(n1 + n2, n1) <= EXACT_MAX_COMBINATIONS:
+        # 가능한 모든 순위 배치에서 |U - E[U]| 가 관측값 이상인 비율
+        observed = abs(u - mean_u)
+        rank_sums = np.array([ranks[list(idx)].sum() for idx in combinations(range(n1 + n2), n1)])
+        null_u = rank_sums - n1 * (n1 + 1) / 2
+        p_value = float(np.mean(np.abs(null_u - mean_u) >= observed - 1e-9))
+        return float(u), p_value
+
+    _, tie_counts = np.unique(ranks, return_counts=True)
+    n = n1 + n2
+    tie_term = (tie_counts ** 3 - tie_counts).sum() / (n * (n - 1))
+    sigma = math.sqrt(n1 * n2 / 12 * ((n + 1) - tie_term))
+    if sigma == 0:
+        return float(u), 1.0
+    z = (abs(u - mean_u) - 0.5) / sigma
+    return float(u), math.erfc(max(z, 0.0) / math.sqrt(2))
+
+
+def bootstrap_relative_change(
+    baseline: np.ndarray,
+    candidate: np.ndarray,
+    n_samples: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> tuple:
+    """
+    평균의 상대 변화율 (candidate / baseline - 1) 에 대한 부트스트랩 백분위 신뢰구간을 계산합니다.
+
+    Returns:
+        tuple: (하한 %, 상한 %)
+    """
+    base_idx = rng.integers(0, len(baseline), size=(n_samples, len(baseline)))
+    cand_idx = rng.integers(0, len(candidate), size=(n_samples, len(candidate)))
+    base_means = baseline[base_idx].mean(axis=1)
+    cand_means = candidate[cand_idx].mean(axis=1)
+    with np.errstate(divide='ignore', invalid='ignore'):
+        change = (cand_means / base_means - 1) * 100
+    tail = (1 - confidence) / 2 * 100
+    low, high = np.nanpercentile(change, [tail, 100 - tail])
+    return float(low), float(high)
+
+
+def compare_runs(
+    baseline_df: pd.DataFrame,
+    candidate_df: pd.DataFrame,
+    threshold_pct: float = None,
+    alpha: float = None,
+) -> pd.DataFrame:
+    """
+    두 실행의 모든 (시나리오, 전략, 측정 키) 셀을 비교한 순위표를 만듭니다.
+    회귀(regression)는 평균이 threshold_pct 이상 증가했고, U 검정이 유의하며,
+    부트스트랩 신뢰구간의 하한도 0보다 큰 경우로 판정합니다.
+
+    Args:
+        baseline_df (pd.DataFrame): 기준 실행의 전처리된 데이터프레임.
+        candidate_df (pd.DataFrame): 비교 실행의 전처리된 데이터프레임.
+        threshold_pct (float): 회귀로 판정할 최소 평균 증가율(%). 기본값은 config.yaml.
+        alpha (float): 유의수준. 기본값은 config.yaml.
+
+    Returns:
+        pd.DataFrame: 변화율 순으로 정렬된 비교 결과 (verdict 컬럼 포함).
+    """
+    cfg = load_config().get('compare', {})
+    threshold_pct = cfg.get('threshold_pct', 10.0) if threshold_pct is None else threshold_pct
+    alpha = cfg.get('alpha', 0.05) if alpha is None else alpha
+    min_time_ms = cfg.get('min_time_ms', 1.0)
+    rng = np.random.default_rng(cfg.get('seed', 0))
+
+    # 레거시 키와 L{n}- 키가 같은 경로로 매핑되도록 timer_tree 의 path 단위로 비교합니다.
+    base_groups = timer_tree.to_long(baseline_df).groupby(cell_columns)['time']
+    cand_groups = dict(list(timer_tree.to_long(candidate_df).groupby(cell_columns)['time']))
+
+    rows = []
+    for cell, base_series in base_groups:
+        cand_series = cand_groups.get(cell)
+        if cand_series is None:
+            continue
+        base, cand = base_series.to_numpy(), cand_series.to_numpy()
+        base_mean, cand_mean = base.mean(), cand.mean()
+        _, p_value = mann_whitney_u(base, cand)
+        ci_low, ci_high = bootstrap_relative_change(
+            base, cand, cfg.get('bootstrap_samples', 2000), cfg.get('confidence', 0.95), rng
+        )
+        change_pct = (cand_mean / base_mean - 1) * 100 if base_mean > 0 else math.nan
+
+        verdict = 'unchanged'
+        if max(base_mean, cand_mean) < min_time_ms:
+            verdict = 'negligible'
+        elif p_value < alpha and change_pct >= threshold_pct and ci_low > 0:
+            verdict = 'regression'
+        elif p_value < alpha and change_pct <= -threshold_pct and ci_high < 0:
+            verdict = 'improvement'
+
+        rows.append({
+            'scenario': cell[0],
+            'strategy': cell[1],
+            'key': cell[2],
+            'baseline_mean': base_mean,
+            'candidate_mean': cand_mean,
+            'change_pct': change_pct,
+            'ci_low_pct': ci_low,
+            'ci_high_pct': ci_high,
+            'p_value': p_value,
+            'n_baseline': len(base),
+            'n_candidate': len(cand),
+            'verdict': verdict,
+        })
+
+    result = pd.DataFrame(rows)
+    if result.empty:
+        return result
+    severity = result['verdict'].map({'regression': 0, 'improvement': 2}).fillna(1)
+    return (
+        result.assign(_severity=severity)
+              .sort_values(['_severity', 'change_pct'], ascending=[True, False])
+              .drop(columns='_severity')
+              .reset_index(drop=True)
+    )
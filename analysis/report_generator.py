@@ -1,33 +1,43 @@
 import os
+import numpy as np
 import pandas as pd
 from jinja2 import Environment, FileSystemLoader
 
-basic_columns = ['scenario', 'seed', 'strategy', 'totalTime']
-three_step_column_names = ['Placement', 'Routing', 'Post-Process']
+import aggregates
+from profiler import profiler
 
-def resolve_three_step_columns(df: pd.DataFrame):
-    """
-    Determine which columns to treat as the three main steps (L1), supporting
-    both legacy names (e.g., 'Placement') and new L1-prefixed names (e.g., 'L1-Placement').
-    Returns a tuple: (selected_columns_in_df, rename_map_for_display)
-    where rename_map maps dataframe column name -> display name.
-    """
-    # Prefer L1-* columns if present
-    l1_prefixed = {f"L1-{name}": name for name in three_step_column_names if f"L1-{name}" in df.columns}
-    if len(l1_prefixed) > 0:
-        return list(l1_prefixed.keys()), l1_prefixed
+basic_columns = ['scenario', 'seed', 'strategy', 'totalTime']
+TEMPLATES_DIR = os.path.join(os.path.dirname(__file__), 'templates')
+TEMPLATE_NAME = 'report_frame.md.j2'
+REPORT_FILE_NAME = 'report_frame.md'
+QUALITY_COLUMNS = {
+    'time_ms': 'Mean Time (ms)',
+    'crossings': 'Crossings',
+    'bends': 'Bends',
+    'wire_length': 'Wire Length',
+    'node_overlaps': 'Node Overlaps',
+    'area': 'Area',
+}
+MEMORY_COLUMNS = {
+    'peak_heap_mb': 'Peak Growth (MB)',
+    'peak_heap_max_mb': 'Peak Growth Max (MB)',
+    'heap_delta_mb': 'Retained Delta (MB)',
+}
 
-    # Fallback to legacy column names
-    legacy = [col for col in three_step_column_names if col in df.columns]
-    legacy_map = {name: name for name in legacy}
-    return legacy, legacy_map
+def _format_column(col: pd.Series, decimals: int = 2) -> pd.Series:
+    """Format a whole column at once: numbers to fixed decimals, missing values to ''."""
+    if pd.api.types.is_numeric_dtype(col):
+        values = col.to_numpy(dtype=float)
+        text = np.char.mod(f"%.{decimals}f", values)
+        return pd.Series(np.where(np.isnan(values), "", text), index=col.index, dtype=object)
+    return col.astype(object).where(col.notna(), "").astype(str)
 
 def format_numbers(df: pd.DataFrame, decimals: int = 2) -> pd.DataFrame:
     """Format all numeric columns to fixed decimals as strings (e.g., 12.40)."""
     formatted = df.copy()
     for col in formatted.columns:
         if pd.api.types.is_numeric_dtype(formatted[col]):
-            formatted[col] = formatted[col].map(lambda x: f"{x:.{decimals}f}" if pd.notna(x) else "")
+            formatted[col] = _format_column(formatted[col], decimals)
     return formatted
 
 def md_table(df: pd.DataFrame) -> str:
@@ -35,37 +45,29 @@ def md_table(df: pd.DataFrame) -> str:
     - Numeric columns get header separators with ---: so they right-align in GitHub.
     - Values in numeric columns are formatted to 2 decimals.
     - Index is emitted as the first (left-aligned) column.
+    Cells are formatted column by column and rows are joined with vectorized string concatenation.
     """
     if df is None or df.empty:
         return ""
 
-    # Prepare a copy for formatting numeric values
-    out = df.copy()
-    numeric_cols = []
-    for col in out.columns:
-        if pd.api.types.is_numeric_dtype(out[col]):
-            numeric_cols.append(col)
-            out[col] = out[col].map(lambda x: f"{x:.2f}" if pd.notna(x) else "")
-        else:
-            out[col] = out[col].map(lambda x: str(x) if pd.notna(x) else "")
+    numeric_cols = [col for col in df.columns if pd.api.types.is_numeric_dtype(df[col])]
 
     # Headers
-    index_name = out.index.name if out.index.name is not None else ""
-    headers = [index_name] + list(out.columns)
+    index_name = df.index.name if df.index.name is not None else ""
+    headers = [index_name] + [str(col) for col in df.columns]
 
     # Alignment row: index left, numeric columns right, others left
-    align = ["---"]
-    for col in out.columns:
-        align.append("---:" if col in numeric_cols else ":---")
+    align = ["---"] + ["---:" if col in numeric_cols else ":---" for col in df.columns]
 
     # Data rows
-    lines = []
-    lines.append("| " + " | ".join(headers) + " |")
-    lines.append("| " + " | ".join(align) + " |")
-    for idx, row in out.iterrows():
-        values = [str(idx)] + [str(row[c]) for c in out.columns]
-        lines.append("| " + " | ".join(values) + " |")
-
+    rows = pd.Series(df.index.map(str), dtype=object)
+    for i in range(df.shape[1]):
+        rows = rows + " | " + _format_column(df.iloc[:, i]).to_numpy()
+    lines = [
+        "| " + " | ".join(headers) + " |",
+        "| " + " | ".join(align) + " |",
+    ]
+    lines.extend("| " + rows + " |")
     return "\n".join(lines)
 
 def caption_figure(section_prefix: str, idx: int, title: str) -> str:
@@ -78,8 +80,9 @@ class Numbering:
     """Simple hierarchical numbering for sections and captions.
     Levels: 2 (scenario), 3 (strategy), 4 (sub-sections like three-step/routing)
     """
-    def __init__(self):
-        self.counters = {2: 0, 3: 0, 4: 0}
+    def __init__(self, first_section: int = 2):
+        # Section 1 is the summary, so scenario sections start at `first_section`.
+        self.counters = {2: first_section - 1, 3: 0, 4: 0}
 
     def _reset_below(self, level: int):
         for k in list(self.counters.keys()):
@@ -99,72 +102,273 @@ class Numbering:
                 parts.append(str(self.counters[lv]))
         return '.'.join(parts) + '.'
 
-def save_report_to_markdown(df: pd.DataFrame, summary_data: dict, output_dir: str):
+def save_report_to_markdown(df: pd.DataFrame, summary_data: dict, output_dir: str, cube: pd.DataFrame = None):
     """
     분석된 통계 데이터를 Markdown 형식의 리포트 파일로 저장합니다.
 
     Args:
         df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+        summary_data (dict): analyzer.analyze_data 결과 (summary.json).
         output_dir (str): 리포트 파일을 저장할 디렉터리 경로.
+        cube (pd.DataFrame): aggregates.build_cube 결과. 없으면 여기서 계산합니다.
     """
-    report_path = os.path.join(output_dir, 'report_frame.md')
-    charts_dir = os.path.join(output_dir, 'charts')
-    num = Numbering()
-
-    # Build summary context
-    summary_df = pd.DataFrame.from_dict(summary_data['overall_summary'], orient='index')
-    total_time_chart_filename = None
-    total_chart_path = os.path.join(charts_dir, 'total_time_comparison.png')
-    if os.path.exists(total_chart_path):
-        total_time_chart_filename = os.path.basename(total_chart_path)
-
-    # Sections (currently only 'Large (Standard)')
-    sections = []
-    target_scenario = 'Large (Standard)'
-    scenario_df = df[df['scenario'] == target_scenario]
-    if not scenario_df.empty:
-        sec2 = num.sec(2)
-        section = {
-            'scenario_name': target_scenario,
-            'sec2': sec2,
-            'strategies': []
-        }
-        for strategy in sorted(scenario_df['strategy'].unique()):
-            strategy_df = scenario_df[scenario_df['strategy'] == strategy]
+    if cube is None:
+        cube = aggregates.build_cube(df)
+    with profiler.section('L2-Report:Tables'):
+        report_path = os.path.join(output_dir, REPORT_FILE_NAME)
+        charts_dir = os.path.join(output_dir, 'charts')
+        num = Numbering()
+
+        def chart_if_exists(filename: str):
+            return filename if os.path.exists(os.path.join(charts_dir, filename)) else None
+
+        # Build summary context: the same steady-state sample (warm-up runs excluded) as main.format_summary_table.
+        # Older summary.json files without robust_summary fall back to overall_summary.
+        steady_rows = [
+            {'Scenario': scenario, 'Strategy': strategy, **paths['Total']}
+            for scenario, strategies in summary_data.get('robust_summary', {}).items()
+            for strategy, paths in strategies.items()
+            if 'std' in paths.get('Total', {})
+        ]
+        if steady_rows:
+            summary_df = pd.DataFrame(steady_rows)
+            summary_df['95% CI (ms)'] = [
+                f"{low:.2f}..{high:.2f}" if low is not None else '-'
+                for low, high in zip(summary_df['mean_ci_low'], summary_df['mean_ci_high'])
+            ]
+            summary_df[['n', 'n_excluded']] = summary_df[['n', 'n_excluded']].astype(str)
+            summary_df = (
+                summary_df.set_index('Scenario')
+                  .rename(columns={'n': 'N', 'mean': 'Mean (ms)', 'std': 'Std (ms)', 'min': 'Min (ms)', 'max': 'Max (ms)',
+                                   'p90': 'p90 (ms)', 'n_excluded': 'Warm-up Excluded'})
+                  [['Strategy', 'N', 'Mean (ms)', 'Std (ms)', 'Min (ms)', 'Max (ms)', '95% CI (ms)', 'p90 (ms)',
+                    'Warm-up Excluded']]
+            )
+        else:
+            summary_df = pd.DataFrame.from_dict(summary_data['overall_summary'], orient='index')
+        total_time_chart_filename = chart_if_exists('total_time_comparison.png')
+
+        # Scaling: log-log growth exponents, steepest first (the module that blows up first)
+        scaling_rows = [
+            {'Strategy': strategy, 'Key': key, **fit}
+            for strategy, fits in summary_data.get('scaling', {}).items()
+            for key, fit in fits.items()
+        ]
+        scaling_table_md = ""
+        if scaling_rows:
+            scaling_df = (
+                pd.DataFrame(scaling_rows)
+                  .drop(columns=['n'])
+                  .sort_values('exponent', ascending=False)
+                  .set_index('Strategy')
+                  .rename(columns={'exponent': 'Exponent', 'ci_low': 'CI Low', 'ci_high': 'CI High', 'r2': 'R²',
+                                   'n_censored': 'Timed Out', 'method': 'Fit'})
+            )
+            if 'Timed Out' in scaling_df.columns:
+                scaling_df['Timed Out'] = scaling_df['Timed Out'].fillna(0).astype(int).astype(str)
+            scaling_df.columns = [c.replace('predicted_ms@', 'Predicted @') + (' (ms)' if c.startswith('predicted_ms@') else '')
+                                  for c in scaling_df.columns]
+            scaling_table_md = md_table(scaling_df)
+        scaling_chart_filename = chart_if_exists('scaling_total_time.png')
+
+        # Practical ceiling per strategy from a size sweep (largest graph finished within the time budget)
+        ceiling_table_md = ""
+        if summary_data.get('ceilings'):
+            ceiling_df = (
+                pd.DataFrame(summary_data['ceilings'])
+                  .set_index('strategy')
+                  .rename(columns={
+                      'budget_ms': 'Budget (ms)', 'max_ok_nodes': 'Largest OK (nodes)', 'max_ok_mean_ms': 'Mean at Largest OK (ms)',
+                      'first_over_nodes': 'First Over Budget (nodes)', 'n_censored': 'Timed Out',
+                      'predicted_nodes': 'Predicted Ceiling (nodes)',
+                  })
+            )
+            ceiling_df.index.name = 'Strategy'
+            ceiling_df = ceiling_df.astype(float)
+            for col in ['Largest OK (nodes)', 'First Over Budget (nodes)', 'Timed Out', 'Predicted Ceiling (nodes)']:
+                ceiling_df[col] = ceiling_df[col].map(lambda v: '' if pd.isna(v) else f'{v:.0f}')
+            ceiling_table_md = md_table(ceiling_df)
+
+        # Robust statistics for total time: bootstrap CIs, tail quantiles, outliers and warm-up runs
+        robust = summary_data.get('robust_summary', {})
+        robust_rows = [
+            {'Scenario': scenario, 'Strategy': strategy, **paths['Total']}
+            for scenario, strategies in robust.items()
+            for strategy, paths in strategies.items()
+            if 'Total' in paths
+        ]
+        robust_table_md = ""
+        if robust_rows:
+            robust_df = pd.DataFrame(robust_rows)
+            robust_df['Outliers (seed)'] = robust_df['outlier_seeds'].map(lambda seeds: ', '.join(map(str, seeds)))
+            robust_df[['n', 'n_excluded']] = robust_df[['n', 'n_excluded']].astype(str)
+            robust_df = (
+                robust_df.set_index('Scenario')
+                  .rename(columns={
+                      'n': 'N', 'n_excluded': 'Warm-up Excluded',
+                      'mean': 'Mean', 'mean_ci_low': 'Mean CI Low', 'mean_ci_high': 'Mean CI High',
+                      'median': 'Median', 'median_ci_low': 'Median CI Low', 'median_ci_high': 'Median CI High',
+                      'p90': 'p90', 'p99': 'p99', 'ci_halfwidth_pct': 'CI ±%',
+                  })
+                  [['Strategy', 'N', 'Warm-up Excluded', 'Mean', 'Mean CI Low', 'Mean CI High', 'Median',
+                    'Median CI Low', 'Median CI High', 'p90', 'p99', 'CI ±%', 'Outliers (seed)']]
+            )
+            robust_table_md = md_table(robust_df)
+        warmup_rows = [row for row in summary_data.get('warmup', []) if row['warmup']]
+        warmup_table_md = ""
+        if warmup_rows:
+            warmup_df = (
+                pd.DataFrame(warmup_rows)
+                  .set_index('scenario')
+                  .rename(columns={'strategy': 'Strategy', 'seed': 'Seed', 'first_ms': 'First Run (ms)',
+                                   'steady_median_ms': 'Steady Median (ms)', 'ratio': 'Ratio', 'z': 'Robust z'})
+                  [['Strategy', 'Seed', 'First Run (ms)', 'Steady Median (ms)', 'Ratio', 'Robust z']]
+            )
+            warmup_df['Seed'] = warmup_df['Seed'].astype(str)
+            warmup_df.index.name = 'Scenario'
+            warmup_table_md = md_table(warmup_df)
+
+        # Memory: peak heap growth of the whole run and bytes-per-node/edge fits (runs recorded with heap metrics only)
+        memory_summary = summary_data.get('memory', {})
+        memory_rows = [
+            {'Scenario': scenario, 'Strategy': strategy, **paths['Total']}
+            for scenario, strategies in memory_summary.items()
+            for strategy, paths in strategies.items()
+            if 'Total' in paths
+        ]
+        memory_table_md = ""
+        if memory_rows:
+            memory_df = (
+                pd.DataFrame(memory_rows)
+                  .set_index('Scenario')
+                  .drop(columns='level')
+                  .rename(columns=MEMORY_COLUMNS)
+            )
+            memory_table_md = md_table(memory_df)
+        memory_scaling_rows = [
+            {'Strategy': strategy, 'Key': key, **fit}
+            for strategy, fits in summary_data.get('memory_scaling', {}).items()
+            for key, fit in fits.items()
+        ]
+        memory_scaling_table_md = ""
+        if memory_scaling_rows:
+            memory_scaling_df = (
+                pd.DataFrame(memory_scaling_rows)
+                  .drop(columns=['n'])
+                  .sort_values('bytes_per_node', ascending=False)
+                  .set_index('Strategy')
+                  .rename(columns={'bytes_per_node': 'Bytes / Node', 'bytes_per_edge': 'Bytes / Edge',
+                                   'exponent': 'Exponent', 'r2': 'R²'})
+            )
+            memory_scaling_df.columns = [c.replace('predicted_mb@', 'Predicted @') + (' (MB)' if c.startswith('predicted_mb@') else '')
+                                         for c in memory_scaling_df.columns]
+            memory_scaling_table_md = md_table(memory_scaling_df)
+        peak_heap_chart_filename = chart_if_exists('peak_heap_comparison.png')
+        memory_scaling_chart_filename = chart_if_exists('memory_scaling.png')
+
+        # Layout quality: mean metrics per (scenario, strategy) and the metrics on which each strategy is Pareto-optimal
+        quality_rows = [
+            {'Scenario': scenario, 'Strategy': strategy, **metrics}
+            for scenario, strategies in summary_data.get('quality', {}).items()
+            for strategy, metrics in strategies.items()
+        ]
+        quality_table_md = ""
+        quality_charts = []
+        if quality_rows:
+            quality_df = pd.DataFrame(quality_rows)
+            quality_df['Pareto-optimal on'] = quality_df['pareto'].map(lambda metrics: ', '.join(metrics))
+            quality_df = quality_df.set_index('Scenario').rename(columns=QUALITY_COLUMNS)
+            quality_df = quality_df[['Strategy'] + [c for c in QUALITY_COLUMNS.values() if c in quality_df.columns]
+                                    + ['Pareto-optimal on']]
+            quality_table_md = md_table(quality_df)
+
+        # Summary sub-sections (1.x) are numbered in order, skipping the ones this run has no data for
+        summary_secs = {'visualization': '1.1.'}
+        for name, present in [('robust', robust_table_md), ('scaling', scaling_table_md), ('memory', memory_table_md),
+                              ('quality', quality_table_md), ('analysis', True)]:
+            if present:
+                summary_secs[name] = f"1.{len(summary_secs) + 1}."
+
+        if quality_table_md:
+            for i, scenario in enumerate(summary_data['quality'], start=1):
+                filename = chart_if_exists(f'quality_pareto_{aggregates.safe_name(scenario)}.png')
+                if filename:
+                    quality_charts.append({'filename': filename,
+                                           'caption': f"그림 {summary_secs['quality']}{i}. Layout Quality vs. Time ({scenario} Scenario)"})
+
+
+    # Sections: one per scenario, one sub-section per strategy (all read from the aggregate cube)
+    with profiler.section('L2-Report:Sections'):
+        sections = []
+        section = None
+        for scenario, strategy, cell in aggregates.cells(cube):
+            if section is None or section['scenario_name'] != scenario:
+                section = {
+                    'scenario_name': scenario,
+                    'sec2': num.sec(2),
+                    'strategies': []
+                }
+                sections.append(section)
             sec3 = num.sec(3)
+            file_suffix = aggregates.chart_suffix(scenario, strategy)
 
-            # Three-step
-            three_step_cols, rename_map = resolve_three_step_columns(strategy_df)
-            three_step_has = len(strategy_df[three_step_cols].dropna(axis=1, how='all').columns) > 0
+            # Three-step: L1 nodes of the timer tree (legacy 'Placement' and 'L1-Placement' share a path)
+            module_avg = cell.loc[cell['level'] == 1, 'mean'].dropna().to_frame(name='Average Time (ms)')
+            module_robust = pd.DataFrame.from_dict(robust.get(scenario, {}).get(strategy, {}), orient='index')
+            if not module_avg.empty and not module_robust.empty:
+                # Steady-state mean and its confidence interval (warm-up runs excluded) next to the plain average
+                module_avg = module_avg.join(
+                    module_robust[['mean', 'mean_ci_low', 'mean_ci_high', 'p90']]
+                      .rename(columns={'mean': 'Steady Mean (ms)', 'mean_ci_low': 'CI Low (ms)',
+                                       'mean_ci_high': 'CI High (ms)', 'p90': 'p90 (ms)'})
+                )
+            module_avg.index.name = None
             three_step = {'has': False}
-            if three_step_has:
+            if not module_avg.empty:
                 sec4 = num.sec(4)
-                display_df = strategy_df[three_step_cols].rename(columns=rename_map)
-                module_avg = display_df.mean().to_frame(name='Average Time (ms)')
                 three_step = {
                     'has': True,
                     'sec4': sec4,
-                    'chart_filename': f'three_step_breakdown_pie_{strategy}.png' if os.path.exists(os.path.join(charts_dir, f'three_step_breakdown_pie_{strategy}.png')) else None,
+                    'chart_filename': chart_if_exists(f'three_step_breakdown_pie_{file_suffix}.png'),
                     'table_md': md_table(module_avg),
                     'fig_caption': caption_figure(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'three-Step Phase Breakdown for "{strategy}"'),
                     'tbl_caption': caption_table(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'three-Step Phase Breakdown for "{strategy}"')
                 }
 
-            # Routing breakdown (exclude basics and the per-strategy three-step columns)
-            routing_cols = [c for c in df.columns if c not in basic_columns + list(three_step_cols)]
-            measured = strategy_df[routing_cols].dropna(axis=1, how='all').columns
+            # Routing breakdown: direct children of the 'Routing' node in the timer tree,
+            # plus the uninstrumented remainder as a '(self)' row.
+            routing_children = aggregates.children(cell, 'Routing')
             routing = {'has': False}
-            if len(measured) > 0:
+            if not routing_children.empty:
                 sec4_r = num.sec(4)
-                module_avg_r = strategy_df[measured].mean().to_frame(name='Average Time (ms)')
+                module_avg_r = routing_children.rename(columns={
+                    'inclusive': 'Inclusive (ms)',
+                    'exclusive': 'Exclusive (ms)',
+                })
                 routing = {
                     'has': True,
                     'sec4': sec4_r,
-                    'chart_filename': f'routing_breakdown_pie_{strategy}.png' if os.path.exists(os.path.join(charts_dir, f'routing_breakdown_pie_{strategy}.png')) else None,
+                    'chart_filename': chart_if_exists(f'routing_breakdown_pie_{file_suffix}.png'),
                     'table_md': md_table(module_avg_r),
                     'fig_caption': caption_figure(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'Routing Phase Breakdown for "{strategy}"'),
                     'tbl_caption': caption_table(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'Routing Phase Breakdown for "{strategy}"')
                 }
+            # Memory breakdown: heap growth per timer-tree node (level >= 1)
+            memory_nodes = pd.DataFrame.from_dict(memory_summary.get(scenario, {}).get(strategy, {}), orient='index')
+            memory_block = {'has': False}
+            if not memory_nodes.empty:
+                memory_nodes = memory_nodes[memory_nodes['level'] >= 1].drop(columns='level').rename(columns=MEMORY_COLUMNS)
+            if not memory_nodes.empty:
+                sec4_m = num.sec(4)
+                memory_block = {
+                    'has': True,
+                    'sec4': sec4_m,
+                    'chart_filename': chart_if_exists(f'memory_breakdown_{file_suffix}.png'),
+                    'table_md': md_table(memory_nodes),
+                    'fig_caption': caption_figure(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'Heap Usage per Module for "{strategy}"'),
+                    'tbl_caption': caption_table(f"{num.counters[2]}.{num.counters[3]}", num.counters[4], f'Heap Usage per Module for "{strategy}"')
+                }
+
             # Analysis section numbering
             analysis_sec4 = num.sec(4)
 
@@ -173,24 +377,37 @@ def save_report_to_markdown(df: pd.DataFrame, summary_data: dict, output_dir: st
                 'sec3': sec3,
                 'three_step': three_step,
                 'routing_breakdown': routing,
+                'memory': memory_block,
                 'analysis_sec4': analysis_sec4,
             })
 
-        sections.append(section)
 
     # Prepare template context
-    templates_dir = os.path.join(os.path.dirname(__file__), 'templates')
-    env = Environment(loader=FileSystemLoader(templates_dir))
-    template = env.get_template('report.md.j2')
+    with profiler.section('L2-Report:Template'):
+        env = Environment(loader=FileSystemLoader(TEMPLATES_DIR))
+        template = env.get_template(TEMPLATE_NAME)
     context = {
         'date': os.path.basename(output_dir),
         'total_time_chart_filename': total_time_chart_filename,
         'summary_table_md': md_table(summary_df),
+        'scaling_table_md': scaling_table_md,
+        'scaling_chart_filename': scaling_chart_filename,
+        'ceiling_table_md': ceiling_table_md,
+        'robust_table_md': robust_table_md,
+        'warmup_table_md': warmup_table_md,
+        'memory_table_md': memory_table_md,
+        'memory_scaling_table_md': memory_scaling_table_md,
+        'peak_heap_chart_filename': peak_heap_chart_filename,
+        'memory_scaling_chart_filename': memory_scaling_chart_filename,
+        'quality_table_md': quality_table_md,
+        'quality_charts': quality_charts,
+        'summary_secs': summary_secs,
         'sections': sections,
     }
 
     # Render and write
-    content = template.render(**context)
-    with open(report_path, 'w', encoding='utf-8') as f:
+    with profiler.section('L2-Report:Render'):
+        content = template.render(**context)
+    with profiler.section('L2-Report:Write'), open(report_path, 'w', encoding='utf-8') as f:
         f.write(content)
     print(f"📜 Report saved to: {report_path}")
\ No newline at end of file
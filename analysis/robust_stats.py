@@ -0,0 +1,193 @@
+import numpy as np
+import pandas as pd
+
+import timer_tree
+from config import load_config
+from record_stream import CENSORED_COLUMN
+
+# --- 설정 ---
+# 시드 5개 정도의 작은 표본에서도 얼마나 믿을 수 있는지 알 수 있도록,
+# (시나리오, 전략, 측정 경로)별 부트스트랩 신뢰구간, 분위수, MAD 이상치, JIT warm-up 을 계산합니다.
+MAD_SCALE = 1.4826  # 정규분포에서 MAD → 표준편차 환산 계수
+cell_columns = ['scenario', 'strategy']
+series_columns = ['scenario', 'strategy', 'path']
+
+
+def robust_z(values: np.ndarray, reference: np.ndarray = None) -> np.ndarray:
+    """
+    중앙값과 MAD 로 표준화한 점수 (x - median) / (1.4826 · MAD) 를 반환합니다.
+    MAD 가 0 이면(값이 거의 같으면) 이상치를 판정할 수 없으므로 0 을 돌려줍니다.
+
+    Args:
+        values (np.ndarray): 점수를 계산할 값.
+        reference (np.ndarray): 중앙값/MAD 를 계산할 기준 표본. 없으면 values 자신.
+    """
+    reference = values if reference is None else reference
+    median = np.median(reference)
+    mad = MAD_SCALE * np.median(np.abs(reference - median))
+    if mad == 0:
+        return np.zeros(len(values))
+    return (values - median) / mad
+
+
+def bootstrap_ci(
+    samples: np.ndarray,
+    n_samples: int,
+    confidence: float,
+    rng: np.random.Generator,
+) -> dict:
+    """
+    표본 크기가 같은 여러 시계열의 평균/중앙값 부트스트랩 백분위 신뢰구간을 한 번에 계산합니다.
+    모든 행이 같은 복원 추출 인덱스를 공유하므로 (행 × 반복 × 표본) 배열 하나로 끝납니다.
+
+    Args:
+        samples (np.ndarray): (시계열 수, 표본 크기) 배열.
+        n_samples (int): 부트스트랩 반복 횟수.
+        confidence (float): 신뢰 수준 (예: 0.95).
+        rng (np.random.Generator): 난수 생성기.
+
+    Returns:
+        dict: mean_ci_low, mean_ci_high, median_ci_low, median_ci_high 배열.
+    """
+    idx = rng.integers(0, samples.shape[1], size=(n_samples, samples.shape[1]))
+    resampled = samples[:, idx]
+    tail = (1 - confidence) / 2 * 100
+    mean_ci = np.percentile(resampled.mean(axis=2), [tail, 100 - tail], axis=1)
+    median_ci = np.percentile(np.median(resampled, axis=2), [tail, 100 - tail], axis=1)
+    return {
+        'mean_ci_low': mean_ci[0],
+        'mean_ci_high': mean_ci[1],
+        'median_ci_low': median_ci[0],
+        'median_ci_high': median_ci[1],
+    }
+
+
+def detect_warmup(df: pd.DataFrame, z_threshold: float = None, min_ratio: float = None) -> pd.DataFrame:
+    """
+    (시나리오, 전략)별로 실행 순서상 첫 레코드가 JIT warm-up 때문에 느린지 판정합니다.
+    run-benchmark.ts 는 시나리오 → 시드 → 전략 순서로 돌기 때문에, 각 전략의 첫 실행(특히 첫 시나리오의 첫 시드)은
+    V8 이 코드를 최적화하기 전이라 체계적으로 느립니다. 첫 레코드의 totalTime 이 나머지 레코드의
+    중앙값/MAD 기준으로 z_threshold 이상, 그리고 min_ratio 배 이상 느리면 warm-up 으로 표시합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임 (한 실행, 행 순서 = 실행 순서).
+        z_threshold (float): warm-up 으로 볼 최소 robust z 점수. 기본값은 config.yaml 의 robust.warmup_z.
+        min_ratio (float): warm-up 으로 볼 최소 (첫 실행 / 나머지 중앙값) 비율.
+
+    Returns:
+        pd.DataFrame: scenario, strategy, record, seed, first_ms, steady_median_ms, ratio, z,
+                      first_of_strategy (전략의 전체 첫 실행 여부), warmup 컬럼.
+    """
+    cfg = load_config().get('robust', {})
+    z_threshold = cfg.get('warmup_z', 3.5) if z_threshold is None else z_threshold
+    min_ratio = cfg.get('warmup_min_ratio', 1.2) if min_ratio is None else min_ratio
+
+    records = df.reset_index(drop=True)
+    first_of_strategy = set(records.groupby('strategy', sort=False).head(1).index)
+    rows = []
+    if CENSORED_COLUMN in records.columns:
+        records = records[~records[CENSORED_COLUMN]]  # 예산에서 잘린 시간은 warm-up 판정에 쓰지 않습니다.
+    for (scenario, strategy), group in records.groupby(cell_columns, sort=False):
+        times = group['totalTime'].to_numpy(float)
+        if len(times) < 3:
+            continue  # 나머지 표본이 2개 미만이면 중앙값/MAD 를 믿을 수 없습니다.
+        first, rest = times[:1], times[1:]
+        steady = float(np.median(rest))
+        z = float(robust_z(first, rest)[0])
+        ratio = float(first[0] / steady) if steady > 0 else np.nan
+        rows.append({
+            'scenario': scenario,
+            'strategy': strategy,
+            'record': int(group.index[0]),
+            'seed': group['seed'].iloc[0],
+            'first_ms': float(first[0]),
+            'steady_median_ms': steady,
+            'ratio': ratio,
+            'z': z,
+            'first_of_strategy': group.index[0] in first_of_strategy,
+            'warmup': bool(z >= z_threshold and ratio >= min_ratio),
+        })
+    return pd.DataFrame(rows, columns=[
+        'scenario', 'strategy', 'record', 'seed', 'first_ms', 'steady_median_ms',
+        'ratio', 'z', 'first_of_strategy', 'warmup',
+    ])
+
+
+def robust_summary(df: pd.DataFrame, warmup: pd.DataFrame = None, max_level: int = None) -> pd.DataFrame:
+    """
+    (시나리오, 전략, 측정 경로)별 견고한(robust) 통계를 계산합니다.
+    warm-up 으로 판정된 레코드는 (config.yaml 의 robust.exclude_warmup 이 켜져 있으면) 모든 경로에서 제외하고,
+    남은 표본으로 평균/중앙값 부트스트랩 신뢰구간, p90/p99, MAD 이상치를 계산합니다.
+    이상치는 표시만 하고 제외하지 않습니다 (작은 표본에서는 실제 꼬리 지연일 수 있습니다).
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임 (한 실행).
+        warmup (pd.DataFrame): detect_warmup 결과. 없으면 여기서 계산합니다.
+        max_level (int): 포함할 최대 측정 레벨 (0 = totalTime). 기본값은 config.yaml 의 robust.max_level.
+
+    Returns:
+        pd.DataFrame: (scenario, strategy, path) 인덱스와 level, n, n_excluded, mean, std, min, max, mean_ci_low, mean_ci_high,
+                      median, median_ci_low, median_ci_high, p90, p99, mad, ci_halfwidth_pct, outlier_seeds 컬럼.
+    """
+    cfg = load_config().get('robust', {})
+    max_level = cfg.get('max_level', 2) if max_level is None else max_level
+    rng = np.random.default_rng(cfg.get('seed', 0))
+    if warmup is None:
+        warmup = detect_warmup(df)
+
+    long = timer_tree.to_long(df)
+    long = long[long['level'] <= max_level]
+    excluded = set()
+    if cfg.get('exclude_warmup', True) and not warmup.empty:
+        excluded = set(warmup.loc[warmup['warmup'], 'record'])
+    is_excluded = long['record'].isin(excluded)
+    n_excluded = is_excluded.groupby([long[c] for c in series_columns], sort=False).sum()
+    used = long[~is_excluded]
+
+    grouped = used.groupby(series_columns, sort=False)
+    stats = grouped['time'].agg(n='count', mean='mean', std='std', min='min', max='max', median='median')
+    quantiles = grouped['time'].quantile([0.9, 0.99]).unstack()
+    quantiles.columns = ['p90', 'p99']
+    stats = stats.join(quantiles).join(grouped['level'].first())
+    stats['n_excluded'] = n_excluded.reindex(stats.index).fillna(0).astype(int)
+
+    # 부트스트랩: 표본 크기가 같은 시계열끼리 묶어서 한 번에 계산합니다.
+    series = {key: (group['time'].to_numpy(float), group['seed'].to_numpy()) for key, group in grouped}
+    ci = pd.DataFrame(np.nan, index=stats.index,
+                      columns=['mean_ci_low', 'mean_ci_high', 'median_ci_low', 'median_ci_high'])
+    for n, keys in stats.groupby('n').groups.items():
+        if n < 2:
+            continue
+        matrix = np.vstack([series[key][0] for key in keys])
+        bounds = bootstrap_ci(matrix, cfg.get('bootstrap_samples', 2000), cfg.get('confidence', 0.95), rng)
+        ci.loc[keys, list(bounds)] = np.column_stack(list(bounds.values()))
+    stats = stats.join(ci)
+
+    # MAD 이상치 (시드 목록으로 기록)
+    outlier_z = cfg.get('outlier_z', 3.5)
+    mads, outliers = [], []
+    for key in stats.index:
+        times, seeds = series[key]
+        mads.append(float(MAD_SCALE * np.median(np.abs(times - np.median(times)))))
+        outliers.append([int(seed) for seed in seeds[np.abs(robust_z(times)) > outlier_z]])
+    stats['mad'] = mads
+    stats['outlier_seeds'] = outliers
+
+    # 평균 신뢰구간의 반폭을 평균 대비 % 로 (의사결정 시 "얼마나 믿을 수 있나"의 한 줄 요약)
+    stats['ci_halfwidth_pct'] = (stats['mean_ci_high'] - stats['mean_ci_low']) / 2 / stats['mean'] * 100
+
+    # 시나리오/전략은 데이터에 처음 등장한 순서 (warm-up 제외로 순서가 바뀌지 않도록)
+    order = np.lexsort([
+        stats['level'].to_numpy(),
+        stats.index.get_level_values('strategy').map(_rank(df['strategy'])).to_numpy(),
+        stats.index.get_level_values('scenario').map(_rank(df['scenario'])).to_numpy(),
+    ])
+    stats = stats.iloc[order]
+
+    columns = ['level', 'n', 'n_excluded', 'mean', 'std', 'min', 'max', 'mean_ci_low', 'mean_ci_high', 'median',
+               'median_ci_low', 'median_ci_high', 'p90', 'p99', 'mad', 'ci_halfwidth_pct', 'outlier_seeds']
+    return stats[columns]
+
+
+def _rank(values: pd.Series) -> dict:
+    return {value: i for i, value in enumerate(pd.unique(values))}
@@ -0,0 +1,368 @@
+import functools
+import json
+import math
+import os
+import time
+from statistics import NormalDist
+from typing import Optional
+
+import config
+
+# --- 설정 ---
+# 다이어그램마다 전략(A-Star, Bus-Channel, Vertices-Network)을 고르기 전에, 그래프 특징만으로 실행 시간을 예측합니다.
+# - 특징: nodes 와 크기에 무관한 비율 edges_per_node, ports_per_node (ports: 라우터의 포트 후보 수).
+#   groups, density, ports 는 측정된 시나리오에서 모두 nodes 를 따라 커지므로 (크기 종류가 몇 개뿐) 그대로 넣으면
+#   서로 구분되지 않는 가중치가 생기고, 한 특징만 다른 질의(groups 가 큰 그래프 등)에서 예측이 엉뚱하게 튑니다.
+#   그래서 groups/density 는 빼고, edges/ports 는 nodes 당 비율로 바꿔 넣습니다 (학습 데이터에서 일정하면 가중치 0).
+# - 모델: 전략 × (Total, L1 단계)마다 log(time) = b + Σ w_i·z_i, z_i = 표준화한 log(1 + 특징) 를 ridge 로 적합합니다.
+# - 셀마다 학습 데이터의 특징 범위를 저장하고, 예측은 그 범위로 잘라서 합니다. 범위 밖의 질의(외삽)는
+#   예산 안이라고 판정하지 않으며, 모든 전략이 범위 밖이면 추천하지 않습니다 (더 큰 그래프로 먼저 측정해야 함).
+# - 시간은 보정 점수로 정규화한 값으로 적합하고, 그 기준 점수(reference_calibration_ms)를 모델에 저장합니다.
+#   recommend() 에 호출하는 호스트의 보정 점수(machine.json 의 calibrationMs)를 주면 그 호스트의 시간으로 바꿔 예측합니다.
+# - 검증: 그래프 크기 단위 교차 검증 (한 크기의 레코드를 모두 빼고 적합 → 그 크기를 예측).
+#   가장 큰 크기를 빼는 fold 가 곧 "더 큰 그래프로 외삽" 하는 경우라, 큰 다이어그램에서의 오차를 정직하게 보여줍니다.
+# - 모델 파일은 작은 JSON 이며, recommend() 는 numpy/pandas 없이 이 파일만으로 예측합니다 (편집기 안에서 호출).
+# 크기 스윕에서 예산을 넘겨 중단된(censored) 레코드는 히스토리에 들어가지 않으므로 적합에서도 빠집니다.
+MODEL_VERSION = 2
+MODEL_PATH = os.path.join(os.path.dirname(__file__), 'models', 'runtime_model.json')
+FEATURES = ['nodes', 'edges_per_node', 'ports_per_node']
+RANGE_TOLERANCE = 1e-9  # 특징 범위 비교의 상대 허용 오차
+ROOT_KEY = 'Total'  # timer_tree.ROOT_PATH
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('model', {})
+    return {
+        'budget_ms': cfg.get('budget_ms', 100),
+        'recent_runs': cfg.get('recent_runs', 2),
+        'ridge': cfg.get('ridge', 1.0),
+        'folds': cfg.get('folds', 10),
+        'confidence': cfg.get('confidence', 0.9),
+        'ports_per_side': cfg.get('ports_per_side', 6),
+        'quality_metric': cfg.get('quality_metric', 'crossings'),
+        'seed': cfg.get('seed', 0),
+    }
+
+
+def graph_features(graph_stats: dict, ports_per_side: Optional[int] = None) -> dict:
+    """
+    그래프 통계(nodes, edges, ports 는 선택)에서 모델 특징을 계산합니다. groups 등 다른 키는 쓰지 않습니다.
+    ports 가 없으면 src/app/config.ts 와 같이 노드마다 4면 × ports_per_side 개로 봅니다.
+    """
+    nodes = float(graph_stats['nodes'])
+    ports = graph_stats.get('ports')
+    if ports is None:
+        ports = nodes * 4 * (ports_per_side or _settings()['ports_per_side'])
+    return {
+        'nodes': nodes,
+        'edges_per_node': float(graph_stats['edges']) / nodes if nodes else 0.0,
+        'ports_per_node': float(ports) / nodes if nodes else 0.0,
+    }
+
+
+# --- 적합 (numpy / pandas) ---
+
+def _design(features, center, scale):
+    import numpy as np
+
+    return (np.log1p(features) - center) / scale
+
+
+def _ridge(x, y, alpha: float):
+    """표준화된 특징 x 에 대한 ridge 회귀 (절편은 벌점 없음). (절편, 계수) 를 반환합니다."""
+    import numpy as np
+
+    x_mean, y_mean = x.mean(axis=0), y.mean()
+    xc = x - x_mean
+    weights = np.linalg.solve(xc.T @ xc + alpha * np.eye(x.shape[1]), xc.T @ (y - y_mean))
+    return y_mean - x_mean @ weights, weights
+
+
+def _cv_folds(sizes, n_folds: int, rng) -> tuple:
+    """
+    교차 검증 fold 번호. 크기가 3종류 이상이면 크기 단위 (fold 수 = min(n_folds, 크기 수)),
+    그보다 적으면 레코드 단위 무작위 fold 입니다. (fold 번호 배열, 방식) 을 반환합니다.
+    """
+    import numpy as np
+
+    unique, codes = np.unique(sizes, axis=0, return_inverse=True)
+    codes = codes.reshape(-1)
+    if len(unique) >= 3:
+        return codes % min(n_folds, len(unique)), 'size'
+    return rng.permutation(len(sizes)) % min(n_folds, len(sizes)), 'record'
+
+
+def fit_cell(features, log_time, settings: dict, rng) -> dict:
+    """
+    한 (전략, 단계) 셀의 모델과 교차 검증 오차를 계산합니다.
+
+    Args:
+        features (np.ndarray): 레코드 × FEATURES 원시 특징.
+        log_time (np.ndarray): 레코드별 log(ms).
+        settings (dict): _settings() 결과.
+        rng (np.random.Generator): 레코드 단위 fold 용 난수 생성기.
+
+    Returns:
+        dict: 모델 파일에 들어갈 intercept, weights, center, scale, feature_min, feature_max (학습 데이터의 특징 범위),
+              residual_std (CV 잔차, log) 와 n, sizes, r2, cv, cv_mape (평균 절대 백분율 오차 %), cv_p90_ape.
+    """
+    import numpy as np
+
+    logged = np.log1p(features)
+    center, scale = logged.mean(axis=0), logged.std(axis=0)
+    scale[scale == 0] = 1.0
+    x = _design(features, center, scale)
+    intercept, weights = _ridge(x, log_time, settings['ridge'])
+    fitted = intercept + x @ weights
+    total = ((log_time - log_time.mean()) ** 2).sum()
+
+    folds, method = _cv_folds(features, settings['folds'], rng)
+    predicted = np.empty_like(log_time)
+    for fold in np.unique(folds):
+        test = folds == fold
+        # fold 안에서도 표준화 기준을 학습 데이터로만 잡아, 빠진 크기의 정보가 새지 않게 합니다.
+        train_logged = logged[~test]
+        train_center, train_scale = train_logged.mean(axis=0), train_logged.std(axis=0)
+        train_scale[train_scale == 0] = 1.0
+        b, w = _ridge(_design(features[~test], train_center, train_scale), log_time[~test], settings['ridge'])
+        predicted[test] = b + _design(features[test], train_center, train_scale) @ w
+    residual = log_time - predicted
+    ape = np.abs(np.expm1(predicted - log_time)) * 100  # |예측 / 실제 - 1| (%)
+
+    return {
+        'intercept': float(intercept),
+        'weights': [float(w) for w in weights],
+        'center': [float(c) for c in center],
+        'scale': [float(s) for s in scale],
+        'feature_min': [float(v) for v in features.min(axis=0)],
+        'feature_max': [float(v) for v in features.max(axis=0)],
+        'residual_std': float(np.sqrt((residual ** 2).mean())),
+        'n': int(len(log_time)),
+        'sizes': int(len(np.unique(features, axis=0))),
+        'r2': float(1 - ((log_time - fitted) ** 2).sum() / total) if total > 0 else float('nan'),
+        'cv': method,
+        'cv_mape': float(ape.mean()),
+        'cv_p90_ape': float(np.percentile(ape, 90)),
+    }
+
+
+def feature_frame(wide):
+    """
+    wide 히스토리(record_stream.pivot_wide)에 FEATURES 컬럼을 채웁니다.
+    크기가 기록되지 않은 과거 실행은 config.yaml 의 scenarios 표, ports 가 없으면 nodes × 4 × ports_per_side.
+    """
+    import analyzer
+
+    sized = analyzer.attach_scenario_sizes(wide)
+    ports = sized['nodes'] * 4 * _settings()['ports_per_side']
+    sized['ports'] = sized['ports'].fillna(ports) if 'ports' in sized.columns else ports
+    sized['edges_per_node'] = sized['edges'] / sized['nodes']
+    sized['ports_per_node'] = sized['ports'] / sized['nodes']
+    return sized
+
+
+def strategy_quality(runs: list, metric: str) -> dict:
+    """
+    히스토리 실행들의 layouts.ndjson 에서 전략별 상대 품질 점수를 계산합니다 (작을수록 좋음).
+    지표는 그래프 크기에 따라 커지므로, 시나리오마다 전략 평균을 그 시나리오의 전략 간 평균으로 나눈 뒤 평균합니다.
+    레이아웃이 기록된 실행이 없으면 빈 dict.
+    """
+    import pandas as pd
+
+    import data_loader
+    import layout_quality
+
+    frames = []
+    for run in runs:
+        path = layout_quality.find_layout_file(os.path.join(data_loader.RESULTS_DIR, run))
+        if path:
+            frames.append(layout_quality.load_quality(path))
+    if not frames:
+        return {}
+    quality = pd.concat(frames, ignore_index=True)
+    means = quality.groupby(['scenario', 'strategy'])[metric].mean().unstack('strategy')
+    relative = means.div(means.mean(axis=1).replace(0, float('nan')), axis=0)
+    return {strategy: float(score) for strategy, score in relative.mean().dropna().items()}
+
+
+def fit_model(wide, runs: list) -> dict:
+    """
+    히스토리에서 전략 × (Total, L1 단계)별 런타임 모델을 적합합니다.
+
+    Args:
+        wide (pd.DataFrame): record_stream.pivot_wide 로 펼친 히스토리 (보정 점수로 정규화된 시간).
+        runs (list): 적합에 쓴 실행 이름 (모델 파일에 기록, 품질 점수 계산).
+
+    Returns:
+        dict: 모델 파일 내용. reference_calibration_ms (정규화 기준 점수, 정규화하지 않았으면 None),
+              strategies → {steps: {단계: fit_cell 결과}, quality?}.
+    """
+    import numpy as np
+
+    import machine
+    import timer_tree
+    from record_stream import CALIBRATION_COLUMN
+
+    settings = _settings()
+    rng = np.random.default_rng(settings['seed'])
+    sized = feature_frame(wide).reset_index(drop=True)
+    long = timer_tree.to_long(sized)
+    long = long[(long['level'] <= 1) & (long['time'] > 0)]
+    features = sized[FEATURES].to_numpy(float)
+
+    quality = strategy_quality(runs, settings['quality_metric'])
+    strategies = {}
+    for (strategy, path), group in long.groupby(['strategy', 'path'], sort=True):
+        records = group['record'].to_numpy()
+        cell_features = features[records]
+        valid = ~np.isnan(cell_features).any(axis=1)
+        if len(np.unique(cell_features[valid], axis=0)) < 2:
+            continue  # 크기가 한 종류뿐이면 크기에 따른 변화를 알 수 없습니다.
+        cell = fit_cell(cell_features[valid], np.log(group['time'].to_numpy(float)[valid]), settings, rng)
+        entry = strategies.setdefault(strategy, {'steps': {}})
+        entry['steps'][path] = cell
+        if strategy in quality:
+            entry['quality'] = quality[strategy]
+
+    return {
+        'version': MODEL_VERSION,
+        'created': time.strftime('%Y-%m-%dT%H:%M:%S'),
+        'runs': [runs[0], runs[-1]] if runs else [],
+        'features': FEATURES,
+        # load_history_data → machine.normalize_long 이 쓴 것과 같은 기준 점수
+        'reference_calibration_ms': (machine.reference_calibration(sized[CALIBRATION_COLUMN])
+                                     if CALIBRATION_COLUMN in sized.columns else None),
+        'ports_per_side': settings['ports_per_side'],
+        'confidence': settings['confidence'],
+        'quality_metric': settings['quality_metric'] if quality else None,
+        'strategies': {name: entry for name, entry in strategies.items() if ROOT_KEY in entry['steps']},
+    }
+
+
+def cv_table(model: dict):
+    """모델의 셀별 교차 검증 결과 표 (strategy, step, n, sizes, r2, cv, cv_mape, cv_p90_ape)."""
+    import pandas as pd
+
+    rows = [
+        {'strategy': strategy, 'step': step, **{k: cell[k] for k in ('n', 'sizes', 'r2', 'cv', 'cv_mape', 'cv_p90_ape')}}
+        for strategy, entry in model['strategies'].items()
+        for step, cell in entry['steps'].items()
+    ]
+    return pd.DataFrame(rows)
+
+
+def save_model(model: dict, path: str = MODEL_PATH):
+    """모델 파일을 씁니다 (임시 파일 + rename)."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    tmp_path = path + '.tmp'
+    with open(tmp_path, 'w') as f:
+        json.dump(model, f, indent=1)
+    os.replace(tmp_path, path)
+
+
+# --- 예측 / 추천 (표준 라이브러리만) ---
+
+@functools.lru_cache(maxsize=4)
+def _load_cached(path: str, mtime: float) -> dict:
+    with open(path, 'r') as f:
+        model = json.load(f)
+    if model.get('version') != MODEL_VERSION:
+        raise ValueError(f"Unsupported runtime model version {model.get('version')} in '{path}'")
+    return model
+
+
+def load_model(path: str = MODEL_PATH) -> dict:
+    """모델 파일을 읽습니다. 파일이 바뀌지 않았으면 이전에 읽은 내용을 그대로 씁니다."""
+    return _load_cached(path, os.path.getmtime(path))
+
+
+def out_of_range(cell: dict, features: dict) -> list:
+    """
+    학습 데이터의 특징 범위(feature_min..feature_max) 밖에 있는 특징 이름.
+    학습 데이터에서 일정했던 특징(범위 폭 0, 예: 모든 시나리오의 edges_per_node = 1.5)은 가중치가 0 이라
+    예측에 영향이 없으므로 검사하지 않습니다. 그렇지 않으면 비율이 조금만 달라도 모든 그래프가 범위 밖이 됩니다.
+    """
+    return [
+        name for name, low, high in zip(FEATURES, cell['feature_min'], cell['feature_max'])
+        if high - low > RANGE_TOLERANCE * max(abs(low), abs(high))
+        and not low - RANGE_TOLERANCE * abs(low) <= features[name] <= high + RANGE_TOLERANCE * abs(high)
+    ]
+
+
+def predict_ms(cell: dict, features: dict) -> float:
+    """한 셀의 예측 시간 (ms, 기하 평균 기준, 정규화된 시간). 특징은 학습 데이터의 범위로 잘라서 씁니다."""
+    log_time = cell['intercept']
+    for i, name in enumerate(FEATURES):
+        value = min(max(features[name], cell['feature_min'][i]), cell['feature_max'][i])
+        log_time += cell['weights'][i] * (math.log1p(value) - cell['center'][i]) / cell['scale'][i]
+    return math.exp(log_time)
+
+
+def recommend(
+    graph_stats: dict,
+    time_budget_ms: Optional[float] = None,
+    model: Optional[dict] = None,
+    calibration_ms: Optional[float] = None,
+) -> dict:
+    """
+    그래프 통계와 시간 예산으로 전략을 추천합니다.
+    예측 상한 (예측 × exp(z·CV 잔차 표준편차), 모델의 confidence 수준) 이 예산 안에 드는 전략 중
+    품질 점수가 가장 좋은 전략을 (품질 정보가 없으면 가장 빠른 전략을) 고릅니다.
+    학습 데이터의 특징 범위 밖인 전략(extrapolated)은 예산 안으로 보지 않습니다 (예측은 범위 끝에서 잘린 값).
+    학습 데이터에서 일정했던 특징은 범위 검사에서 빠집니다 (out_of_range 참고).
+    예산 안에 드는 전략이 없으면 범위 안의 가장 빠른 전략을 within_budget=False 로, 모든 전략이 범위 밖이면
+    strategy=None 을 반환합니다.
+
+    Args:
+        graph_stats (dict): nodes, edges (선택: ports).
+        time_budget_ms (Optional[float]): 시간 예산 (ms). 기본값은 config.yaml 의 model.budget_ms.
+        model (Optional[dict]): load_model 결과. 없으면 기본 모델 파일을 읽습니다.
+        calibration_ms (Optional[float]): 실행할 호스트의 보정 점수 (machine.json 의 calibrationMs).
+            주면 예측을 그 호스트의 시간으로 바꾸고 (× calibration_ms / 모델의 기준 점수), 없으면 기준 호스트의 시간입니다.
+
+    Returns:
+        dict: strategy, within_budget, extrapolated (모든 전략이 범위 밖), budget_ms, time_scale (호스트 환산 배율),
+              candidates (전략별 predicted_ms, upper_ms, steps, within_budget, quality, extrapolated,
+              out_of_range; 예측 시간 순).
+    """
+    model = model or load_model()
+    budget_ms = time_budget_ms if time_budget_ms is not None else _settings()['budget_ms']
+    features = graph_features(graph_stats, model.get('ports_per_side'))
+    z = NormalDist().inv_cdf(model.get('confidence', 0.9))
+    reference = model.get('reference_calibration_ms')
+    time_scale = calibration_ms / reference if calibration_ms and reference else 1.0
+
+    candidates = []
+    for strategy, entry in model['strategies'].items():
+        total = entry['steps'][ROOT_KEY]
+        predicted = predict_ms(total, features) * time_scale
+        upper = predicted * math.exp(z * total['residual_std'])
+        outside = out_of_range(total, features)
+        candidates.append({
+            'strategy': strategy,
+            'predicted_ms': predicted,
+            'upper_ms': upper,
+            'steps': {step: predict_ms(cell, features) * time_scale
+                      for step, cell in entry['steps'].items() if step != ROOT_KEY},
+            'within_budget': upper <= budget_ms and not outside,
+            'quality': entry.get('quality'),
+            'extrapolated': bool(outside),
+            'out_of_range': outside,
+        })
+    candidates.sort(key=lambda c: c['predicted_ms'])
+
+    in_range = [c for c in candidates if not c['extrapolated']]
+    fitting = [c for c in in_range if c['within_budget']]
+    if fitting:
+        rated = [c for c in fitting if c['quality'] is not None]
+        best = min(rated, key=lambda c: c['quality']) if rated else fitting[0]
+    else:
+        best = in_range[0] if in_range else None
+    return {
+        'strategy': best['strategy'] if best else None,
+        'within_budget': bool(fitting),
+        'extrapolated': bool(candidates) and not in_range,
+        'budget_ms': budget_ms,
+        'time_scale': time_scale,
+        'candidates': candidates,
+    }
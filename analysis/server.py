@@ -0,0 +1,383 @@
+import json
+import math
+import os
+import threading
+import time
+import traceback
+from collections import OrderedDict
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Optional
+from urllib.parse import parse_qs, urlparse
+
+import config
+import data_loader
+
+# --- 설정 ---
+# 분석 결과를 대시보드/스크립트가 HTTP(JSON) 로 물어볼 수 있게 하는 로컬 질의 서비스입니다 (python main.py serve).
+# - 질의마다 원시 결과 파일을 다시 읽지 않도록, 실행별 데이터프레임과 집계 큐브(aggregates.build_cube)를
+#   실행 지문(원시 파일과 machine.json 의 경로/mtime/크기)을 키로 하는 LRU 캐시에 둡니다.
+# - 응답 JSON 도 (경로, 질의, 관련 실행 지문) 키로 캐시하므로, 같은 질의는 파일/계산 없이 바로 응답합니다.
+# - 질의마다 results/ 의 실행 디렉터리들의 mtime 을 확인해, 바뀌었으면(실행이 생기거나 지워짐, 실행 디렉터리에
+#   원시 결과 파일이 뒤늦게 생김) 실행 목록을 다시 만들고, 목록이 달라졌을 때만 응답 캐시를 비웁니다.
+#   기존 실행의 파일이 다시 쓰이면 지문이 바뀌어 그 실행의 항목만 자연스럽게 다시 계산됩니다.
+# 엔드포인트 (GET, 모두 JSON):
+#   /runs                                             실행 목록과 원시 결과 파일
+#   /summary?run=&scenario=&strategy=                 (시나리오, 전략)별 totalTime 통계 (warm-up 제외, 보고서/CLI 와 같은 표본)
+#   /breakdown?run=&scenario=&strategy=&max_level=    측정 경로별 inclusive/exclusive 시간과 비중
+#   /diff?baseline=&candidate=&threshold=&alpha=      두 실행의 회귀 순위표 (main.py compare 와 같은 판정)
+#   /health                                           캐시 크기와 적중률
+# run / baseline / candidate 는 실행 디렉터리 접두사입니다 (없으면 최신 실행).
+SUMMARY_COLUMNS = ['count', 'warmup_excluded', 'mean', 'std', 'min', 'median', 'p90', 'max']
+BREAKDOWN_COLUMNS = ['key', 'level', 'parent', 'count', 'mean', 'p90', 'inclusive', 'exclusive', 'uninstrumented', 'share']
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('serve', {})
+    return {
+        'host': cfg.get('host', '127.0.0.1'),
+        'port': cfg.get('port', 8765),
+        'cache_size': cfg.get('cache_size', 256),
+        'frame_cache_size': cfg.get('frame_cache_size', 8),
+    }
+
+
+class QueryError(Exception):
+    """잘못된 질의. status 는 응답할 HTTP 상태 코드입니다."""
+
+    def __init__(self, message: str, status: int = 400):
+        super().__init__(message)
+        self.status = status
+
+
+class LRUCache:
+    """
+    최근에 쓴 항목을 max_size 개까지 남기는 스레드 안전한 캐시입니다 (OrderedDict: 끝이 가장 최근).
+    """
+
+    def __init__(self, max_size: int):
+        self.max_size = max_size
+        self.hits = 0
+        self.misses = 0
+        self._items = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._items)
+
+    def get(self, key):
+        with self._lock:
+            if key not in self._items:
+                self.misses += 1
+                return None
+            self.hits += 1
+            self._items.move_to_end(key)
+            return self._items[key]
+
+    def put(self, key, value):
+        with self._lock:
+            self._items[key] = value
+            self._items.move_to_end(key)
+            while len(self._items) > self.max_size:
+                self._items.popitem(last=False)
+
+    def clear(self):
+        with self._lock:
+            self._items.clear()
+
+    def stats(self) -> dict:
+        return {'size': len(self._items), 'max_size': self.max_size, 'hits': self.hits, 'misses': self.misses}
+
+
+def _file_stamp(path: str) -> Optional[tuple]:
+    try:
+        stat = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return os.path.basename(path), stat.st_mtime_ns, stat.st_size
+
+
+def run_fingerprint(raw_path: str) -> tuple:
+    """실행 지문: 실행 이름, 원시 결과 파일과 machine.json 의 (이름, mtime, 크기). 파일이 바뀌면 지문도 바뀝니다."""
+    import machine
+
+    run_dir = os.path.dirname(raw_path)
+    return (os.path.basename(run_dir), _file_stamp(raw_path),
+            _file_stamp(os.path.join(run_dir, machine.MACHINE_FILE_NAME)))
+
+
+def _json_value(value):
+    """numpy 스칼라와 NaN/inf 를 JSON 에 맞게 바꿉니다 (NaN → null)."""
+    if hasattr(value, 'item'):
+        value = value.item()
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def _records(df) -> list:
+    """데이터프레임(이름 있는 인덱스 포함)을 JSON 행 목록으로 바꿉니다."""
+    if any(name is not None for name in df.index.names):
+        df = df.reset_index()
+    return [{column: _json_value(value) for column, value in zip(df.columns, row)}
+            for row in df.itertuples(index=False, name=None)]
+
+
+def _float_param(params: dict, name: str) -> Optional[float]:
+    if name not in params:
+        return None
+    try:
+        return float(params[name])
+    except ValueError:
+        raise QueryError(f"Parameter '{name}' must be a number, got '{params[name]}'")
+
+
+class QueryService:
+    """
+    HTTP 와 무관한 질의 처리부입니다 (캐시와 계산). 엔드포인트 메서드는 파라미터 dict 를 받아
+    JSON 으로 직렬화할 수 있는 값을 반환하고, 잘못된 질의에는 QueryError 를 발생시킵니다.
+    """
+
+    def __init__(self, cache_size: int = None, frame_cache_size: int = None):
+        settings = _settings()
+        self.responses = LRUCache(cache_size or settings['cache_size'])
+        self.frames = LRUCache(frame_cache_size or settings['frame_cache_size'])
+        self.endpoints = {
+            '/runs': self.runs,
+            '/summary': self.summary,
+            '/breakdown': self.breakdown,
+            '/diff': self.diff,
+            '/health': self.health,
+        }
+        # pandas 계산과 파이프라인 profiler 는 스레드 안전을 보장하지 않으므로, 캐시에 없는 계산은 하나씩 합니다.
+        # (큐브 계산이 데이터프레임 계산을 부르므로 재진입 가능한 잠금)
+        self._compute_lock = threading.RLock()
+        self._results_stamp = None
+        self._runs = None
+
+    # --- 실행 목록 / 캐시 무효화 ---
+
+    def _refresh(self):
+        """
+        실행 디렉터리들의 (이름, mtime) 이 바뀌었으면 실행 목록을 다시 만듭니다. 실행 디렉터리는 원시 결과 파일보다
+        먼저 만들어지므로 results/ 자체의 mtime 만으로는 부족합니다 (파일이 생기거나 교체되면 디렉터리 mtime 이 바뀜).
+        목록(실행 → 원시 결과 파일)이 달라졌을 때만 응답 캐시를 비웁니다.
+        """
+        try:
+            with os.scandir(data_loader.RESULTS_DIR) as entries:
+                stamp = tuple(sorted((entry.name, entry.stat().st_mtime_ns) for entry in entries if entry.is_dir()))
+        except FileNotFoundError:
+            raise QueryError(f"Results directory not found at '{data_loader.RESULTS_DIR}'", status=404)
+        if stamp != self._results_stamp:
+            runs = {os.path.basename(os.path.dirname(path)): path for path in data_loader.list_benchmark_files()}
+            if runs != self._runs:
+                self.responses.clear()
+            self._runs = runs
+            self._results_stamp = stamp
+
+    def _run_files(self) -> dict:
+        """실행 이름 → 원시 결과 파일 경로 (오래된 순)."""
+        if self._runs is None:
+            self._refresh()
+        return self._runs
+
+    def resolve(self, prefix: Optional[str]) -> str:
+        """실행 디렉터리 접두사(없으면 최신 실행)에 맞는 가장 최신 실행의 원시 결과 파일 경로."""
+        runs = self._run_files()
+        matches = [name for name in runs if not prefix or name.startswith(prefix)]
+        if not matches:
+            raise QueryError(f"No results found for prefix '{prefix}'" if prefix else "No benchmark runs found", status=404)
+        return runs[matches[-1]]
+
+    # --- 실행별 데이터 (frame 캐시) ---
+
+    def _compute(self, cache: LRUCache, key, compute: Callable):
+        value = cache.get(key)
+        if value is None:
+            with self._compute_lock:
+                value = cache.get(key)
+                if value is None:
+                    value = compute()
+                    cache.put(key, value)
+        return value
+
+    def frame(self, raw_path: str):
+        """정규화하지 않은 wide 데이터프레임 (compare 처럼 여러 실행을 같은 기준으로 정규화할 때 씁니다)."""
+        def load():
+            df = data_loader.load_and_preprocess_data(raw_path, normalize=False)
+            if df is None:
+                raise QueryError(f"Failed to load '{raw_path}'", status=422)
+            return df
+
+        return self._compute(self.frames, ('frame', run_fingerprint(raw_path)), load)
+
+    def cube(self, raw_path: str):
+        """파이프라인과 같은 (실행 자체의 보정 점수로 정규화한) 데이터의 집계 큐브."""
+        import aggregates
+        import machine
+
+        return self._compute(self.frames, ('cube', run_fingerprint(raw_path)),
+                             lambda: aggregates.build_cube(machine.normalize_frame(self.frame(raw_path))))
+
+    def steady(self, raw_path: str):
+        """robust_stats.robust_summary 의 totalTime 통계 (warm-up 레코드를 뺀 정상 상태, 분석 파이프라인과 같은 표본)."""
+        import machine
+        import robust_stats
+
+        def compute():
+            stats = robust_stats.robust_summary(machine.normalize_frame(self.frame(raw_path)), max_level=0)
+            return stats.rename(columns={'n': 'count', 'n_excluded': 'warmup_excluded'})
+
+        return self._compute(self.frames, ('steady', run_fingerprint(raw_path)), compute)
+
+    def _cells(self, cube, params: dict):
+        """scenario / strategy 파라미터로 큐브 행을 거릅니다."""
+        for name in ('scenario', 'strategy'):
+            if name in params:
+                values = cube.index.get_level_values(name)
+                if params[name] not in set(values):
+                    raise QueryError(f"Unknown {name} '{params[name]}' (available: {', '.join(dict.fromkeys(values))})",
+                                     status=404)
+                cube = cube[values == params[name]]
+        return cube
+
+    # --- 엔드포인트 ---
+
+    def runs(self, params: dict) -> dict:
+        return {'runs': [{'run': run, 'file': os.path.basename(path)} for run, path in self._run_files().items()]}
+
+    def summary(self, params: dict) -> dict:
+        raw_path = self.resolve(params.get('run'))
+        stats = self._cells(self.steady(raw_path), params)
+        rows = stats[SUMMARY_COLUMNS].droplevel('path')
+        return {'run': run_fingerprint(raw_path)[0], 'key': 'totalTime', 'sample': 'steady_state', 'rows': _records(rows)}
+
+    def breakdown(self, params: dict) -> dict:
+        raw_path = self.resolve(params.get('run'))
+        cube = self._cells(self.cube(raw_path), params)
+        max_level = _float_param(params, 'max_level')
+        if max_level is not None:
+            cube = cube[cube['level'] <= max_level]
+        return {'run': run_fingerprint(raw_path)[0], 'rows': _records(cube[BREAKDOWN_COLUMNS])}
+
+    def diff(self, params: dict) -> dict:
+        import machine
+        import regression
+
+        if 'baseline' not in params or 'candidate' not in params:
+            raise QueryError("Parameters 'baseline' and 'candidate' are required")
+        paths = [self.resolve(params['baseline']), self.resolve(params['candidate'])]
+
+        def compare():
+            frames = machine.normalize_together([self.frame(path) for path in paths],
+                                                [os.path.dirname(path) for path in paths])
+            if frames is None:
+                raise QueryError("Runs come from incompatible machines (machine.on_mismatch: error)", status=409)
+            return regression.compare_runs(*frames, threshold_pct=_float_param(params, 'threshold'),
+                                           alpha=_float_param(params, 'alpha'))
+
+        result = self._compute(self.frames, ('diff', *map(run_fingerprint, paths),
+                                             params.get('threshold'), params.get('alpha')), compare)
+        return {
+            'baseline': run_fingerprint(paths[0])[0],
+            'candidate': run_fingerprint(paths[1])[0],
+            'regressions': int((result['verdict'] == 'regression').sum()) if not result.empty else 0,
+            'rows': _records(result) if not result.empty else [],
+        }
+
+    def health(self, params: dict) -> dict:
+        return {'status': 'ok', 'responses': self.responses.stats(), 'frames': self.frames.stats()}
+
+    # --- 질의 ---
+
+    def query(self, path: str, params: dict) -> tuple:
+        """
+        질의에 대한 (HTTP 상태, JSON bytes, 캐시 적중 여부) 를 반환합니다.
+        응답 키에 관련 실행의 지문을 넣으므로, 실행 파일이 바뀐 뒤의 응답은 새로 계산됩니다.
+        """
+        endpoint = self.endpoints.get(path)
+        if endpoint is None:
+            return 404, self._encode({'error': f"Unknown endpoint '{path}'", 'endpoints': list(self.endpoints)}), False
+        if endpoint == self.health:
+            return 200, self._encode(endpoint(params)), False
+        try:
+            self._refresh()
+            runs = tuple(run_fingerprint(self.resolve(params[name]))
+                         for name in ('run', 'baseline', 'candidate') if name in params)
+            if path in ('/summary', '/breakdown') and 'run' not in params:
+                runs += (run_fingerprint(self.resolve(None)),)
+            key = (path, tuple(sorted(params.items())), runs)
+            cached = self.responses.get(key)
+            if cached is not None:
+                return 200, cached, True
+            body = self._encode(endpoint(params))
+        except QueryError as e:
+            return e.status, self._encode({'error': str(e)}), False
+        except Exception as e:
+            # 계산 중 예상하지 못한 오류도 연결을 끊지 않고 JSON 으로 응답합니다 (자세한 내용은 서버 로그).
+            print(f"❌ Error: {path} failed: {e!r}")
+            traceback.print_exc()
+            return 500, self._encode({'error': f"Internal error: {e}"}), False
+        self.responses.put(key, body)
+        return 200, body, False
+
+    @staticmethod
+    def _encode(payload: dict) -> bytes:
+        return json.dumps(payload, ensure_ascii=False, allow_nan=False).encode('utf-8')
+
+
+def _make_handler(service: QueryService):
+    class Handler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            started = time.perf_counter()
+            url = urlparse(self.path)
+            params = {name: values[-1] for name, values in parse_qs(url.query).items()}
+            status, body, hit = service.query(url.path.rstrip('/') or '/', params)
+            self.send_response(status)
+            self.send_header('Content-Type', 'application/json; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.send_header('X-Cache', 'hit' if hit else 'miss')
+            self.end_headers()
+            self.wfile.write(body)
+            elapsed_ms = (time.perf_counter() - started) * 1000
+            print(f"🌐 {status} {self.path} ({'cached, ' if hit else ''}{elapsed_ms:.1f} ms)")
+
+        def log_message(self, format, *args):
+            # 요청 로그는 do_GET 에서 처리 시간과 함께 출력합니다.
+            pass
+
+    return Handler
+
+
+def serve(host: str = None, port: int = None) -> int:
+    """
+    질의 서비스를 띄우고 Ctrl+C 까지 요청을 처리합니다 (요청마다 스레드).
+
+    Args:
+        host (str): 바인드할 주소. 기본값은 config.yaml 의 serve.host (로컬 전용 127.0.0.1).
+        port (int): 포트. 기본값은 serve.port.
+
+    Returns:
+        int: 종료 코드.
+    """
+    settings = _settings()
+    host = host or settings['host']
+    port = port or settings['port']
+    if not os.path.isdir(data_loader.RESULTS_DIR):
+        print(f"❌ Error: Results directory not found at '{data_loader.RESULTS_DIR}'")
+        return 1
+
+    service = QueryService()
+    try:
+        server = ThreadingHTTPServer((host, port), _make_handler(service))
+    except OSError as e:
+        print(f"❌ Error: Cannot listen on {host}:{port} ({e})")
+        return 1
+    server.daemon_threads = True
+    print(f"🌐 Serving analysis queries on http://{host}:{port} ({', '.join(service.endpoints)}). Press Ctrl+C to stop.")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print("\n👋 Stopped.")
+    finally:
+        server.server_close()
+    return 0
@@ -0,0 +1,254 @@
+import argparse
+import os
+import signal
+import subprocess
+import sys
+import time
+from typing import Optional
+
+import aggregates
+import config
+import data_loader
+import machine
+import orchestrator
+import record_stream
+from record_stream import BUDGET_COLUMN, CENSORED_COLUMN
+
+# --- 설정 ---
+# 고정 시나리오(12/60/120 노드)보다 큰 그래프에서 전략별 실용 한계를 찾기 위한 크기 스윕입니다.
+# 노드/엣지 수를 단계마다 factor 배씩 키우며 전략마다 run-benchmark.ts 를 실행하고,
+# 실행 1회(시드 하나)가 시간 예산을 넘기면 프로세스를 중단해 "예산보다 오래 걸림" 인 censored 레코드를 남긴 뒤
+# 그 전략의 다음 단계는 건너뜁니다. 결과는 data_loader 가 그대로 읽는 raw_results.json 하나로 모입니다.
+SWEEP_DIR_NAME = 'sweep'
+SCENARIO_PREFIX = 'Sweep'
+POLL_INTERVAL = 0.1  # 진행 상황(raw_results.ndjson 줄 수)을 확인하는 간격 (초)
+
+
+def _kill_tree(proc: subprocess.Popen):
+    """
+    단계 프로세스와 그 자식들을 모두 끝냅니다. 기본 명령(npx tsx ...)은 npx → tsx → node 로 프로세스를 띄우므로,
+    npx 만 죽이면 node 가 남아 CPU 를 쓰고 ndjson 에 계속 기록해 다음 단계의 측정을 오염시킵니다.
+    POSIX 에서는 새 세션(프로세스 그룹)으로 띄우고 그룹 전체에 SIGKILL 을 보냅니다.
+    """
+    if os.name == 'posix':
+        try:
+            os.killpg(proc.pid, signal.SIGKILL)
+        except ProcessLookupError:
+            pass
+    else:
+        proc.kill()
+    proc.wait()
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('sweep', {})
+    return {
+        'start_nodes': cfg.get('start_nodes', 120),
+        'factor': cfg.get('factor', 2.0),
+        'max_nodes': cfg.get('max_nodes', 8000),
+        'edge_ratio': cfg.get('edge_ratio', 1.5),
+        'nodes_per_group': cfg.get('nodes_per_group', 30),
+        'seeds': cfg.get('seeds', [42]),
+        'budget_ms': cfg.get('budget_ms', 60000),
+        'startup_ms': cfg.get('startup_ms', 15000),
+        'strategies': cfg.get('strategies'),
+        'warmup': cfg.get('warmup', True),
+    }
+
+
+def sweep_sizes(start_nodes: int, factor: float, max_nodes: int, edge_ratio: float, nodes_per_group: int) -> list:
+    """
+    기하급수적으로 커지는 시나리오 크기 목록을 만듭니다 (edges = nodes × edge_ratio, groups = nodes / nodes_per_group).
+
+    Returns:
+        list: name, nodes, edges, groups 키를 가진 dict 목록 (작은 크기부터).
+    """
+    if factor <= 1:
+        raise ValueError(f"sweep.factor must be greater than 1 (got {factor})")
+    sizes, nodes = [], start_nodes
+    while nodes <= max_nodes:
+        n = int(round(nodes))
+        sizes.append({
+            'name': f'{SCENARIO_PREFIX}-{n}',
+            'nodes': n,
+            'edges': max(1, int(round(n * edge_ratio))),
+            'groups': max(1, n // nodes_per_group),
+        })
+        nodes *= factor
+    return sizes
+
+
+def run_step(
+    command: list,
+    size: dict,
+    strategy: str,
+    seeds: list,
+    step_dir: str,
+    budget_ms: float,
+    startup_ms: float,
+    extra_args: list = (),
+    warmup: bool = True,
+) -> tuple:
+    """
+    한 (크기, 전략) 단계를 실행합니다. 시드마다 예산을 따로 적용하기 위해 raw_results.ndjson 의 줄 수를 지켜보다가,
+    첫 레코드는 budget_ms + startup_ms (프로세스 시작, warm-up, 그래프 생성 포함), 그 뒤로는 레코드가 늘어난 때부터
+    budget_ms 안에 다음 레코드가 나오지 않으면 프로세스를 중단합니다.
+
+    Returns:
+        tuple: (레코드 목록, 상태). 상태는 'ok' (모두 예산 안), 'over' (끝났지만 예산 초과),
+               'timeout' (중단됨, 진행 중이던 시드는 censored 레코드), 'failed' (비정상 종료) 중 하나.
+    """
+    os.makedirs(step_dir, exist_ok=True)
+    stream_path = os.path.join(step_dir, 'raw_results.ndjson')
+    scenario = f"{size['name']}:{size['nodes']}:{size['edges']}:{size['groups']}"
+    args = command + [
+        f'--scenario={scenario}', f'--strategy={strategy}', f"--seeds={','.join(map(str, seeds))}", f'--out={step_dir}',
+    ] + ([] if warmup else ['--no-warmup']) + list(extra_args)
+    first_window, window = (budget_ms + startup_ms) / 1000, budget_ms / 1000
+
+    with open(os.path.join(step_dir, orchestrator.LOG_FILE_NAME), 'w') as log:
+        proc = subprocess.Popen(args, cwd=orchestrator.REPO_ROOT, stdout=log, stderr=subprocess.STDOUT,
+                                start_new_session=os.name == 'posix')
+        done, deadline, timed_out = 0, time.monotonic() + first_window, False
+        while proc.poll() is None:
+            time.sleep(POLL_INTERVAL)
+            lines = orchestrator.count_lines(stream_path)
+            if lines > done:
+                done, deadline = lines, time.monotonic() + window
+            elif time.monotonic() > deadline:
+                _kill_tree(proc)
+                timed_out = True
+
+    records = list(record_stream.iter_records(stream_path)) if os.path.exists(stream_path) else []
+    for record in records:
+        record[CENSORED_COLUMN] = False
+        record[BUDGET_COLUMN] = budget_ms
+    if timed_out:
+        if len(records) < len(seeds):
+            records.append({
+                'scenario': size['name'],
+                'nodes': size['nodes'],
+                'edges': size['edges'],
+                'groups': size['groups'],
+                'seed': seeds[len(records)],
+                'strategy': strategy,
+                'totalTime': budget_ms,
+                'details': {},
+                CENSORED_COLUMN: True,
+                BUDGET_COLUMN: budget_ms,
+            })
+        return records, 'timeout'
+    if proc.returncode != 0:
+        return records, 'failed'
+    if any((record.get('totalTime') or 0) > budget_ms for record in records):
+        return records, 'over'
+    return records, 'ok'
+
+
+def run_sweep(
+    budget_ms: Optional[float] = None,
+    max_nodes: Optional[int] = None,
+    strategies: Optional[list] = None,
+    extra_args: list = (),
+) -> Optional[str]:
+    """
+    전략마다 작은 그래프부터 크기를 키워가며, 예산을 넘길 때까지 실행합니다.
+    단계가 끝날 때마다 지금까지의 레코드를 raw_results.json 에 다시 써서(원자적 교체),
+    중간에 멈춰도 그때까지의 결과로 분석할 수 있습니다.
+
+    Args:
+        budget_ms (Optional[float]): 실행 1회의 시간 예산. 기본값은 config.yaml 의 sweep.budget_ms.
+        max_nodes (Optional[int]): 가장 큰 그래프의 노드 수. 기본값은 sweep.max_nodes.
+        strategies (Optional[list]): 실행할 전략 이름. 기본값은 sweep.strategies, 없으면 모든 전략.
+        extra_args (list): run-benchmark.ts 에 그대로 넘길 인자 (예: ['--no-layout']).
+
+    Returns:
+        Optional[str]: raw_results.json 경로. 전략 목록을 가져오지 못하면 None.
+    """
+    settings = _settings()
+    command = list(config.load_config().get('orchestrator', {}).get('command', ['npx', 'tsx', 'scripts/run-benchmark.ts']))
+    budget_ms = budget_ms or settings['budget_ms']
+    sizes = sweep_sizes(settings['start_nodes'], settings['factor'], max_nodes or settings['max_nodes'],
+                        settings['edge_ratio'], settings['nodes_per_group'])
+
+    try:
+        available = list(dict.fromkeys(case['strategy'] for case in orchestrator.list_cases(command)))
+    except (OSError, subprocess.CalledProcessError, ValueError, IndexError) as e:
+        print(f"❌ Error: Could not list benchmark strategies with '{' '.join(command)} --list': {e}")
+        return None
+    strategies = strategies or settings['strategies'] or available
+    unknown = [name for name in strategies if name not in available]
+    if unknown:
+        print(f"❌ Error: Unknown strategies {unknown} (expected one of {available})")
+        return None
+
+    run_dir = os.path.join(data_loader.RESULTS_DIR, time.strftime(orchestrator.RUN_TIME_FORMAT))
+    output_path = os.path.join(run_dir, orchestrator.RAW_FILE_NAME)
+    os.makedirs(run_dir, exist_ok=True)
+    print(f"🚀 Sweeping {len(strategies)} strategies over {[size['nodes'] for size in sizes]} nodes "
+          f"(budget {budget_ms / 1000:.1f}s per run, seeds {settings['seeds']})")
+
+    records, step_dirs, offsets, active = [], [], [], list(strategies)
+    for size in sizes:
+        for strategy in list(active):
+            step_dir = os.path.join(run_dir, SWEEP_DIR_NAME, f"{aggregates.safe_name(strategy)}-{size['nodes']}")
+            started = time.monotonic()
+            step_records, status = run_step(command, size, strategy, settings['seeds'], step_dir, budget_ms,
+                                            settings['startup_ms'], extra_args, warmup=settings['warmup'])
+            offsets.append(len(records))
+            records.extend(step_records)
+            step_dirs.append(step_dir)
+            orchestrator.write_records(records, output_path)
+            orchestrator.merge_layouts(step_dirs, offsets, os.path.join(run_dir, orchestrator.LAYOUT_FILE_NAME))
+            machine.merge_machines(step_dirs, os.path.join(run_dir, machine.MACHINE_FILE_NAME))
+
+            elapsed = time.monotonic() - started
+            if status == 'ok':
+                print(f"✅ {strategy} @ {size['nodes']} nodes: {len(step_records)} runs ({elapsed:.1f}s)")
+                continue
+            active.remove(strategy)
+            if status == 'failed':
+                print(f"❌ Error: {strategy} @ {size['nodes']} nodes failed "
+                      f"(see {os.path.join(step_dir, orchestrator.LOG_FILE_NAME)}). Stopping this strategy.")
+            else:
+                print(f"⏱️ {strategy} @ {size['nodes']} nodes exceeded the {budget_ms / 1000:.1f}s budget "
+                      f"({'timed out' if status == 'timeout' else 'finished late'}). Stopping this strategy.")
+        if not active:
+            break
+
+    print(f"📝 Saved {len(records)} records "
+          f"({sum(1 for record in records if record.get(CENSORED_COLUMN))} timed out) into: {output_path}")
+    return output_path
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(
+        description='Grow the graph size per strategy until each run exceeds its time budget.',
+        epilog='Arguments after "--" are passed to run-benchmark.ts (e.g. -- --no-layout).',
+    )
+    parser.add_argument('--budget', type=float, default=None,
+                        help='Time budget per run in seconds (default: sweep.budget_ms).')
+    parser.add_argument('--max-nodes', type=int, default=None, help='Largest graph to try (default: sweep.max_nodes).')
+    parser.add_argument('--strategy', action='append', default=None,
+                        help='Strategy to sweep (repeatable, default: sweep.strategies or all).')
+    parser.add_argument('--analyze', action='store_true', help='Run the analysis pipeline on the sweep results.')
+    argv = sys.argv[1:]
+    extra = []
+    if '--' in argv:
+        split = argv.index('--')
+        argv, extra = argv[:split], argv[split + 1:]
+    args = parser.parse_args(argv)
+
+    budget_ms = args.budget * 1000 if args.budget is not None else None
+    output_path = run_sweep(budget_ms, args.max_nodes, args.strategy, extra)
+    if output_path is None:
+        return 1
+    if args.analyze:
+        import main as analysis_main
+
+        return analysis_main.run_pipeline(output_path)
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
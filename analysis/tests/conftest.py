@@ -0,0 +1,5 @@
+import os
+import sys
+
+# analysis/ 의 모듈은 패키지가 아니라 스크립트 디렉터리에서 import 되므로 (python main.py), 테스트도 같은 경로를 씁니다.
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
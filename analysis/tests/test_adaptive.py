@@ -0,0 +1,30 @@
+import numpy as np
+import pytest
+
+import adaptive
+
+
+@pytest.mark.parametrize('df, expected', [(1, 12.7062), (2, 4.3027), (3, 3.1824), (4, 2.7764), (9, 2.2622), (30, 2.0423)])
+def test_t_critical_matches_table(df, expected):
+    assert adaptive.t_critical(0.95, df) == pytest.approx(expected, abs=1e-4)
+
+
+def test_t_critical_other_levels():
+    assert adaptive.t_critical(0.90, 2) == pytest.approx(2.9200, abs=1e-4)
+    assert adaptive.t_critical(0.99, 5) == pytest.approx(4.0321, abs=1e-4)
+
+
+def test_cell_precision_covers_mean_at_three_runs():
+    # 정규 잡음에서 n=3 칸의 95% 구간이 참 평균을 95% 가까이 포함해야 합니다 (부트스트랩은 약 76%).
+    rng = np.random.default_rng(0)
+    trials, covered = 2000, 0
+    for _ in range(trials):
+        records = [{'scenario': 'S', 'strategy': 'A', 'totalTime': t} for t in rng.normal(100, 30, size=3)]
+        row = adaptive.cell_precision(records, 0.95)[('S', 'A')]
+        covered += row['ci_low'] < 100 < row['ci_high']
+    assert 0.93 < covered / trials < 0.97
+
+
+def test_cell_precision_single_run_has_no_interval():
+    row = adaptive.cell_precision([{'scenario': 'S', 'strategy': 'A', 'totalTime': 5.0}], 0.95)[('S', 'A')]
+    assert row['n'] == 1 and row['mean'] == 5.0 and np.isnan(row['ci_halfwidth_pct'])
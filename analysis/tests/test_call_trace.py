@@ -0,0 +1,24 @@
+import json
+
+import pytest
+
+import call_trace
+
+
+def test_call_stats_counts_repeated_records(tmp_path):
+    # 같은 (시나리오, 시드, 전략) 을 두 번 잰 trace: 레코드(pid) 마다 호출 2번.
+    events = []
+    for pid in (0, 1):
+        events.append({'name': 'process_name', 'ph': 'M', 'pid': pid,
+                       'args': {'scenario': 'S', 'seed': 1, 'strategy': 'A'}})
+        events += [{'name': 'route', 'ph': 'X', 'pid': pid, 'ts': ts, 'dur': 1000.0} for ts in (0, 2000)]
+    path = tmp_path / 'trace.ndjson'
+    path.write_text('\n'.join(json.dumps(event) for event in events) + '\n')
+
+    calls = call_trace.load_calls(str(path))
+    assert calls['record'].tolist() == [0, 0, 1, 1]
+    stats = call_trace.call_stats(calls, percentiles=[50])
+    row = stats.iloc[0]
+    assert row['calls'] == 4
+    assert row['calls_per_run'] == pytest.approx(2.0)
+    assert row['total_ms'] == pytest.approx(2.0)
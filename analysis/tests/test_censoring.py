@@ -0,0 +1,44 @@
+import numpy as np
+
+import censoring
+
+TRUE_SLOPE, TRUE_INTERCEPT, TRUE_SIGMA = 2.0, 1.0, 0.3
+
+
+def _censored_sample(n=600, quantile=0.7, seed=0):
+    """y = 1 + 2x + N(0, 0.3²) 를 상위 (1 - quantile) 에서 잘라낸 우측 중도절단 표본."""
+    rng = np.random.default_rng(seed)
+    x = rng.uniform(np.log(10), np.log(1000), size=n)
+    y = TRUE_INTERCEPT + TRUE_SLOPE * x + rng.normal(0, TRUE_SIGMA, size=n)
+    budget = np.quantile(y, quantile)
+    censored = y > budget
+    return x, np.minimum(y, budget), censored
+
+
+def test_tobit_recovers_known_slope():
+    x, y, censored = _censored_sample()
+    assert 0.2 < censored.mean() < 0.4
+    slope, intercept, sigma = censoring.tobit_fit(x, y, censored)
+    assert abs(slope - TRUE_SLOPE) < 0.1
+    assert abs(intercept - TRUE_INTERCEPT) < 0.4
+    assert abs(sigma - TRUE_SIGMA) < 0.05
+    # 하한을 관측값처럼 넣은 최소제곱은 기울기를 과소평가합니다.
+    ols_slope = np.polyfit(x, y, 1)[0]
+    assert ols_slope < slope - 0.2
+
+
+def test_tobit_without_censoring_is_least_squares():
+    x, y, _ = _censored_sample(quantile=1.0)
+    slope, intercept, _ = censoring.tobit_fit(x, y, np.zeros_like(x, dtype=bool))
+    ols_slope, ols_intercept = np.polyfit(x, y, 1)
+    assert np.isclose(slope, ols_slope) and np.isclose(intercept, ols_intercept)
+
+
+def test_bootstrap_interval_covers_known_slope():
+    x, y, censored = _censored_sample(n=300, seed=1)
+    slopes = censoring.bootstrap_tobit_slopes(x, y, censored, 100, np.random.default_rng(0))
+    slopes = slopes[~np.isnan(slopes)]
+    assert len(slopes) == 100
+    low, high = np.percentile(slopes, [2.5, 97.5])
+    assert low < TRUE_SLOPE < high
+    assert high - low < 0.5
@@ -0,0 +1,145 @@
+import numpy as np
+import pandas as pd
+import pytest
+
+import layout_quality
+
+
+def _segments(lines, edges=None):
+    """[(x0, y0, x1, y1), ...] 를 edge_segments 와 같은 모양의 선분 dict 로 만듭니다 (선분마다 엣지 하나)."""
+    lines = np.asarray(lines, dtype=float).reshape(-1, 4)
+    n = len(lines)
+    return {
+        'x0': lines[:, 0], 'y0': lines[:, 1], 'x1': lines[:, 2], 'y1': lines[:, 3],
+        'edge': np.arange(n) if edges is None else np.asarray(edges),
+        'source': np.full(n, -1), 'target': np.full(n, -1),
+    }
+
+
+def _brute_force_crossings(lines):
+    """서로 다른 수평/수직 선분 쌍마다 양쪽 내부에서 만나는지 직접 확인합니다."""
+    unique = {(min(x0, x1), min(y0, y1), max(x0, x1), max(y0, y1)) for x0, y0, x1, y1 in lines}
+    horizontal = [line for line in unique if line[1] == line[3] and line[0] != line[2]]
+    vertical = [line for line in unique if line[0] == line[2] and line[1] != line[3]]
+    return sum(
+        hx_lo < vx < hx_hi and vy_lo < hy < vy_hi
+        for hx_lo, hy, hx_hi, _ in horizontal
+        for vx, vy_lo, _, vy_hi in vertical
+    )
+
+
+def _random_grid_lines(rng, n, size):
+    """작은 격자 위의 수평/수직 선분. 끝점 접촉, 겹침, 중복이 자주 생깁니다."""
+    lines = []
+    for _ in range(n):
+        a, b = sorted(rng.choice(size + 1, size=2, replace=False))
+        c = rng.integers(0, size + 1)
+        lines.append((a, c, b, c) if rng.random() < 0.5 else (c, a, c, b))
+    return lines
+
+
+@pytest.mark.parametrize('seed', range(5))
+@pytest.mark.parametrize('block', [3, layout_quality.SWEEP_BLOCK])
+def test_crossings_match_brute_force(monkeypatch, seed, block):
+    monkeypatch.setattr(layout_quality, 'SWEEP_BLOCK', block)
+    lines = _random_grid_lines(np.random.default_rng(seed), 60, 10)
+    assert layout_quality.count_crossings(_segments(lines)) == _brute_force_crossings(lines)
+
+
+def test_crossing_plus():
+    assert layout_quality.count_crossings(_segments([(0, 5, 10, 5), (5, 0, 5, 10)])) == 1
+
+
+def test_t_junction_is_not_a_crossing():
+    # 수직 선분의 끝점이 수평 선분 위에 닿음 / 수평 선분의 끝점이 수직 선분 위에 닿음 / 모서리끼리 닿음
+    assert layout_quality.count_crossings(_segments([(0, 5, 10, 5), (5, 5, 5, 10)])) == 0
+    assert layout_quality.count_crossings(_segments([(5, 0, 5, 10), (0, 5, 5, 5)])) == 0
+    assert layout_quality.count_crossings(_segments([(0, 0, 10, 0), (0, 0, 0, 10)])) == 0
+
+
+def test_collinear_overlap_is_not_a_crossing():
+    lines = [(0, 0, 10, 0), (5, 0, 15, 0), (3, -5, 3, 5), (20, 0, 20, 10), (20, 5, 20, 15)]
+    # (3, -5)..(3, 5) 는 두 수평 선분 중 첫 번째만 내부에서 지납니다.
+    assert layout_quality.count_crossings(_segments(lines)) == 1
+
+
+def test_duplicate_segments_count_once():
+    lines = [(0, 5, 10, 5), (10, 5, 0, 5), (5, 0, 5, 10)]
+    assert layout_quality.count_crossings(_segments(lines)) == 1
+
+
+def test_zero_length_segments_are_dropped():
+    layout = {
+        'nodes': [],
+        'edges': [
+            {'source': 0, 'target': 1, 'path': [[0, 5], [0, 5], [10, 5], [10, 5]]},
+            {'source': 2, 'target': 3, 'path': [[5, 0], [5, 10]]},
+            {'source': 4, 'target': 5, 'path': [[5, 5], [5, 5]]},
+        ],
+    }
+    seg = layout_quality.edge_segments(layout)
+    assert len(seg['x0']) == 2
+    assert layout_quality.count_crossings(seg) == 1
+    assert layout_quality.count_bends(seg) == 0
+    assert layout_quality.count_crossings(_segments([(5, 5, 5, 5), (0, 5, 10, 5)])) == 0
+
+
+def test_node_overlaps():
+    rects = np.array([[0, 0, 10, 10], [20, 0, 10, 10], [40, 0, 10, 10]], dtype=float)
+    seg = _segments([(5, 5, 25, 5), (25, 5, 45, 5), (0, 20, 50, 20), (10, -5, 10, 15)], edges=[0, 0, 1, 2])
+    seg['source'] = np.array([0, 0, 1, 1])
+    seg['target'] = np.array([2, 2, 2, 2])
+    # 엣지 0 은 자기 양 끝(0, 2)이 아닌 노드 1 을 지남 (선분 두 개가 지나도 한 쌍),
+    # 엣지 1 은 어느 노드와도 겹치지 않음, 엣지 2 는 노드 0 의 테두리만 따라감.
+    assert layout_quality.count_node_overlaps(seg, rects) == 1
+
+
+def test_node_overlaps_chunked(monkeypatch):
+    monkeypatch.setattr(layout_quality, 'OVERLAP_CHUNK', 1)
+    rects = np.array([[0, 0, 10, 10], [20, 0, 10, 10]], dtype=float)
+    seg = _segments([(-5, 5, 35, 5), (5, -5, 5, 15), (25, -5, 25, 15)])
+    assert layout_quality.count_node_overlaps(seg, rects) == 4
+
+
+def test_pareto_front():
+    time = np.array([1.0, 2.0, 3.0, 2.0, 1.0, 4.0])
+    value = np.array([5.0, 3.0, 1.0, 4.0, 5.0, 1.0])
+    # (2, 4) 는 (2, 3) 에, (4, 1) 은 (3, 1) 에 지배됨. 같은 점 (1, 5) 두 개는 서로를 지배하지 않음.
+    assert layout_quality.pareto_front(time, value).tolist() == [True, True, True, False, True, False]
+
+
+def _repeated_run():
+    """adaptive --repeat 처럼 같은 (시나리오, 시드, 전략) 이 두 번씩 나오는 실행의 레코드와 레이아웃 품질."""
+    df = pd.DataFrame({
+        'scenario': ['S'] * 4, 'seed': [1, 1, 1, 1], 'strategy': ['A', 'B', 'A', 'B'],
+        'totalTime': [10.0, 20.0, 30.0, 40.0],
+    })
+    quality = pd.DataFrame({
+        'record': [0, 1, 2, 3], 'scenario': ['S'] * 4, 'seed': [1] * 4, 'strategy': ['A', 'B', 'A', 'B'],
+        'crossings': [1.0, 2.0, 3.0, 4.0],
+    })
+    return df, quality
+
+
+def test_join_records_keeps_one_row_per_record():
+    df, quality = _repeated_run()
+    joined = layout_quality.join_records(quality, df, ['totalTime'])
+    assert len(joined) == 4
+    assert joined['totalTime'].tolist() == [10.0, 20.0, 30.0, 40.0]
+
+
+def test_join_records_without_record_number_uses_occurrence():
+    df, quality = _repeated_run()
+    joined = layout_quality.join_records(quality.drop(columns='record').iloc[::-1], df, ['totalTime'])
+    # 역순으로 읽힌 레이아웃: 같은 키 안의 순서는 (역순이므로) 뒤집혀 맞춰집니다.
+    assert len(joined) == 4
+    assert sorted(joined['totalTime']) == [10.0, 20.0, 30.0, 40.0]
+
+
+def test_quality_summary_does_not_multiply_repeats(monkeypatch):
+    monkeypatch.setattr(layout_quality, 'load_config', lambda: {'quality': {'metrics': ['crossings']}})
+    df, quality = _repeated_run()
+    summary = layout_quality.quality_summary(quality, df)
+    assert summary['n'].tolist() == [2, 2]
+    assert summary['time_ms'].tolist() == [20.0, 30.0]
+    assert summary['crossings'].tolist() == [2.0, 3.0]
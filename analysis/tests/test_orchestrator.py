@@ -0,0 +1,52 @@
+import json
+
+import orchestrator
+
+
+def _write_run(run_dir, records):
+    run_dir.mkdir(parents=True)
+    (run_dir / 'raw_results.ndjson').write_text(''.join(json.dumps(r) + '\n' for r in records))
+    (run_dir / orchestrator.LAYOUT_FILE_NAME).write_text(''.join(
+        json.dumps({'record': i, 'scenario': r['scenario'], 'seed': r['seed'], 'strategy': r['strategy'],
+                    'nodes': [], 'edges': []}) + '\n'
+        for i, r in enumerate(records)
+    ))
+
+
+def _read_lines(path):
+    return [json.loads(line) for line in path.read_text().splitlines()]
+
+
+def test_merge_shards_renumbers_layouts_in_merged_order(tmp_path):
+    cases = [
+        {'index': 0, 'scenario': 'S', 'seed': 1, 'strategy': 'A'},
+        {'index': 1, 'scenario': 'S', 'seed': 1, 'strategy': 'B'},
+        {'index': 2, 'scenario': 'S', 'seed': 2, 'strategy': 'A'},
+    ]
+    record = lambda case: {'scenario': case['scenario'], 'seed': case['seed'], 'strategy': case['strategy'],
+                           'totalTime': float(case['index']), 'details': {}}
+    _write_run(tmp_path / 'shard-0', [record(cases[2]), record(cases[0])])
+    _write_run(tmp_path / 'shard-1', [record(cases[1])])
+
+    output = tmp_path / 'raw_results.json'
+    n = orchestrator.merge_shards(cases, [str(tmp_path / 'shard-0'), str(tmp_path / 'shard-1')], str(output))
+    assert n == 3
+    merged = json.loads(output.read_text())
+    assert [r['totalTime'] for r in merged] == [0.0, 1.0, 2.0]
+    layouts = _read_lines(tmp_path / orchestrator.LAYOUT_FILE_NAME)
+    for layout in layouts:
+        target = merged[layout['record']]
+        assert (target['scenario'], target['seed'], target['strategy']) == (
+            layout['scenario'], layout['seed'], layout['strategy'])
+
+
+def test_merge_layouts_offsets_and_legacy_lines(tmp_path):
+    _write_run(tmp_path / 'a', [{'scenario': 'S', 'seed': 1, 'strategy': 'A'}] * 2)
+    _write_run(tmp_path / 'b', [{'scenario': 'S', 'seed': 1, 'strategy': 'A'}])
+    (tmp_path / 'c').mkdir()
+    (tmp_path / 'c' / orchestrator.LAYOUT_FILE_NAME).write_text(json.dumps({'scenario': 'S'}) + '\n')
+
+    output = tmp_path / 'layouts.ndjson'
+    dirs = [str(tmp_path / name) for name in ('a', 'missing', 'b', 'c')]
+    assert orchestrator.merge_layouts(dirs, [0, 2, 2, 3], str(output)) == 4
+    assert [layout.get('record') for layout in _read_lines(output)] == [0, 1, 2, None]
@@ -0,0 +1,53 @@
+import json
+
+import pytest
+
+import record_stream
+
+RECORDS = [
+    {'scenario': 'Small', 'strategy': 'A-Star', 'seed': s, 'timedOut': False, 'durationMs': 12.5 + s, 'ratio': 1.5e-3}
+    for s in range(3)
+]
+
+
+def _write(tmp_path, text):
+    path = tmp_path / 'raw_results.json'
+    path.write_text(text)
+    return str(path)
+
+
+def test_reads_array_across_chunk_boundaries(tmp_path, monkeypatch):
+    text = json.dumps(RECORDS, indent=2)
+    path = _write(tmp_path, text)
+    for size in (1, 7, len(text)):
+        monkeypatch.setattr(record_stream, 'CHUNK_SIZE', size)
+        assert list(record_stream.iter_records(path)) == RECORDS
+
+
+def test_every_truncation_point_is_deferred_not_corrupt():
+    record = json.dumps(RECORDS[0])
+    decoder = json.JSONDecoder()
+    for end in range(1, len(record)):
+        buf = record[:end]
+        with pytest.raises(json.JSONDecodeError) as err:
+            decoder.raw_decode(buf)
+        assert record_stream._is_truncated(err.value, buf), buf
+
+
+def test_corrupt_record_mid_file_raises(tmp_path, monkeypatch):
+    good = [json.dumps(r) for r in RECORDS]
+    path = _write(tmp_path, '[' + good[0] + ', {"scenario": "Small", ]' + ', ' + good[1] + ']')
+    monkeypatch.setattr(record_stream, 'CHUNK_SIZE', 8)
+    records = record_stream.iter_records(path)
+    assert next(records) == RECORDS[0]
+    with pytest.raises(json.JSONDecodeError):
+        list(records)
+
+
+def test_truncated_file_raises_unless_following(tmp_path, capsys):
+    path = _write(tmp_path, '[' + json.dumps(RECORDS[0]) + ', {"scenario": "Sm')
+    with pytest.raises(json.JSONDecodeError):
+        list(record_stream.iter_records(path))
+
+    assert list(record_stream.iter_records(path, follow=True, idle_timeout=0)) == RECORDS[:1]
+    assert 'incomplete record' in capsys.readouterr().out
@@ -0,0 +1,67 @@
+import math
+from itertools import combinations
+
+import numpy as np
+import pytest
+
+import regression
+
+# scipy.stats.mannwhitneyu 문서의 예제 (Conover, Practical Nonparametric Statistics)
+MALES = np.array([19, 22, 16, 29, 24], dtype=float)
+FEMALES = np.array([20, 11, 17, 12], dtype=float)
+
+
+def _brute_force(baseline: np.ndarray, candidate: np.ndarray) -> tuple:
+    """U 를 쌍 비교로 정의대로 세고, 모든 라벨 배치에 대해 양측 p-value 를 계산합니다."""
+    def u_stat(cand, base):
+        return sum((c > b) + 0.5 * (c == b) for c in cand for b in base)
+
+    pooled = np.concatenate([candidate, baseline])
+    n1 = len(candidate)
+    mean_u = n1 * len(baseline) / 2
+    observed = abs(u_stat(candidate, baseline) - mean_u)
+    extreme = total = 0
+    for idx in combinations(range(len(pooled)), n1):
+        rest = np.delete(pooled, idx)
+        total += 1
+        extreme += abs(u_stat(pooled[list(idx)], rest) - mean_u) >= observed - 1e-9
+    return u_stat(candidate, baseline), extreme / total
+
+
+def test_exact_matches_reference():
+    u, p = regression.mann_whitney_u(FEMALES, MALES)
+    assert u == 17.0
+    assert p == pytest.approx(1 / 9)  # scipy: method='exact' → 0.1111111111111111
+
+
+def test_asymptotic_matches_reference(monkeypatch):
+    monkeypatch.setattr(regression, 'EXACT_MAX_COMBINATIONS', 0)
+    u, p = regression.mann_whitney_u(FEMALES, MALES)
+    assert u == 17.0
+    assert p == pytest.approx(0.11134688653314041, rel=1e-9)  # scipy: method='asymptotic'
+
+
+def test_separated_samples():
+    # 완전히 분리된 3 vs 3: 가장 극단적인 배치 2개 / C(6, 3) = 20
+    assert regression.mann_whitney_u(np.array([1., 2., 3.]), np.array([4., 5., 6.])) == (9.0, pytest.approx(0.1))
+    # 10 vs 10 은 C(20, 10) > EXACT_MAX_COMBINATIONS 라 정규 근사 (연속성 보정, 동점 없음)
+    u, p = regression.mann_whitney_u(np.arange(10.), np.arange(10.) + 100)
+    assert u == 100.0
+    assert p == pytest.approx(0.0001826717911095504, rel=1e-9)
+    assert math.comb(20, 10) > regression.EXACT_MAX_COMBINATIONS
+
+
+def test_exact_with_ties_matches_brute_force():
+    baseline = np.array([1., 2., 2., 3., 5.])
+    candidate = np.array([2., 3., 3., 4., 6.])
+    u, p = regression.mann_whitney_u(baseline, candidate)
+    expected_u, expected_p = _brute_force(baseline, candidate)
+    assert u == expected_u
+    assert p == pytest.approx(expected_p)
+
+
+def test_identical_and_empty_samples():
+    values = np.array([1., 1., 1.])
+    assert regression.mann_whitney_u(values, values)[1] == pytest.approx(1.0)
+    u, p = regression.mann_whitney_u(np.array([]), values)
+    assert math.isnan(u) and math.isnan(p)
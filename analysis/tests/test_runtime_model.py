@@ -0,0 +1,84 @@
+import numpy as np
+import pytest
+
+import runtime_model
+
+SETTINGS = {'ridge': 1.0, 'folds': 10, 'ports_per_side': 6}
+SIZES = [(12, 18), (60, 90), (120, 180)]
+
+
+def _cell(exponent, scale_ms, rng):
+    """time = scale_ms · (nodes / 12)^exponent · 잡음 을 따르는 레코드로 Total 셀 하나를 적합합니다."""
+    stats = [{'nodes': n, 'edges': e} for n, e in SIZES for _ in range(10)]
+    features = np.array([[f[name] for name in runtime_model.FEATURES]
+                         for f in (runtime_model.graph_features(s, 6) for s in stats)])
+    log_time = np.log(scale_ms) + exponent * np.log(features[:, 0] / 12) + rng.normal(0, 0.05, len(stats))
+    return runtime_model.fit_cell(features, log_time, SETTINGS, rng)
+
+
+def _model(reference=None):
+    rng = np.random.default_rng(0)
+    return {
+        'version': runtime_model.MODEL_VERSION,
+        'ports_per_side': 6,
+        'confidence': 0.9,
+        'reference_calibration_ms': reference,
+        'strategies': {
+            'Fast': {'steps': {runtime_model.ROOT_KEY: _cell(1.0, 1.0, rng)}},
+            'Slow': {'steps': {runtime_model.ROOT_KEY: _cell(2.0, 5.0, rng)}},
+        },
+    }
+
+
+def test_fit_cell_stores_training_range():
+    cell = _model()['strategies']['Fast']['steps'][runtime_model.ROOT_KEY]
+    assert cell['feature_min'] == [12.0, 1.5, 24.0]
+    assert cell['feature_max'] == [120.0, 1.5, 24.0]
+    # 학습 데이터에서 일정한 비율 특징은 가중치가 0 입니다.
+    assert cell['weights'][1:] == [0.0, 0.0]
+
+
+def test_recommend_inside_range():
+    result = runtime_model.recommend({'nodes': 60, 'edges': 90}, 100, _model())
+    assert result['strategy'] == 'Fast' and result['within_budget'] and not result['extrapolated']
+    fast = result['candidates'][0]
+    assert fast['predicted_ms'] == pytest.approx(5.0, rel=0.1)
+
+
+def test_recommend_refuses_outside_range():
+    result = runtime_model.recommend({'nodes': 1000, 'edges': 1500}, 1e9, _model())
+    assert result['strategy'] is None and not result['within_budget'] and result['extrapolated']
+    assert all(c['out_of_range'] == ['nodes'] and not c['within_budget'] for c in result['candidates'])
+    # 범위 끝(120 노드)에서 잘린 예측이므로 외삽값처럼 튀지 않습니다.
+    edge = runtime_model.recommend({'nodes': 120, 'edges': 180}, 1e9, _model())
+    assert [c['predicted_ms'] for c in result['candidates']] == [c['predicted_ms'] for c in edge['candidates']]
+
+
+def test_off_ratio_graph_is_still_recommended():
+    # 학습 데이터에서 일정했던 비율(edges/node = 1.5, ports/node = 24)과 달라도 범위 밖으로 보지 않습니다 (가중치 0).
+    plain = runtime_model.recommend({'nodes': 60, 'edges': 90}, 100, _model())
+    for stats in ({'nodes': 60, 'edges': 91}, {'nodes': 60, 'edges': 600}, {'nodes': 60, 'edges': 90, 'ports': 1000}):
+        result = runtime_model.recommend(stats, 100, _model())
+        assert result['strategy'] == 'Fast' and result['within_budget'] and not result['extrapolated']
+        assert result['candidates'][0]['out_of_range'] == []
+        assert result['candidates'][0]['predicted_ms'] == pytest.approx(plain['candidates'][0]['predicted_ms'])
+
+
+def test_varying_ratio_is_range_checked():
+    # 학습 데이터에서 비율이 달라졌다면 그 범위는 검사합니다.
+    model = _model()
+    cell = model['strategies']['Fast']['steps'][runtime_model.ROOT_KEY]
+    cell['feature_min'][1], cell['feature_max'][1] = 1.0, 2.0
+    candidate = next(c for c in runtime_model.recommend({'nodes': 60, 'edges': 600}, 100, model)['candidates']
+                     if c['strategy'] == 'Fast')
+    assert candidate['out_of_range'] == ['edges_per_node'] and not candidate['within_budget']
+
+
+def test_recommend_scales_to_caller_calibration():
+    model = _model(reference=10.0)
+    base = runtime_model.recommend({'nodes': 60, 'edges': 90}, 100, model)
+    slower = runtime_model.recommend({'nodes': 60, 'edges': 90}, 100, model, calibration_ms=20.0)
+    assert slower['time_scale'] == 2.0
+    assert slower['candidates'][0]['predicted_ms'] == pytest.approx(2 * base['candidates'][0]['predicted_ms'])
+    # 기준 점수가 없는 모델이면 환산하지 않습니다.
+    assert runtime_model.recommend({'nodes': 60, 'edges': 90}, 100, _model(), calibration_ms=20.0)['time_scale'] == 1.0
@@ -0,0 +1,59 @@
+import json
+
+import data_loader
+import server
+
+
+def _query(service, path, params=None):
+    status, body, hit = service.query(path, params or {})
+    return status, json.loads(body), hit
+
+
+def test_run_appears_once_raw_file_is_written(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'RESULTS_DIR', str(tmp_path))
+    service = server.QueryService(cache_size=8, frame_cache_size=2)
+    run_dir = tmp_path / '2025-10-20_10-00-00'
+    run_dir.mkdir()
+
+    # 실행 디렉터리는 생겼지만 원시 결과 파일은 아직 없음
+    status, payload, _ = _query(service, '/runs')
+    assert status == 200 and payload['runs'] == []
+
+    (run_dir / 'raw_results.ndjson').write_text(json.dumps({
+        'scenario': 'S', 'seed': 1, 'strategy': 'A', 'totalTime': 1.0, 'details': {},
+    }) + '\n')
+    status, payload, hit = _query(service, '/runs')
+    assert status == 200 and not hit
+    assert payload['runs'] == [{'run': run_dir.name, 'file': 'raw_results.ndjson'}]
+
+
+def test_unexpected_error_returns_json_500(tmp_path, monkeypatch, capsys):
+    monkeypatch.setattr(data_loader, 'RESULTS_DIR', str(tmp_path))
+    service = server.QueryService(cache_size=8, frame_cache_size=2)
+
+    def broken(params):
+        raise RuntimeError('boom')
+
+    service.endpoints['/runs'] = broken
+    status, payload, hit = _query(service, '/runs')
+    assert status == 500 and not hit
+    assert payload == {'error': 'Internal error: boom'}
+    assert 'boom' in capsys.readouterr().err
+
+
+def test_summary_excludes_warmup_like_the_report(tmp_path, monkeypatch):
+    monkeypatch.setattr(data_loader, 'RESULTS_DIR', str(tmp_path))
+    service = server.QueryService(cache_size=8, frame_cache_size=2)
+    run_dir = tmp_path / '2025-10-20_10-00-00'
+    run_dir.mkdir()
+    times = [50.0, 10.0, 11.0, 10.0, 12.0]  # 첫 실행은 JIT warm-up
+    (run_dir / 'raw_results.ndjson').write_text(''.join(
+        json.dumps({'scenario': 'S', 'seed': seed, 'strategy': 'A', 'totalTime': time, 'details': {'L1-Routing': time}}) + '\n'
+        for seed, time in enumerate(times, start=1)
+    ))
+
+    status, payload, _ = _query(service, '/summary')
+    assert status == 200 and payload['sample'] == 'steady_state'
+    [row] = payload['rows']
+    assert row['count'] == 4 and row['warmup_excluded'] == 1
+    assert row['mean'] == sum(times[1:]) / 4
@@ -0,0 +1,40 @@
+import os
+import sys
+import time
+
+import pytest
+
+import sweep
+
+# npx → tsx → node 처럼 자식 프로세스를 띄우고, 자식이 측정을 계속하는 동안 자신은 기다리는 래퍼.
+WRAPPER = '''
+import subprocess, sys, time
+child = subprocess.Popen([sys.executable, "-c", "import time; time.sleep(60)"])
+open(sys.argv[1], "w").write(str(child.pid))
+time.sleep(60)
+'''
+
+
+def _alive(pid: int) -> bool:
+    try:
+        with open(f'/proc/{pid}/status') as f:
+            return not any(line.startswith('State:') and 'Z' in line.split()[1] for line in f)
+    except FileNotFoundError:
+        return False
+
+
+@pytest.mark.skipif(not sys.platform.startswith('linux'), reason='checks /proc for the child process')
+def test_timeout_kills_grandchildren(tmp_path):
+    pid_path = tmp_path / 'child.pid'
+    command = [sys.executable, '-c', WRAPPER, str(pid_path)]
+    size = {'name': 'Sweep-10', 'nodes': 10, 'edges': 15, 'groups': 1}
+    records, status = sweep.run_step(command, size, 'A-Star', [1], str(tmp_path / 'step'),
+                                     budget_ms=300, startup_ms=700)
+    assert status == 'timeout'
+    assert len(records) == 1 and records[0]['timedOut']
+
+    child = int(pid_path.read_text())
+    deadline = time.monotonic() + 5
+    while _alive(child) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert not _alive(child)
@@ -0,0 +1,20 @@
+import data_loader
+import watcher
+
+
+def test_raw_signature_of_a_file_is_none(tmp_path):
+    stray = tmp_path / 'history.sqlite'
+    stray.write_bytes(b'SQLite format 3\x00')
+    assert watcher.raw_signature(str(stray)) is None
+
+
+def test_watch_once_skips_stray_files_in_results(tmp_path, monkeypatch):
+    # trend / model 이 만드는 results/history.sqlite 같은 파일이 있어도 시작할 때 훑기가 멈추지 않아야 합니다.
+    (tmp_path / 'history.sqlite').write_bytes(b'SQLite format 3\x00')
+    run_dir = tmp_path / '2025-10-14_14-12-57'
+    run_dir.mkdir()
+    (run_dir / 'raw_results.ndjson').write_text('{"scenario": "S", "seed": 1, "strategy": "A", "totalTime": 1.0}\n')
+    monkeypatch.setattr(data_loader, 'RESULTS_DIR', str(tmp_path))
+    monkeypatch.setattr(watcher, 'is_stale', lambda raw_path: False)
+
+    assert watcher.watch(polling=True, once=True) == 0
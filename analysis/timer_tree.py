@@ -0,0 +1,199 @@
+import numpy as np
+import pandas as pd
+
+from config import load_config
+from record_stream import CENSORED_COLUMN, MEMORY_SEPARATOR, machine_columns, size_columns, sweep_columns
+
+# --- 설정 ---
+# docs/measurement_levels.md 의 L{level}-{path} 키를 호출 트리로 해석합니다.
+# totalTime 은 트리의 루트(level 0)이고, L1 단계들은 그 자식이 됩니다.
+ROOT_PATH = 'Total'
+id_columns = ['run', 'scenario', 'seed', 'strategy']
+non_timer_columns = id_columns + size_columns + ['totalTime'] + sweep_columns + machine_columns
+
+
+def parse_timer_keys(keys, levels_cfg: dict = None) -> pd.DataFrame:
+    """
+    측정 키 목록을 (level, path, parent) 메타데이터로 변환합니다.
+    - `L{n}-A:B` 형식은 정규식으로 level/path 를 추출합니다.
+    - L1 이름과 같은 레거시 키(예: 'Routing')는 L1 으로 취급합니다.
+    - 그 외 레거시 평면 키(예: 'findBestRamp')는 `legacy_parent` 아래의 L2 로 붙입니다.
+    부모 경로가 측정되지 않은 경우, 측정된 가장 가까운 조상으로 올라갑니다.
+
+    Args:
+        keys: 측정 키(컬럼 이름) 목록.
+        levels_cfg (dict): config.yaml 의 'levels' 섹션. 없으면 기본 설정을 로드합니다.
+
+    Returns:
+        pd.DataFrame: 측정 키를 인덱스로 하는 level, path, parent 컬럼.
+    """
+    cfg = levels_cfg or load_config()['levels']
+    delimiter = cfg['delimiter']
+    keys = pd.Series(list(keys), index=list(keys), dtype=object)
+
+    parsed = keys.str.extract(cfg['regex'])
+    level = pd.to_numeric(parsed['level'])
+    path = parsed['path']
+
+    legacy_l1 = path.isna() & keys.isin(cfg['l1_names'])
+    path = path.mask(legacy_l1, keys)
+    level = level.mask(legacy_l1, 1)
+
+    legacy_other = path.isna()
+    path = path.mask(legacy_other, cfg['legacy_parent'] + delimiter + keys)
+    level = level.mask(legacy_other, 2)
+
+    meta = pd.DataFrame({'level': level.astype(int), 'path': path})
+    meta['parent'] = meta['path'].str.rpartition(delimiter)[0].replace('', ROOT_PATH)
+
+    # 측정되지 않은 중간 노드는 건너뛰고, 존재하는 가장 가까운 조상에 연결합니다.
+    known = set(meta['path']) | {ROOT_PATH}
+    for key in meta.index[~meta['parent'].isin(known)]:
+        parent = meta.at[key, 'parent']
+        while parent not in known:
+            parent = parent.rpartition(delimiter)[0] or ROOT_PATH
+        meta.at[key, 'parent'] = parent
+    return meta
+
+
+def timer_columns(df: pd.DataFrame) -> list:
+    """DataFrame 에서 측정 시간(세부 모듈) 컬럼만 골라냅니다."""
+    return [
+        col for col in df.columns
+        if col not in non_timer_columns
+        and MEMORY_SEPARATOR not in col
+        and pd.api.types.is_numeric_dtype(df[col])
+    ]
+
+
+def to_long(df: pd.DataFrame, levels_cfg: dict = None) -> pd.DataFrame:
+    """
+    wide 형태의 벤치마크 데이터프레임을 (record, level, path, parent, time) long 테이블로 변환합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임. record_stream 의 compact long 테이블(key, value 컬럼)도 받습니다.
+        levels_cfg (dict): config.yaml 의 'levels' 섹션.
+
+    Returns:
+        pd.DataFrame: 측정되지 않은(NaN) 값과 시간 예산을 넘겨 중단된(censored) 레코드가 제거된 long 형태의 데이터프레임.
+                      record 번호는 제거 전 행 번호입니다.
+    """
+    if {'key', 'value'}.issubset(df.columns):
+        return _compact_to_long(df, levels_cfg)
+    ids = [c for c in id_columns if c in df.columns]
+    timers = timer_columns(df)
+
+    meta = parse_timer_keys(timers, levels_cfg)
+    meta.loc['totalTime'] = {'level': 0, 'path': ROOT_PATH, 'parent': None}
+
+    frame = df[ids + timers + ['totalTime']].reset_index(drop=True)
+    frame['record'] = np.arange(len(frame))
+    if CENSORED_COLUMN in df.columns:
+        # censored 레코드의 totalTime 은 실제 시간이 아니므로 평균/분위수에 섞지 않습니다 (censoring 모듈에서 따로 다룸).
+        frame = frame[~df[CENSORED_COLUMN].to_numpy(bool)]
+    long = frame.melt(
+        id_vars=ids + ['record'],
+        value_vars=timers + ['totalTime'],
+        var_name='key',
+        value_name='time'
+    ).dropna(subset=['time'])
+    return long.join(meta, on='key')
+
+
+def _compact_to_long(compact: pd.DataFrame, levels_cfg: dict = None) -> pd.DataFrame:
+    """compact long 테이블은 이미 (record, key) 행이므로 melt 없이 측정 키만 골라 메타데이터를 붙입니다."""
+    keys = compact['key'].cat.remove_unused_categories()
+    timers = [key for key in keys.cat.categories if key not in non_timer_columns and MEMORY_SEPARATOR not in key]
+
+    meta = parse_timer_keys(timers, levels_cfg)
+    meta.loc['totalTime'] = {'level': 0, 'path': ROOT_PATH, 'parent': None}
+
+    keep = keys.isin(timers + ['totalTime']).to_numpy()
+    if CENSORED_COLUMN in keys.cat.categories:
+        censored = compact.loc[(keys == CENSORED_COLUMN).to_numpy() & (compact['value'] > 0).to_numpy(), 'record']
+        keep &= ~compact['record'].isin(censored).to_numpy()
+    ids = [c for c in id_columns if c in compact.columns]
+    long = compact.loc[keep, ids + ['record', 'key', 'value']].rename(columns={'value': 'time'})
+    long['key'] = long['key'].astype(str)
+    long['time'] = long['time'].astype('float64')
+    return long.dropna(subset=['time']).join(meta, on='key')
+
+
+def compute_self_time(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    각 레코드의 노드별 자식 시간 합과 exclusive(self) 시간을 계산합니다.
+    exclusive = inclusive - sum(직계 자식 inclusive) 이며, 자식이 있는 노드에서는
+    이 값이 곧 계측되지 않은(uninstrumented) 나머지 시간입니다.
+    """
+    children = long.groupby(['record', 'parent'])['time'].sum().rename('children')
+    out = long.join(children, on=['record', 'path'])
+    out['has_children'] = out['children'].notna()
+    out['children'] = out['children'].fillna(0.0)
+    out['exclusive'] = out['time'] - out['children']
+    return out
+
+
+def build_tree(df: pd.DataFrame, levels_cfg: dict = None) -> pd.DataFrame:
+    """
+    (시나리오, 전략)별 호출 트리를 만들고, 노드별 평균 inclusive/exclusive 시간을 계산합니다.
+    평균은 해당 셀의 전체 레코드 수로 나누므로 (측정되지 않은 시드는 0으로 간주),
+    부모 inclusive = 자식 inclusive 합 + 부모 exclusive 관계가 평균에서도 그대로 성립합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+        levels_cfg (dict): config.yaml 의 'levels' 섹션.
+
+    Returns:
+        pd.DataFrame: [run,] scenario, strategy, level, path, parent, inclusive, exclusive,
+                      uninstrumented(자식이 있는 노드만), share(루트 대비 %) 컬럼.
+    """
+    return tree_from_long(compute_self_time(to_long(df, levels_cfg)))
+
+
+def tree_from_long(long: pd.DataFrame) -> pd.DataFrame:
+    """
+    compute_self_time 결과로부터 build_tree 와 같은 트리를 만듭니다.
+    long 테이블을 이미 가지고 있는 경우(예: aggregates.build_cube) 변환을 반복하지 않기 위해 분리했습니다.
+    """
+    cell = [c for c in ['run', 'scenario', 'strategy'] if c in long.columns]
+
+    n_records = long.groupby(cell)['record'].nunique().rename('n_records')
+    tree = long.groupby(cell + ['level', 'path', 'parent'], dropna=False, sort=False).agg(
+        inclusive=('time', 'sum'),
+        exclusive=('exclusive', 'sum'),
+        has_children=('has_children', 'any'),
+    ).reset_index().join(n_records, on=cell)
+
+    tree['inclusive'] /= tree['n_records']
+    tree['exclusive'] /= tree['n_records']
+    tree['uninstrumented'] = tree['exclusive'].where(tree['has_children'])
+
+    root = tree.loc[tree['path'] == ROOT_PATH].set_index(cell)['inclusive'].rename('root')
+    tree = tree.join(root, on=cell)
+    tree['share'] = tree['inclusive'] / tree['root'] * 100
+    return (
+        tree.drop(columns=['has_children', 'n_records', 'root'])
+            .sort_values(cell + ['level', 'path'])
+            .reset_index(drop=True)
+    )
+
+
+def children_of(tree: pd.DataFrame, path: str, include_self: bool = True) -> pd.DataFrame:
+    """
+    트리에서 특정 노드의 직계 자식들을 반환합니다 (단일 셀로 필터링된 트리 기준).
+    include_self 가 True 이고 부모에게 계측되지 않은 시간이 있으면 '(self)' 행을 추가합니다.
+
+    Returns:
+        pd.DataFrame: name(마지막 경로 세그먼트)을 인덱스로 하는 inclusive, exclusive 컬럼.
+    """
+    delimiter = load_config()['levels']['delimiter']
+    kids = tree.loc[tree['parent'] == path, ['path', 'inclusive', 'exclusive']].copy()
+    kids.index = kids.pop('path').str.split(delimiter).str[-1]
+    kids.index.name = None
+
+    if include_self and not kids.empty:
+        parent = tree.loc[tree['path'] == path]
+        if not parent.empty and parent['uninstrumented'].iloc[0] > 0:
+            own = parent['uninstrumented'].iloc[0]
+            kids.loc['(self)'] = {'inclusive': own, 'exclusive': own}
+    return kids
@@ -0,0 +1,78 @@
+import math
+
+import pandas as pd
+
+import regression
+import timer_tree
+from config import load_config
+
+# --- 설정 ---
+# 여러 실행(run)에 걸친 (시나리오, 전략, 측정 경로)별 시계열을 만들고,
+# rolling median 과 변화점(change point)을 표시합니다.
+RUN_TIME_FORMAT = '%Y-%m-%d_%H-%M-%S'  # results/<run> 디렉터리 이름 형식
+series_columns = ['scenario', 'strategy', 'path']
+
+
+def build_trend(
+    df: pd.DataFrame,
+    window: int = None,
+    threshold_pct: float = None,
+    alpha: float = None,
+    max_level: int = None,
+) -> pd.DataFrame:
+    """
+    실행별 평균 시간의 시계열과 변화점을 계산합니다.
+    실행 i 는 (1) 직전 실행들의 rolling median 대비 변화율이 threshold_pct 이상이고,
+    (2) 직전 실행과 시드별 측정값을 비교한 Mann-Whitney U 검정이 유의할 때 변화점으로 표시됩니다.
+
+    Args:
+        df (pd.DataFrame): 'run' 컬럼이 있는 여러 실행의 데이터프레임 (data_loader.load_history_data).
+        window (int): rolling median 창 크기 (실행 수). 기본값은 config.yaml 의 trend.window.
+        threshold_pct (float): 변화점으로 볼 최소 변화율(%).
+        alpha (float): 유의수준.
+        max_level (int): 포함할 최대 측정 레벨 (0 = totalTime).
+
+    Returns:
+        pd.DataFrame: scenario, strategy, path, level, run, timestamp, n, mean, median,
+                      rolling_median, change_pct, p_value, change_point 컬럼 (실행 순 정렬).
+    """
+    cfg = load_config().get('trend', {})
+    window = cfg.get('window', 3) if window is None else window
+    threshold_pct = cfg.get('threshold_pct', 25.0) if threshold_pct is None else threshold_pct
+    alpha = cfg.get('alpha', 0.05) if alpha is None else alpha
+    max_level = cfg.get('max_level', 2) if max_level is None else max_level
+
+    long = timer_tree.to_long(df)
+    long = long[long['level'] <= max_level]
+    by_run = long.groupby(series_columns + ['run'], sort=True)['time']
+    trend = by_run.agg(n='count', mean='mean', median='median').reset_index()
+    trend = trend.join(long.groupby('path')['level'].first(), on='path')
+
+    # 같은 시계열 안에서 직전 실행들과 비교합니다.
+    series = trend.groupby(series_columns, sort=False)
+    trend['rolling_median'] = series['mean'].transform(lambda s: s.rolling(window, min_periods=1).median())
+    baseline = series['rolling_median'].shift(1)
+    trend['change_pct'] = (trend['mean'] / baseline - 1) * 100
+
+    samples = {key: values.to_numpy() for key, values in by_run}
+    previous_run = series['run'].shift(1)
+    p_values = []
+    for row, prev in zip(trend[series_columns + ['run']].itertuples(index=False), previous_run):
+        if pd.isna(prev):
+            p_values.append(math.nan)
+            continue
+        _, p_value = regression.mann_whitney_u(samples[(*row[:3], prev)], samples[tuple(row)])
+        p_values.append(p_value)
+    trend['p_value'] = p_values
+    trend['change_point'] = (trend['p_value'] < alpha) & (trend['change_pct'].abs() >= threshold_pct)
+
+    trend['timestamp'] = pd.to_datetime(trend['run'], format=RUN_TIME_FORMAT, errors='coerce')
+    columns = series_columns + ['level', 'run', 'timestamp', 'n', 'mean', 'median',
+                                'rolling_median', 'change_pct', 'p_value', 'change_point']
+    return trend[columns]
+
+
+def change_points(trend: pd.DataFrame) -> pd.DataFrame:
+    """변화점으로 표시된 행만, 변화율 크기 순으로 반환합니다."""
+    points = trend[trend['change_point']]
+    return points.reindex(points['change_pct'].abs().sort_values(ascending=False).index).reset_index(drop=True)
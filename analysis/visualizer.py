@@ -1,22 +1,679 @@
+import hashlib
+import inspect
+import json
+import os
+import zlib
+from concurrent.futures import ProcessPoolExecutor
+from typing import Callable, NamedTuple, Optional
+
+import matplotlib
+matplotlib.use('Agg')  # 화면 없이 파일로만 렌더링 (워커 프로세스에서도 안전)
+from matplotlib.figure import Figure
+import numpy as np
 import pandas as pd
-import matplotlib.pyplot as plt
 import seaborn as sns
-import os
+
+import aggregates
+import censoring
+import flamegraph
+import layout_quality
+import memory
+import timer_tree
+from config import load_config
+from profiler import profiler
 
 # --- 설정 ---
 basic_columns = ['scenario', 'seed', 'strategy', 'totalTime']
-three_step_columns = ['Placement', 'Routing', 'Post-Process']
 
-def resolve_three_step_columns(df: pd.DataFrame):
+# 차트별 입력 fingerprint 를 기록하는 파일 (charts/ 디렉터리 안)
+CACHE_MANIFEST = '.chart_cache.json'
+
+
+class ChartJob(NamedTuple):
+    """차트 한 장을 그리는 데 필요한 모든 것: 렌더러, 입력 데이터 조각, 출력 파일 이름."""
+    renderer: Callable
+    payload: dict
+    filename: str
+    label: str = ' Chart'
+
+
+# --- 렌더러 ---
+# 전역 pyplot 상태를 쓰지 않고 Figure 객체만 다루므로, 여러 프로세스에서 동시에 실행해도 안전합니다.
+
+def _render_total_time(payload: dict, output_path: str):
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    sns.barplot(data=payload['data'], x='scenario', y='totalTime', hue='strategy', palette='viridis', ax=ax)
+
+    ax.set_title('Overall Performance Comparison by Scenario', fontsize=16)
+    ax.set_ylabel('Average Total Time (ms) - Log Scale')
+    ax.set_xlabel('Scenario')
+    ax.set_yscale('log')
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _render_stacked_breakdown(payload: dict, output_path: str):
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    payload['data'].plot(kind='bar', stacked=True, colormap='tab20c', ax=ax)
+
+    ax.set_title(f'3-Step Breakdown for "{payload["strategy"]}" Strategy', fontsize=16)
+    ax.set_ylabel('Average Time (ms)')
+    ax.set_xlabel('Scenario')
+    ax.tick_params(axis='x', labelrotation=0)
+    ax.legend(title='Modules', bbox_to_anchor=(1.05, 1), loc='upper left')
+    fig.tight_layout(rect=[0, 0, 0.85, 1])
+    fig.savefig(output_path)
+
+
+def _render_pie(payload: dict, output_path: str):
+    module_avg = payload['data']
+
+    # 임계값 설정 (1% 미만은 표시 안 함)
+    threshold = 1.0
+    total = module_avg.sum()
+    labels = [label if (value / total * 100) >= threshold else '' for label, value in module_avg.items()]
+
+    fig = Figure(figsize=(10, 8))
+    ax = fig.subplots()
+    ax.pie(
+        module_avg,
+        labels=labels,
+        autopct=lambda p: f'{p:.1f}%' if p >= threshold else '',
+        startangle=90,
+        colors=sns.color_palette(payload['palette'], n_colors=len(module_avg))
+    )
+    ax.set_title(payload['title'], fontsize=16)
+    ax.axis('equal')
+    fig.savefig(output_path)
+
+
+def _render_scaling(payload: dict, output_path: str):
+    points, fits = payload['points'], payload['fits']
+    prediction_cols = [c for c in fits.columns if c.startswith('predicted_ms@')]
+    targets = [int(c.split('@')[1]) for c in prediction_cols]
+    palette = sns.color_palette('viridis', n_colors=len(fits))
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    for color, (strategy, fit) in zip(palette, fits.iterrows()):
+        strategy_points = points[points['strategy'] == strategy]
+        observed = strategy_points[~strategy_points['censored']]
+        ax.scatter(observed['nodes'], observed['totalTime'], color=color, alpha=0.5, s=20)
+        # 예산을 넘겨 중단된 실행: 실제 시간은 예산보다 크다는 것만 알 수 있으므로 예산 위치에 ▲ 로 표시합니다.
+        cut = strategy_points[strategy_points['censored']]
+        if not cut.empty:
+            ax.scatter(cut['nodes'], cut['totalTime'], color=color, marker='^', s=60, edgecolors='black', linewidths=0.5)
+            ax.axhline(cut['totalTime'].max(), color='gray', linestyle=':', linewidth=1)
+
+        # 측정 구간에서 외삽 구간까지 적합 직선을 이어서 그립니다.
+        x_max = max([strategy_points['nodes'].max()] + targets)
+        xs = np.geomspace(strategy_points['nodes'].min(), x_max, 50)
+        anchor_x, anchor_y = targets[0], fit[prediction_cols[0]]
+        ys = anchor_y * (xs / anchor_x) ** fit['exponent']
+        ax.plot(xs, ys, color=color,
+                label=f"{strategy}: b={fit['exponent']:.2f} [{fit['ci_low']:.2f}, {fit['ci_high']:.2f}]")
+
+        for target, col in zip(targets, prediction_cols):
+            ax.scatter([target], [fit[col]], color=color, marker='x', s=60)
+            ax.annotate(f"{fit[col] / 1000:.1f}s", (target, fit[col]), textcoords='offset points',
+                        xytext=(5, 5), fontsize=9, color=color)
+
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_title('Empirical Scaling of Total Time (log-log)', fontsize=16)
+    ax.set_xlabel('Nodes')
+    ax.set_ylabel('Total Time (ms)')
+    title = 'Strategy (exponent, 95% CI)'
+    if points['censored'].any():
+        title += '\n▲ = timed out at budget (censored)'
+    ax.legend(title=title)
+    ax.grid(True, which='both', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _render_trend(payload: dict, output_path: str):
+    series = payload['data']
+    palette = sns.color_palette('tab10', n_colors=series['path'].nunique())
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    for color, (path, points) in zip(palette, series.groupby('path', sort=False)):
+        ax.plot(points['timestamp'], points['mean'], marker='o', color=color, label=path)
+        ax.plot(points['timestamp'], points['rolling_median'], linestyle='--', color=color, alpha=0.6)
+
+        # 변화점: 직전 rolling median 대비 유의하게 달라진 실행
+        changes = points[points['change_point']]
+        ax.scatter(changes['timestamp'], changes['mean'], s=160, facecolors='none', edgecolors='red', linewidths=2, zorder=3)
+        for _, change in changes.iterrows():
+            ax.annotate(f"{change['change_pct']:+.0f}%", (change['timestamp'], change['mean']),
+                        textcoords='offset points', xytext=(6, 8), fontsize=9, color='red')
+
+    ax.set_yscale('log')
+    ax.set_title(f'Performance Trend for "{payload["strategy"]}" ({payload["scenario"]} Scenario)', fontsize=16)
+    ax.set_ylabel('Average Time (ms) - Log Scale (dashed: rolling median)')
+    ax.set_xlabel('Run')
+    ax.legend(title='Key', bbox_to_anchor=(1.02, 1), loc='upper left')
+    ax.grid(True, which='both', alpha=0.3)
+    fig.autofmt_xdate()
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _render_peak_heap(payload: dict, output_path: str):
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    sns.barplot(data=payload['data'], x='scenario', y='peak_heap_mb', hue='strategy', palette='viridis', ax=ax)
+
+    ax.set_title('Peak Heap Growth by Scenario', fontsize=16)
+    ax.set_ylabel('Average Peak Heap Growth (MB) - Log Scale')
+    ax.set_xlabel('Scenario')
+    ax.set_yscale('log')
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _render_memory_breakdown(payload: dict, output_path: str):
+    data = payload['data']
+    fig = Figure(figsize=(12, 1.5 + 0.4 * len(data)))
+    ax = fig.subplots()
+    data.plot(kind='barh', ax=ax, color=['#d95f02', '#7570b3'][:data.shape[1]])
+
+    ax.set_title(f'Heap Usage per Module for "{payload["strategy"]}" ({payload["scenario"]} Scenario)', fontsize=14)
+    ax.set_xlabel('Heap (MB)')
+    ax.set_ylabel('')
+    ax.invert_yaxis()  # 호출 트리 순서대로 위에서 아래로
+    ax.axvline(0, color='gray', linewidth=0.8)
+    ax.legend(loc='lower right')
+    ax.grid(True, axis='x', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _render_memory_scaling(payload: dict, output_path: str):
+    points, fits = payload['points'], payload['fits']
+    prediction_cols = [c for c in fits.columns if c.startswith('predicted_mb@')]
+    targets = [int(c.split('@')[1]) for c in prediction_cols]
+    palette = sns.color_palette('viridis', n_colors=len(fits))
+
+    fig = Figure(figsize=(12, 7))
+    ax = fig.subplots()
+    for color, (strategy, fit) in zip(palette, fits.iterrows()):
+        strategy_points = points[points['strategy'] == strategy]
+        ax.scatter(strategy_points['nodes'], strategy_points['mb'], color=color, alpha=0.5, s=20)
+        if pd.isna(fit['exponent']) or not prediction_cols:
+            continue
+
+        x_max = max([strategy_points['nodes'].max()] + targets)
+        xs = np.geomspace(strategy_points['nodes'].min(), x_max, 50)
+        ys = fit[prediction_cols[0]] * (xs / targets[0]) ** fit['exponent']
+        ax.plot(xs, ys, color=color,
+                label=f"{strategy}: b={fit['exponent']:.2f}, {fit['bytes_per_node'] / 1024:.1f} KB/node")
+        for target, col in zip(targets, prediction_cols):
+            ax.scatter([target], [fit[col]], color=color, marker='x', s=60)
+            ax.annotate(f"{fit[col]:.0f} MB", (target, fit[col]), textcoords='offset points',
+                        xytext=(5, 5), fontsize=9, color=color)
+
+    ax.set_xscale('log')
+    ax.set_yscale('log')
+    ax.set_title('Empirical Scaling of Peak Heap Growth (log-log)', fontsize=16)
+    ax.set_xlabel('Nodes')
+    ax.set_ylabel('Peak Heap Growth (MB)')
+    ax.legend(title='Strategy (exponent, linear bytes/node)')
+    ax.grid(True, which='both', alpha=0.3)
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+QUALITY_LABELS = {
+    'crossings': 'Edge Crossings',
+    'bends': 'Bends',
+    'wire_length': 'Total Wire Length',
+    'node_overlaps': 'Node-Edge Overlaps',
+    'area': 'Bounding Box Area',
+}
+
+
+def _render_quality_pareto(payload: dict, output_path: str):
+    summary, points, metrics = payload['summary'], payload['points'], payload['metrics']
+    strategies = list(summary.index)
+    palette = dict(zip(strategies, sns.color_palette('viridis', n_colors=len(strategies))))
+
+    n_cols = min(3, len(metrics))
+    n_rows = -(-len(metrics) // n_cols)
+    fig = Figure(figsize=(5.5 * n_cols, 4.5 * n_rows))
+    axes = np.atleast_1d(fig.subplots(n_rows, n_cols)).ravel()
+    for ax, metric in zip(axes, metrics):
+        for strategy in strategies:
+            records = points[points['strategy'] == strategy]
+            ax.scatter(records['totalTime'], records[metric], color=palette[strategy], alpha=0.3, s=15)
+            row = summary.loc[strategy]
+            optimal = bool(row[f'pareto_{metric}'])
+            ax.scatter([row['time_ms']], [row[metric]], color=palette[strategy], s=90,
+                       marker='*' if optimal else 'o', edgecolors='black', linewidths=0.6, label=strategy)
+        # 파레토 경계: 최적인 전략들을 시간 순서로 계단형으로 잇습니다 (왼쪽 아래가 좋음).
+        front = summary[summary[f'pareto_{metric}']].sort_values('time_ms')
+        ax.step(front['time_ms'], front[metric], where='post', color='gray', linestyle='--', linewidth=1)
+        ax.set_xscale('log')
+        ax.set_title(QUALITY_LABELS.get(metric, metric), fontsize=12)
+        ax.set_xlabel('Total Time (ms) - Log Scale')
+        ax.grid(True, which='both', alpha=0.3)
+    for ax in axes[len(metrics):]:
+        ax.axis('off')
+    axes[0].legend(title='Strategy (★ = Pareto-optimal)', fontsize=9)
+    fig.suptitle(f'Layout Quality vs. Time ({payload["scenario"]} Scenario, lower is better)', fontsize=16)
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+def _flame_color(name: str):
+    """이름마다 고정된 따뜻한 색 (전통적인 flame graph 팔레트)."""
+    return matplotlib.colormaps['YlOrRd'](0.2 + 0.5 * (zlib.crc32(name.encode()) % 1000) / 1000)
+
+
+def _render_icicle(payload: dict, output_path: str):
+    layout = payload['data']
+    root_width = layout['width'].iloc[0] or 1.0
+    diff = 'change_pct' in layout.columns
+
+    if diff:
+        # 회귀는 빨강, 개선은 파랑 (변화율 ±limit% 에서 최대 채도), 유의하지 않은 변화는 회색
+        limit = payload.get('limit_pct', 100.0)
+        cmap = matplotlib.colormaps['RdBu_r']
+        significant = layout['verdict'].isin(['regression', 'improvement'])
+        colors = [
+            cmap(0.5 + 0.5 * float(np.clip(change / limit, -1, 1))) if sig else '#d9d9d9'
+            for change, sig in zip(layout['change_pct'].fillna(0), significant)
+        ]
+    else:
+        colors = [_flame_color(name) for name in layout['name']]
+
+    max_depth = int(layout['depth'].max())
+    fig = Figure(figsize=(16, 1.5 + 0.45 * (max_depth + 1)))
+    ax = fig.subplots()
+    ax.barh(layout['depth'], layout['width'], left=layout['x0'], height=0.92,
+            color=colors, edgecolor='white', linewidth=0.5, align='center')
+
+    for row in layout.itertuples(index=False):
+        if row.width / root_width < 0.03:
+            continue  # 좁은 칸에는 라벨을 쓰지 않습니다 (folded 파일에는 그대로 남아 있음).
+        label = f"{row.name} {row.inclusive:.1f} ms ({row.width / root_width * 100:.1f}%)"
+        if diff and pd.notna(row.change_pct):
+            label += f" {row.change_pct:+.0f}%"
+        ax.text(row.x0 + row.width / 2, row.depth, label, ha='center', va='center', fontsize=8, clip_on=True)
+
+    ax.set_xlim(0, root_width)
+    ax.set_ylim(max_depth + 0.5, -0.5)  # icicle: 루트(Total)가 위
+    ax.set_yticks(range(max_depth + 1))
+    ax.set_ylabel('Depth')
+    ax.set_xlabel('Inclusive Time (ms)')
+    ax.set_title(payload['title'], fontsize=14)
+    for side in ('top', 'right'):
+        ax.spines[side].set_visible(False)
+    fig.tight_layout()
+    fig.savefig(output_path)
+
+
+# --- 차트 작업 생성 ---
+# 집계는 aggregates.build_cube 로 한 번만 계산하고, 차트별로 필요한 (이미 집계된) 작은 입력 조각만 잘라 씁니다.
+
+def total_time_jobs(df: pd.DataFrame) -> list:
+    """시나리오별/전략별 전체 실행 시간 비교 막대 차트 (신뢰구간 표시를 위해 레코드 단위 데이터 사용)."""
+    data = df.loc[~censoring.is_censored(df), ['scenario', 'strategy', 'totalTime']].reset_index(drop=True)
+    return [ChartJob(_render_total_time, {'data': data}, 'total_time_comparison.png')]
+
+
+def three_step_breakdown_jobs(cube: pd.DataFrame) -> list:
+    """각 전략의 시나리오별 3단계(L1) 실행 시간 누적 막대 차트 (전략별로 파일 분리)."""
+    steps = aggregates.level_table(cube, level=1)
+    jobs = []
+    for strategy, module_avg in steps.groupby(level='strategy', sort=False):
+        module_avg = module_avg.droplevel('strategy').dropna(axis=1, how='all')
+        if module_avg.empty:
+            continue
+        module_avg.columns.name = None
+        jobs.append(ChartJob(
+            _render_stacked_breakdown,
+            {'strategy': strategy, 'data': module_avg},
+            f'three_step_breakdown_{aggregates.safe_name(strategy)}.png'
+        ))
+    return jobs
+
+
+def three_step_breakdown_pie_jobs(cube: pd.DataFrame, target_scenario: Optional[str] = None) -> list:
+    """시나리오/전략별 3단계(L1) 비중 파이 차트. target_scenario 가 없으면 모든 시나리오."""
+    jobs = []
+    for scenario, strategy, cell in aggregates.cells(cube, target_scenario):
+        module_avg = cell.loc[cell['level'] == 1, 'mean'].dropna()
+        if module_avg.empty:
+            continue
+        module_avg.index.name = None
+        jobs.append(ChartJob(
+            _render_pie,
+            {
+                'data': module_avg,
+                'palette': 'tab20c',
+                'title': f'3-Step Phase Breakdown for "{strategy}"\n({scenario} Scenario)',
+            },
+            f'three_step_breakdown_pie_{aggregates.chart_suffix(scenario, strategy)}.png',
+            '🥧 Pie chart'
+        ))
+    return jobs
+
+
+def routing_breakdown_pie_jobs(cube: pd.DataFrame, target_scenario: Optional[str] = None) -> list:
+    """시나리오/전략별 'Routing' 단계 내부 시간 비중 파이 차트. target_scenario 가 없으면 모든 시나리오."""
+    jobs = []
+    for scenario, strategy, cell in aggregates.cells(cube, target_scenario):
+        # 'Routing' 노드의 직계 자식들과, 자식으로 계측되지 않은 나머지(self) 시간
+        routing_children = aggregates.children(cell, 'Routing')
+        if routing_children.empty:
+            continue
+        # 자식 inclusive 합 + (self) = Routing inclusive 이므로 각 조각이 실제 비중을 나타냅니다.
+        module_avg = routing_children['inclusive'].clip(lower=0)
+        jobs.append(ChartJob(
+            _render_pie,
+            {
+                'data': module_avg,
+                'palette': 'viridis',
+                'title': f'Routing Phase Breakdown for "{strategy}"\n({scenario} Scenario)',
+            },
+            f'routing_breakdown_pie_{aggregates.chart_suffix(scenario, strategy)}.png',
+            '🥧 Pie chart'
+        ))
+    return jobs
+
+
+def scaling_jobs(df: pd.DataFrame, scaling: pd.DataFrame) -> list:
+    """
+    노드 수 대비 totalTime 의 log-log 차트 (전략별 적합 직선, 성장 지수, 외삽 예상 시간 포함).
+
+    Args:
+        df (pd.DataFrame): 시나리오 크기가 붙은 벤치마크 데이터프레임 (analyzer.attach_scenario_sizes).
+        scaling (pd.DataFrame): analyzer.fit_scaling 결과.
+    """
+    totals = scaling[scaling['key'] == timer_tree.ROOT_PATH].set_index('strategy') if not scaling.empty else scaling
+    if totals.empty or 'nodes' not in df.columns:
+        return []
+    points = df[['strategy', 'nodes', 'totalTime']].assign(censored=censoring.is_censored(df)).reset_index(drop=True)
+    return [ChartJob(_render_scaling, {'points': points, 'fits': totals.drop(columns='key')}, 'scaling_total_time.png')]
+
+
+def memory_jobs(df: pd.DataFrame, memory_cube: Optional[pd.DataFrame] = None) -> list:
+    """
+    힙 사용량 차트: 시나리오별 peak heap 비교, (시나리오, 전략)별 모듈 heap 막대, 노드 수 대비 peak heap log-log.
+    힙 사용량이 기록되지 않은 실행이면 빈 목록입니다.
+
+    Args:
+        df (pd.DataFrame): 시나리오 크기가 붙은 벤치마크 데이터프레임 (analyzer.attach_scenario_sizes).
+        memory_cube (Optional[pd.DataFrame]): memory.memory_cube 결과. 없으면 여기서 계산합니다.
+    """
+    if memory_cube is None:
+        memory_cube = memory.memory_cube(df)
+    if memory_cube.empty or 'peak_heap_mb' not in memory_cube.columns:
+        return []
+
+    totals = memory_cube.xs(timer_tree.ROOT_PATH, level='path')['peak_heap_mb'].reset_index()
+    jobs = [ChartJob(_render_peak_heap, {'data': totals}, 'peak_heap_comparison.png', '🧠 Memory chart')]
+
+    columns = {'peak_heap_mb': 'Peak Growth (MB)', 'heap_delta_mb': 'Retained Delta (MB)'}
+    for scenario, strategy, cell in aggregates.cells(memory_cube):
+        modules = cell[cell['level'] >= 1][[c for c in columns if c in cell.columns]].rename(columns=columns)
+        if modules.empty:
+            continue
+        modules.index.name = None
+        jobs.append(ChartJob(
+            _render_memory_breakdown,
+            {'scenario': scenario, 'strategy': strategy, 'data': modules},
+            f'memory_breakdown_{aggregates.chart_suffix(scenario, strategy)}.png',
+            '🧠 Memory chart'
+        ))
+
+    fits = memory.fit_memory_scaling(df)
+    if not fits.empty:
+        fits = fits[fits['key'] == timer_tree.ROOT_PATH].set_index('strategy').drop(columns='key')
+        long = memory.to_long(df)
+        points = long[(long['metric'] == 'peakHeap') & (long['path'] == timer_tree.ROOT_PATH)]
+        points = points.assign(mb=points['bytes'] / memory.BYTES_PER_MB)[['strategy', 'nodes', 'mb']]
+        if not fits.empty:
+            jobs.append(ChartJob(_render_memory_scaling, {'points': points.reset_index(drop=True), 'fits': fits},
+                                 'memory_scaling.png', '🧠 Memory chart'))
+    return jobs
+
+
+def quality_jobs(df: pd.DataFrame, quality: pd.DataFrame) -> list:
+    """
+    시나리오별 레이아웃 품질 지표 대 totalTime 파레토 차트 (지표마다 subplot 하나, 레코드 점 + 전략 평균).
+    레이아웃이 기록되지 않은 실행이면 빈 목록입니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
+        quality (pd.DataFrame): layout_quality.load_quality 결과.
+    """
+    if quality is None or quality.empty:
+        return []
+    summary = layout_quality.quality_summary(quality, df)
+    if summary.empty:
+        return []
+    metrics = [c[len('pareto_'):] for c in summary.columns if c.startswith('pareto_')]
+    points = layout_quality.join_records(quality, df, ['totalTime'])
+    jobs = []
+    for scenario, cell in summary.groupby(level='scenario', sort=False):
+        jobs.append(ChartJob(
+            _render_quality_pareto,
+            {
+                'scenario': scenario,
+                'summary': cell.droplevel('scenario'),
+                'points': points.loc[points['scenario'] == scenario, ['strategy', 'totalTime'] + metrics].reset_index(drop=True),
+                'metrics': metrics,
+            },
+            f'quality_pareto_{aggregates.safe_name(scenario)}.png',
+            '📐 Quality chart'
+        ))
+    return jobs
+
+
+def flame_jobs(cube: pd.DataFrame) -> list:
+    """(시나리오, 전략)별 호출 트리 icicle SVG (폭 = inclusive 시간)."""
+    jobs = []
+    for scenario, strategy, cell in aggregates.cells(cube):
+        if timer_tree.ROOT_PATH not in cell.index:
+            continue
+        jobs.append(ChartJob(
+            _render_icicle,
+            {
+                'data': flamegraph.icicle_layout(cell),
+                'title': f'Timer Tree for "{strategy}" ({scenario} Scenario)',
+            },
+            f'flame_{aggregates.safe_name(scenario)}_{aggregates.safe_name(strategy)}.svg',
+            '🔥 Flame graph'
+        ))
+    return jobs
+
+
+def diff_flame_jobs(candidate_cube: pd.DataFrame, comparison: pd.DataFrame, baseline_name: str) -> list:
     """
-    Support both legacy three-step names and new L1-* columns.
-    Returns (selected_columns, rename_map) where rename_map maps selected name -> display name.
+    두 실행의 차분(differential) flame graph. 폭은 비교 실행(candidate)의 inclusive 시간이고,
+    색은 regression.compare_runs 판정(회귀 = 빨강, 개선 = 파랑)과 변화율입니다.
+
+    Args:
+        candidate_cube (pd.DataFrame): 비교 실행의 aggregates.build_cube 결과.
+        comparison (pd.DataFrame): regression.compare_runs(baseline, candidate) 결과.
+        baseline_name (str): 제목에 표시할 기준 실행 이름.
+    """
+    limit = load_config().get('compare', {}).get('threshold_pct', 10.0) * 5
+    verdicts = None
+    if not comparison.empty:
+        verdicts = comparison.set_index(['scenario', 'strategy', 'key'])[['change_pct', 'verdict']].sort_index()
+    jobs = []
+    for scenario, strategy, cell in aggregates.cells(candidate_cube):
+        if timer_tree.ROOT_PATH not in cell.index:
+            continue
+        layout = flamegraph.icicle_layout(cell)
+        if verdicts is not None and (scenario, strategy) in verdicts.index.droplevel('key'):
+            layout = layout.join(verdicts.loc[(scenario, strategy)], on='path')
+        else:
+            layout = layout.assign(change_pct=np.nan, verdict=None)
+        jobs.append(ChartJob(
+            _render_icicle,
+            {
+                'data': layout,
+                'limit_pct': limit,
+                'title': f'Differential Timer Tree for "{strategy}" ({scenario} Scenario) vs {baseline_name}\n'
+                         f'(red = regression, blue = improvement, gray = not significant)',
+            },
+            f'flame_diff_{aggregates.safe_name(scenario)}_{aggregates.safe_name(strategy)}.svg',
+            '🔥 Flame graph'
+        ))
+    return jobs
+
+
+def trend_jobs(trend: pd.DataFrame, max_level: int = None) -> list:
     """
-    l1_prefixed = {f"L1-{name}": name for name in three_step_columns if f"L1-{name}" in df.columns}
-    if len(l1_prefixed) > 0:
-        return list(l1_prefixed.keys()), l1_prefixed
-    legacy = [col for col in three_step_columns if col in df.columns]
-    return legacy, {name: name for name in legacy}
+    (시나리오, 전략)별 실행 시계열 차트 (측정 키별 평균, rolling median, 변화점 표시).
+
+    Args:
+        trend (pd.DataFrame): trend.build_trend 결과.
+        max_level (int): 차트에 그릴 최대 레벨. 기본값은 config.yaml 의 trend.chart_max_level.
+    """
+    if max_level is None:
+        max_level = load_config().get('trend', {}).get('chart_max_level', 1)
+    shown = trend[trend['level'] <= max_level]
+    jobs = []
+    for (scenario, strategy), series in shown.groupby(['scenario', 'strategy'], sort=False):
+        data = series[['path', 'timestamp', 'mean', 'rolling_median', 'change_pct', 'change_point']].reset_index(drop=True)
+        jobs.append(ChartJob(
+            _render_trend,
+            {'scenario': scenario, 'strategy': strategy, 'data': data},
+            f'trend_{aggregates.safe_name(scenario)}_{aggregates.safe_name(strategy)}.png'
+        ))
+    return jobs
+
+
+# --- 캐시 및 실행 ---
+
+def _hash_value(digest, value):
+    if isinstance(value, (pd.DataFrame, pd.Series)):
+        labels = value.columns if isinstance(value, pd.DataFrame) else value.name
+        digest.update(repr(list(labels) if isinstance(value, pd.DataFrame) else labels).encode())
+        digest.update(pd.util.hash_pandas_object(value, index=True).to_numpy().tobytes())
+    elif isinstance(value, dict):
+        for key in sorted(value):
+            digest.update(str(key).encode())
+            _hash_value(digest, value[key])
+    else:
+        digest.update(repr(value).encode())
+
+
+def fingerprint(job: ChartJob) -> str:
+    """
+    차트 입력 조각과 렌더러 소스 코드의 해시. 둘 중 하나라도 바뀌면 차트를 다시 그립니다.
+    """
+    digest = hashlib.sha256()
+    digest.update(inspect.getsource(job.renderer).encode())
+    _hash_value(digest, job.payload)
+    return digest.hexdigest()
+
+
+def _run_job(job: ChartJob, output_path: str) -> str:
+    job.renderer(job.payload, output_path)
+    return output_path
+
+
+def render_jobs(jobs: list, charts_dir: str, workers: Optional[int] = None, force: bool = False) -> list:
+    """
+    차트 작업들을 렌더링합니다. 입력 fingerprint 가 이전 실행과 같고 파일이 남아 있으면 건너뛰며,
+    나머지는 프로세스 풀에서 병렬로 그립니다.
+
+    Args:
+        jobs (list): ChartJob 목록.
+        charts_dir (str): 차트 파일을 저장할 디렉터리 경로.
+        workers (Optional[int]): 워커 프로세스 수. None 이면 config.yaml 의 charts.workers (없으면 CPU 수).
+        force (bool): True 이면 캐시를 무시하고 모두 다시 그립니다.
+
+    Returns:
+        list: 새로 렌더링한 차트 파일 경로 목록.
+    """
+    with profiler.section('L3-Visualize:Render:Cache'):
+        manifest_path = os.path.join(charts_dir, CACHE_MANIFEST)
+        manifest = {}
+        if os.path.exists(manifest_path):
+            with open(manifest_path, 'r') as f:
+                manifest = json.load(f)
+
+        pending = []
+        for job in jobs:
+            output_path = os.path.join(charts_dir, job.filename)
+            key = fingerprint(job)
+            if not force and manifest.get(job.filename) == key and os.path.exists(output_path):
+                print(f"{job.label} up to date: {output_path}")
+                continue
+            manifest[job.filename] = key
+            pending.append((job, output_path))
+
+    if workers is None:
+        workers = load_config().get('charts', {}).get('workers') or os.cpu_count() or 1
+    workers = max(1, min(workers, len(pending)))
+
+    # 프로세스 풀의 워커는 측정되지 않으므로, 그리기 시간은 부모 프로세스에서 본 경과 시간입니다.
+    with profiler.section('L3-Visualize:Render:Draw'):
+        if workers == 1:
+            for job, output_path in pending:
+                _run_job(job, output_path)
+                print(f"{job.label} saved to: {output_path}")
+        else:
+            with ProcessPoolExecutor(max_workers=workers) as pool:
+                futures = [(job, pool.submit(_run_job, job, output_path)) for job, output_path in pending]
+                for job, future in futures:
+                    print(f"{job.label} saved to: {future.result()}")
+
+    with open(manifest_path, 'w') as f:
+        json.dump(manifest, f, indent=2, sort_keys=True)
+    return [output_path for _, output_path in pending]
+
+
+def render_all_charts(
+    df: pd.DataFrame,
+    charts_dir: str,
+    scaling: Optional[pd.DataFrame] = None,
+    cube: Optional[pd.DataFrame] = None,
+    workers: Optional[int] = None,
+    force: bool = False,
+    quality: Optional[pd.DataFrame] = None,
+) -> list:
+    """
+    파이프라인의 모든 차트를 한 번에 생성합니다.
+
+    Args:
+        df (pd.DataFrame): 전처리된 벤치마크 데이터프레임 (scaling 차트를 그리려면 시나리오 크기 포함).
+        charts_dir (str): 차트 파일을 저장할 디렉터리 경로.
+        scaling (Optional[pd.DataFrame]): analyzer.fit_scaling 결과. 없으면 scaling 차트를 생략합니다.
+        cube (Optional[pd.DataFrame]): aggregates.build_cube 결과. 없으면 여기서 계산합니다.
+        workers (Optional[int]): 워커 프로세스 수.
+        force (bool): True 이면 캐시를 무시합니다.
+        quality (Optional[pd.DataFrame]): layout_quality.load_quality 결과. 없으면 품질 차트를 생략합니다.
+    """
+    if cube is None:
+        cube = aggregates.build_cube(df)
+    with profiler.section('L2-Visualize:Jobs'):
+        jobs = (
+            total_time_jobs(df)
+            + three_step_breakdown_jobs(cube)
+            + routing_breakdown_pie_jobs(cube)
+            + three_step_breakdown_pie_jobs(cube)
+            + flame_jobs(cube)
+            + memory_jobs(df)
+            + quality_jobs(df, quality)
+        )
+        if scaling is not None:
+            jobs += scaling_jobs(df, scaling)
+    with profiler.section('L2-Visualize:Render'):
+        return render_jobs(jobs, charts_dir, workers=workers, force=force)
+
+
+# --- 개별 차트 함수 (기존 API 호환) ---
 
 def plot_total_time_comparison(df: pd.DataFrame, charts_dir: str):
     """
@@ -26,20 +683,8 @@ def plot_total_time_comparison(df: pd.DataFrame, charts_dir: str):
         df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
         charts_dir (str): 차트 파일을 저장할 디렉터리 경로.
     """
-    output_path = os.path.join(charts_dir, 'total_time_comparison.png')
-
-    plt.figure(figsize=(12, 7))
-    sns.barplot(data=df, x='scenario', y='totalTime', hue='strategy', palette='viridis')
-    
-    plt.title('Overall Performance Comparison by Scenario', fontsize=16)
-    plt.ylabel('Average Total Time (ms) - Log Scale')
-    plt.xlabel('Scenario')
-    plt.yscale('log')
-    plt.tight_layout()
-    
-    plt.savefig(output_path)
-    plt.close()
-    print(f" Chart saved to: {output_path}")
+    render_jobs(total_time_jobs(df), charts_dir, workers=1)
+
 
 def plot_three_step_breakdown(df: pd.DataFrame, charts_dir: str):
     """
@@ -50,151 +695,41 @@ def plot_three_step_breakdown(df: pd.DataFrame, charts_dir: str):
         df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
         charts_dir (str): 차트 파일을 저장할 디렉터리 경로.
     """
-    strategies = df['strategy'].unique()
-    
-    for strategy in strategies:
-        strategy_df = df[df['strategy'] == strategy].dropna(axis=1, how='all')
+    render_jobs(three_step_breakdown_jobs(aggregates.build_cube(df)), charts_dir, workers=1)
 
-        # Resolve columns (legacy or L1-*) and rename for display
-        selected_cols, rename_map = resolve_three_step_columns(df)
-        detail_columns = [c for c in selected_cols if c in strategy_df.columns]
-        if not detail_columns:
-            continue
 
-        module_avg = strategy_df.groupby('scenario')[detail_columns].mean()
-        module_avg = module_avg.rename(columns=rename_map)
-        
-        module_avg.plot(kind='bar', stacked=True, figsize=(12, 7), colormap='tab20c')
-        
-        plt.title(f'3-Step Breakdown for "{strategy}" Strategy', fontsize=16)
-        plt.ylabel('Average Time (ms)')
-        plt.xlabel('Scenario')
-        plt.xticks(rotation=0)
-        plt.legend(title='Modules', bbox_to_anchor=(1.05, 1), loc='upper left')
-        plt.tight_layout(rect=[0, 0, 0.85, 1])
-        
-        safe_strategy_name = strategy.replace(' ', '-').replace('*', 'Star')
-        output_path = os.path.join(charts_dir, f'three_step_breakdown_{safe_strategy_name}.png')
-        
-        plt.savefig(output_path)
-        plt.close()
-        print(f" Chart saved to: {output_path}")
-
-def plot_three_step_breakdown_pie(df: pd.DataFrame, charts_dir: str, target_scenario: str = 'Large (Standard)'):
-    """
-    특정 시나리오에 대해, 각 전략의 3단계 별 비중을 파이 차트로 생성합니다.
+def plot_three_step_breakdown_pie(df: pd.DataFrame, charts_dir: str, target_scenario: Optional[str] = None):
+    """
+    시나리오별로, 각 전략의 3단계 별 비중을 파이 차트로 생성합니다.
 
     Args:
         df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
         charts_dir (str): 차트를 저장할 디렉터리 경로.
-        target_scenario (str): 분석할 대상 시나리오의 이름.
+        target_scenario (Optional[str]): 분석할 대상 시나리오의 이름. 없으면 모든 시나리오.
     """
-    scenario_df = df[df['scenario'] == target_scenario]
-    if scenario_df.empty:
-        return
-
-    strategies = scenario_df['strategy'].unique()
-
-    for strategy in strategies:
-        strategy_df = scenario_df[scenario_df['strategy'] == strategy]
-        
-        # Resolve three-step columns and rename for display
-        selected_cols, rename_map = resolve_three_step_columns(df)
-        routing_detail_cols = [c for c in selected_cols if c in strategy_df.columns]
-
-        # 해당 전략에서 측정된 값들만 필터링
-        measured_modules = strategy_df[routing_detail_cols].dropna(axis=1, how='all')
-        
-        if measured_modules.empty:
-            continue
-            
-        # 각 세부 모듈의 평균 시간을 계산
-        module_avg = measured_modules.mean()
-        module_avg.index = [rename_map.get(ix, ix) for ix in module_avg.index]
-
-        # 임계값 설정 (1% 미만은 표시 안 함)
-        threshold = 1.0 
-        total = module_avg.sum()
-        
-        # 비율이 임계값 미만인 경우 레이블을 빈 문자열로 처리
-        labels = [label if (value / total * 100) >= threshold else '' for label, value in module_avg.items()]
-        
-        # 파이 차트 생성
-        plt.figure(figsize=(10, 8))
-        plt.pie(
-            module_avg, 
-            labels=labels, # 수정된 레이블 사용
-            # 비율이 임계값 미만인 경우 퍼센트 텍스트도 표시 안 함
-            autopct=lambda p: f'{p:.1f}%' if p >= threshold else '', 
-            startangle=90,
-            colors=sns.color_palette('tab20c', n_colors=len(module_avg)) # 색상은 'tab20c' 유지
-        )
-        
-        plt.title(f'3-Step Phase Breakdown for "{strategy}"\n({target_scenario} Scenario)', fontsize=16)
-        plt.axis('equal')
-        
-        # 파일 저장
-        safe_strategy_name = strategy.replace(' ', '-').replace('*', 'Star')
-        output_path = os.path.join(charts_dir, f'three_step_breakdown_pie_{safe_strategy_name}.png')
-        plt.savefig(output_path)
-        plt.close()
-        print(f"🥧 Pie chart saved to: {output_path}")
+    render_jobs(three_step_breakdown_pie_jobs(aggregates.build_cube(df), target_scenario), charts_dir, workers=1)
 
 
-def plot_routing_breakdown_pie(df: pd.DataFrame, charts_dir: str, target_scenario: str = 'Large (Standard)'):
+def plot_routing_breakdown_pie(df: pd.DataFrame, charts_dir: str, target_scenario: Optional[str] = None):
     """
-    특정 시나리오에 대해, 각 전략의 'Routing' 단계 내부 시간 비중을 파이 차트로 생성합니다.
+    시나리오별로, 각 전략의 'Routing' 단계 내부 시간 비중을 파이 차트로 생성합니다.
 
     Args:
         df (pd.DataFrame): 전처리된 벤치마크 데이터프레임.
         charts_dir (str): 차트를 저장할 디렉터리 경로.
-        target_scenario (str): 분석할 대상 시나리오의 이름.
+        target_scenario (Optional[str]): 분석할 대상 시나리오의 이름. 없으면 모든 시나리오.
     """
-    scenario_df = df[df['scenario'] == target_scenario]
-    if scenario_df.empty:
-        return
+    render_jobs(routing_breakdown_pie_jobs(aggregates.build_cube(df), target_scenario), charts_dir, workers=1)
 
-    strategies = scenario_df['strategy'].unique()
 
-    for strategy in strategies:
-        strategy_df = scenario_df[scenario_df['strategy'] == strategy]
-        
-        # 'Routing' 단계에 속하는 세부 모듈들을 식별합니다. (Placement, Post-Process, totalTime 제외)
-        routing_detail_cols = [
-            col for col in df.columns
-            if col not in basic_columns + three_step_columns
-        ]
-        
-        # 해당 전략에서 측정된 값들만 필터링
-        measured_modules = strategy_df[routing_detail_cols].dropna(axis=1, how='all')
-        
-        if measured_modules.empty:
-            continue
-            
-        # 각 세부 모듈의 평균 시간을 계산
-        module_avg = measured_modules.mean()
-        
-        threshold = 1.0
-        total = module_avg.sum()
-        labels = [label if (value / total * 100) >= threshold else '' for label, value in module_avg.items()]
-        
-        # 파이 차트 생성
-        plt.figure(figsize=(10, 8))
-        plt.pie(
-            module_avg, 
-            labels=labels, 
-            autopct=lambda p: f'{p:.1f}%' if p >= threshold else '',
-            startangle=90,
-            # --- ✨ 2단계 수정: 다른 색상 팔레트 사용 ---
-            colors=sns.color_palette('viridis', n_colors=len(module_avg)) 
-        )
-        
-        plt.title(f'Routing Phase Breakdown for "{strategy}"\n({target_scenario} Scenario)', fontsize=16)
-        plt.axis('equal')
-        
-        # 파일 저장
-        safe_strategy_name = strategy.replace(' ', '-').replace('*', 'Star')
-        output_path = os.path.join(charts_dir, f'routing_breakdown_pie_{safe_strategy_name}.png')
-        plt.savefig(output_path)
-        plt.close()
-        print(f"🥧 Pie chart saved to: {output_path}")
\ No newline at end of file
+def plot_scaling(df: pd.DataFrame, scaling: pd.DataFrame, charts_dir: str):
+    """
+    노드 수 대비 totalTime 을 log-log 축에 그리고, 전략별 적합 직선과 성장 지수,
+    그리고 외삽한 대규모 그래프(예: 1k, 5k 노드)의 예상 실행 시간을 함께 표시합니다.
+
+    Args:
+        df (pd.DataFrame): 시나리오 크기가 붙은 벤치마크 데이터프레임 (analyzer.attach_scenario_sizes).
+        scaling (pd.DataFrame): analyzer.fit_scaling 결과.
+        charts_dir (str): 차트 파일을 저장할 디렉터리 경로.
+    """
+    render_jobs(scaling_jobs(df, scaling), charts_dir, workers=1)
@@ -0,0 +1,271 @@
+import ctypes
+import ctypes.util
+import os
+import select
+import struct
+import subprocess
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
+
+import config
+import data_loader
+
+# --- 설정 ---
+# results/ 를 지켜보다가 새로 생겼거나 바뀐 실행 디렉터리만 분석합니다 (python main.py watch).
+# - 감지 : Linux 에서는 inotify (ctypes), 그 외에는 주기적으로 디렉터리를 훑는 polling
+# - 디바운스 : 원시 결과 파일의 (mtime, 크기) 가 debounce_s 동안 그대로이고 JSON 배열이 닫혀 있어야 분석합니다.
+#             raw_results.ndjson 만 있는 실행(아직 실행 중이거나 중단됨)은 stream_idle_s 동안 조용해야 분석합니다.
+# - 실행 : 실행마다 `main.py --target <run>` 하위 프로세스를 띄우고, 동시에 workers 개까지만 실행합니다.
+#         차트 렌더링 프로세스 수도 CPU 수 / workers 로 나눠, 여러 실행이 겹쳐도 CPU 를 초과 구독하지 않습니다.
+MAIN_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'main.py')
+LOG_FILE_NAME = 'analysis.log'  # results/<run>/analysis.log
+STREAM_FILE_NAME = 'raw_results.ndjson'
+COLUMNAR_FILE_NAME = 'raw_results.col'  # columnar.COLUMNAR_FILE_NAME
+# main.py --target 이 읽는 원시 결과 파일 (data_loader.find_benchmark_file 과 같은 순서).
+# 초기(2025-10-09) 실행의 benchmark-results.json 은 새로 생기지 않으므로 지켜보지 않습니다.
+# 컬럼 파일은 JSON 보다 새것일 때만 씁니다 (history_store.find_raw_file 과 같은 규칙).
+RAW_FILE_NAMES = [COLUMNAR_FILE_NAME, 'raw_results.json', STREAM_FILE_NAME]
+STALE_STAGES = ['analyze', 'visualize', 'report']
+
+# <sys/inotify.h>
+IN_MODIFY = 0x00000002
+IN_CLOSE_WRITE = 0x00000008
+IN_MOVED_TO = 0x00000080
+IN_CREATE = 0x00000100
+IN_ISDIR = 0x40000000
+IN_NONBLOCK = os.O_NONBLOCK
+IN_CLOEXEC = 0o2000000
+EVENT_HEADER = struct.Struct('iIII')  # wd, mask, cookie, len
+
+
+def _settings() -> dict:
+    cfg = config.load_config().get('watch', {})
+    return {
+        'workers': cfg.get('workers', 2),
+        'debounce_s': cfg.get('debounce_s', 5.0),
+        'stream_idle_s': cfg.get('stream_idle_s', 300.0),
+        'poll_interval_s': cfg.get('poll_interval_s', 2.0),
+    }
+
+
+class _Inotify:
+    """
+    results/ (새 실행 디렉터리) 와 각 실행 디렉터리 (원시 결과 파일) 에 inotify 감시를 겁니다.
+    이벤트는 "다시 훑어볼 때가 됐다" 는 신호로만 쓰고, 실제 판단은 파일 서명으로 합니다.
+    """
+
+    name = 'inotify'
+
+    def __init__(self):
+        self._libc = ctypes.CDLL(ctypes.util.find_library('c') or 'libc.so.6', use_errno=True)
+        self._fd = self._libc.inotify_init1(IN_NONBLOCK | IN_CLOEXEC)
+        if self._fd < 0:
+            raise OSError(ctypes.get_errno(), 'inotify_init1 failed')
+        self._watched = set()
+
+    def add(self, path: str, is_root: bool = False):
+        if path in self._watched:
+            return
+        mask = IN_CREATE | IN_MOVED_TO if is_root else IN_CREATE | IN_MODIFY | IN_CLOSE_WRITE | IN_MOVED_TO
+        if self._libc.inotify_add_watch(self._fd, os.fsencode(path), mask) < 0:
+            raise OSError(ctypes.get_errno(), f"inotify_add_watch failed for '{path}'")
+        self._watched.add(path)
+
+    def wait(self, timeout: float) -> bool:
+        """timeout 초 안에 관련 이벤트(새 디렉터리, 원시 결과 파일 변경)가 오면 True."""
+        deadline = time.monotonic() + timeout
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not select.select([self._fd], [], [], remaining)[0]:
+                return False
+            buf = os.read(self._fd, 1 << 16)
+            pos, relevant = 0, False
+            while pos < len(buf):
+                _, mask, _, length = EVENT_HEADER.unpack_from(buf, pos)
+                name = buf[pos + EVENT_HEADER.size:pos + EVENT_HEADER.size + length].rstrip(b'\0').decode(errors='replace')
+                pos += EVENT_HEADER.size + length
+                # 분석 결과(summary.json, charts/ 등)도 같은 디렉터리에 쓰이므로 원시 결과 파일만 봅니다.
+                relevant |= bool(mask & IN_ISDIR) or name in RAW_FILE_NAMES
+            if relevant:
+                return True
+
+    def close(self):
+        os.close(self._fd)
+
+
+class _Polling:
+    """inotify 를 쓸 수 없을 때(Linux 외, 감시 한도 초과 등): 매 poll_interval_s 마다 다시 훑습니다."""
+
+    name = 'polling'
+
+    def __init__(self, interval: float):
+        self.interval = interval
+
+    def add(self, path: str, is_root: bool = False):
+        pass
+
+    def wait(self, timeout: float) -> bool:
+        time.sleep(min(timeout, self.interval))
+        return True
+
+    def close(self):
+        pass
+
+
+def raw_signature(run_dir: str) -> Optional[tuple]:
+    """실행 디렉터리의 원시 결과 파일 (이름, mtime, 크기). 없거나 run_dir 가 디렉터리가 아니면 None."""
+    found = []
+    for name in RAW_FILE_NAMES:
+        try:
+            stat = os.stat(os.path.join(run_dir, name))
+        except OSError:  # 없는 파일, 또는 run_dir 가 파일 (results/history.sqlite 등)
+            continue
+        found.append((name, stat.st_mtime, stat.st_size))
+    if len(found) > 1 and found[0][0] == COLUMNAR_FILE_NAME and found[0][1] < found[1][1]:
+        found.pop(0)
+    return found[0] if found else None
+
+
+def is_complete(raw_path: str) -> bool:
+    """JSON 배열 파일이 끝까지 쓰였는지 (마지막 글자가 ']') 확인합니다. NDJSON 스트림은 항상 True."""
+    if not raw_path.endswith('.json'):
+        return True
+    with open(raw_path, 'rb') as f:
+        f.seek(0, os.SEEK_END)
+        f.seek(max(0, f.tell() - 64))
+        return f.read().rstrip().endswith(b']')
+
+
+def is_stale(raw_path: str) -> bool:
+    """분석 결과(summary/charts/report) 중 입력이나 코드가 바뀐 단계가 있는지, 파이프라인 fingerprint 로 확인합니다."""
+    import main
+
+    pipeline = main.build_pipeline(raw_path)
+    return not all(pipeline.is_fresh(name) for name in STALE_STAGES)
+
+
+def analyze_run(run: str, results_dir: str, chart_workers: int) -> tuple:
+    """
+    한 실행을 하위 프로세스(main.py --target <run>)로 분석합니다. 출력은 results/<run>/analysis.log 에 남습니다.
+
+    Returns:
+        tuple: (종료 코드, 걸린 시간(초)).
+    """
+    started = time.monotonic()
+    args = [sys.executable, MAIN_PATH, '--target', run, '--chart-workers', str(chart_workers)]
+    with open(os.path.join(results_dir, run, LOG_FILE_NAME), 'w') as log:
+        code = subprocess.call(args, cwd=os.path.dirname(MAIN_PATH), stdout=log, stderr=subprocess.STDOUT)
+    return code, time.monotonic() - started
+
+
+def watch(
+    workers: Optional[int] = None,
+    debounce_s: Optional[float] = None,
+    polling: bool = False,
+    once: bool = False,
+) -> int:
+    """
+    results 디렉터리를 지켜보며, 원시 결과 파일이 새로 생기거나 바뀐 실행을 (쓰기가 끝난 뒤) 분석합니다.
+    시작할 때는 분석 결과가 오래된(stale) 실행만 분석하고, 최신인 실행은 건너뜁니다.
+
+    Args:
+        workers (Optional[int]): 동시에 분석할 실행 수. 기본값은 config.yaml 의 watch.workers.
+        debounce_s (Optional[float]): 원시 결과 파일이 이 시간 동안 바뀌지 않아야 분석합니다.
+        polling (bool): True 이면 inotify 대신 polling 을 씁니다.
+        once (bool): True 이면 지금 오래된 실행만 분석하고 끝냅니다 (cron 등).
+
+    Returns:
+        int: 종료 코드 (once 모드에서 실패한 분석이 있으면 1).
+    """
+    settings = _settings()
+    results_dir = data_loader.RESULTS_DIR
+    workers = max(1, workers or settings['workers'])
+    debounce_s = settings['debounce_s'] if debounce_s is None else debounce_s
+    chart_workers = max(1, (os.cpu_count() or 1) // workers)
+    if not os.path.isdir(results_dir):
+        print(f"❌ Error: Results directory not found at '{results_dir}'")
+        return 1
+
+    watcher = _Polling(settings['poll_interval_s'])
+    if not polling and sys.platform.startswith('linux'):
+        try:
+            watcher = _Inotify()
+            watcher.add(results_dir, is_root=True)
+        except (OSError, AttributeError) as e:
+            print(f"Warning: inotify unavailable ({e}). Falling back to polling.")
+            watcher = _Polling(settings['poll_interval_s'])
+
+    seen = {}      # run -> (서명, 마지막으로 바뀐 시각)
+    analyzed = {}  # run -> 마지막으로 분석을 시작한 서명
+    running = {}   # run -> (future, 서명)
+    failed = []
+    for run in sorted(os.listdir(results_dir)):
+        if not os.path.isdir(os.path.join(results_dir, run)):
+            continue
+        signature = raw_signature(os.path.join(results_dir, run))
+        if signature is not None and not is_stale(os.path.join(results_dir, run, signature[0])):
+            analyzed[run] = signature
+
+    mode = 'once' if once else f'{watcher.name}, debounce {debounce_s:.0f}s'
+    print(f"👀 Watching {results_dir} ({mode}, {workers} workers × {chart_workers} chart processes). "
+          f"{len(analyzed)} runs up to date.")
+
+    pool = ThreadPoolExecutor(max_workers=workers)
+    try:
+        while True:
+            now = time.time()
+            next_check = settings['poll_interval_s'] * 30  # 이벤트가 없어도 가끔은 다시 훑습니다.
+            for run in sorted(os.listdir(results_dir)):
+                run_dir = os.path.join(results_dir, run)
+                if not os.path.isdir(run_dir):
+                    continue
+                try:
+                    watcher.add(run_dir)
+                except OSError as e:
+                    print(f"Warning: {e}. Falling back to polling.")
+                    watcher.close()
+                    watcher = _Polling(settings['poll_interval_s'])
+                signature = raw_signature(run_dir)
+                if signature is None or signature == analyzed.get(run) or run in running:
+                    continue
+                if seen.get(run, (None,))[0] != signature:
+                    seen[run] = (signature, now)
+                # 쓰는 중인 파일은 건너뜁니다: 서명이 debounce 동안 그대로이고, JSON 배열이 닫혀 있어야 합니다.
+                quiet = settings['stream_idle_s'] if signature[0] == STREAM_FILE_NAME else debounce_s
+                waited = max(now - seen[run][1], now - signature[1])
+                if waited < quiet and not once:
+                    next_check = min(next_check, quiet - waited)
+                    continue
+                if not is_complete(os.path.join(run_dir, signature[0])):
+                    if once:
+                        print(f"Warning: Skipping '{run}' ({signature[0]} is still being written).")
+                        analyzed[run] = signature
+                    continue
+                print(f"🔄 Analyzing '{run}' ({signature[0]} {'changed' if run in analyzed else 'is new'})...")
+                running[run] = (pool.submit(analyze_run, run, results_dir, chart_workers), signature)
+
+            for run, (future, signature) in list(running.items()):
+                if not future.done():
+                    continue
+                del running[run]
+                analyzed[run] = signature
+                code, elapsed = future.result()
+                if code == 0:
+                    print(f"✅ Analyzed '{run}' in {elapsed:.1f}s")
+                else:
+                    failed.append(run)
+                    print(f"❌ Error: Analysis of '{run}' failed with exit code {code} "
+                          f"(see {os.path.join(results_dir, run, LOG_FILE_NAME)})")
+
+            if once and not running:
+                return 1 if failed else 0
+            # 실행 중인 분석이 있으면 끝났는지 자주 확인합니다.
+            watcher.wait(min(next_check, 0.5) if running else next_check)
+    except KeyboardInterrupt:
+        print("\n👋 Stopped watching (waiting for running analyses to finish).")
+        return 0
+    finally:
+        pool.shutdown(wait=True, cancel_futures=True)
+        watcher.close()
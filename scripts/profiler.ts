@@ -1,18 +1,98 @@
+/**
+ * Chrome trace-event 형식의 complete('X') 이벤트.
+ * start/stop 한 쌍을 시작 시각(ts)과 지속 시간(dur)으로 기록합니다. 단위는 마이크로초(µs)입니다.
+ * chrome://tracing 또는 Perfetto 에서 그대로 열 수 있습니다.
+ */
+export type TraceEvent = {
+  name: string;
+  ph: "X" | "M";
+  ts: number;
+  dur?: number;
+  pid: number;
+  tid: number;
+  args?: Record<string, unknown>;
+};
+
+export type ProfilerOptions = {
+  // true이면 합산 시간과 함께 호출 단위 이벤트도 기록합니다 (기본값: false)
+  trace?: boolean;
+  // 이벤트의 pid. 벤치마크에서는 레코드(시나리오/시드/전략) 번호로 사용합니다.
+  pid?: number;
+  // true이면 측정 항목별 힙 사용량 변화(heapDelta)와 최대 증가량(peakHeap)도 기록합니다 (기본값: false)
+  memory?: boolean;
+};
+
+/**
+ * 현재 V8 힙 사용량(bytes)을 반환합니다. 브라우저처럼 process 가 없는 환경에서는 null.
+ */
+export function readHeapUsed(): number | null {
+  if (typeof process === "undefined" || typeof process.memoryUsage !== "function") {
+    return null;
+  }
+  return process.memoryUsage().heapUsed;
+}
+
 /**
  * 코드 블록의 실행 시간을 측정하기 위한 간단한 프로파일러 유틸리티.
  * performance.now()를 사용하여 마이크로초 단위의 정밀한 시간 측정을 지원합니다.
+ * trace 옵션을 켜면 start/stop 호출마다 타임스탬프가 붙은 이벤트를 남겨,
+ * 합산 시간이 "느린 호출 몇 개"인지 "보통 호출 여러 개"인지 구분할 수 있습니다.
  */
 export class Profiler {
   // 각 측정 항목의 시작 시간을 기록하는 Map
   private startTimeMap: Map<string, number> = new Map();
+  // trace 모드에서 start()에 전달된 부가 정보 (예: { edge: 'e12' })
+  private startArgsMap: Map<string, Record<string, unknown>> = new Map();
   // 측정된 최종 실행 시간(ms)을 기록하는 Map
   private durations: Map<string, number> = new Map();
+  // trace 모드에서 기록된 호출 단위 이벤트
+  private events: TraceEvent[] = [];
+  // memory 모드: 측정 중인 항목의 시작 시점 힙 사용량과, 그 뒤로 관측된 최대 힙 사용량
+  private heapStartMap: Map<string, number> = new Map();
+  private heapHighMap: Map<string, number> = new Map();
+  // memory 모드: 항목별 누적 힙 변화량(bytes)과 호출 중 최대 증가량(bytes)
+  private heapDeltas: Map<string, number> = new Map();
+  private heapPeaks: Map<string, number> = new Map();
+  // memory 모드: 프로파일러 생애 동안 관측된 최대 힙 사용량(bytes)
+  private peakHeapUsed = 0;
+  private readonly traceEnabled: boolean;
+  private readonly memoryEnabled: boolean;
+  private readonly pid: number;
+
+  constructor(options: ProfilerOptions = {}) {
+    this.traceEnabled = options.trace ?? false;
+    this.memoryEnabled = (options.memory ?? false) && readHeapUsed() !== null;
+    this.pid = options.pid ?? 0;
+  }
+
+  /**
+   * 힙 사용량을 한 번 샘플링하고, 측정 중인 모든 항목의 최대값을 갱신합니다.
+   * 샘플은 start/stop 시점에만 찍히므로 peakHeap 은 실제 최대값의 하한입니다
+   * (하위 항목이 많을수록, 예를 들어 엣지 단위 키가 있으면 더 촘촘해집니다).
+   */
+  private sampleHeap(): number {
+    const used = readHeapUsed() ?? 0;
+    for (const [name, high] of this.heapHighMap) {
+      if (used > high) this.heapHighMap.set(name, used);
+    }
+    if (used > this.peakHeapUsed) this.peakHeapUsed = used;
+    return used;
+  }
 
   /**
    * 지정된 이름으로 시간 측정을 시작합니다.
    * @param name - 측정 항목의 고유 이름 (예: 'initialPlacement')
+   * @param args - trace 모드에서 이벤트에 함께 기록할 정보 (예: { edge: edge.id })
    */
-  public start(name: string): void {
+  public start(name: string, args?: Record<string, unknown>): void {
+    if (this.traceEnabled && args) {
+      this.startArgsMap.set(name, args);
+    }
+    if (this.memoryEnabled) {
+      const used = this.sampleHeap();
+      this.heapStartMap.set(name, used);
+      this.heapHighMap.set(name, used);
+    }
     this.startTimeMap.set(name, performance.now());
   }
 
@@ -32,6 +112,33 @@ export class Profiler {
     const accumulatedTime = (this.durations.get(name) || 0) + duration;
     this.durations.set(name, accumulatedTime);
     this.startTimeMap.delete(name); // 시작 시간 기록 삭제
+
+    if (this.memoryEnabled) {
+      const used = this.sampleHeap();
+      const heapStart = this.heapStartMap.get(name) ?? used;
+      const growth = (this.heapHighMap.get(name) ?? used) - heapStart;
+      this.heapDeltas.set(name, (this.heapDeltas.get(name) || 0) + (used - heapStart));
+      this.heapPeaks.set(name, Math.max(this.heapPeaks.get(name) ?? 0, growth));
+      this.heapStartMap.delete(name);
+      this.heapHighMap.delete(name);
+    }
+
+    if (this.traceEnabled) {
+      const event: TraceEvent = {
+        name,
+        ph: "X",
+        ts: startTime * 1000,
+        dur: duration * 1000,
+        pid: this.pid,
+        tid: 0,
+      };
+      const args = this.startArgsMap.get(name);
+      if (args) {
+        event.args = args;
+        this.startArgsMap.delete(name);
+      }
+      this.events.push(event);
+    }
   }
 
   /**
@@ -42,12 +149,44 @@ export class Profiler {
     return this.durations;
   }
 
+  /**
+   * memory 모드에서 기록된 항목별 힙 사용량을 반환합니다 (memory 모드가 아니면 빈 Map).
+   * - heapDelta : 종료 시점 - 시작 시점 힙 사용량의 누적합 (GC 가 끼면 음수일 수 있음)
+   * - peakHeap  : 한 번의 호출 동안 시작 시점 대비 최대 증가량 (호출들 중 최대값)
+   * @returns {{ heapDelta: Map<string, number>; peakHeap: Map<string, number> }} 단위는 bytes
+   */
+  public getMemoryResults(): { heapDelta: Map<string, number>; peakHeap: Map<string, number> } {
+    return { heapDelta: this.heapDeltas, peakHeap: this.heapPeaks };
+  }
+
+  /**
+   * memory 모드에서 관측된 최대 힙 사용량(bytes)을 반환합니다.
+   */
+  public getPeakHeapUsed(): number {
+    return this.peakHeapUsed;
+  }
+
+  /**
+   * trace 모드에서 기록된 호출 단위 이벤트를 반환합니다 (trace 모드가 아니면 빈 배열).
+   * @returns {TraceEvent[]} 시작 순서가 아닌 종료 순서로 쌓인 complete 이벤트 목록
+   */
+  public getTraceEvents(): TraceEvent[] {
+    return this.events;
+  }
+
   /**
    * 모든 측정 기록을 초기화합니다.
    */
   public clear(): void {
     this.startTimeMap.clear();  
+    this.startArgsMap.clear();
     this.durations.clear();
+    this.events = [];
+    this.heapStartMap.clear();
+    this.heapHighMap.clear();
+    this.heapDeltas.clear();
+    this.heapPeaks.clear();
+    this.peakHeapUsed = 0;
   }
 }
 
@@ -79,4 +218,20 @@ profiler.stop('anotherTask');
 // 4. 모든 결과 출력
 const results = profiler.getResults();
 console.log(results); // Map(2) { 'expensiveTask' => 123.45, 'anotherTask' => 67.89 }
+
+// 5. 호출 단위 trace (선택)
+const tracer = new Profiler({ trace: true });
+for (const edge of edges) {
+  tracer.start('findPathOnGraph', { edge: edge.id });
+  // ...
+  tracer.stop('findPathOnGraph');
+}
+console.log(tracer.getTraceEvents()); // [{ name: 'findPathOnGraph', ph: 'X', ts, dur, pid: 0, tid: 0, args: { edge: 'e1' } }, ...]
+
+// 6. 힙 사용량 (선택, Node.js 전용)
+const memoryProfiler = new Profiler({ memory: true });
+memoryProfiler.start('buildVisibilityGraph');
+// ...
+memoryProfiler.stop('buildVisibilityGraph');
+console.log(memoryProfiler.getMemoryResults()); // { heapDelta: Map(1) { 'buildVisibilityGraph' => 1048576 }, peakHeap: Map(1) { ... } }
 */
\ No newline at end of file
@@ -1,85 +1,467 @@
+import { createHash } from "crypto";
 import fs from "fs";
+import os from "os";
 import path from "path";
 import { createInitialGraph } from "../src/domain/scenario/generator";
 import { CONFIG } from "../src/app/config";
-import { Profiler } from "./profiler";
+import { Profiler, TraceEvent, readHeapUsed } from "./profiler";
 import { SCENARIOS, SEEDS, STRATEGIES } from "./benchmark.config";
 import { cloneGraph } from "../src/domain/graph";
+import type { Graph } from "../src/domain/types";
 
 // 결과를 저장할 타입 정의
 type BenchmarkResult = {
   scenario: string;
+  // 확장성(scaling) 분석을 위해 시나리오 크기를 함께 기록
+  nodes: number;
+  edges: number;
+  groups: number;
+  // 라우터가 탐색하는 포트 후보 수 (노드 수 × 4면 × CONFIG.portPerSide). 런타임 예측 모델(analysis/runtime_model.py)의 특징
+  ports: number;
   seed: number;
   strategy: string;
   totalTime: number;
   details: Record<string, number>;
+  // 측정 항목별 힙 사용량 (bytes). 'totalTime' 키는 레코드 전체입니다. --memory 일 때만 기록됩니다.
+  // - heapDelta : 종료 - 시작 시점의 힙 사용량 변화 (GC 가 끼면 음수일 수 있음)
+  // - peakHeap  : 시작 시점 대비 최대 증가량 (start/stop 시점 샘플 기준의 하한)
+  heapDelta?: Record<string, number>;
+  peakHeap?: Record<string, number>;
+  // analysis/sweep.py 가 시간 예산 안에 끝나지 않아 중단한 실행에 붙이는 표시
+  // (totalTime = 예산, details 없음: 실제 시간은 예산보다 크다는 것만 알 수 있는 censored 측정값)
+  timedOut?: boolean;
+  // 호스트 간 비교용 (analysis/machine.py). 호스트 지문 전체는 같은 디렉터리의 machine.json 에 있습니다.
+  // - host          : machine.json 의 키 (지문 해시)
+  // - calibrationMs : 이 프로세스에서 잰 보정 마이크로벤치마크 점수 (ms, 작을수록 빠른 호스트)
+  // - loadAvg       : 레코드 측정 시작 시점의 1분 load average (Windows 는 0)
+  host: string;
+  calibrationMs: number;
+  loadAvg: number;
 };
 
+// 실행한 호스트의 지문. machine.json 에 { [host]: MachineInfo } 로 저장됩니다.
+// 호스트 이름은 넣지 않습니다: 같은 하드웨어/런타임이면 다른 장비라도 같은 host 로 묶여 비교됩니다.
+type MachineInfo = {
+  host: string;
+  cpuModel: string;
+  cores: number;
+  platform: string;
+  arch: string;
+  totalMemory: number;
+  node: string;
+  v8: string;
+  calibrationMs: number;
+  // 측정 전에 JIT warm-up 을 했는지. 이 필드가 없는 (이전) 실행은 warm-up 없이 측정했습니다.
+  warmup: boolean;
+};
+
+// 보정 마이크로벤치마크: 고정된 작업량(의사 난수 배열 정렬 + Map 삽입/조회)을 여러 번 실행한 중앙값.
+// 전략 코드와 비슷하게 CPU/메모리/JIT 에 의존하는 작업이라, 호스트 간 측정 시간의 비율을 근사합니다.
+const CALIBRATION_SIZE = 200_000;
+const CALIBRATION_REPEATS = 7;
+
+// --format=columnar 로 저장하는 컬럼 바이너리 포맷 (analysis/columnar.py 와 같은 구조, little-endian 호스트 기준).
+// MAGIC | 헤더 길이 (uint64) | 헤더 JSON | 컬럼 버퍼들 (64 bytes 정렬). 분석 쪽에서 JSON 파싱 없이 memory-map 으로 읽습니다.
+type ResultFormat = "json" | "columnar";
+const COLUMNAR_MAGIC = Buffer.from([0x4f, 0x4c, 0x43, 0x4f, 0x4c, 0x00, 0x01, 0x0a]); // "OLCOL\0\x01\n"
+const COLUMNAR_VERSION = 1;
+const COLUMNAR_ALIGNMENT = 64;
+type ColumnarColumn = { name: string; dtype: string; offset: number; categories?: string[] };
+
+// 레이아웃 품질 분석(analysis/layout_quality.py)용 최종 레이아웃. layouts.ndjson 에 레코드마다 한 줄씩 기록합니다.
+type LayoutRecord = {
+  // 이 레이아웃을 만든 레코드의 번호 (raw_results 에서의 순서, 0부터). --repeat 처럼 같은 (시나리오, 시드, 전략) 이
+  // 여러 번 나와도 레코드와 1:1 로 맞출 수 있습니다. 실행을 합칠 때(오케스트레이터 등) 합친 파일의 번호로 바뀝니다.
+  record: number;
+  scenario: string;
+  seed: number;
+  strategy: string;
+  // 노드 사각형 [x, y, w, h] (Graph.nodes 순서)
+  nodes: number[][];
+  // source/target 은 nodes 의 인덱스, path 는 꺾은선 좌표 [x0, y0, x1, y1, ...] (라우팅되지 않았으면 빈 배열)
+  edges: { source: number; target: number; path: number[] }[];
+};
+
+/**
+ * 전략이 만든 그래프에서 노드 사각형과 엣지 꺾은선만 뽑아냅니다 (측정이 끝난 뒤 호출).
+ */
+function exportLayout(graph: Graph, record: number, scenario: string, seed: number, strategy: string): LayoutRecord {
+  const nodeIndex = new Map<string, number>();
+  const nodes: number[][] = [];
+  for (const node of graph.nodes.values()) {
+    nodeIndex.set(node.id, nodes.length);
+    nodes.push([node.bbox.x, node.bbox.y, node.bbox.w, node.bbox.h]);
+  }
+  const edges = [...graph.edges.values()].map((edge) => ({
+    source: nodeIndex.get(edge.sourceId) ?? -1,
+    target: nodeIndex.get(edge.targetId) ?? -1,
+    path: (edge.path ?? []).flatMap((p) => [p.x, p.y]),
+  }));
+  return { record, scenario, seed, strategy, nodes, edges };
+}
+
+// 호출 단위 trace 출력 형식
+// - ndjson : trace.ndjson 에 레코드마다 이벤트를 한 줄씩 추가 (실행 중에도 읽을 수 있음)
+// - chrome : 종료 시 trace.json 에 Chrome trace-event 형식으로 저장 (chrome://tracing, Perfetto)
+type TraceFormat = "ndjson" | "chrome";
+
+/**
+ * `--format=json` (기본값, raw_results.json) / `--format=columnar` (raw_results.col) 인자를 해석합니다.
+ */
+function parseResultFormat(argv: string[]): ResultFormat {
+  const format = parseOption(argv, "format") ?? "json";
+  if (format !== "json" && format !== "columnar") {
+    throw new Error(`Unknown result format '${format}' (expected 'json' or 'columnar')`);
+  }
+  return format;
+}
+
+/**
+ * `--trace` / `--trace=ndjson` / `--trace=chrome` 인자를 해석합니다. 없으면 null (trace 끔).
+ */
+function parseTraceFormat(argv: string[]): TraceFormat | null {
+  const arg = argv.find((a) => a === "--trace" || a.startsWith("--trace="));
+  if (!arg) return null;
+  const format = arg.includes("=") ? arg.split("=")[1] : "ndjson";
+  if (format !== "ndjson" && format !== "chrome") {
+    throw new Error(`Unknown trace format '${format}' (expected 'ndjson' or 'chrome')`);
+  }
+  return format;
+}
+
+// 벤치마크 행렬(시나리오 × 시드 × 전략)의 한 칸. index 는 전체 행렬에서의 순서입니다.
+type BenchmarkCase = {
+  index: number;
+  scenario: (typeof SCENARIOS)[number];
+  seed: number;
+  strategyName: string;
+};
+
+/**
+ * `--name=value` 형식의 인자 값을 반환합니다. 없으면 null.
+ */
+function parseOption(argv: string[], name: string): string | null {
+  const prefix = `--${name}=`;
+  const arg = argv.find((a) => a.startsWith(prefix));
+  return arg ? arg.slice(prefix.length) : null;
+}
+
+/**
+ * `--scenario=<name>:<nodes>:<edges>:<groups>` 가 있으면 SCENARIOS 대신 그 시나리오 하나를 사용합니다.
+ * analysis/sweep.py 가 그래프 크기를 기하급수적으로 키워가며 실행할 때 사용합니다.
+ */
+function parseScenarios(argv: string[]): (typeof SCENARIOS)[number][] {
+  const spec = parseOption(argv, "scenario");
+  if (!spec) return SCENARIOS;
+  const [name, nodes, edges, groups] = spec.split(":");
+  const scenario = { name, nodes: Number(nodes), edges: Number(edges), groups: Number(groups) };
+  if (!name || [scenario.nodes, scenario.edges, scenario.groups].some((v) => !Number.isInteger(v) || v <= 0)) {
+    throw new Error(`Invalid --scenario '${spec}' (expected <name>:<nodes>:<edges>:<groups>)`);
+  }
+  return [scenario];
+}
+
+/**
+ * 시나리오 → 시드 → 전략 순서로 전체 벤치마크 행렬을 만듭니다.
+ * `--scenario`, `--seeds=42,101`, `--strategy=<name>` 으로 행렬의 축을 바꾸거나 좁힐 수 있습니다.
+ */
+function buildCases(argv: string[] = []): BenchmarkCase[] {
+  const seedsOption = parseOption(argv, "seeds");
+  const seeds = seedsOption ? seedsOption.split(",").map(Number) : SEEDS;
+  const strategyOption = parseOption(argv, "strategy");
+  const strategyNames = [...STRATEGIES.keys()].filter((name) => !strategyOption || name === strategyOption);
+  if (strategyOption && strategyNames.length === 0) {
+    throw new Error(`Unknown strategy '${strategyOption}' (expected one of ${[...STRATEGIES.keys()].join(", ")})`);
+  }
+
+  const cases: BenchmarkCase[] = [];
+  for (const scenario of parseScenarios(argv)) {
+    for (const seed of seeds) {
+      for (const strategyName of strategyNames) {
+        cases.push({ index: cases.length, scenario, seed, strategyName });
+      }
+    }
+  }
+  return cases;
+}
+
+/**
+ * `--cases=<file>` (case index 의 JSON 배열) 이 있으면 그 칸들만 고릅니다. 없으면 전체 행렬.
+ * analysis/orchestrator.py 가 행렬을 여러 프로세스로 나눠 실행할 때 사용합니다.
+ */
+function selectCases(cases: BenchmarkCase[], argv: string[]): BenchmarkCase[] {
+  const casesPath = parseOption(argv, "cases");
+  if (!casesPath) return cases;
+  const wanted = new Set<number>(JSON.parse(fs.readFileSync(casesPath, "utf-8")));
+  return cases.filter((c) => wanted.has(c.index));
+}
+
+/**
+ * 측정 전에 전략마다 가장 작은 시나리오를 한 번씩 실행해 JIT 를 데웁니다 (결과는 버림).
+ */
+function runWarmup() {
+  const scenario = SCENARIOS[0];
+  const baseGraph = createInitialGraph(
+    scenario.nodes,
+    scenario.edges,
+    scenario.groups,
+    CONFIG.gridSize,
+    SEEDS[0]
+  );
+  for (const [strategyName, strategy] of STRATEGIES.entries()) {
+    console.log(`🔥 Warm-up: ${scenario.name} | Seed: ${SEEDS[0]} | Strategy: ${strategyName}`);
+    strategy.execute(cloneGraph(baseGraph), CONFIG, new Profiler());
+  }
+}
+
+/**
+ * 보정 마이크로벤치마크를 실행하고 중앙값(ms)을 반환합니다. 입력은 항상 같으므로 호스트만 결과를 바꿉니다.
+ */
+function runCalibration(): number {
+  const times: number[] = [];
+  let checksum = 0;
+  for (let repeat = 0; repeat < CALIBRATION_REPEATS; repeat++) {
+    const start = performance.now();
+    const values = new Float64Array(CALIBRATION_SIZE);
+    let x = 12345;
+    for (let i = 0; i < CALIBRATION_SIZE; i++) {
+      x = (Math.imul(x, 1103515245) + 12345) >>> 0;
+      values[i] = x;
+    }
+    values.sort();
+    const index = new Map<number, number>();
+    for (let i = 0; i < CALIBRATION_SIZE; i++) index.set(values[i], i);
+    for (let i = 0; i < CALIBRATION_SIZE; i += 7) checksum += index.get(values[i])!;
+    times.push(performance.now() - start);
+  }
+  // 결과를 쓰지 않으면 JIT 가 작업을 없앨 수 있으므로 checksum 을 남깁니다.
+  if (checksum < 0) console.log(checksum);
+  times.sort((a, b) => a - b);
+  return times[Math.floor(times.length / 2)];
+}
+
+/**
+ * CPU 모델, 코어 수, 플랫폼, Node/V8 버전으로 호스트 지문을 만듭니다.
+ */
+function describeMachine(calibrationMs: number, warmup: boolean): MachineInfo {
+  const cpus = os.cpus();
+  const cpuModel = cpus[0]?.model.trim() ?? "unknown";
+  const fingerprint = [cpuModel, cpus.length, os.platform(), os.arch(), process.versions.node].join("|");
+  return {
+    host: createHash("sha256").update(fingerprint).digest("hex").slice(0, 12),
+    cpuModel,
+    cores: cpus.length,
+    platform: os.platform(),
+    arch: os.arch(),
+    totalMemory: os.totalmem(),
+    node: process.versions.node,
+    v8: process.versions.v8,
+    calibrationMs,
+    warmup,
+  };
+}
+
+/**
+ * 가능하면(node --expose-gc) GC 를 실행해, 레코드마다 비슷한 힙 상태에서 측정을 시작합니다.
+ */
+function collectGarbage(): boolean {
+  const gc = (globalThis as { gc?: () => void }).gc;
+  if (typeof gc !== "function") return false;
+  gc();
+  return true;
+}
+
 /**
  * Headless 벤치마크를 실행하는 메인 함수
  */
 async function runBenchmark() {
+  const argv = process.argv.slice(2);
+  const allCases = buildCases(argv);
+  if (argv.includes("--list")) {
+    // 오케스트레이터용: 행렬을 JSON 으로 출력하고 종료 (stdout 에는 JSON 만)
+    const listed = allCases.map((c) => ({
+      index: c.index,
+      scenario: c.scenario.name,
+      nodes: c.scenario.nodes,
+      edges: c.scenario.edges,
+      groups: c.scenario.groups,
+      seed: c.seed,
+      strategy: c.strategyName,
+    }));
+    console.log(JSON.stringify(listed));
+    return;
+  }
+
   console.log("🚀 Starting Orthogonal Layout Benchmark...");
 
+  const traceFormat = parseTraceFormat(argv);
+  const resultFormat = parseResultFormat(argv);
+  // 힙 사용량 기록 (기본값: 끔). start/stop 마다 힙을 읽고 레코드마다 gc() 를 부르므로 타이밍이 달라집니다.
+  // 시간 측정과 섞지 말고 --memory 로 따로 한 번 돌리세요.
+  const memory = argv.includes("--memory") && readHeapUsed() !== null;
+  const cases = selectCases(allCases, argv);
   const allResults: BenchmarkResult[] = [];
-  const totalRuns = SCENARIOS.length * SEEDS.length * STRATEGIES.size;
+  const allTraceEvents: TraceEvent[] = [];
+  // 실행 중에도 분석 측에서 따라 읽을 수 있도록 결과를 한 줄씩 NDJSON으로 기록
+  const outputDir = createOutputDir(parseOption(argv, "out"));
+  const streamPath = path.join(outputDir, "raw_results.ndjson");
+  const traceStreamPath = path.join(outputDir, "trace.ndjson");
+  // 최종 레이아웃 기록 (기본값: 켬). 타이밍만 필요하면 --no-layout
+  const layout = !argv.includes("--no-layout");
+  const layoutStreamPath = path.join(outputDir, "layouts.ndjson");
+  const totalRuns = cases.length;
   let currentRun = 1;
+  if (traceFormat) {
+    console.log(`🔎 Per-call trace enabled (${traceFormat})`);
+  }
+  if (memory) {
+    console.log("🧠 Heap metrics enabled (--memory): timings of this run are not comparable with timing-only runs");
+  }
+  if (memory && !collectGarbage()) {
+    console.log("ℹ️ Heap metrics are recorded without forced GC (run node with --expose-gc for a stable baseline)");
+  }
+  // JIT warm-up (기본값: 켬). 직접 실행과 오케스트레이터/스윕이 같은 조건에서 재도록 기본값을 맞춥니다.
+  // 차가운 JIT 를 재려면 --no-warmup (machine.json 의 warmup 에 기록됩니다)
+  const warmup = !argv.includes("--no-warmup");
+  if (warmup) {
+    runWarmup();
+  }
+  // warm-up 뒤에 보정 점수를 재서, 측정과 같은 (JIT 가 데워진) 상태의 호스트 속도를 기록합니다.
+  const machine = describeMachine(runCalibration(), warmup);
+  saveMachine(outputDir, machine);
 
-  for (const scenario of SCENARIOS) {
-    for (const seed of SEEDS) {
-      // 1. 시나리오와 시드를 기반으로 기준 그래프 생성
-      const baseGraph = createInitialGraph(
+  // 같은 (시나리오, 시드) 의 칸들은 연속해 있으므로, 기준 그래프는 바뀔 때만 새로 만듭니다.
+  let baseGraphKey = "";
+  let baseGraph: ReturnType<typeof createInitialGraph> | null = null;
+
+  for (const { scenario, seed, strategyName } of cases) {
+    // 1. 시나리오와 시드를 기반으로 기준 그래프 생성
+    const graphKey = `${scenario.name}|${seed}`;
+    if (baseGraph === null || graphKey !== baseGraphKey) {
+      baseGraph = createInitialGraph(
         scenario.nodes,
         scenario.edges,
         scenario.groups,
         CONFIG.gridSize,
         seed
       );
+      baseGraphKey = graphKey;
+    }
+    const strategy = STRATEGIES.get(strategyName)!;
 
-      for (const [strategyName, strategy] of STRATEGIES.entries()) {
-        console.log(
-          `[${currentRun++}/${totalRuns}] Running: ${
-            scenario.name
-          } | Seed: ${seed} | Strategy: ${strategyName}`
-        );
+    console.log(
+      `[${currentRun++}/${totalRuns}] Running: ${
+        scenario.name
+      } | Seed: ${seed} | Strategy: ${strategyName}`
+    );
 
-        // 2. 각 실행마다 새로운 프로파일러 사용
-        const profiler = new Profiler();
-        const totalTimeProfiler = new Profiler();
+    // 2. 각 실행마다 새로운 프로파일러 사용 (trace 이벤트의 pid = 레코드 번호)
+    const recordIndex = allResults.length;
+    const profiler = new Profiler({ trace: traceFormat !== null, pid: recordIndex, memory });
+    const totalTimeProfiler = new Profiler();
+    const loadAvg = os.loadavg()[0];
+    if (memory) collectGarbage();
+    const heapBefore = memory ? readHeapUsed()! : 0;
 
-        // 3. 전체 실행 시간 측정 시작
-        totalTimeProfiler.start("total");
+    // 3. 전체 실행 시간 측정 시작
+    totalTimeProfiler.start("total");
 
-        // 그래프 복제하여 원본 보존
-        const graphClone = cloneGraph(baseGraph);
+    // 그래프 복제하여 원본 보존
+    const graphClone = cloneGraph(baseGraph);
 
-        // 4. 전략 실행 (내부적으로 세부 시간 측정)
-        strategy.execute(graphClone, CONFIG, profiler);
+    // 4. 전략 실행 (내부적으로 세부 시간 측정)
+    const laidOut = strategy.execute(graphClone, CONFIG, profiler);
 
-        totalTimeProfiler.stop("total");
+    totalTimeProfiler.stop("total");
 
-        // 5. 결과 수집
-        const detailedDurations = Object.fromEntries(
-          profiler.getResults().entries()
-        );
+    // 5. 결과 수집
+    const detailedDurations = Object.fromEntries(
+      profiler.getResults().entries()
+    );
+
+    const result: BenchmarkResult = {
+      scenario: scenario.name,
+      nodes: scenario.nodes,
+      edges: scenario.edges,
+      groups: scenario.groups,
+      ports: scenario.nodes * 4 * CONFIG.portPerSide,
+      seed: seed,
+      strategy: strategyName,
+      totalTime: totalTimeProfiler.getResults().get("total")!,
+      details: detailedDurations,
+      host: machine.host,
+      calibrationMs: machine.calibrationMs,
+      loadAvg,
+    };
+    if (memory) {
+      const heapAfter = readHeapUsed()!;
+      const { heapDelta, peakHeap } = profiler.getMemoryResults();
+      result.heapDelta = {
+        totalTime: heapAfter - heapBefore,
+        ...Object.fromEntries(heapDelta.entries()),
+      };
+      result.peakHeap = {
+        totalTime: Math.max(profiler.getPeakHeapUsed(), heapAfter) - heapBefore,
+        ...Object.fromEntries(peakHeap.entries()),
+      };
+    }
+    allResults.push(result);
+    fs.appendFileSync(streamPath, JSON.stringify(result) + "\n");
+    if (layout) {
+      fs.appendFileSync(
+        layoutStreamPath,
+        JSON.stringify(exportLayout(laidOut, recordIndex, scenario.name, seed, strategyName)) + "\n"
+      );
+    }
 
-        allResults.push({
-          scenario: scenario.name,
-          seed: seed,
-          strategy: strategyName,
-          totalTime: totalTimeProfiler.getResults().get("total")!,
-          details: detailedDurations,
-        });
+    if (traceFormat) {
+      // 레코드를 식별하는 메타데이터 이벤트 + 호출 단위 이벤트
+      const events: TraceEvent[] = [
+        {
+          name: "process_name",
+          ph: "M",
+          ts: 0,
+          pid: recordIndex,
+          tid: 0,
+          args: {
+            name: `${scenario.name} | seed ${seed} | ${strategyName}`,
+            scenario: scenario.name,
+            seed,
+            strategy: strategyName,
+          },
+        },
+        ...profiler.getTraceEvents(),
+      ];
+      if (traceFormat === "ndjson") {
+        fs.appendFileSync(
+          traceStreamPath,
+          events.map((event) => JSON.stringify(event)).join("\n") + "\n"
+        );
+      } else {
+        allTraceEvents.push(...events);
       }
     }
   }
 
   // 6. 결과 파일로 저장
-  saveResults(allResults);
+  if (resultFormat === "columnar") {
+    saveColumnar(outputDir, allResults);
+  } else {
+    saveResults(outputDir, allResults);
+  }
+  if (traceFormat === "chrome") {
+    saveTrace(outputDir, allTraceEvents);
+  }
   console.log("✅ Benchmark finished!");
 }
 
-function saveResults(results: BenchmarkResult[]) {
+function createOutputDir(outDir: string | null = null): string {
+  // --out=<dir> 가 있으면 그 디렉터리에 저장합니다 (오케스트레이터의 샤드 디렉터리).
+  if (outDir) {
+    fs.mkdirSync(outDir, { recursive: true });
+    return outDir;
+  }
+
   // YYYY-MM-DD_HH-MM-SS 형식의 타임스탬프 생성
   const date = new Date();
   const timestamp =
@@ -102,7 +484,10 @@ function saveResults(results: BenchmarkResult[]) {
   if (!fs.existsSync(outputDir)) {
     fs.mkdirSync(outputDir, { recursive: true });
   }
+  return outputDir;
+}
 
+function saveResults(outputDir: string, results: BenchmarkResult[]) {
   // JSON 파일명 및 최종 경로
   const fileName = "raw_results.json";
   const filePath = path.join(outputDir, fileName);
@@ -111,7 +496,109 @@ function saveResults(results: BenchmarkResult[]) {
   console.log(`📝 Results saved to: ${filePath}`);
 }
 
+/**
+ * analysis/record_stream.py 의 flatten_record 와 같은 순서로 레코드를 평탄화합니다 (힙 사용량은 '<metric>@<key>').
+ */
+function flattenResult(result: BenchmarkResult): Record<string, string | number | boolean> {
+  const flat: Record<string, string | number | boolean> = {
+    scenario: result.scenario,
+    nodes: result.nodes,
+    edges: result.edges,
+    groups: result.groups,
+    ports: result.ports,
+    seed: result.seed,
+    strategy: result.strategy,
+    totalTime: result.totalTime,
+  };
+  if (result.timedOut !== undefined) flat.timedOut = result.timedOut;
+  flat.calibrationMs = result.calibrationMs;
+  flat.loadAvg = result.loadAvg;
+  Object.assign(flat, result.details);
+  for (const [key, value] of Object.entries(result.heapDelta ?? {})) flat[`heapDelta@${key}`] = value;
+  for (const [key, value] of Object.entries(result.peakHeap ?? {})) flat[`peakHeap@${key}`] = value;
+  // 기록되지 않은 필드는 컬럼을 만들지 않습니다 (flatten_record 는 없는 키를 건너뜀).
+  return Object.fromEntries(Object.entries(flat).filter(([, value]) => value !== undefined));
+}
+
+/**
+ * 결과를 컬럼 바이너리 포맷(raw_results.col)으로 저장합니다. 문자열 컬럼은 코드 + categories,
+ * seed 는 int64, timedOut 은 bool, 나머지는 float64 (없는 값은 NaN) 입니다.
+ */
+function saveColumnar(outputDir: string, results: BenchmarkResult[]) {
+  const rows = results.map(flattenResult);
+  const names = [...new Set(rows.flatMap((row) => Object.keys(row)))];
+  const columns: ColumnarColumn[] = [];
+  const buffers: Buffer[] = [];
+  for (const name of names) {
+    const values = rows.map((row) => row[name]);
+    if (name === "scenario" || name === "strategy") {
+      const categories: string[] = [];
+      const index = new Map<string, number>();
+      const codes = Int32Array.from(values, (value) => {
+        if (value === undefined) return -1;
+        const key = String(value);
+        if (!index.has(key)) index.set(key, categories.push(key) - 1);
+        return index.get(key)!;
+      });
+      columns.push({ name, dtype: "<i4", offset: 0, categories });
+      buffers.push(Buffer.from(codes.buffer));
+    } else if (name === "seed") {
+      columns.push({ name, dtype: "<i8", offset: 0 });
+      buffers.push(Buffer.from(BigInt64Array.from(values, (value) => BigInt(value as number)).buffer));
+    } else if (name === "timedOut") {
+      columns.push({ name, dtype: "|b1", offset: 0 });
+      buffers.push(Buffer.from(Uint8Array.from(values, (value) => (value ? 1 : 0))));
+    } else {
+      columns.push({ name, dtype: "<f8", offset: 0 });
+      buffers.push(Buffer.from(Float64Array.from(values, (value) => (value === undefined ? NaN : Number(value))).buffer));
+    }
+  }
+
+  // 헤더 길이가 오프셋 자릿수에 따라 바뀌므로, 오프셋이 더 바뀌지 않을 때까지 다시 계산합니다.
+  const align = (position: number) => Math.ceil(position / COLUMNAR_ALIGNMENT) * COLUMNAR_ALIGNMENT;
+  const header = { version: COLUMNAR_VERSION, rows: rows.length, columns };
+  for (;;) {
+    let position = align(COLUMNAR_MAGIC.length + 8 + Buffer.byteLength(JSON.stringify(header)));
+    let changed = false;
+    columns.forEach((column, i) => {
+      changed ||= column.offset !== position;
+      column.offset = position;
+      position = align(position + buffers[i].length);
+    });
+    if (!changed) break;
+  }
+
+  const encoded = Buffer.from(JSON.stringify(header));
+  const headerLength = Buffer.alloc(8);
+  headerLength.writeBigUInt64LE(BigInt(encoded.length));
+  const parts = [COLUMNAR_MAGIC, headerLength, encoded];
+  let written = COLUMNAR_MAGIC.length + 8 + encoded.length;
+  columns.forEach((column, i) => {
+    parts.push(Buffer.alloc(column.offset - written), buffers[i]);
+    written = column.offset + buffers[i].length;
+  });
+
+  const filePath = path.join(outputDir, "raw_results.col");
+  fs.writeFileSync(`${filePath}.tmp`, Buffer.concat(parts));
+  fs.renameSync(`${filePath}.tmp`, filePath);
+  console.log(`📝 Results saved to: ${filePath}`);
+}
+
+function saveMachine(outputDir: string, machine: MachineInfo) {
+  const filePath = path.join(outputDir, "machine.json");
+  fs.writeFileSync(filePath, JSON.stringify({ [machine.host]: machine }, null, 2));
+  console.log(`🖥️ Host ${machine.host}: ${machine.cpuModel} ×${machine.cores}, Node ${machine.node}, calibration ${machine.calibrationMs.toFixed(2)} ms${machine.warmup ? "" : ", no warm-up"}`);
+}
+
+function saveTrace(outputDir: string, events: TraceEvent[]) {
+  const filePath = path.join(outputDir, "trace.json");
+  fs.writeFileSync(filePath, JSON.stringify({ traceEvents: events, displayTimeUnit: "ms" }));
+  console.log(`🔎 Trace saved to: ${filePath}`);
+}
+
 // 스크립트 실행
 runBenchmark().catch((error) => {
   console.error("Benchmark script failed:", error);
+  // 오케스트레이터가 실패한 샤드를 알 수 있도록 0 이 아닌 종료 코드로 끝냅니다.
+  process.exitCode = 1;
 });
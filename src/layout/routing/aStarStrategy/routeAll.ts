@@ -8,6 +8,10 @@ import { getCandidateSides } from "./portSelector";
 import { portPosition } from "@layout/port/assign";
 import { setLastBuiltGrid } from "@render/debug";
 import { manhattan } from "@utils/math";
+import { makeKey } from "@utils/timerKey";
+
+// aStar_Loop 안의 엣지 하나에 대한 탐색 + 후처리 시간 (L3-Routing:aStar_Loop:routeEdge)
+const EDGE_TIMER_KEY = makeKey(3, "Routing", "aStar_Loop", "routeEdge");
 
 /**
  * [1단계 성능 개선] A*의 목표 지점을 노드 경계에 더 가깝게 설정하여 '감싸는' 현상을 해결
@@ -115,6 +119,8 @@ export function routeAll(g: Graph, cfg: any, profiler: Profiler): Graph {
     const s = out.nodes.get(e.sourceId)!;
     const t = out.nodes.get(e.targetId)!;
     if (!s || !t) continue;
+    // 엣지 단위 측정 (trace 모드에서 엣지별 지연 시간 분포와 가장 느린 엣지를 확인하는 데 사용)
+    profiler.start(EDGE_TIMER_KEY, { edge: e.id });
 
     // 1. 최적의 연결 방향(side)을 결정
     const candidateSides = getCandidateSides(s, t);
@@ -129,6 +135,7 @@ export function routeAll(g: Graph, cfg: any, profiler: Profiler): Graph {
       const sp = portPosition(s, sourceSide, 0.5);
       const tp = portPosition(t, targetSide, 0.5);
       out.edges.set(e.id, { ...e, path: [sp, { x: tp.x, y: sp.y }, tp] });
+      profiler.stop(EDGE_TIMER_KEY);
       continue;
     }
 
@@ -164,6 +171,7 @@ export function routeAll(g: Graph, cfg: any, profiler: Profiler): Graph {
     }
 
     out.edges.set(e.id, { ...e, path: finalPath });
+    profiler.stop(EDGE_TIMER_KEY);
   }
   profiler.stop("aStar_Loop"); 
   return out;
@@ -47,26 +47,26 @@ function findPathForEdge(
   const targetNode = g.nodes.get(edge.targetId)!;
 
   // 1. Off-Ramp 후보군을 먼저 탐색
-  profiler.start("findRampCandidates");
+  profiler.start("findRampCandidates", { edge: edge.id });
   const offRampCandidates = findRampCandidates(targetNode, network);
   if (offRampCandidates.length === 0)
     return createFallbackPath(sourceNode, targetNode);
   profiler.stop("findRampCandidates");
 
   // 2. On-Ramp를 찾을 때, 각 후보에서 Off-Ramp 후보군까지의 총 예상 비용을 계산
-  profiler.start("findBestRamp");
+  profiler.start("findBestRamp", { edge: edge.id });
   const onRamp = findBestRamp(sourceNode, network, offRampCandidates);
   if (!onRamp) return createFallbackPath(sourceNode, targetNode);
   profiler.stop("findBestRamp");
 
   // 3. 선택된 On-Ramp를 기준으로 최적의 Off-Ramp를 최종 결정
-  profiler.start("findBestOffRamp");
+  profiler.start("findBestOffRamp", { edge: edge.id });
   const offRamp = findBestOffRamp(onRamp, network, offRampCandidates);
   if (!offRamp) return createFallbackPath(sourceNode, targetNode);
   profiler.stop("findBestOffRamp");
 
   // 4. Highway: 네트워크 그래프에서 A*로 최단 비용 채널 경로 탐색
-  profiler.start("findBusRoute");
+  profiler.start("findBusRoute", { edge: edge.id });
   const channelPath = findBusRoute(
     onRamp.channel.id,
     offRamp.channel.id,
@@ -76,12 +76,12 @@ function findPathForEdge(
 
   // 5. 경로 조합: 찾은 세 조각을 합쳐 최종 직교 경로 생성
   if (channelPath) {
-    profiler.start("stitchPath");
+    profiler.start("stitchPath", { edge: edge.id });
     const result = stitchPath(onRamp, offRamp, channelPath, network, edge.id, cfg);
     profiler.stop("stitchPath");
     return result
   } else {
-    profiler.start("createFallbackPath2");
+    profiler.start("createFallbackPath2", { edge: edge.id });
     const result = createFallbackPath(sourceNode, targetNode);
     profiler.stop("createFallbackPath2");
     return result;
@@ -234,7 +234,7 @@ export function routeOnVisibilityGraph(
   for (const edge of edgesToRoute) {
     const sourceNode = out.nodes.get(edge.sourceId)!;
     const targetNode = out.nodes.get(edge.targetId)!;
-    profiler.start("findRampInfo");
+    profiler.start("findRampInfo", { edge: edge.id });
     const startInfo = findRampInfo(
       sourceNode,
       targetNode,
@@ -250,7 +250,7 @@ export function routeOnVisibilityGraph(
     profiler.stop("findRampInfo");
 
     if (startInfo && endInfo) {
-      profiler.start("findPathOnGraph");
+      profiler.start("findPathOnGraph", { edge: edge.id });
       const vertexIdPath = findPathOnGraph(
         startInfo.vertex.id,
         endInfo.vertex.id,
@@ -273,7 +273,7 @@ export function routeOnVisibilityGraph(
         );
 
         // 수정된 stitchPath 호출
-        profiler.start("stitchPath");
+        profiler.start("stitchPath", { edge: edge.id });
         const finalPath = stitchPath(startInfo.port, endInfo.port, vertexPath);
         profiler.stop("stitchPath");
 
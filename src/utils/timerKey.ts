@@ -3,7 +3,7 @@
 // and enforce the L{level}-{path} naming convention with ':' as sub-path delimiter.
 
 export type Profiler = {
-  start: (name: string) => void;
+  start: (name: string, args?: Record<string, unknown>) => void;
   stop: (name: string) => void;
 };
 